@@ -92,7 +92,20 @@ a = Analysis(
         'ImageClassifierGUI', 
         'DuplicateImageIdentifier',
         'DuplicateImageIdentifierGUI',
+        'ClipModelService',
+        'SignatureCache',
+        'EmbeddingCache',
+        'PerceptualHash',
+        'LibraryAnalyzer',
+        'LibraryAnalyzerGUI',
+        'ImageQualityAnalyzer',
+        'FileScanner',
+        'ScanResultCache',
+        'ImageDecoder',
+        'ImageHeader',
         'CommonUI',
+        'ThumbnailCache',
+        'ThumbnailService',
         'launchPhotoSiftApp',
         
         # Additional suspected missing imports for Torch/Transformers
@@ -16,6 +16,9 @@ setup(
         "requests",  # Used by transformers for downloading models
         "packaging",  # Used by transformers for version handling
     ],
+    extras_require={
+        "onnx": ["onnx", "onnxruntime"],  # ONNX Runtime CLIP backend (PHOTOSIFT_CLIP_BACKEND=onnx)
+    },
     python_requires=">=3.8",
     entry_points={
         "console_scripts": [
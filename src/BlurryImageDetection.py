@@ -9,7 +9,10 @@ import numpy as np
 from PIL import Image
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import multiprocessing
+
+from FileScanner import scan_image_files
+from ImageDecoder import decode_for_analysis
+from ImageQualityAnalyzer import blur_score, default_workers, iter_quality_records, ResultBatcher
 
 
 class BlurryImageDetector:
@@ -37,6 +40,11 @@ class BlurryImageDetector:
         """
         Calculate the blur score (Laplacian variance) for an image.
         
+        The image is measured at ImageDecoder.ANALYSIS_MAX_SIDE (large JPEGs
+        are decoded at reduced scale) and the variance is corrected back to
+        the full-resolution scale the thresholds were tuned on (see
+        ImageQualityAnalyzer.blur_score).
+        
         Args:
             image_path (str): Path to the image file
             
@@ -45,21 +53,11 @@ class BlurryImageDetector:
                    Returns -1 if image cannot be processed
         """
         try:
-            # Read image
-            image = cv2.imread(str(image_path))
-            if image is None:
-                # Try with PIL if cv2 fails
-                pil_image = Image.open(image_path)
-                image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
-            
-            # Convert to grayscale
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            # Read image at the canonical analysis scale
+            image, full_size = decode_for_analysis(image_path)
             
-            # Calculate Laplacian variance
-            laplacian = cv2.Laplacian(gray, cv2.CV_64F)
-            variance = laplacian.var()
-            
-            return variance
+            # Laplacian variance, on the full-resolution scale
+            return blur_score(image, full_size)
             
         except Exception as e:
             print(f"Error processing {image_path}: {str(e)}")
@@ -106,7 +104,8 @@ class BlurryImageDetector:
             return "Very Blurry"
 
 
-def detect_blurry_images_batch(folder_path, threshold=100.0, progress_callback=None, batch_size=10, max_workers=None):
+def detect_blurry_images_batch(folder_path, threshold=100.0, progress_callback=None, batch_size=10, max_workers=None,
+                               manifest=None, backend="thread", result_callback=None):
     """
     Scan a folder for blurry images using parallel batch processing for better performance.
     
@@ -115,7 +114,12 @@ def detect_blurry_images_batch(folder_path, threshold=100.0, progress_callback=N
         threshold (float): Blur detection threshold
         progress_callback (callable): Optional callback function(current, total, filename)
         batch_size (int): Number of images to process in each batch
-        max_workers (int): Maximum number of parallel workers (default: CPU count)
+        max_workers (int): Maximum number of parallel workers (default: CPU count; up to 8 threads)
+        manifest (FileManifest): Optional pre-scanned file list for folder_path
+        backend (str): "thread" or "process". The process backend sends chunks of
+            paths to worker processes and scales past the GIL on many-core machines.
+        result_callback (callable): Optional callback([(path, score, is_blurry), ...])
+            receiving results in chunks while the scan runs, unsorted
         
     Returns:
         dict: {
@@ -127,29 +131,19 @@ def detect_blurry_images_batch(folder_path, threshold=100.0, progress_callback=N
     """
     detector = BlurryImageDetector(threshold=threshold)
     
-    # Supported image extensions
-    image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.webp'}
-    
-    # Find all images, excluding Trash folder
-    # Use a set to avoid duplicates (e.g., same file found as .jpg and .JPG)
-    image_files_set = set()
-    for ext in image_extensions:
-        for img_path in Path(folder_path).rglob(f'*{ext}'):
-            if 'Trash' not in img_path.parts:
-                image_files_set.add(img_path)
-        for img_path in Path(folder_path).rglob(f'*{ext.upper()}'):
-            if 'Trash' not in img_path.parts:
-                image_files_set.add(img_path)
-    
-    image_files = list(image_files_set)
+    # One directory walk with Trash pruned, unless the caller already has a manifest
+    if manifest is None:
+        manifest = scan_image_files(folder_path)
+    image_files = [Path(p) for p in manifest]
     blurry_images = []
     sharp_images = []
     total = len(image_files)
     processed = 0
+    stream = ResultBatcher(result_callback)
     
     # Use CPU count if max_workers not specified
     if max_workers is None:
-        max_workers = min(multiprocessing.cpu_count(), 8)  # Cap at 8 to avoid overhead
+        max_workers = default_workers(backend)
     
     def process_single_image(image_path):
         """Process a single image and return result"""
@@ -161,32 +155,48 @@ def detect_blurry_images_batch(folder_path, threshold=100.0, progress_callback=N
             return (str(image_path), -1, False)
     
     # Process images in parallel batches
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_path = {executor.submit(process_single_image, img_path): img_path 
-                         for img_path in image_files}
+    if backend == "process":
+        # Worker processes score chunks of paths and return compact arrays
+        for record in iter_quality_records(image_files, backend="process", max_workers=max_workers):
+            score = record['blur_score']
+            if score != -1:
+                if score < threshold:
+                    blurry_images.append((record['path'], score))
+                else:
+                    sharp_images.append((record['path'], score))
+                stream.add((record['path'], score, score < threshold))
+            processed += 1
+            if progress_callback:
+                progress_callback(processed, total, os.path.basename(record['path']))
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Submit all tasks
+            future_to_path = {executor.submit(process_single_image, img_path): img_path 
+                             for img_path in image_files}
         
-        # Process completed tasks as they finish
-        for future in as_completed(future_to_path):
-            img_path = future_to_path[future]
-            try:
-                path_str, score, is_blurry = future.result()
+            # Process completed tasks as they finish
+            for future in as_completed(future_to_path):
+                img_path = future_to_path[future]
+                try:
+                    path_str, score, is_blurry = future.result()
                 
-                if score != -1:  # Successfully processed
-                    if is_blurry:
-                        blurry_images.append((path_str, score))
-                    else:
-                        sharp_images.append((path_str, score))
+                    if score != -1:  # Successfully processed
+                        if is_blurry:
+                            blurry_images.append((path_str, score))
+                        else:
+                            sharp_images.append((path_str, score))
+                        stream.add((path_str, score, is_blurry))
                 
-                processed += 1
+                    processed += 1
                 
-                # Update progress
-                if progress_callback:
-                    progress_callback(processed, total, img_path.name)
+                    # Update progress
+                    if progress_callback:
+                        progress_callback(processed, total, img_path.name)
                     
-            except Exception as e:
-                print(f"Error processing result for {img_path}: {e}")
-                processed += 1
+                except Exception as e:
+                    print(f"Error processing result for {img_path}: {e}")
+                    processed += 1
+    stream.flush()
     
     # Sort by blur score (most blurry first for blurry_images, sharpest first for sharp_images)
     blurry_images.sort(key=lambda x: x[1])  # Lowest score (most blurry) first
@@ -200,7 +210,7 @@ def detect_blurry_images_batch(folder_path, threshold=100.0, progress_callback=N
     }
 
 
-def detect_blurry_images(folder_path, threshold=100.0, progress_callback=None):
+def detect_blurry_images(folder_path, threshold=100.0, progress_callback=None, manifest=None):
     """
     Scan a folder for blurry images.
     
@@ -208,6 +218,7 @@ def detect_blurry_images(folder_path, threshold=100.0, progress_callback=None):
         folder_path (str): Path to the folder containing images
         threshold (float): Blur detection threshold
         progress_callback (callable): Optional callback function(current, total, filename)
+        manifest (FileManifest): Optional pre-scanned file list for folder_path
         
     Returns:
         dict: {
@@ -219,21 +230,10 @@ def detect_blurry_images(folder_path, threshold=100.0, progress_callback=None):
     """
     detector = BlurryImageDetector(threshold=threshold)
     
-    # Supported image extensions
-    image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.webp'}
-    
-    # Find all images, excluding Trash folder
-    # Use a set to avoid duplicates (e.g., same file found as .jpg and .JPG)
-    image_files_set = set()
-    for ext in image_extensions:
-        for img_path in Path(folder_path).rglob(f'*{ext}'):
-            if 'Trash' not in img_path.parts:
-                image_files_set.add(img_path)
-        for img_path in Path(folder_path).rglob(f'*{ext.upper()}'):
-            if 'Trash' not in img_path.parts:
-                image_files_set.add(img_path)
-    
-    image_files = list(image_files_set)
+    # One directory walk with Trash pruned, unless the caller already has a manifest
+    if manifest is None:
+        manifest = scan_image_files(folder_path)
+    image_files = [Path(p) for p in manifest]
     blurry_images = []
     sharp_images = []
     total = len(image_files)
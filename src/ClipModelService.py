@@ -0,0 +1,553 @@
+"""
+Shared CLIP Model Service for PhotoSift
+One process-wide CLIP ViT-B/32 instance used by the duplicate finder, the
+people/screenshot classifier and the safe content scanner, so opening several
+tools never loads the model twice. Text-prompt embeddings for the zero-shot
+classifiers are computed once and cached in memory and on disk.
+
+torch and transformers are imported on first use rather than at import time,
+so opening a CLIP tool's window does not wait for them; the launcher warms
+the model in the background instead (see warm_up).
+
+Inference runs on PyTorch by default. set_backend("onnx") (or
+PHOTOSIFT_CLIP_BACKEND=onnx) runs the vision and text towers with ONNX
+Runtime's CPU provider instead; both towers are exported once and kept in the
+cache folder, and only the processor and the two sessions stay in memory.
+Embeddings match the PyTorch ones within ONNX_TOLERANCE, so the embedding
+and text caches are shared between backends.
+"""
+
+import os
+import sys
+import gc
+import copy
+import hashlib
+import threading
+
+import numpy as np
+
+from SignatureCache import get_cache_dir
+
+MODEL_NAME = "clip-vit-base-patch32"
+BACKENDS = ("torch", "onnx")
+ONNX_OPSET = 17
+ONNX_TOLERANCE = 1e-3  # Max abs difference from PyTorch embeddings accepted by the tests
+
+_device = None
+_model = None
+_processor = None
+_lock = threading.Lock()
+
+# prompt-set key -> (normalized text embeddings [P, D], logit scale)
+_text_embeddings = {}
+_text_lock = threading.Lock()
+
+_backend = os.environ.get("PHOTOSIFT_CLIP_BACKEND", "torch").strip().lower()
+if _backend not in BACKENDS:
+    print(f"[WARN] Unknown CLIP backend {_backend!r}, using torch")
+    _backend = "torch"
+_onnx_sessions = None
+_onnx_lock = threading.Lock()
+
+
+def get_model_path():
+    """Get the correct path to the model whether running as script or frozen exe"""
+    if getattr(sys, 'frozen', False):
+        # Running as PyInstaller bundle
+        base_path = sys._MEIPASS
+        model_path = os.path.join(base_path, 'models', MODEL_NAME)
+    else:
+        # Running as script - look for local models folder first
+        local_path = os.path.join('models', MODEL_NAME)
+        if os.path.exists(local_path):
+            model_path = local_path
+        else:
+            # Fall back to downloading from HuggingFace
+            model_path = f"openai/{MODEL_NAME}"
+    return model_path
+
+
+def get_device():
+    """Return "cuda" or "cpu" for the shared model (imports torch on first call)"""
+    global _device
+    if _device is None:
+        import torch
+        _device = "cuda" if torch.cuda.is_available() else "cpu"
+    return _device
+
+
+def __getattr__(name):
+    # `device` used to be a module constant; it is now resolved on first access
+    if name == "device":
+        return get_device()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def load_models():
+    """
+    Lazily load the shared CLIP processor and the selected backend (thread-safe).
+
+    With the ONNX backend only the processor and the ONNX Runtime sessions are
+    kept in memory; the PyTorch model is built only to export the towers the
+    first time and is dropped again afterwards.
+
+    Returns:
+        (model, processor); model is None when the ONNX backend is active
+    """
+    if _active_backend() == "onnx":
+        return None, load_processor()
+    return _load_torch_model()
+
+
+def load_processor():
+    """Lazily load only the shared CLIPProcessor (thread-safe)"""
+    global _processor
+    if _processor is not None:
+        return _processor
+    with _lock:
+        if _processor is None:
+            try:
+                from transformers import CLIPProcessor
+                _processor = CLIPProcessor.from_pretrained(get_model_path())
+            except Exception as e:
+                print(f"Error loading CLIP processor: {e}")
+                raise
+        return _processor
+
+
+def _load_torch_model():
+    """Lazily load the shared PyTorch CLIP model and processor (thread-safe)"""
+    global _model, _processor
+    if _model is not None and _processor is not None:
+        return _model, _processor
+    with _lock:
+        if _model is None or _processor is None:
+            try:
+                from transformers import CLIPModel, CLIPProcessor
+                model_path = get_model_path()
+                print(f"Loading CLIP model from: {model_path}")
+                model = CLIPModel.from_pretrained(model_path).to(get_device()).eval()
+                processor = CLIPProcessor.from_pretrained(model_path)
+            except Exception as e:
+                print(f"Error loading CLIP model: {e}")
+                raise
+            _model, _processor = model, processor
+        return _model, _processor
+
+
+def warm_up():
+    """
+    Load the shared model on a daemon thread so the first scan does not wait.
+
+    Failures are only logged; load_models() retries when a tool needs the model.
+
+    Returns:
+        threading.Thread running the load
+    """
+    def load():
+        try:
+            load_models()
+            print("[LOG] CLIP model warmed up")
+        except Exception as e:
+            print(f"[WARN] CLIP model warm-up failed: {e}")
+
+    thread = threading.Thread(target=load, daemon=True, name="clip-warm-up")
+    thread.start()
+    return thread
+
+
+def is_loaded():
+    """Return True if the shared model (PyTorch or ONNX Runtime) is currently in memory"""
+    return _processor is not None and (_model is not None or _onnx_sessions is not None)
+
+
+def unload_models():
+    """
+    Drop the shared model and release its memory.
+
+    Callers that still hold a reference keep it alive; the next load_models()
+    call loads a fresh instance.
+    """
+    global _model, _processor, _onnx_sessions
+    # Same lock order as _load_onnx_sessions, which may load the model for an export
+    with _onnx_lock, _lock:
+        if _model is None and _processor is None and _onnx_sessions is None:
+            return
+        _model = None
+        _processor = None
+        _onnx_sessions = None
+    gc.collect()
+    if _device == "cuda":
+        import torch
+        torch.cuda.empty_cache()
+    print("[LOG] CLIP model unloaded")
+
+
+def _as_features(output):
+    """Return the projected embedding tensor from get_image/text_features.
+
+    transformers 4.x returns the tensor directly; 5.x returns a model output
+    whose pooler_output holds the projected embeddings.
+    """
+    import torch
+    return output if isinstance(output, torch.Tensor) else output.pooler_output
+
+
+def _to_numpy(value, dtype):
+    """Convert a processor output (torch tensor or array) to a contiguous numpy array"""
+    if hasattr(value, "cpu"):
+        value = value.cpu().numpy()
+    return np.ascontiguousarray(value, dtype=dtype)
+
+
+def get_backend():
+    """Return the selected inference backend ("torch" or "onnx")"""
+    return _backend
+
+
+def set_backend(name):
+    """
+    Select the inference backend used by every CLIP tool in this process.
+
+    Args:
+        name: "torch" or "onnx". ONNX Runtime is set up on the next inference;
+            if onnxruntime is missing or the export fails, a warning is logged
+            and the process falls back to torch.
+    """
+    global _backend
+    name = name.strip().lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown CLIP backend {name!r}, expected one of {BACKENDS}")
+    _backend = name
+
+
+def onnx_available():
+    """Return True if onnxruntime can be imported"""
+    try:
+        import onnxruntime  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_onnx_paths(onnx_dir=None):
+    """
+    Return the cached (vision, text) ONNX model paths.
+
+    Args:
+        onnx_dir: Folder holding the exported models. Defaults to onnx/ in get_cache_dir().
+    """
+    if onnx_dir is None:
+        onnx_dir = os.path.join(get_cache_dir(), 'onnx')
+    return tuple(os.path.join(onnx_dir, f"{MODEL_NAME}-{tower}-opset{ONNX_OPSET}.onnx")
+                 for tower in ("vision", "text"))
+
+
+def export_onnx(onnx_dir=None, force=False):
+    """
+    Export the CLIP vision and text towers to ONNX (once).
+
+    The vision graph maps pixel_values [N, 3, 224, 224] to image embeddings;
+    the text graph maps input_ids/attention_mask [P, T] to text embeddings plus
+    the model's logit scale. Batch and sequence sizes are dynamic. Existing
+    files are reused unless force is set.
+
+    Args:
+        onnx_dir: Output folder. Defaults to onnx/ in get_cache_dir().
+        force: Re-export even if the files already exist
+
+    Returns:
+        (vision_path, text_path)
+    """
+    vision_path, text_path = get_onnx_paths(onnx_dir)
+    if not force and os.path.exists(vision_path) and os.path.exists(text_path):
+        return vision_path, text_path
+
+    import torch
+    model, _ = _load_torch_model()
+    if next(model.parameters()).device.type != "cpu":
+        # Export from a CPU copy so the graph does not depend on the GPU
+        model = copy.deepcopy(model).float().cpu()
+
+    class VisionTower(torch.nn.Module):
+        def __init__(self, clip):
+            super().__init__()
+            self.clip = clip
+
+        def forward(self, pixel_values):
+            return _as_features(self.clip.get_image_features(pixel_values=pixel_values))
+
+    class TextTower(torch.nn.Module):
+        def __init__(self, clip):
+            super().__init__()
+            self.clip = clip
+
+        def forward(self, input_ids, attention_mask):
+            features = _as_features(self.clip.get_text_features(input_ids=input_ids, attention_mask=attention_mask))
+            return features, self.clip.logit_scale.exp()
+
+    os.makedirs(os.path.dirname(vision_path), exist_ok=True)
+    size = model.config.vision_config.image_size
+    tokens = torch.ones((2, 8), dtype=torch.int64)
+    exports = (
+        (VisionTower(model), (torch.zeros((2, 3, size, size)),), vision_path, ["pixel_values"],
+         ["image_embeds"], {"pixel_values": {0: "batch"}, "image_embeds": {0: "batch"}}),
+        (TextTower(model), (tokens, tokens), text_path, ["input_ids", "attention_mask"],
+         ["text_embeds", "logit_scale"],
+         {"input_ids": {0: "prompts", 1: "tokens"}, "attention_mask": {0: "prompts", 1: "tokens"},
+          "text_embeds": {0: "prompts"}}),
+    )
+    for module, args, path, input_names, output_names, dynamic_axes in exports:
+        # Write to a temporary name so an interrupted export is never picked up
+        tmp_path = path + ".tmp"
+        try:
+            with torch.no_grad():
+                torch.onnx.export(module, args, tmp_path, input_names=input_names, output_names=output_names,
+                                  dynamic_axes=dynamic_axes, opset_version=ONNX_OPSET, dynamo=False)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    print(f"[LOG] Exported CLIP to ONNX: {os.path.dirname(vision_path)}")
+    return vision_path, text_path
+
+
+def _load_onnx_sessions(onnx_dir=None):
+    """
+    Create the ONNX Runtime sessions for both towers (thread-safe, exports on first use).
+
+    Args:
+        onnx_dir: Folder of the exported models, as in export_onnx()
+    """
+    global _model, _onnx_sessions
+    if _onnx_sessions is not None:
+        return _onnx_sessions
+    with _onnx_lock:
+        if _onnx_sessions is None:
+            import onnxruntime as ort
+            model_was_loaded = _model is not None
+            vision_path, text_path = export_onnx(onnx_dir)
+            if not model_was_loaded and _model is not None:
+                # The PyTorch model was only needed for the export
+                with _lock:
+                    _model = None
+                gc.collect()
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            providers = ["CPUExecutionProvider"]
+            _onnx_sessions = {
+                "vision": ort.InferenceSession(vision_path, options, providers=providers),
+                "text": ort.InferenceSession(text_path, options, providers=providers),
+            }
+            print("[LOG] CLIP running on ONNX Runtime (CPU)")
+        return _onnx_sessions
+
+
+def _active_backend():
+    """Return the backend to run on, falling back to torch if ONNX Runtime cannot be set up"""
+    global _backend
+    if _backend == "onnx":
+        try:
+            _load_onnx_sessions()
+        except Exception as e:
+            print(f"[WARN] ONNX Runtime backend unavailable, using torch: {e}")
+            _backend = "torch"
+    return _backend
+
+
+def compute_image_features(inputs):
+    """
+    Run the CLIP vision tower on preprocessed inputs.
+
+    Args:
+        inputs: Processor output containing pixel_values
+
+    Returns:
+        np.ndarray [N, D] of unnormalized image embeddings
+    """
+    if _active_backend() == "onnx":
+        pixel_values = _to_numpy(inputs["pixel_values"], np.float32)
+        return _load_onnx_sessions()["vision"].run(None, {"pixel_values": pixel_values})[0]
+
+    import torch
+    model, _ = _load_torch_model()
+    device = get_device()
+    with torch.no_grad(), torch.autocast(device_type="cuda", dtype=torch.float16, enabled=(device == "cuda")):
+        image_features = _as_features(model.get_image_features(**{k: v.to(device) for k, v in inputs.items()}))
+    return image_features.float().cpu().numpy()
+
+
+def encode_images(images):
+    """Return CLIP image embeddings [N, D] for a list of PIL images"""
+    _, processor = load_models()
+    inputs = processor(images=list(images), return_tensors="pt", padding=True)
+    return compute_image_features(inputs)
+
+
+def _prompt_key(prompts):
+    """Cache key for a prompt list: model name plus a hash of the prompts"""
+    digest = hashlib.sha256("\n".join(prompts).encode("utf-8")).hexdigest()[:16]
+    return f"{MODEL_NAME}-{digest}"
+
+
+def prompt_set_key(labels):
+    """Cache key for a label -> prompts dict; changes whenever any prompt changes"""
+    return _prompt_key([p for label_prompts in labels.values() for p in label_prompts])
+
+
+def get_text_embeddings(prompts):
+    """
+    Get L2-normalized text embeddings for a list of prompts.
+
+    Computed once per prompt set and cached in memory and on disk (keyed by
+    model name and a hash of the prompts), so the text tower never runs on the
+    per-image hot path.
+
+    Args:
+        prompts: List of prompt strings
+
+    Returns:
+        (embeddings, logit_scale): np.ndarray [P, D] and the model's logit scale
+    """
+    prompts = list(prompts)
+    key = _prompt_key(prompts)
+    cached = _text_embeddings.get(key)
+    if cached is not None:
+        return cached
+
+    with _text_lock:
+        cached = _text_embeddings.get(key)
+        if cached is not None:
+            return cached
+
+        cache_path = None
+        try:
+            cache_dir = os.path.join(get_cache_dir(), 'text_embeddings')
+            os.makedirs(cache_dir, exist_ok=True)
+            cache_path = os.path.join(cache_dir, f"{key}.npz")
+            if os.path.exists(cache_path):
+                with np.load(cache_path) as data:
+                    cached = (data['embeddings'], float(data['logit_scale']))
+        except (OSError, KeyError, ValueError) as e:
+            print(f"[WARN] Could not read cached text embeddings: {e}")
+            cached = None
+
+        if cached is None:
+            if _active_backend() == "onnx":
+                inputs = load_processor()(text=prompts, return_tensors="np", padding=True)
+                embeddings, logit_scale = _load_onnx_sessions()["text"].run(None, {
+                    "input_ids": _to_numpy(inputs["input_ids"], np.int64),
+                    "attention_mask": _to_numpy(inputs["attention_mask"], np.int64)})
+                logit_scale = float(logit_scale)
+            else:
+                import torch
+                model, processor = _load_torch_model()
+                inputs = processor(text=prompts, return_tensors="pt", padding=True)
+                device = get_device()
+                with torch.no_grad():
+                    text_features = _as_features(
+                        model.get_text_features(**{k: v.to(device) for k, v in inputs.items()}))
+                    logit_scale = float(model.logit_scale.exp().item())
+                embeddings = text_features.float().cpu().numpy()
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+            cached = (embeddings, logit_scale)
+            if cache_path:
+                try:
+                    np.savez(cache_path, embeddings=embeddings, logit_scale=logit_scale)
+                except OSError as e:
+                    print(f"[WARN] Could not write cached text embeddings: {e}")
+
+        _text_embeddings[key] = cached
+        return cached
+
+
+def zero_shot_classify(image_features, labels):
+    """
+    Zero-shot classify images from their embeddings against prompt groups.
+
+    Equivalent to softmax over CLIPModel logits_per_image with every prompt,
+    summed per label, but uses the cached text matrix instead of the text tower.
+
+    Args:
+        image_features: np.ndarray [N, D] of image embeddings (normalized or not)
+        labels: dict of label -> list of prompts
+
+    Returns:
+        List of (predicted_label, confidence, {label: score}) per image
+    """
+    prompts, owners = [], []
+    for lbl, label_prompts in labels.items():
+        for p in label_prompts:
+            prompts.append(p)
+            owners.append(lbl)
+    text_embeddings, logit_scale = get_text_embeddings(prompts)
+
+    image_features = np.asarray(image_features, dtype=np.float32)
+    if image_features.shape[0] == 0:
+        return []
+    image_features = image_features / np.linalg.norm(image_features, axis=1, keepdims=True)
+    logits = logit_scale * image_features @ text_embeddings.T
+    logits -= logits.max(axis=1, keepdims=True)
+    probs = np.exp(logits)
+    probs /= probs.sum(axis=1, keepdims=True)
+
+    label_names = list(labels.keys())
+    owners = np.array(owners)
+    membership = np.stack([(owners == lbl) for lbl in label_names], axis=1).astype(np.float32)
+    label_scores = probs @ membership  # [N, num_labels]
+
+    results = []
+    for row in label_scores:
+        scores = {lbl: float(v) for lbl, v in zip(label_names, row)}
+        pred = max(scores, key=scores.get)
+        results.append((pred, scores[pred], scores))
+    return results
+
+
+def benchmark_backends(images, batch_size=32, repeats=3):
+    """
+    Compare image-embedding throughput and output of the torch and ONNX backends.
+
+    Each backend encodes the images once to warm up, then repeats times; the
+    best run is reported. The selected backend is restored afterwards.
+
+    Args:
+        images: List of PIL images
+        batch_size: Images per encode_images() call
+        repeats: Timed runs per backend
+
+    Returns:
+        dict with images/second per backend ("torch", and "onnx" when
+        available) and, when both ran, "max_abs_diff" and "min_cosine"
+        between their embeddings
+    """
+    import time
+
+    images = list(images)
+    batches = [images[i:i + batch_size] for i in range(0, len(images), batch_size)]
+    previous = get_backend()
+    results, outputs = {}, {}
+    try:
+        for name in BACKENDS:
+            set_backend(name)
+            if _active_backend() != name:
+                continue
+            outputs[name] = np.concatenate([encode_images(batch) for batch in batches])
+            best = None
+            for _ in range(repeats):
+                start = time.perf_counter()
+                for batch in batches:
+                    encode_images(batch)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = len(images) / best if best else float("inf")
+    finally:
+        set_backend(previous)
+
+    if len(outputs) == len(BACKENDS):
+        reference, onnx_features = outputs["torch"], outputs["onnx"]
+        results["max_abs_diff"] = float(np.abs(reference - onnx_features).max())
+        cosine = np.sum(reference * onnx_features, axis=1) / (
+            np.linalg.norm(reference, axis=1) * np.linalg.norm(onnx_features, axis=1))
+        results["min_cosine"] = float(cosine.min())
+    return results
@@ -11,8 +11,24 @@ import tkinter.ttk as ttk
 import tkinter.messagebox
 import os
 import shutil
+import threading
+import time
+import bisect
+import itertools
+import weakref
+from collections import deque, OrderedDict
 from PIL import Image, ImageTk
 
+PROGRESS_POLL_MS = 100  # Progress windows redraw at most ten times a second
+RATE_WINDOW = 5.0  # Seconds of progress history behind the images/sec figure
+
+CARD_PAD_X = 30  # Horizontal room around each thumbnail card
+CARD_INFO_HEIGHT = 62  # Filename checkbox and one info line under the thumbnail
+OVERSCAN_ROWS = 1  # Rows kept bound above and below the viewport for smooth scrolling
+SECTION_HEADER_HEIGHT = 44  # Title band above each section of a sectioned grid
+
+IMAGE_CACHE_BUDGET = 384 * 1024 * 1024  # Decoded thumbnail bytes shared by every open tool
+
 
 class ToolTip:
     """
@@ -61,7 +77,7 @@ class ToolTip:
             self.widget.after_cancel(id)
 
     def showtip(self, event=None):
-        if self.tw:
+        if self.tw or not self.text:
             return
         x = self.widget.winfo_rootx() + 25
         y = self.widget.winfo_rooty() + 25
@@ -104,8 +120,110 @@ class ModernColors:
         }
 
 
+def format_eta(seconds):
+    """Format a duration as m:ss, or h:mm:ss from an hour up"""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+class ProgressChannel:
+    """
+    Thread-safe progress state shared between a worker and the UI.
+
+    Workers call push() as often as they like; it only stores the latest
+    counters under a lock. The UI reads snapshot() on its own timer, so a
+    scan of 10,000 files costs a few hundred redraws instead of 10,000
+    root.after() callbacks.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self, total=0, status_text="", detail_text=""):
+        """Start a new operation"""
+        with self._lock:
+            self._current = 0
+            self._total = total
+            self._status = status_text
+            self._detail = detail_text
+            self._samples = deque()
+
+    def push(self, current, total, status_text=None, detail_text=None):
+        """
+        Record progress; safe to call from any thread.
+
+        Args:
+            current: Items done
+            total: Items in this phase
+            status_text: Headline text, or None to keep the previous one
+            detail_text: Secondary text, or None to keep the previous one
+        """
+        with self._lock:
+            if total != self._total or current < self._current:
+                # A new phase (or a restart) makes the old rate meaningless
+                self._samples.clear()
+            self._current = current
+            self._total = total
+            if status_text is not None:
+                self._status = status_text
+            if detail_text is not None:
+                self._detail = detail_text
+
+    def snapshot(self):
+        """
+        Read the latest state and update the rate estimate.
+
+        The rate is measured over the last RATE_WINDOW seconds of snapshots,
+        so it follows the current speed rather than the whole-run average
+        (cached files finish far faster than new ones).
+
+        Returns:
+            dict with current, total, status, detail, rate (items/sec or
+            None until two samples exist) and eta (seconds or None)
+        """
+        now = self._clock()
+        with self._lock:
+            current, total = self._current, self._total
+            samples = self._samples
+            samples.append((now, current))
+            while len(samples) > 2 and now - samples[1][0] >= RATE_WINDOW:
+                samples.popleft()
+            status, detail = self._status, self._detail
+            first_time, first_count = samples[0]
+
+        rate = None
+        eta = None
+        if now > first_time and current > first_count:
+            rate = (current - first_count) / (now - first_time)
+            eta = max(total - current, 0) / rate
+        return {'current': current, 'total': total, 'status': status, 'detail': detail,
+                'rate': rate, 'eta': eta}
+
+    @staticmethod
+    def describe(snapshot):
+        """Detail line with the images/sec figure and ETA appended when known"""
+        parts = [snapshot['detail']] if snapshot['detail'] else []
+        if snapshot['rate']:
+            parts.append(f"{snapshot['rate']:.1f} img/s")
+            if snapshot['current'] < snapshot['total']:
+                parts.append(f"ETA {format_eta(snapshot['eta'])}")
+        return " • ".join(parts)
+
+
 class ProgressWindow:
-    """Reusable progress window for long-running operations"""
+    """
+    Reusable progress window for long-running operations.
+
+    Worker threads report through report() (or the channel directly); the
+    window polls the channel every PROGRESS_POLL_MS and renders the latest
+    state with images/sec and ETA.
+    """
     
     def __init__(self, parent, title="Processing", width=450, height=180):
         self.parent = parent
@@ -115,24 +233,42 @@ class ProgressWindow:
         self.progress_label = None
         self.progress_detail = None
         self.progress_bar = None
+        self.channel = ProgressChannel()
+        self._poll_id = None
+        self._on_render = None
         
         self.title = title
         self.width = width
         self.height = height
     
-    def show(self, total, initial_text="Initializing..."):
-        """Show the progress window"""
+    def show(self, total, initial_text="Initializing...", modal=True, on_render=None):
+        """
+        Show the progress window.
+
+        Args:
+            total: Maximum progress value
+            initial_text: Status text shown until the first update
+            modal: Block the parent window. Pass False when results are shown
+                while the scan runs; the window then sits in the bottom-right
+                corner so the first page of results stays visible.
+            on_render: Optional callable(snapshot) run on the UI thread after
+                each redraw, e.g. to mirror progress in a status bar
+        """
         if self.progress_window:
             return
+        self.channel.reset(total, initial_text)
+        self._on_render = on_render
             
         self.progress_window = tk.Toplevel(self.parent)
         self.progress_window.title(self.title)
         self.progress_window.geometry(f"{self.width}x{self.height}")
         self.progress_window.transient(self.parent)
-        self.progress_window.grab_set()
-        
-        # Center the window
-        self._center_window()
+        if modal:
+            self.progress_window.grab_set()
+            # Center the window
+            self._center_window()
+        else:
+            self._dock_window()
         
         # Style the window
         self.progress_window.configure(bg=self.colors['bg_primary'])
@@ -169,21 +305,45 @@ class ProgressWindow:
                                        bg=self.colors['bg_primary'], 
                                        fg=self.colors['text_secondary'])
         self.progress_detail.pack()
+        self._poll_id = self.parent.after(PROGRESS_POLL_MS, self._poll)
+    
+    def report(self, current, total, status_text=None, detail_text=None):
+        """Record progress from any thread; the window picks it up on its next poll"""
+        self.channel.push(current, total, status_text, detail_text)
     
     def update(self, current, total, status_text, detail_text=""):
-        """Update progress window"""
+        """Update progress window immediately (UI thread only)"""
+        self.channel.push(current, total, status_text, detail_text or None)
         if self.progress_window and self.progress_window.winfo_exists():
-            self.progress_var.set(current)
-            self.progress_label.config(text=status_text)
-            if detail_text:
-                self.progress_detail.config(text=detail_text)
+            self._render()
             self.progress_window.update_idletasks()
     
     def close(self):
         """Close the progress window"""
+        if self._poll_id is not None:
+            self.parent.after_cancel(self._poll_id)
+            self._poll_id = None
         if self.progress_window and self.progress_window.winfo_exists():
             self.progress_window.destroy()
-            self.progress_window = None
+        self.progress_window = None
+    
+    def _poll(self):
+        """Redraw from the channel and reschedule while the window is open"""
+        self._poll_id = None
+        if not (self.progress_window and self.progress_window.winfo_exists()):
+            return
+        self._render()
+        self._poll_id = self.parent.after(PROGRESS_POLL_MS, self._poll)
+    
+    def _render(self):
+        snapshot = self.channel.snapshot()
+        if snapshot['total'] > 0 and float(self.progress_bar.cget('maximum')) != snapshot['total']:
+            self.progress_bar.config(maximum=snapshot['total'])
+        self.progress_var.set(snapshot['current'])
+        self.progress_label.config(text=snapshot['status'])
+        self.progress_detail.config(text=ProgressChannel.describe(snapshot))
+        if self._on_render:
+            self._on_render(snapshot)
     
     def _center_window(self):
         """Center the progress window on screen"""
@@ -193,6 +353,628 @@ class ProgressWindow:
         y = (screen_height - self.height) // 2
         self.progress_window.geometry(f"{self.width}x{self.height}+{x}+{y}")
 
+    def _dock_window(self):
+        """Place the progress window in the bottom-right corner of the parent"""
+        self.parent.update_idletasks()
+        x = self.parent.winfo_rootx() + max(0, self.parent.winfo_width() - self.width - 40)
+        y = self.parent.winfo_rooty() + max(0, self.parent.winfo_height() - self.height - 60)
+        self.progress_window.geometry(f"{self.width}x{self.height}+{x}+{y}")
+
+
+class ResultTree:
+    """Helpers for the category/count tree shown in each detector's sidebar"""
+
+    @staticmethod
+    def set_counts(tree, categories):
+        """
+        Insert or update category rows in place, keeping the user's selection.
+
+        Args:
+            tree: ttk.Treeview with a "count" column
+            categories: list of (item_id, text, count) in display order
+        """
+        for item_id, text, count in categories:
+            if tree.exists(item_id):
+                tree.item(item_id, values=(count,))
+            else:
+                tree.insert("", "end", item_id, text=text, values=(count,))
+
+
+def image_nbytes(image):
+    """Estimate the memory held by a decoded image (RGBA pixels; 0 for non-images)"""
+    if hasattr(image, 'width') and callable(image.width):
+        return image.width() * image.height() * 4  # ImageTk.PhotoImage
+    size = getattr(image, 'size', None)
+    if isinstance(size, tuple) and len(size) == 2:
+        return size[0] * size[1] * 4  # PIL.Image
+    return 0
+
+
+class ImageCacheBudget:
+    """
+    Memory budget shared by several ImageCaches.
+
+    When the caches together hold more than max_bytes, the least recently
+    used entry across all of them is evicted, so a tool left open in the
+    background gives way to the one being used.
+
+    Args:
+        max_bytes: Total estimated pixel bytes allowed
+    """
+
+    def __init__(self, max_bytes=IMAGE_CACHE_BUDGET):
+        self.max_bytes = max_bytes
+        self._caches = weakref.WeakSet()  # Closed tools drop out with their caches
+        self._clock = itertools.count()
+
+    def register(self, cache):
+        self._caches.add(cache)
+
+    def tick(self):
+        """Next value of the shared recency clock"""
+        return next(self._clock)
+
+    @property
+    def used_bytes(self):
+        return sum(cache.nbytes for cache in self._caches)
+
+    def enforce(self):
+        """Evict least recently used entries until the caches fit the budget"""
+        used = self.used_bytes
+        while used > self.max_bytes:
+            oldest = None
+            for cache in self._caches:
+                tick = cache.oldest_tick()
+                if tick is not None and (oldest is None or tick < oldest[0]):
+                    oldest = (tick, cache)
+            if oldest is None:
+                return
+            used -= oldest[1].evict_oldest()
+
+
+_shared_budget = None
+
+
+def shared_image_budget():
+    """Return the process-wide ImageCacheBudget used by every tool's ImageCache"""
+    global _shared_budget
+    if _shared_budget is None:
+        _shared_budget = ImageCacheBudget()
+    return _shared_budget
+
+
+class ImageCache:
+    """
+    LRU cache of decoded images bounded by estimated pixel bytes.
+
+    Lookups and inserts are O(1) (OrderedDict); eviction is driven by the
+    shared ImageCacheBudget. Keys are usually (path, size) tuples. Used from
+    the Tk thread only.
+
+    Args:
+        budget: ImageCacheBudget (default: shared_image_budget())
+        sizeof: Callable(value) -> bytes (default: image_nbytes)
+    """
+
+    def __init__(self, budget=None, sizeof=image_nbytes):
+        self.budget = budget if budget is not None else shared_image_budget()
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._entries = OrderedDict()  # key -> [value, nbytes, tick], least recent first
+        self.budget.register(self)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """Return a cached value and mark it most recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return default
+        self.stats['hits'] += 1
+        entry[2] = self.budget.tick()
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def peek(self, key, default=None):
+        """Return a cached value without touching recency or stats"""
+        entry = self._entries.get(key)
+        return default if entry is None else entry[0]
+
+    def put(self, key, value):
+        """Cache a value, evicting least recently used entries if over budget"""
+        self.pop(key)
+        nbytes = self.sizeof(value)
+        self._entries[key] = [value, nbytes, self.budget.tick()]
+        self.nbytes += nbytes
+        self.budget.enforce()
+
+    def pop(self, key, default=None):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return default
+        self.nbytes -= entry[1]
+        return entry[0]
+
+    def forget_path(self, path):
+        """Drop every (path, size) entry for a file, e.g. after moving it to Trash"""
+        for key in [k for k in self._entries if isinstance(k, tuple) and k and k[0] == path]:
+            self.pop(key)
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def oldest_tick(self):
+        """Recency of the least recently used entry, or None if empty"""
+        if not self._entries:
+            return None
+        return next(iter(self._entries.values()))[2]
+
+    def evict_oldest(self):
+        """Drop the least recently used entry and return the bytes freed"""
+        _, entry = self._entries.popitem(last=False)
+        self.nbytes -= entry[1]
+        self.stats['evictions'] += 1
+        return entry[1]
+
+    def reset_stats(self):
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get_stats(self):
+        total = self.stats['hits'] + self.stats['misses']
+        hit_rate = (self.stats['hits'] / total * 100) if total > 0 else 0
+        return dict(self.stats, entries=len(self._entries), bytes=self.nbytes, hit_rate=hit_rate)
+
+
+class GridLayout:
+    """
+    Row/column arithmetic for a grid of equally sized cells.
+
+    The items can be split into consecutive sections, e.g. duplicate groups.
+    Each section starts on a new row below a header band of its own.
+
+    Args:
+        count: Number of items
+        cell_width: Cell width in pixels
+        cell_height: Cell height in pixels
+        width: Available width in pixels
+        sections: Optional item count of each section (summing to count)
+        header_height: Height of each section header in pixels
+    """
+
+    def __init__(self, count, cell_width, cell_height, width, sections=None, header_height=0):
+        self.count = count
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.columns = max(1, width // cell_width)
+        self.header_height = header_height if sections is not None else 0
+        self._sizes = [count] if sections is None else list(sections)
+        self.section_starts = []  # Index of each section's first item
+        self.section_tops = []  # Y coordinate of each section's header
+        start = top = 0
+        for size in self._sizes:
+            self.section_starts.append(start)
+            self.section_tops.append(top)
+            start += size
+            top += self.header_height + -(-size // self.columns) * cell_height
+        self.rows = sum(-(-size // self.columns) for size in self._sizes)
+        self._height = top
+
+    @property
+    def height(self):
+        """Total content height in pixels"""
+        return self._height
+
+    def _section(self, index):
+        # Empty sections share their start with the next one; take the last
+        return bisect.bisect_right(self.section_starts, index) - 1
+
+    def position(self, index):
+        """Top-left (x, y) of an item's cell"""
+        section = self._section(index)
+        row, col = divmod(index - self.section_starts[section], self.columns)
+        return col * self.cell_width, self.section_tops[section] + self.header_height + row * self.cell_height
+
+    def row_top(self, index):
+        """Y coordinate of the row holding an item"""
+        return self.position(index)[1]
+
+    def _first_index(self, y):
+        """Index of the first item whose row ends below y"""
+        section = max(0, bisect.bisect_right(self.section_tops, y) - 1)
+        row = max(0, int((y - self.section_tops[section] - self.header_height) // self.cell_height))
+        return self.section_starts[section] + min(row * self.columns, self._sizes[section])
+
+    def _stop_index(self, y):
+        """One past the last item whose row starts above y"""
+        section = bisect.bisect_left(self.section_tops, y) - 1
+        if section < 0:
+            return 0
+        rows = max(0, int(-(-(y - self.section_tops[section] - self.header_height) // self.cell_height)))
+        return self.section_starts[section] + min(rows * self.columns, self._sizes[section])
+
+    def visible_range(self, top, height, overscan_rows=0):
+        """
+        Items whose rows overlap the band [top, top + height).
+
+        Args:
+            top: Y coordinate of the top of the viewport
+            height: Viewport height
+            overscan_rows: Extra rows to include above and below
+
+        Returns:
+            range of item indices
+        """
+        if self.count == 0 or height <= 0:
+            return range(0)
+        overscan = overscan_rows * self.cell_height
+        first = self._first_index(top - overscan)
+        return range(first, max(first, self._stop_index(top + height + overscan)))
+
+    def visible_sections(self, top, height):
+        """Sections whose headers overlap the band [top, top + height)"""
+        if not self.header_height or height <= 0:
+            return range(0)
+        first = bisect.bisect_right(self.section_tops, top - self.header_height)
+        return range(first, bisect.bisect_left(self.section_tops, top + height))
+
+
+class _GridCard:
+    """Widgets of one recyclable thumbnail card"""
+
+    def __init__(self, frame, img_canvas, image_item, text_item, check, check_var, info_label, tooltip):
+        self.frame = frame
+        self.img_canvas = img_canvas
+        self.image_item = image_item
+        self.text_item = text_item
+        self.check = check
+        self.check_var = check_var
+        self.info_label = info_label
+        self.tooltip = tooltip
+        self.window = None
+        self.path = None
+        self.generation = -1
+        self.pending = False  # Thumbnail still being decoded
+
+
+class VirtualGrid:
+    """
+    Scrollable thumbnail grid that only builds widgets for the cards on screen.
+
+    Cards sit on a Canvas at computed positions. As the view scrolls, cards
+    that leave the viewport go back to a pool and are re-bound to the items
+    coming into view, so the number of widgets follows the window size rather
+    than the number of items and a whole category fits in one continuous
+    scroll. Selection is kept by path, so it survives scrolling. Items can be
+    split into sections, each under a header row drawn on the canvas.
+
+    Thumbnails come from a ThumbnailService: cards show a placeholder until
+    their image is decoded in the background, and cards on screen are
+    decoded before the overscan rows.
+
+    Args:
+        parent: Container widget
+        colors: Color scheme from ModernColors
+        thumbnails: ThumbnailService shared with the rest of the window
+        thumb_size: (width, height) of the thumbnail area
+        describe: Optional callable(path) -> (text, color, tooltip) for the info line
+        on_open: Optional callable(path) run on double-click
+        on_selection_change: Optional callable() run after the selection changes
+    """
+
+    def __init__(self, parent, colors, thumbnails, thumb_size=(240, 180), describe=None, on_open=None,
+                 on_selection_change=None):
+        self.colors = colors
+        self.thumbnails = thumbnails
+        self.thumb_size = thumb_size
+        self.describe = describe
+        self.on_open = on_open
+        self.on_selection_change = on_selection_change
+
+        self.items = []
+        self.sections = None  # [(title, count), ...] when the items are grouped
+        self.layout = GridLayout(0, 1, 1, 1)
+        self._selected = set()
+        self._active = {}  # item index -> _GridCard
+        self._pool = []
+        self._headers = {}  # section index -> (rectangle, text) canvas items
+        self._header_pool = []
+        self._generation = 0
+        self._render_pending = None
+        self._trash_icon_cache = {}
+
+        self.frame = tk.Frame(parent, bg=colors['bg_primary'])
+        self.canvas = tk.Canvas(self.frame, bg=colors['bg_primary'], highlightthickness=0, bd=0)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.canvas.yview,
+                                       style="Modern.Vertical.TScrollbar")
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Configure>", self._on_configure)
+
+    def pack(self, **kwargs):
+        """Pack the grid frame"""
+        self.frame.pack(**kwargs)
+
+    # --- Items and selection ---
+
+    def set_items(self, items, keep_position=False, sections=None):
+        """
+        Show a new list of image paths.
+
+        Args:
+            items: Paths in display order
+            keep_position: Keep the scroll offset and the selected paths that
+                are still listed (used while results stream in); otherwise
+                scroll to the top and clear the selection
+            sections: Optional [(title, count), ...] splitting the items into
+                consecutive groups, each shown under a header row
+        """
+        self.items = list(items)
+        self.sections = list(sections) if sections is not None else None
+        if keep_position:
+            self._selected.intersection_update(self.items)
+        else:
+            self._selected.clear()
+        self._generation += 1
+        self._relayout(keep_offset=keep_position)
+        if self.on_selection_change:
+            self.on_selection_change()
+
+    def set_thumb_size(self, thumb_size):
+        """Change the card size, keeping the first visible item in view"""
+        anchor = self.first_visible_index()
+        self.thumb_size = thumb_size
+        # Card widgets are built for one size; drop them all
+        for card in list(self._active.values()) + self._pool:
+            card.frame.destroy()
+            self.canvas.delete(card.window)
+        self._active.clear()
+        self._pool.clear()
+        self._relayout(anchor=anchor)
+
+    def refresh(self):
+        """Re-bind the visible cards, e.g. after thumbnails or info text changed"""
+        self._generation += 1
+        self._render()
+
+    def selected_paths(self):
+        """Selected paths in display order"""
+        return [path for path in self.items if path in self._selected]
+
+    def selection_count(self):
+        return len(self._selected)
+
+    def all_selected(self):
+        return bool(self.items) and len(self._selected) == len(self.items)
+
+    def set_all_selected(self, selected):
+        """Select or clear every item, including those scrolled out of view"""
+        self.set_selected(self.items if selected else ())
+
+    def set_selected(self, paths):
+        """Replace the selection with the given paths that are listed"""
+        self._selected = set(paths).intersection(self.items)
+        self.refresh()
+        if self.on_selection_change:
+            self.on_selection_change()
+
+    def first_visible_index(self):
+        visible = self.visible_range()
+        return visible.start if visible else 0
+
+    def visible_range(self, overscan_rows=0):
+        """Indices of the items currently in the viewport"""
+        return self.layout.visible_range(self.canvas.canvasy(0), self.canvas.winfo_height(), overscan_rows)
+
+    # --- Layout and rendering ---
+
+    def _relayout(self, keep_offset=False, anchor=None):
+        top = self.canvas.canvasy(0)
+        width = self.canvas.winfo_width()
+        if width < 200:
+            width = 1000  # Not mapped yet
+        thumb_width, thumb_height = self.thumb_size
+        if self.sections is None:
+            self.layout = GridLayout(len(self.items), thumb_width + CARD_PAD_X, thumb_height + CARD_INFO_HEIGHT, width)
+        else:
+            self.layout = GridLayout(len(self.items), thumb_width + CARD_PAD_X, thumb_height + CARD_INFO_HEIGHT, width,
+                                     sections=[count for _, count in self.sections],
+                                     header_height=SECTION_HEADER_HEIGHT)
+        content_height = max(self.layout.height, 1)
+        self.canvas.configure(scrollregion=(0, 0, width, content_height))
+        if anchor is not None:
+            top = self.layout.row_top(anchor)
+        elif not keep_offset:
+            top = 0
+        self.canvas.yview_moveto(top / content_height)
+        self._render()
+
+    def _on_configure(self, event):
+        width = max(event.width, 200)
+        if max(1, width // self.layout.cell_width) != self.layout.columns:
+            self._relayout(anchor=self.first_visible_index())
+        else:
+            self._schedule_render()
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._schedule_render()
+
+    def _schedule_render(self):
+        # Coalesce bursts of scroll events into one pass
+        if self._render_pending is None:
+            self._render_pending = self.canvas.after_idle(self._render)
+
+    def _render(self):
+        if self._render_pending is not None:
+            self.canvas.after_cancel(self._render_pending)
+            self._render_pending = None
+        visible = self.visible_range()
+        wanted = self.visible_range(OVERSCAN_ROWS)
+        for index in list(self._active):
+            if index not in wanted:
+                card = self._active.pop(index)
+                self.canvas.itemconfigure(card.window, state="hidden")
+                if card.pending:
+                    # Scrolled past before its thumbnail was decoded
+                    self.thumbnails.cancel(card.path, self.thumb_size)
+                    card.pending = False
+                    card.path = None
+                self._pool.append(card)
+        for index in wanted:
+            card = self._active.get(index)
+            if card is None:
+                card = self._pool.pop() if self._pool else self._create_card()
+                self._active[index] = card
+            self._bind(card, index, prefetch=index not in visible)
+            if card.pending and index in visible:
+                self.thumbnails.prioritize(card.path, self.thumb_size)
+        self._render_headers()
+
+    def _render_headers(self):
+        """Draw the headers of the sections in view, reusing the canvas items of those that left"""
+        wanted = self.layout.visible_sections(self.canvas.canvasy(0), self.canvas.winfo_height())
+        for section in list(self._headers):
+            if section not in wanted:
+                header = self._headers.pop(section)
+                for item in header:
+                    self.canvas.itemconfigure(item, state="hidden")
+                self._header_pool.append(header)
+        width = max(self.canvas.winfo_width(), self.layout.cell_width)
+        for section in wanted:
+            header = self._headers.get(section)
+            if header is None:
+                header = self._header_pool.pop() if self._header_pool else self._create_header()
+                self._headers[section] = header
+            rect, text = header
+            top = self.layout.section_tops[section]
+            self.canvas.coords(rect, 5, top + 5, width - 5, top + SECTION_HEADER_HEIGHT - 4)
+            self.canvas.coords(text, 15, top + (SECTION_HEADER_HEIGHT + 1) // 2)
+            self.canvas.itemconfigure(text, text=self.sections[section][0])
+            for item in header:
+                self.canvas.itemconfigure(item, state="normal")
+
+    def _create_header(self):
+        rect = self.canvas.create_rectangle(0, 0, 0, 0, fill=self.colors['bg_secondary'], width=0)
+        text = self.canvas.create_text(0, 0, anchor="w", text="", font=("Segoe UI", 12, "bold"),
+                                       fill=self.colors['text_primary'])
+        return rect, text
+
+    def _create_card(self):
+        colors = self.colors
+        thumb_width, thumb_height = self.thumb_size
+        frame = tk.Frame(self.canvas, bd=0, bg=colors['bg_card'], highlightbackground=colors['bg_secondary'],
+                         highlightthickness=1, relief=tk.SOLID)
+        img_canvas = tk.Canvas(frame, width=thumb_width, height=thumb_height, bg=colors['bg_card'],
+                               highlightthickness=0, bd=0)
+        img_canvas.pack(padx=1, pady=1)
+        image_item = img_canvas.create_image(thumb_width // 2, thumb_height // 2, anchor=tk.CENTER)
+        text_item = img_canvas.create_text(thumb_width // 2, thumb_height // 2, text="",
+                                           fill=colors.get('text_secondary', 'gray'))
+
+        info_frame = tk.Frame(frame, bg=colors['bg_card'])
+        info_frame.pack(fill=tk.X, padx=1, pady=1)
+        check_var = tk.BooleanVar()
+        check = tk.Checkbutton(info_frame, variable=check_var, font=("Segoe UI", 10, "bold"),
+                               bg=colors['bg_card'], fg=colors['text_primary'], activebackground=colors['bg_card'],
+                               selectcolor=colors['accent'], bd=0, highlightthickness=0, anchor="w", padx=1, pady=1)
+        check.pack(fill=tk.X, padx=1, pady=1)
+        info_label = tk.Label(info_frame, text="", bg=colors['bg_card'], font=("Segoe UI", 9), anchor="w",
+                              padx=1, pady=1)
+        info_label.pack(fill=tk.X, padx=1, pady=1)
+
+        card = _GridCard(frame, img_canvas, image_item, text_item, check, check_var, info_label,
+                         ToolTip(info_label, ""))
+        check.config(command=lambda: self._on_check(card))
+        img_canvas.bind('<Double-Button-1>', lambda e: self._open(card))
+
+        # Hover highlight
+        def on_enter(ev):
+            frame.config(highlightbackground=colors['accent'], highlightthickness=2)
+
+        def on_leave(ev):
+            frame.config(highlightbackground=colors['bg_secondary'], highlightthickness=1)
+
+        for widget in (frame, img_canvas):
+            widget.bind("<Enter>", on_enter)
+            widget.bind("<Leave>", on_leave)
+
+        card.window = self.canvas.create_window(0, 0, window=frame, anchor="nw",
+                                                width=self.layout.cell_width - 2,
+                                                height=self.layout.cell_height - 2)
+        return card
+
+    def _bind(self, card, index, prefetch=False):
+        """Move a card to an item's cell and fill it in if it shows something else"""
+        x, y = self.layout.position(index)
+        self.canvas.coords(card.window, x, y)
+        self.canvas.itemconfigure(card.window, state="normal")
+        path = self.items[index]
+        if card.path == path and card.generation == self._generation:
+            return
+        card.path = path
+        card.generation = self._generation
+
+        img_tk = self.thumbnails.get(path, self.thumb_size, callback=self._on_thumbnail, prefetch=prefetch)
+        card.pending = img_tk is None
+        self._show_thumbnail(card, img_tk)
+
+        filename = os.path.basename(path)
+        if len(filename) > 25:
+            filename = filename[:22] + "..."
+        card.check.config(text=filename)
+        card.check_var.set(path in self._selected)
+        self._draw_overlay(card)
+
+        if self.describe:
+            text, color, tooltip = self.describe(path)
+            card.info_label.config(text=text, fg=color)
+            card.tooltip.text = tooltip or ""
+
+    def _show_thumbnail(self, card, img_tk):
+        card.img_canvas.itemconfigure(card.image_item, image=img_tk or "")
+        card.img_canvas.image = img_tk  # Keep reference to prevent GC blanking
+        if img_tk:
+            text = ""
+        else:
+            text = "Loading..." if card.pending else "No Preview"
+        card.img_canvas.itemconfigure(card.text_item, text=text)
+        # Keep the trash overlay above the image
+        card.img_canvas.tag_raise("cross_overlay")
+
+    def _on_thumbnail(self, path, size, img_tk):
+        """A thumbnail finished decoding; fill in the card still waiting for it"""
+        if size != tuple(self.thumb_size):
+            return
+        for card in self._active.values():
+            if card.pending and card.path == path:
+                card.pending = False
+                self._show_thumbnail(card, img_tk)
+
+    def _draw_overlay(self, card):
+        ImageUtils.update_cross_overlay([(card.check_var, card.path, card.img_canvas)], card.check_var,
+                                        card.path, self._trash_icon_cache)
+
+    def _open(self, card):
+        if self.on_open and card.path:
+            self.on_open(card.path)
+
+    def _on_check(self, card):
+        if card.check_var.get():
+            self._selected.add(card.path)
+        else:
+            self._selected.discard(card.path)
+        self._draw_overlay(card)
+        if self.on_selection_change:
+            self.on_selection_change()
+
 
 class ModernStyling:
     """Centralized TTK styling for PhotoSift applications"""
@@ -9,7 +9,10 @@ import numpy as np
 from PIL import Image
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import multiprocessing
+
+from FileScanner import scan_image_files
+from ImageDecoder import decode_for_analysis
+from ImageQualityAnalyzer import default_workers, iter_quality_records, ResultBatcher
 
 
 class DarkImageDetector:
@@ -43,12 +46,8 @@ class DarkImageDetector:
                    Returns -1 if image cannot be processed
         """
         try:
-            # Read image
-            image = cv2.imread(str(image_path))
-            if image is None:
-                # Try with PIL if cv2 fails
-                pil_image = Image.open(image_path)
-                image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+            # Read image at reduced scale (the mean is scale-invariant)
+            image, _ = decode_for_analysis(image_path)
             
             # Convert to HSV color space
             hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
@@ -108,7 +107,8 @@ class DarkImageDetector:
             return "Very Bright"
 
 
-def detect_dark_images_batch(folder_path, threshold=40.0, progress_callback=None, max_workers=None):
+def detect_dark_images_batch(folder_path, threshold=40.0, progress_callback=None, max_workers=None, manifest=None,
+                             backend="thread", result_callback=None):
     """
     Scan a folder for dark images using parallel batch processing.
     
@@ -117,6 +117,11 @@ def detect_dark_images_batch(folder_path, threshold=40.0, progress_callback=None
         threshold (float): Dark detection threshold
         progress_callback (callable): Optional callback function(current, total, filename)
         max_workers (int): Maximum number of parallel workers
+        manifest (FileManifest): Optional pre-scanned file list for folder_path
+        backend (str): "thread" or "process". The process backend sends chunks of
+            paths to worker processes and scales past the GIL on many-core machines.
+        result_callback (callable): Optional callback([(path, score, is_dark), ...])
+            receiving results in chunks while the scan runs, unsorted
         
     Returns:
         dict: {
@@ -128,28 +133,19 @@ def detect_dark_images_batch(folder_path, threshold=40.0, progress_callback=None
     """
     detector = DarkImageDetector(threshold=threshold)
     
-    # Supported image extensions
-    image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.webp'}
-    
-    # Find all images, excluding Trash folder
-    image_files_set = set()
-    for ext in image_extensions:
-        for img_path in Path(folder_path).rglob(f'*{ext}'):
-            if 'Trash' not in img_path.parts:
-                image_files_set.add(img_path)
-        for img_path in Path(folder_path).rglob(f'*{ext.upper()}'):
-            if 'Trash' not in img_path.parts:
-                image_files_set.add(img_path)
-    
-    image_files = list(image_files_set)
+    # One directory walk with Trash pruned, unless the caller already has a manifest
+    if manifest is None:
+        manifest = scan_image_files(folder_path)
+    image_files = [Path(p) for p in manifest]
     dark_images = []
     bright_images = []
     total = len(image_files)
     processed = 0
+    stream = ResultBatcher(result_callback)
     
     # Use CPU count if max_workers not specified
     if max_workers is None:
-        max_workers = min(multiprocessing.cpu_count(), 8)
+        max_workers = default_workers(backend)
     
     def process_single_image(image_path):
         """Process a single image and return result"""
@@ -161,29 +157,45 @@ def detect_dark_images_batch(folder_path, threshold=40.0, progress_callback=None
             return (str(image_path), -1, False)
     
     # Process images in parallel batches
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_path = {executor.submit(process_single_image, img_path): img_path 
-                         for img_path in image_files}
+    if backend == "process":
+        # Worker processes score chunks of paths and return compact arrays
+        for record in iter_quality_records(image_files, backend="process", max_workers=max_workers):
+            score = record['brightness']
+            if score != -1:
+                if score < threshold:
+                    dark_images.append((record['path'], score))
+                else:
+                    bright_images.append((record['path'], score))
+                stream.add((record['path'], score, score < threshold))
+            processed += 1
+            if progress_callback:
+                progress_callback(processed, total, os.path.basename(record['path']))
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_path = {executor.submit(process_single_image, img_path): img_path 
+                             for img_path in image_files}
         
-        for future in as_completed(future_to_path):
-            img_path = future_to_path[future]
-            try:
-                path_str, score, is_dark = future.result()
+            for future in as_completed(future_to_path):
+                img_path = future_to_path[future]
+                try:
+                    path_str, score, is_dark = future.result()
                 
-                if score != -1:
-                    if is_dark:
-                        dark_images.append((path_str, score))
-                    else:
-                        bright_images.append((path_str, score))
+                    if score != -1:
+                        if is_dark:
+                            dark_images.append((path_str, score))
+                        else:
+                            bright_images.append((path_str, score))
+                        stream.add((path_str, score, is_dark))
                 
-                processed += 1
+                    processed += 1
                 
-                if progress_callback:
-                    progress_callback(processed, total, img_path.name)
+                    if progress_callback:
+                        progress_callback(processed, total, img_path.name)
                     
-            except Exception as e:
-                print(f"Error processing result for {img_path}: {e}")
-                processed += 1
+                except Exception as e:
+                    print(f"Error processing result for {img_path}: {e}")
+                    processed += 1
+    stream.flush()
     
     # Sort: dark images (lowest score first), bright images (highest score first)
     dark_images.sort(key=lambda x: x[1])
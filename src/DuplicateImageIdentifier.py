@@ -1,159 +1,683 @@
 import os
 import sys
+import hashlib
+import queue
+import threading
+from collections import defaultdict
 from pathlib import Path
 from PIL import Image
 import numpy as np
-import cv2
-import torch
-from transformers import CLIPModel, CLIPProcessor
 from concurrent.futures import ThreadPoolExecutor
 import logging
+from ClipModelService import load_models, get_model_path, compute_image_features
+from EmbeddingCache import get_embedding_cache
+from FileScanner import scan_image_files
+from ImageDecoder import load_resized
+from ScanResultCache import get_result_cache
+from ThumbnailCache import get_thumbnail_cache
+from PerceptualHash import (compute_hashes_batch, find_hash_neighbors, distance_to_similarity,
+                            similarity_to_distance, MULTI_INDEX_MAX_RADIUS)
 
-device = "cuda" if torch.cuda.is_available() else "cpu"
 IMG_EXT = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
-
-model = None
-processor = None
-
-def get_model_path():
-    """Get the correct path to the model whether running as script or frozen exe"""
-    if getattr(sys, 'frozen', False):
-        # Running as PyInstaller bundle
-        base_path = sys._MEIPASS
-        model_path = os.path.join(base_path, 'models', 'clip-vit-base-patch32')
-    else:
-        # Running as script - look for local models folder first
-        local_path = os.path.join('models', 'clip-vit-base-patch32')
-        if os.path.exists(local_path):
-            model_path = local_path
-        else:
-            # Fallback (though in production this should be avoided)
-            model_path = "openai/clip-vit-base-patch32"
-            
-    return model_path
-
-def load_models():
-    """Lazy load models only when needed"""
-    global model, processor
-    if model is None or processor is None:
-        try:
-            model_path = get_model_path()
-            print(f"Loading CLIP model from: {model_path}")
-            model = CLIPModel.from_pretrained(model_path).to(device).eval()
-            processor = CLIPProcessor.from_pretrained(model_path)
-        except Exception as e:
-            print(f"Error loading CLIP model: {e}")
-            # If local load fails, try catch and re-raise or handle
-            raise e
+CLIP_CACHE_KEY = "clip-vit-base-patch32-draft"  # Model plus decode path of cached embeddings
+DEFAULT_SIMILARITY_BLOCK_MB = 256  # Memory budget for one block of similarity rows
+MIN_GROUPING_THRESHOLD = 0.80  # Lowest threshold offered by the GUI slider
+PARTIAL_HASH_BYTES = 64 * 1024  # Bytes hashed from each end of a file before a full hash
+# Hamming radius for perceptual-hash candidates sent to CLIP; the largest the
+# sub-quadratic multi-index search covers. Edited copies further apart are only
+# found by the full CLIP comparison (hash_prefilter=None).
+HASH_CANDIDATE_DISTANCE = MULTI_INDEX_MAX_RADIUS
+# Lowest threshold a hash graph is built for unless a looser one is requested
+# (1 - 7/64 ~ 0.89); lower thresholds need the quadratic scan
+HASH_GRAPH_MIN_THRESHOLD = float(distance_to_similarity(MULTI_INDEX_MAX_RADIUS))
+PIPELINE_PREFETCH_BATCHES = 2  # Preprocessed batches queued ahead of the model
+FILE_HASH_CACHE_KEY = "file-hash-blake2b"  # Persistent partial/full digests for exact-copy detection
 
 def load_image_cv(path, size=(224, 224)):
-    """Load image with Unicode path support (handles Chinese/special characters)"""
+    """Load image with Unicode path support (handles Chinese/special characters).
+    Returns None if the file cannot be decoded."""
     try:
-        # Use PIL to load the image first (handles Unicode paths properly)
-        img = Image.open(path).convert("RGB")
-        
-        # Resize using PIL's high-quality resampling
-        img = img.resize(size, Image.Resampling.LANCZOS)
-        
-        return img
+        # PIL handles Unicode paths; JPEGs are DCT-scaled close to size before resampling
+        return load_resized(path, size)
     except Exception as e:
         print(f"Warning: Failed to load image {path}: {e}")
-        # Return a blank image as fallback (should rarely happen)
-        return Image.new("RGB", size)
+        return None
+
+def _preprocess_batch(img_paths, size, executor):
+    """
+    Decode a batch of images in parallel and convert them to model inputs.
+
+    Returns:
+        (paths, inputs): the paths that decoded, in order, and their model
+        inputs (None if no image in the batch decoded)
+    """
+    _, processor = load_models()
+    images = list(executor.map(lambda p: load_image_cv(p, size), img_paths))
+    decoded = [(path, img) for path, img in zip(img_paths, images) if img is not None]
+    if not decoded:
+        return [], None
+    paths, images = zip(*decoded)
+    return list(paths), processor(images=list(images), return_tensors="pt", padding=True)
+
+def _image_features(inputs):
+    """Run the CLIP vision tower on preprocessed inputs and return a numpy array"""
+    return compute_image_features(inputs)
 
 def get_clip_embedding_batch(img_paths, size=(224, 224)):
     # Ensure models are loaded
     load_models()
     
+    _, processor = load_models()
     with ThreadPoolExecutor(max_workers=16) as executor:
         images = list(executor.map(lambda p: load_image_cv(p, size), img_paths))
+    # One row per path: undecodable files get a blank image here, callers index rows by position
+    images = [Image.new("RGB", size) if img is None else img for img in images]
     inputs = processor(images=images, return_tensors="pt", padding=True)
-    with torch.no_grad(), torch.autocast(device_type="cuda", dtype=torch.float16, enabled=(device=="cuda")):
-        image_features = model.get_image_features(**{k: v.to(device) for k, v in inputs.items()})
-    return image_features.cpu().numpy()
+    return _image_features(inputs)
 
-def get_clip_embedding(img_path):
+def iter_clip_embeddings(img_paths, size=(224, 224), batch_size=64, prefetch_batches=PIPELINE_PREFETCH_BATCHES,
+                         decode_workers=16):
+    """
+    Stream CLIP embeddings with decoding overlapped with inference.
+
+    A producer thread decodes and preprocesses upcoming batches into a bounded
+    queue while the model runs on the current one, so the CPU is not idle on
+    decode while inference runs and vice versa.
+
+    Args:
+        img_paths: List of image file paths
+        size: Input size passed to load_image_cv
+        batch_size: Number of images per model forward pass
+        prefetch_batches: Maximum preprocessed batches waiting for the model
+        decode_workers: Threads decoding images
+
+    Yields:
+        (batch_paths, embeddings) for each batch in order. batch_paths only
+        holds the images that decoded; files that cannot be decoded and
+        batches that fail to preprocess or run are logged and skipped.
+    """
     load_models()
-    img = Image.open(img_path).convert("RGB").resize((224, 224), Image.BICUBIC)
+    img_paths = list(img_paths)
+    batches = [img_paths[i:i + batch_size] for i in range(0, len(img_paths), batch_size)]
+    ready = queue.Queue(maxsize=max(1, prefetch_batches))
+    stop = threading.Event()
+    done_marker = object()
+
+    def put(item):
+        # Give up if the consumer stopped iterating, so the thread can exit
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def producer():
+        with ThreadPoolExecutor(max_workers=decode_workers) as executor:
+            for batch in batches:
+                if stop.is_set():
+                    break
+                try:
+                    put((batch, *_preprocess_batch(batch, size, executor), None))
+                except Exception as e:
+                    put((batch, batch, None, e))
+        put(done_marker)
+
+    threading.Thread(target=producer, daemon=True).start()
+    try:
+        while True:
+            item = ready.get()
+            if item is done_marker:
+                break
+            batch, decoded, inputs, error = item
+            if error is None:
+                if inputs is None:
+                    continue
+                try:
+                    yield decoded, _image_features(inputs)
+                    continue
+                except Exception as e:
+                    error = e
+            print(f"Error processing batch of {len(batch)} images starting at {batch[0]}: {error}")
+    finally:
+        stop.set()
+
+def get_clip_embedding(img_path):
+    _, processor = load_models()
+    img = load_resized(img_path, (224, 224), resample=Image.BICUBIC)
     inputs = processor(images=img, return_tensors="pt")
-    with torch.no_grad():
-        image_features = model.get_image_features(**{k: v.to(device) for k, v in inputs.items()})
-    return image_features.squeeze().cpu().numpy()
+    return compute_image_features(inputs).squeeze()
 
-def group_similar_images_clip(folder=None, threshold=0.95, embeddings=None, files=None, progress_callback=None, return_scores=False):
-    # Accept precomputed embeddings and file list for efficiency
-    if files is None:
-        files = [os.path.join(dp, f) for dp, dn, filenames in os.walk(folder)
-                 for f in filenames if Path(f).suffix.lower() in IMG_EXT]
-    if embeddings is None:
-        # Use batch embedding extraction for all files
-        emb_array = get_clip_embedding_batch(files)
-        embeddings = {f: emb_array[i] for i, f in enumerate(files)}
-    
-    # Convert embeddings to numpy array for vectorized operations
+def get_clip_embeddings_cached(img_paths, size=(224, 224), batch_size=64, progress_callback=None, on_batch=None):
+    """
+    Get CLIP embeddings for many files, reading the persistent cache first.
+
+    Only files that are missing from the cache (or whose size/mtime changed)
+    are sent to the model, through the overlapped iter_clip_embeddings
+    pipeline; their new embeddings are written back as each batch finishes.
+
+    Args:
+        img_paths: List of image file paths
+        size: Input size passed to load_image_cv
+        batch_size: Number of images per model forward pass
+        progress_callback: Optional callback(current, total, status_text, detail_text)
+        on_batch: Optional callback(paths, embeddings) called with the cached
+            embeddings first and then with each newly computed batch
+
+    Returns:
+        dict of path -> embedding (np.ndarray). Files that could not be
+        decoded, and files in a batch that failed, are omitted and not cached,
+        so they are retried on the next scan.
+    """
+    img_paths = list(img_paths)
+    total = len(img_paths)
+    cache = get_embedding_cache(f"{CLIP_CACHE_KEY}@{size[0]}x{size[1]}")
+    embeddings, misses = cache.get_many(img_paths)
+    cached_count = len(embeddings)
+    print(f"[LOG] Embedding cache: {cached_count} hits, {len(misses)} to compute")
+
+    if cached_count:
+        if on_batch:
+            on_batch(list(embeddings.keys()), np.array(list(embeddings.values())))
+        if progress_callback:
+            progress_callback(cached_count, total, f"Loaded {cached_count} cached embeddings",
+                              f"{len(misses)} new or changed images need analysis...")
+
+    if not misses:
+        return embeddings
+
+    processed = 0
+    for batch_files, batch_embeddings in iter_clip_embeddings(misses, size, batch_size):
+        processed += len(batch_files)
+        embeddings.update(zip(batch_files, batch_embeddings))
+        cache.put_many(zip(batch_files, batch_embeddings))
+        if on_batch:
+            on_batch(batch_files, batch_embeddings)
+        if progress_callback:
+            done = cached_count + processed
+            percent = int((done / total) * 100) if total else 100
+            progress_callback(done, total, f"Processing Images ({percent}%)",
+                              f"Analyzed {processed} of {len(misses)} new images...")
+
+    return embeddings
+
+def prune_scan_caches(folder, files, size=(224, 224), extensions=IMG_EXT):
+    """
+    Drop cached embeddings, file digests and thumbnails for images deleted from folder.
+
+    Args:
+        folder: Folder that was just scanned
+        files: Every image currently found under folder
+        extensions: Extensions the scan matched; entries for other file
+            types belong to other tools and are kept
+    """
+    removed = get_embedding_cache(f"{CLIP_CACHE_KEY}@{size[0]}x{size[1]}").prune(folder, files, extensions)
+    removed += get_result_cache(FILE_HASH_CACHE_KEY).prune(folder, files, extensions)
+    removed += get_thumbnail_cache().prune(folder, files, extensions)
+    if removed:
+        print(f"[LOG] Dropped {removed} cache entries for deleted files")
+
+def _partial_file_hash(path, size):
+    """Hash the first and last PARTIAL_HASH_BYTES of a file"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        h.update(f.read(PARTIAL_HASH_BYTES))
+        if size > 2 * PARTIAL_HASH_BYTES:
+            f.seek(-PARTIAL_HASH_BYTES, os.SEEK_END)
+            h.update(f.read(PARTIAL_HASH_BYTES))
+    return h.digest()
+
+def _full_file_hash(path):
+    """Hash the full contents of a file"""
+    h = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.digest()
+
+def _refine_buckets(buckets, hash_fn, executor):
+    """Split each bucket of candidate files by hash_fn, keeping only collisions"""
+    candidates = [p for bucket in buckets for p in bucket]
+
+    def safe_hash(path):
+        try:
+            return hash_fn(path)
+        except OSError as e:
+            print(f"[WARN] Could not hash {path}: {e}")
+            return None
+
+    digests = dict(zip(candidates, executor.map(safe_hash, candidates)))
+    refined = []
+    for bucket in buckets:
+        by_digest = defaultdict(list)
+        for path in bucket:
+            if digests[path] is not None:
+                by_digest[digests[path]].append(path)
+        refined.extend(g for g in by_digest.values() if len(g) > 1)
+    return refined
+
+def find_exact_duplicates(files, progress_callback=None, max_workers=8):
+    """
+    Find byte-identical files without decoding them.
+
+    Files are bucketed by size; only size collisions are hashed, first on a
+    head/tail sample and then, for files that still collide, in full. Digests
+    of unchanged files are reused from the persistent scan result cache.
+
+    Args:
+        files: List of file paths
+        progress_callback: Optional callback(current, total, status_text, detail_text)
+        max_workers: Threads used for hashing (I/O bound)
+
+    Returns:
+        List of exact-duplicate groups, each in the order of files. The first
+        path of a group is its representative.
+    """
+    files = list(files)
+    total = len(files)
+    by_size = defaultdict(list)
+    for path in files:
+        try:
+            by_size[os.path.getsize(path)].append(path)
+        except OSError:
+            continue
+    buckets = [bucket for bucket in by_size.values() if len(bucket) > 1]
+
+    if progress_callback:
+        collisions = sum(len(b) for b in buckets)
+        progress_callback(0, total, "Checking for Exact Copies...",
+                          f"{collisions} of {total} images share a file size with another image")
+
+    hash_cache = get_result_cache(FILE_HASH_CACHE_KEY)
+    stored, _ = hash_cache.get_many(p for bucket in buckets for p in bucket)
+    updated = {}
+
+    def cached_hash(kind, hash_fn):
+        def lookup(path):
+            entry = stored.get(path, {})
+            if kind in entry:
+                return bytes.fromhex(entry[kind])
+            digest = hash_fn(path)
+            updated.setdefault(path, dict(entry))[kind] = digest.hex()
+            return digest
+        return lookup
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        buckets = _refine_buckets(
+            buckets, cached_hash("partial", lambda p: _partial_file_hash(p, os.path.getsize(p))), executor)
+        buckets = _refine_buckets(buckets, cached_hash("full", _full_file_hash), executor)
+    hash_cache.put_many(updated.items())
+
+    # Keep groups in file order so the earliest copy represents the group
+    order = {path: idx for idx, path in enumerate(files)}
+    groups = sorted((sorted(g, key=order.__getitem__) for g in buckets), key=lambda g: order[g[0]])
+
+    if progress_callback:
+        copies = sum(len(g) - 1 for g in groups)
+        progress_callback(total, total, "Exact Copy Check Complete",
+                          f"Found {copies} exact copies in {len(groups)} groups")
+    print(f"[LOG] Exact duplicates: {len(groups)} groups, {sum(len(g) - 1 for g in groups)} copies")
+    return groups
+
+def split_exact_duplicates(files, exact_groups):
+    """
+    Remove non-representative exact copies from a file list.
+
+    Args:
+        files: List of file paths
+        exact_groups: Output of find_exact_duplicates
+
+    Returns:
+        (representatives, exact_copies): files with only one entry per exact
+        group, and a dict of representative -> list of its other copies.
+    """
+    exact_copies = {group[0]: group[1:] for group in exact_groups}
+    skipped = {path for group in exact_groups for path in group[1:]}
+    representatives = [f for f in files if f not in skipped]
+    return representatives, exact_copies
+
+def _similarity_block_rows(num_files, max_block_mb):
+    """Number of similarity-matrix rows that fit in max_block_mb of float32"""
+    row_bytes = max(num_files, 1) * 4
+    return max(1, int(max_block_mb * 1024 * 1024) // row_bytes)
+
+def iter_similarity_blocks(normalized_embeddings, max_block_mb=DEFAULT_SIMILARITY_BLOCK_MB):
+    """
+    Yield the cosine similarity matrix one horizontal block at a time.
+
+    Only a (block_rows x N) slice is alive at any moment, so memory stays
+    bounded by max_block_mb regardless of N.
+
+    Args:
+        normalized_embeddings: (N, D) array of L2-normalized embeddings
+        max_block_mb: Upper bound on the size of each yielded block
+
+    Yields:
+        (start, block) where block[k] holds the similarities of row start + k
+        against all N embeddings.
+    """
+    num_files = normalized_embeddings.shape[0]
+    block_rows = _similarity_block_rows(num_files, max_block_mb)
+    for start in range(0, num_files, block_rows):
+        end = min(start + block_rows, num_files)
+        yield start, np.dot(normalized_embeddings[start:end], normalized_embeddings.T)
+
+class SimilarityGraph:
+    """
+    Sparse neighbor graph of image similarities, built once per scan.
+
+    Stores, for every image, the other images at or above min_threshold sorted
+    by descending similarity (CSR layout). Grouping at any threshold
+    >= min_threshold is then a single pass over the stored edges.
+
+    Args:
+        files: List of file paths; row i of the graph belongs to files[i]
+        indptr: Row offsets into indices/similarities (length N + 1)
+        indices: Neighbor column indices, each row sorted by descending similarity
+        similarities: Similarity of each stored edge (float32)
+        min_threshold: Lowest similarity kept when the graph was built
+        exact_copies: Optional dict of file -> byte-identical copies that were
+            left out of the graph; they are added back next to their file
+    """
+
+    def __init__(self, files, indptr, indices, similarities, min_threshold, exact_copies=None):
+        self.files = list(files)
+        self.indptr = indptr
+        self.indices = indices
+        self.similarities = similarities
+        self.min_threshold = min_threshold
+        self.exact_copies = exact_copies or {}
+
+    @property
+    def num_edges(self):
+        return len(self.indices)
+
+    def _ungrouped_neighbors(self, i, threshold, used):
+        """Return (indices, similarities) of ungrouped neighbors of row i, in file order"""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        if start == end:
+            return self.indices[:0], self.similarities[:0]
+        # Rows are sorted by descending similarity, so neighbors above the
+        # threshold are a prefix of the row
+        row_sims = self.similarities[start:end]
+        count = int(np.count_nonzero(row_sims >= threshold))
+        neighbor_idx = self.indices[start:start + count]
+        neighbor_sims = row_sims[:count]
+        keep = ~used[neighbor_idx]
+        neighbor_idx = neighbor_idx[keep]
+        neighbor_sims = neighbor_sims[keep]
+
+        # Keep members in file order, as the pairwise grouping does
+        order = np.argsort(neighbor_idx, kind="stable")
+        return neighbor_idx[order], neighbor_sims[order]
+
+    def group(self, threshold, return_scores=False, progress_callback=None):
+        """
+        Greedy duplicate grouping at the given threshold.
+
+        Produces the same groups as comparing every pair at that threshold:
+        in file order, each ungrouped image collects all other ungrouped
+        images with similarity >= threshold. Exact copies always join the
+        group of the image they duplicate.
+
+        Args:
+            threshold: Similarity threshold, must be >= min_threshold
+            return_scores: Also return a dict of path -> similarity to its group leader
+            progress_callback: Optional callback(current, total, status_text, detail_text)
+
+        Returns:
+            List of groups, or (groups, similarity_scores) if return_scores
+        """
+        if threshold < self.min_threshold:
+            raise ValueError(f"Threshold {threshold} is below the graph minimum {self.min_threshold}")
+
+        groups = []
+        similarity_scores = {}
+        total_files = len(self.files)
+        used = np.zeros(total_files, dtype=bool)
+
+        for i in range(total_files):
+            if used[i]:
+                continue
+            used[i] = True
+            f1 = self.files[i]
+            neighbor_idx, neighbor_sims = self._ungrouped_neighbors(i, threshold, used)
+            if len(neighbor_idx) == 0 and f1 not in self.exact_copies:
+                continue
+
+            # Exact copies sit next to the image they duplicate and share its score
+            group = [f1] + self.exact_copies.get(f1, [])
+            for path in group:
+                similarity_scores[path] = 1.0
+            for idx, sim in zip(neighbor_idx, neighbor_sims):
+                for path in [self.files[idx]] + self.exact_copies.get(self.files[idx], []):
+                    group.append(path)
+                    similarity_scores[path] = float(sim)
+            groups.append(group)
+            used[neighbor_idx] = True
+
+        if progress_callback:
+            progress_callback(total_files, total_files, "Duplicate Grouping Complete!",
+                              f"Found {len(groups)} duplicate groups from {total_files} images")
+
+        if return_scores:
+            return groups, similarity_scores
+        return groups
+
+def _graph_from_pairs(file_list, rows, cols, sims, min_threshold, exact_copies=None):
+    """Build a SimilarityGraph from directed (row, col, similarity) edges"""
+    total_files = len(file_list)
+    keep = sims >= min_threshold
+    rows, cols, sims = rows[keep], cols[keep], sims[keep]
+    # Sort each row by descending similarity
+    order = np.lexsort((-sims, rows))
+    rows, cols, sims = rows[order], cols[order], sims[order]
+    indptr = np.zeros(total_files + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=total_files), out=indptr[1:])
+    return SimilarityGraph(file_list, indptr, cols.astype(np.int32), sims.astype(np.float32),
+                           min_threshold, exact_copies)
+
+def build_similarity_graph(embeddings, files, min_threshold=MIN_GROUPING_THRESHOLD, progress_callback=None,
+                           max_block_mb=DEFAULT_SIMILARITY_BLOCK_MB, exact_copies=None, candidate_pairs=None):
+    """
+    Build a SimilarityGraph holding every pair at or above min_threshold.
+
+    Similarities are computed in bounded row blocks (see iter_similarity_blocks);
+    only the surviving edges are kept. When candidate_pairs is given, only
+    those pairs are compared (e.g. perceptual-hash neighbors), which makes
+    the search sub-quadratic at the cost of missing pairs outside the candidates.
+
+    Args:
+        embeddings: dict of path -> embedding
+        files: List of file paths (order determines group leaders)
+        min_threshold: Lowest threshold the graph must support
+        progress_callback: Optional callback(current, total, status_text, detail_text)
+        max_block_mb: Memory budget for one block of the similarity matrix
+        exact_copies: Optional dict of file -> byte-identical copies (see split_exact_duplicates)
+        candidate_pairs: Optional (rows, cols) index arrays of the pairs to compare
+
+    Returns:
+        SimilarityGraph
+    """
     file_list = list(files)
-    embedding_matrix = np.array([embeddings[f] for f in file_list])
-    
-    # Normalize embeddings once for cosine similarity
+    total_files = len(file_list)
+    if total_files == 0:
+        return SimilarityGraph([], np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32),
+                               np.zeros(0, dtype=np.float32), min_threshold, exact_copies)
+
+    # Convert embeddings to numpy array and normalize once for cosine similarity
+    embedding_matrix = np.array([embeddings[f] for f in file_list], dtype=np.float32)
     norms = np.linalg.norm(embedding_matrix, axis=1, keepdims=True)
     normalized_embeddings = embedding_matrix / norms
-    
-    # Compute full similarity matrix using vectorized operations
+
+    if candidate_pairs is not None:
+        rows, cols = (np.asarray(a, dtype=np.int64) for a in candidate_pairs)
+        if progress_callback:
+            progress_callback(0, total_files, "Comparing Images...",
+                              f"Checking {len(rows)} candidate pairs...")
+        sims = np.concatenate([
+            np.einsum("ij,ij->i", normalized_embeddings[rows[k:k + 65536]], normalized_embeddings[cols[k:k + 65536]])
+            for k in range(0, len(rows), 65536)] or [np.zeros(0, dtype=np.float32)])
+        graph = _graph_from_pairs(file_list, rows, cols, sims, min_threshold, exact_copies)
+        print(f"[LOG] Similarity graph: {total_files} images, {graph.num_edges} edges >= {min_threshold} "
+              f"from {len(rows)} candidates")
+        return graph
+
     if progress_callback:
-        progress_callback(0, len(file_list), "Computing Similarity Matrix...", 
-                        "Calculating all pairwise similarities using vectorized operations...")
-    
-    similarity_matrix = np.dot(normalized_embeddings, normalized_embeddings.T)
-    
-    # Find duplicate groups using the precomputed similarity matrix
-    groups = []
-    similarity_scores = {}  # Store similarity scores for each image
-    used = set()
-    total_files = len(file_list)
-    
-    for i, f1 in enumerate(file_list):
-        if i in used:
-            continue
-            
-        # Find all similar images for this one using the precomputed matrix
-        similar_indices = np.where(similarity_matrix[i] >= threshold)[0]
-        
-        # Filter out already used indices and self
-        group_indices = [idx for idx in similar_indices if idx not in used and idx != i]
-        
-        if len(group_indices) > 0:  # Only create group if there are duplicates
-            group = [f1] + [file_list[idx] for idx in group_indices]
-            groups.append(group)
-            
-            # Store similarity scores for this group (relative to the first image)
-            for idx in group_indices:
-                file_path = file_list[idx]
-                similarity_scores[file_path] = float(similarity_matrix[i][idx])
-            
-            # First image in group gets maximum score (1.0)
-            similarity_scores[f1] = 1.0
-            
-            # Mark all images in this group as used
-            used.add(i)
-            used.update(group_indices)
-        else:
-            used.add(i)
-        
-        # Progress update
-        if progress_callback and (i + 1) % 50 == 0:
-            percent = int(((i + 1) / total_files) * 100)
-            progress_callback(i + 1, total_files, f"Grouping Duplicates... ({percent}%)", 
-                            f"Processed {i + 1}/{total_files} images: {os.path.basename(f1)}")
-    
-    # Final progress update
+        progress_callback(0, total_files, "Comparing Images...",
+                          "Calculating pairwise similarities block by block...")
+
+    counts = np.zeros(total_files, dtype=np.int64)
+    index_chunks = []
+    sim_chunks = []
+    for start, block in iter_similarity_blocks(normalized_embeddings, max_block_mb):
+        block_rows = block.shape[0]
+        # Exclude self-similarity
+        block[np.arange(block_rows), np.arange(start, start + block_rows)] = -np.inf
+        rows, cols = np.nonzero(block >= min_threshold)
+        sims = block[rows, cols]
+        # Sort each row by descending similarity
+        order = np.lexsort((-sims, rows))
+        rows, cols, sims = rows[order], cols[order], sims[order]
+        counts[start:start + block_rows] = np.bincount(rows, minlength=block_rows)
+        index_chunks.append(cols.astype(np.int32))
+        sim_chunks.append(sims.astype(np.float32))
+
+        if progress_callback:
+            done = start + block_rows
+            percent = int((done / total_files) * 100)
+            progress_callback(done, total_files, f"Comparing Images... ({percent}%)",
+                              f"Compared {done}/{total_files} images")
+
+    indptr = np.zeros(total_files + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    graph = SimilarityGraph(file_list, indptr, np.concatenate(index_chunks),
+                            np.concatenate(sim_chunks), min_threshold, exact_copies)
+    print(f"[LOG] Similarity graph: {total_files} images, {graph.num_edges} edges >= {min_threshold}")
+    return graph
+
+def find_hash_candidate_pairs(files, method="dhash", max_distance=HASH_CANDIDATE_DISTANCE, progress_callback=None):
+    """
+    Use perceptual hashes to pick which pairs are worth comparing with CLIP.
+
+    Args:
+        files: List of file paths
+        method: "dhash" or "phash"
+        max_distance: Hamming radius for a pair to become a candidate
+        progress_callback: Optional callback(current, total, status_text, detail_text)
+
+    Returns:
+        (rows, cols) index arrays into files, listing each candidate pair in both directions
+    """
+    files = list(files)
+    hashes = compute_hashes_batch(files, method, progress_callback)
+    hashed = [i for i, f in enumerate(files) if f in hashes]
+    rows, cols, _ = find_hash_neighbors([hashes[files[i]] for i in hashed], max_distance)
+    index = np.array(hashed, dtype=np.int64)
+    return index[rows], index[cols]
+
+def build_hash_similarity_graph(files, min_threshold=HASH_GRAPH_MIN_THRESHOLD, method="dhash", progress_callback=None,
+                                exact_copies=None, hashes=None):
+    """
+    Build a SimilarityGraph from 64-bit perceptual hashes alone (no AI model).
+
+    Hamming distance d maps to similarity 1 - d/64, so the same threshold slider
+    applies: 0.95 allows 3 differing bits, 0.80 allows 12. Thresholds down to
+    HASH_GRAPH_MIN_THRESHOLD use the multi-index search; lower ones fall back
+    to a quadratic scan.
+
+    Args:
+        files: List of file paths (order determines group leaders)
+        min_threshold: Lowest threshold the graph must support
+        method: "dhash" or "phash"
+        progress_callback: Optional callback(current, total, status_text, detail_text)
+        exact_copies: Optional dict of file -> byte-identical copies
+        hashes: Optional dict of path -> hash from compute_hashes_batch, e.g.
+            kept from an earlier build to rebuild at a lower threshold
+
+    Returns:
+        SimilarityGraph over the files that could be hashed
+    """
+    if hashes is None:
+        hashes = compute_hashes_batch(files, method, progress_callback)
+    file_list = [f for f in files if f in hashes]
     if progress_callback:
-        progress_callback(total_files, total_files, "Duplicate Grouping Complete!", 
-                        f"Found {len(groups)} duplicate groups from {total_files} images")
+        progress_callback(len(file_list), len(file_list), "Comparing Hashes...",
+                          f"Searching Hamming neighbors for {len(file_list)} images...")
+    rows, cols, distances = find_hash_neighbors([hashes[f] for f in file_list],
+                                                similarity_to_distance(min_threshold))
+    graph = _graph_from_pairs(file_list, rows, cols, distance_to_similarity(distances),
+                              min_threshold, exact_copies)
+    print(f"[LOG] Hash similarity graph: {len(file_list)} images, {graph.num_edges} edges >= {min_threshold}")
+    return graph
+
+def group_similar_images_hash(folder=None, threshold=0.95, files=None, method="dhash", progress_callback=None,
+                              return_scores=False):
+    """
+    Fast CPU-only duplicate grouping using perceptual hashes instead of CLIP.
+
+    Args:
+        folder: Folder to scan when files is not given
+        threshold: Minimum hash similarity (1 - hamming/64)
+        files: Optional list of file paths
+        method: "dhash" or "phash"
+        progress_callback: Optional callback(current, total, status_text, detail_text)
+        return_scores: Also return a dict of path -> similarity to its group leader
+
+    Returns:
+        List of groups, or (groups, similarity_scores) if return_scores
+    """
+    if files is None:
+        files = scan_image_files(folder, IMG_EXT).files
+    files, exact_copies = split_exact_duplicates(files, find_exact_duplicates(files, progress_callback))
+    graph = build_hash_similarity_graph(files, min_threshold=threshold, method=method,
+                                        progress_callback=progress_callback, exact_copies=exact_copies)
+    return graph.group(threshold, return_scores=return_scores, progress_callback=progress_callback)
+
+def group_similar_images_clip(folder=None, threshold=0.95, embeddings=None, files=None, progress_callback=None,
+                              return_scores=False, max_block_mb=DEFAULT_SIMILARITY_BLOCK_MB, hash_prefilter=None):
+    """
+    Group near-duplicate images by CLIP cosine similarity.
+
+    Greedy grouping in file order: each image not yet grouped collects every
+    other ungrouped image at or above the threshold. Similarities are computed
+    in row blocks of at most max_block_mb, never as a full N x N matrix.
+
+    Args:
+        folder: Folder to scan when files is not given
+        threshold: Minimum cosine similarity for two images to be duplicates
+        embeddings: Optional dict of path -> embedding. When omitted, exact
+            copies are found by hashing first and only one per copy group is embedded.
+        files: Optional list of file paths (order determines group leaders)
+        progress_callback: Optional callback(current, total, status_text, detail_text)
+        return_scores: Also return a dict of path -> similarity to its group leader
+        max_block_mb: Memory budget for one block of the similarity matrix
+        hash_prefilter: Optional "dhash"/"phash"; only pairs within
+            HASH_CANDIDATE_DISTANCE bits of each other are compared with CLIP
+
+    Returns:
+        List of groups (lists of paths), or (groups, similarity_scores) if return_scores
+    """
+    # Accept precomputed embeddings and file list for efficiency
+    if files is None:
+        files = scan_image_files(folder, IMG_EXT).files
+        prune_scan_caches(folder, files)
+    exact_copies = None
+    if embeddings is None:
+        # Byte-identical copies are grouped by hash; only one of each goes to CLIP
+        files, exact_copies = split_exact_duplicates(files, find_exact_duplicates(files, progress_callback))
+        # Use batch embedding extraction for the rest, reusing cached vectors
+        embeddings = get_clip_embeddings_cached(files)
+        files = [f for f in files if f in embeddings]
     
-    if return_scores:
-        return groups, similarity_scores
-    else:
-        return groups
+    candidate_pairs = None
+    if hash_prefilter:
+        candidate_pairs = find_hash_candidate_pairs(files, hash_prefilter, progress_callback=progress_callback)
+    
+    graph = build_similarity_graph(embeddings, files, min_threshold=threshold,
+                                   progress_callback=progress_callback, max_block_mb=max_block_mb,
+                                   exact_copies=exact_copies, candidate_pairs=candidate_pairs)
+    return graph.group(threshold, return_scores=return_scores, progress_callback=progress_callback)
 
 if __name__ == "__main__":
     folder = "test_image"  # change as needed
@@ -1,12 +1,14 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import tkinter.ttk as ttk
-from PIL import Image, ImageTk
 import os
 import time
 from DuplicateImageIdentifier import group_similar_images_clip, IMG_EXT
+from FileScanner import scan_image_files
 from CommonUI import (ToolTip, ModernColors, ProgressWindow, ModernStyling, 
-                     StatusBar, ZoomControls, ModernButton, ImageUtils, TrashManager, FileOperations)
+                     StatusBar, ZoomControls, ModernButton, ImageUtils, TrashManager, FileOperations,
+                     VirtualGrid)
+from ThumbnailService import ThumbnailService
 
 
 class DuplicateImageIdentifierApp:
@@ -22,11 +24,12 @@ class DuplicateImageIdentifierApp:
         self.groups = []
         self.embeddings = {}  # Store embeddings for re-grouping with different thresholds
         self.files = []  # Store file list for re-grouping
+        self.hashes = {}  # Perceptual hashes from fast mode, for rebuilding its graph
+        self.similarity_graph = None  # Sorted neighbor graph for instant re-grouping
+        self.exact_copies = {}  # representative path -> byte-identical copies skipped by CLIP
         
-        # Selection and confidence tracking
-        self.selected_check_vars = []  # List of (checkbox_var, image_path, img_canvas) tuples
+        # Similarity tracking (the image grid keeps the checkbox selection)
         self.similarity_scores = {}  # path -> similarity score for duplicates
-        self._updating_bulk_selection = False  # Flag to prevent callback loops during bulk operations
         self._cleaning_in_progress = False  # Flag to prevent UI updates during cleaning
         self._refresh_in_progress = False  # Flag to prevent recursive tree selection during refresh
         
@@ -36,19 +39,15 @@ class DuplicateImageIdentifierApp:
         self.min_thumb_size = (80, 60)  # Minimum size
         self.max_thumb_size = (300, 225)  # Maximum size
         
-        # Paging variables
-        self.page_size = 10  # groups per page (changed from images to groups)
-        self.current_page = 0
-        self.current_display_groups = []  # Store current groups being displayed for paging (changed from images)
+        # Groups shown in the image grid
+        self.current_display_groups = []  # [{'name': ..., 'images': [...]}, ...]
         
-        # Image caching system for performance
-        self.image_cache = {}  # cache_key -> ImageTk.PhotoImage
-        self.cache_access_order = []  # For LRU cache management
-        self.max_cache_size = 300  # Maximum number of cached images
-        self.cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        # Thumbnails are decoded in the background and kept in a byte-bounded LRU cache
+        self.thumbnails = ThumbnailService(self.root)
         
         # Initialize progress window
         self.progress_window = ProgressWindow(self.root, "Processing Images - Duplicate Detection")
+        self.progress_prefix = None  # Status bar label while progress is mirrored there
         
         self.setup_ui()
         ModernStyling.apply_modern_styling(self.colors)
@@ -176,6 +175,22 @@ class DuplicateImageIdentifierApp:
                 bg=self.colors['bg_secondary'], fg=self.colors['text_secondary'],
                 justify=tk.LEFT).pack(anchor="w")
         
+        # Fast mode: perceptual hashes instead of the CLIP model
+        self.fast_mode_var = tk.BooleanVar(value=False)
+        fast_mode_chk = tk.Checkbutton(threshold_section,
+                                       text="Fast mode (no AI)",
+                                       variable=self.fast_mode_var,
+                                       font=("Segoe UI", 10),
+                                       bg=self.colors['bg_secondary'],
+                                       fg=self.colors['text_primary'],
+                                       activebackground=self.colors['bg_secondary'],
+                                       selectcolor=self.colors['bg_card'])
+        fast_mode_chk.pack(anchor="w", pady=(10, 0))
+        ToolTip(fast_mode_chk,
+                "Compare 64-bit perceptual hashes instead of running the AI model.\n"
+                "Much faster on CPU-only machines; finds resized, recompressed\n"
+                "and lightly edited copies but not semantically similar photos.")
+        
         # Scan button
         self.scan_btn = ModernButton.create_primary_button(
             threshold_section, "Start Scan", self.start_scan, self.colors)
@@ -278,37 +293,6 @@ class DuplicateImageIdentifierApp:
                 "Check images you want to remove, then click Clean.\n"
                 "Images will be moved to a local Trash folder for safety.")
         
-        # Modern pagination controls
-        self.page_frame = tk.Frame(main_area, bg=self.colors['bg_primary'], height=50)
-        self.page_frame.pack(fill=tk.X, pady=(0, 20))
-        self.page_frame.pack_propagate(False)
-        
-        # Center container for navigation
-        nav_center = tk.Frame(self.page_frame, bg=self.colors['bg_primary'])
-        nav_center.pack(expand=True)
-        
-        # Modern navigation buttons
-        nav_btn_style = {"font": ("Segoe UI", 12), 
-                        "bg": self.colors['bg_secondary'], 
-                        "fg": self.colors['text_primary'],
-                        "activebackground": self.colors['bg_card'], 
-                        "activeforeground": self.colors['text_primary'],
-                        "bd": 0, "padx": 20, "pady": 8, "cursor": "hand2"}
-        
-        self.prev_page_btn = tk.Button(nav_center, text="← Previous", command=self.prev_page, **nav_btn_style)
-        self.prev_page_btn.pack(side=tk.LEFT, padx=(0, 15))
-        
-        self.page_label = tk.Label(nav_center, text="Page 1 of 1", 
-                                  font=("Segoe UI", 12, "bold"), 
-                                  bg=self.colors['bg_primary'], 
-                                  fg=self.colors['text_primary'])
-        self.page_label.pack(side=tk.LEFT, padx=20)
-        
-        self.next_page_btn = tk.Button(nav_center, text="Next →", command=self.next_page, **nav_btn_style)
-        self.next_page_btn.pack(side=tk.LEFT, padx=(15, 0))
-        
-        self.page_frame.pack_forget()  # Hide initially
-        
         # Image display area with scrolling
         self.create_image_display_area(main_area)
 
@@ -317,44 +301,31 @@ class DuplicateImageIdentifierApp:
         img_container = tk.Frame(parent, bg=self.colors['bg_primary'])
         img_container.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
         
-        # Canvas for scrolling
-        self.img_canvas = tk.Canvas(img_container, 
-                                   bg=self.colors['bg_primary'],
-                                   highlightthickness=0,
-                                   bd=0)
-        
-        # Modern scrollbar
-        img_scrollbar = ttk.Scrollbar(img_container, 
-                                    orient="vertical", 
-                                    command=self.img_canvas.yview,
-                                    style="Modern.Vertical.TScrollbar")
-        
-        self.img_canvas.configure(yscrollcommand=img_scrollbar.set)
-        
-        img_scrollbar.pack(side="right", fill="y")
-        self.img_canvas.pack(side="left", fill="both", expand=True)
-        
-        # Frame for images
-        self.img_panel = tk.Frame(self.img_canvas, bg=self.colors['bg_primary'])
-        self.img_canvas.create_window((0, 0), window=self.img_panel, anchor="nw")
-        
-        # Bind scrolling
-        self.img_panel.bind("<Configure>", self.on_img_frame_configure)
+        # Only the cards in view are built; each group is a header row followed by its images
+        self.image_grid = VirtualGrid(img_container, self.colors, self.thumbnails, thumb_size=self.thumb_size,
+                                      describe=self.describe_card, on_open=self.open_full_image,
+                                      on_selection_change=self.on_selection_change)
+        self.image_grid.pack(fill=tk.BOTH, expand=True)
+        self.img_canvas = self.image_grid.canvas
         self.img_canvas.bind("<MouseWheel>", self.on_mousewheel)
 
-    def on_img_frame_configure(self, event):
-        self.img_canvas.configure(scrollregion=self.img_canvas.bbox("all"))
-
     def on_mousewheel(self, event):
         self.img_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
 
     def show_progress_window(self, total):
         """Show progress window using common component"""
-        self.progress_window.show(total, "Initializing Duplicate Detection...")
+        self.progress_prefix = None
+        self.progress_window.show(total, "Initializing Duplicate Detection...", on_render=self._mirror_progress)
 
     def update_progress(self, current, total, status_text, detail_text=""):
-        """Update progress window using common component"""
-        self.progress_window.update(current, total, status_text, detail_text)
+        """Report progress from any thread; the progress window polls it on the main thread"""
+        self.progress_window.report(current, total, status_text, detail_text)
+
+    def _mirror_progress(self, snapshot):
+        """Repeat the current phase's counters in the status bar on each progress redraw"""
+        if self.progress_prefix and snapshot['total'] > 0:
+            percent = int(snapshot['current'] / snapshot['total'] * 100)
+            self.status_bar.set_text(f"{self.progress_prefix}: {snapshot['current']}/{snapshot['total']} ({percent}%)")
 
     def close_progress(self):
         """Close progress window using common component"""
@@ -367,7 +338,7 @@ class DuplicateImageIdentifierApp:
     
     def regroup_duplicates(self):
         """Re-group duplicates using the current threshold without re-extracting embeddings"""
-        if not self.embeddings or not self.files:
+        if self.similarity_graph is None and not self.embeddings:
             messagebox.showinfo("No Data", "Please scan a folder first before re-grouping.")
             return
         
@@ -388,31 +359,35 @@ class DuplicateImageIdentifierApp:
         import threading
         def process():
             try:
-                from DuplicateImageIdentifier import group_similar_images_clip
+                from DuplicateImageIdentifier import build_similarity_graph, build_hash_similarity_graph
                 
                 # Update status bar
                 self.root.after(0, self.status_bar.set_text, f"Re-grouping duplicates at {threshold_percent}% similarity...")
                 
                 # Define progress callback for duplicate detection
                 def duplicate_progress_callback(current, total_imgs, status_text, detail_text):
-                    self.root.after(0, self.update_progress, current, total_imgs, status_text, detail_text)
-                    percent = int((current / total_imgs) * 100) if total_imgs > 0 else 100
-                    status_bar_text = f"Re-grouping: {current}/{total_imgs} ({percent}%)"
-                    self.root.after(0, self.status_bar.set_text, status_bar_text)
+                    self.progress_prefix = "Re-grouping"
+                    self.update_progress(current, total_imgs, status_text, detail_text)
                 
-                # Re-group using cached embeddings with new threshold
-                result = group_similar_images_clip(folder=self.folder, threshold=threshold, 
-                                                 embeddings=self.embeddings, files=self.files, 
-                                                 progress_callback=duplicate_progress_callback, 
-                                                 return_scores=True)
-                if isinstance(result, tuple):
-                    self.groups, self.similarity_scores = result
-                else:
-                    # Fallback for older version
-                    self.groups = result
-                    self.similarity_scores = {}
+                # Re-group from the precomputed neighbor graph (one pass over its edges)
+                graph = self.similarity_graph
+                if graph is None or (threshold < graph.min_threshold and self.embeddings):
+                    graph = build_similarity_graph(self.embeddings, self.files, min_threshold=threshold,
+                                                   progress_callback=duplicate_progress_callback,
+                                                   exact_copies=self.exact_copies)
+                    self.similarity_graph = graph
+                elif threshold < graph.min_threshold and self.hashes:
+                    graph = build_hash_similarity_graph(self.files, min_threshold=threshold,
+                                                        progress_callback=duplicate_progress_callback,
+                                                        exact_copies=self.exact_copies, hashes=self.hashes)
+                    self.similarity_graph = graph
+                t0 = time.perf_counter()
+                self.groups, self.similarity_scores = graph.group(
+                    threshold, return_scores=True, progress_callback=duplicate_progress_callback)
+                print(f"[LOG] Re-grouped {total} images in {(time.perf_counter() - t0) * 1000:.1f} ms")
                 
-                # Update final status
+                # Update final status (the status bar stops mirroring progress)
+                self.progress_prefix = None
                 total_duplicates = sum(len(group) - 1 for group in self.groups)
                 final_status = f"Re-grouping Complete! Found {len(self.groups)} images with duplicates (≥{threshold_percent}% similarity)"
                 final_detail = f"Analyzed {total} images - {total_duplicates} total duplicates found"
@@ -437,6 +412,7 @@ class DuplicateImageIdentifierApp:
                 error_msg = f"Error during re-grouping: {str(e)}"
                 print(f"[ERROR] {error_msg}")
                 
+                self.progress_prefix = None
                 self.update_progress(0, total, "Re-grouping Failed", error_msg)
                 
                 # Update status bar with error
@@ -472,63 +448,21 @@ class DuplicateImageIdentifierApp:
         
         return f"{level}\n{percentage:.1f}% Similarity\n\n{description}"
 
-    def get_cached_thumbnail(self, img_path, thumb_size):
-        """Get cached thumbnail or create and cache new one with LRU management"""
-        # Create unique cache key based on path and size
-        cache_key = f"{img_path}_{thumb_size[0]}x{thumb_size[1]}"
-        
-        # Check if image is in cache
-        if cache_key in self.image_cache:
-            self.cache_stats['hits'] += 1
-            # Move to end for LRU management
-            self.cache_access_order.remove(cache_key)
-            self.cache_access_order.append(cache_key)
-            return self.image_cache[cache_key]
-        
-        # Cache miss - load and process image
-        self.cache_stats['misses'] += 1
-        
-        try:
-            # Load and resize image
-            img = Image.open(img_path)
-            img.thumbnail(thumb_size, Image.Resampling.LANCZOS)
-            img_tk = ImageTk.PhotoImage(img)
-            
-            # Manage cache size with LRU eviction
-            if len(self.image_cache) >= self.max_cache_size:
-                # Remove oldest entries (LRU)
-                evict_count = max(1, self.max_cache_size // 10)  # Remove 10% when full
-                for _ in range(evict_count):
-                    if self.cache_access_order:
-                        oldest_key = self.cache_access_order.pop(0)
-                        if oldest_key in self.image_cache:
-                            del self.image_cache[oldest_key]
-                            self.cache_stats['evictions'] += 1
-            
-            # Cache the result
-            self.image_cache[cache_key] = img_tk
-            self.cache_access_order.append(cache_key)
-            return img_tk
-            
-        except Exception as e:
-            print(f"Error loading image {img_path}: {e}")
-            return None
-    
     def clear_image_cache(self):
         """Clear the image cache and reset statistics"""
-        self.image_cache.clear()
-        self.cache_access_order.clear()
-        print(f"Cache cleared. Stats - Hits: {self.cache_stats['hits']}, Misses: {self.cache_stats['misses']}, Evictions: {self.cache_stats['evictions']}")
-        self.cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        stats = self.thumbnails.cache.get_stats()
+        self.thumbnails.clear()
+        print(f"Cache cleared. Stats - Hits: {stats['hits']}, Misses: {stats['misses']}, Evictions: {stats['evictions']}")
+        self.thumbnails.cache.reset_stats()
     
     def print_cache_stats(self):
         """Print current cache statistics for performance monitoring"""
-        total_requests = self.cache_stats['hits'] + self.cache_stats['misses']
-        if total_requests > 0:
-            hit_rate = (self.cache_stats['hits'] / total_requests) * 100
-            print(f"Cache Stats - Size: {len(self.image_cache)}, Hit Rate: {hit_rate:.1f}%, Hits: {self.cache_stats['hits']}, Misses: {self.cache_stats['misses']}, Evictions: {self.cache_stats['evictions']}")
+        stats = self.thumbnails.cache.get_stats()
+        size = f"{stats['entries']} ({stats['bytes'] / (1024 * 1024):.1f} MB)"
+        if stats['hits'] + stats['misses'] > 0:
+            print(f"Cache Stats - Size: {size}, Hit Rate: {stats['hit_rate']:.1f}%, Hits: {stats['hits']}, Misses: {stats['misses']}, Evictions: {stats['evictions']}")
         else:
-            print(f"Cache Stats - Size: {len(self.image_cache)}, No requests yet")
+            print(f"Cache Stats - Size: {size}, No requests yet")
     
     def update_duplications_label(self):
         """Update the duplications label with the current group count"""
@@ -580,31 +514,23 @@ class DuplicateImageIdentifierApp:
             # Clear tree
             self.tree.delete(*self.tree.get_children())
             
-            # Clear image panel
-            for widget in self.img_panel.winfo_children():
-                widget.destroy()
+            # Clear image grid
+            self.clear_image_grid()
             
             # Clear any previous scan data
             self.groups = []
             self.embeddings = {}
+            self.hashes = {}
             self.files = []
+            self.similarity_graph = None
+            self.exact_copies = {}
             self.similarity_scores = {}
             
             # Hide re-group button until scan completes
             self.regroup_btn.pack_forget()
             
-            # Count image files (excluding Trash folder)
-            files = []
-            for dp, dn, filenames in os.walk(folder):
-                # Skip the Trash directory and its subdirectories
-                if "Trash" in dp.split(os.sep):
-                    continue
-                    
-                # Add valid images to the list
-                for f in filenames:
-                    if os.path.splitext(f)[1].lower() in IMG_EXT:
-                        files.append(os.path.join(dp, f))
-            total = len(files)
+            # Count image files (one walk, Trash folder pruned)
+            total = len(scan_image_files(folder, IMG_EXT))
             
             if total == 0:
                 self.status_bar.set_text("No images found in selected folder")
@@ -624,17 +550,8 @@ class DuplicateImageIdentifierApp:
             messagebox.showerror("Error", "Please select a folder first.")
             return
         
-        # Get all image files (excluding Trash folder)
-        files = []
-        for dp, dn, filenames in os.walk(self.folder):
-            # Skip the Trash directory and its subdirectories
-            if "Trash" in dp.split(os.sep):
-                continue
-                
-            # Add valid images to the list
-            for f in filenames:
-                if os.path.splitext(f)[1].lower() in IMG_EXT:
-                    files.append(os.path.join(dp, f))
+        # Get all image files (one walk, Trash folder pruned)
+        files = scan_image_files(self.folder, IMG_EXT).files
         total = len(files)
         
         if total == 0:
@@ -642,78 +559,83 @@ class DuplicateImageIdentifierApp:
             messagebox.showinfo("No Images", "No images found in the selected folder.")
             return
         
-        # Clear image panel
-        for widget in self.img_panel.winfo_children():
-            widget.destroy()
+        # Clear image grid
+        self.clear_image_grid()
         
         # Show progress window
         self.show_progress_window(total)
         
         # Get the threshold value from slider
         threshold = self.threshold_var.get()
+        fast_mode = self.fast_mode_var.get()
         
         # Process in thread
         import threading
         def process():
             try:
-                from DuplicateImageIdentifier import get_clip_embedding_batch, group_similar_images_clip
-                embeddings = {}
-                batch_size = 64
+                from DuplicateImageIdentifier import (get_clip_embeddings_cached, build_similarity_graph,
+                                                      build_hash_similarity_graph, find_exact_duplicates,
+                                                      split_exact_duplicates, prune_scan_caches,
+                                                      MIN_GROUPING_THRESHOLD, HASH_GRAPH_MIN_THRESHOLD)
+                from PerceptualHash import compute_hashes_batch
                 
-                # Process images in batches
-                for start in range(0, total, batch_size):
-                    end = min(start + batch_size, total)
-                    batch_files = files[start:end]
-                    percent = int((end/total)*100) if total else 100
-                    
-                    print(f"[LOG] Processing images {start+1}-{end}/{total} ({percent}%)")
-                    
-                    # Update progress window and status bar
-                    status_text = f"Processing Images ({percent}%)"
-                    detail_text = f"Analyzing batch {start+1}-{end} of {total} images..."
-                    self.update_progress(end, total, status_text, detail_text)
-                    
-                    # Update status bar
-                    status_bar_text = f"Processing images {start+1}-{end}/{total} ({percent}%)"
-                    self.root.after(0, self.status_bar.set_text, status_bar_text)
-                    
-                    try:
-                        batch_embeddings = get_clip_embedding_batch(batch_files)
-                        for f, emb in zip(batch_files, batch_embeddings):
-                            embeddings[f] = emb
-                    except Exception as e:
-                        print(f"Error processing batch {start}-{end}: {e}")
-                        continue
+                # Cached embeddings/digests of unchanged files are reused; drop deleted ones
+                prune_scan_caches(self.folder, files)
+                
+                def embedding_progress_callback(current, total_imgs, status_text, detail_text):
+                    print(f"[LOG] {status_text} - {detail_text}")
+                    self.progress_prefix = "Processing images"
+                    self.update_progress(current, total_imgs, status_text, detail_text)
+                
+                # Byte-identical copies are matched by hash; only one of each goes to CLIP
+                exact_groups = find_exact_duplicates(files, progress_callback=embedding_progress_callback)
+                clip_files, exact_copies = split_exact_duplicates(files, exact_groups)
+                
+                if fast_mode:
+                    embeddings = {}
+                    self.hashes = compute_hashes_batch(clip_files, progress_callback=embedding_progress_callback)
+                    scanned_files = clip_files
+                else:
+                    # Cached embeddings are reused; only new or changed images go through the model
+                    embeddings = get_clip_embeddings_cached(clip_files, batch_size=64,
+                                                            progress_callback=embedding_progress_callback)
+                    scanned_files = [f for f in clip_files if f in embeddings]
                 
                 # Store embeddings and files for re-grouping
                 self.embeddings = embeddings
-                self.files = files
+                self.files = scanned_files
+                self.exact_copies = exact_copies
                 
                 # Update progress for duplicate detection phase
+                self.progress_prefix = None
                 self.update_progress(total, total, "Identifying Duplicates...", 
                                    "Comparing image similarities and grouping duplicates...")
                 self.root.after(0, self.status_bar.set_text, "Identifying duplicate groups...")
                 
                 # Define progress callback for duplicate detection
                 def duplicate_progress_callback(current, total_imgs, status_text, detail_text):
-                    self.root.after(0, self.update_progress, current, total_imgs, status_text, detail_text)
-                    percent = int((current / total_imgs) * 100) if total_imgs > 0 else 100
-                    status_bar_text = f"Identifying duplicates: {current}/{total_imgs} ({percent}%)"
-                    self.root.after(0, self.status_bar.set_text, status_bar_text)
+                    self.progress_prefix = "Identifying duplicates"
+                    self.update_progress(current, total_imgs, status_text, detail_text)
                 
-                # Get groups and similarity scores with user-specified threshold
-                result = group_similar_images_clip(folder=self.folder, threshold=threshold, 
-                                                 embeddings=embeddings, files=files, 
-                                                 progress_callback=duplicate_progress_callback, 
-                                                 return_scores=True)
-                if isinstance(result, tuple):
-                    self.groups, self.similarity_scores = result
+                # Build the neighbor graph once down to the slider minimum so that
+                # later threshold changes only need a single pass over its edges.
+                # Hash graphs stop where the multi-index search does; re-grouping
+                # below that rebuilds from the stored hashes.
+                if fast_mode:
+                    self.similarity_graph = build_hash_similarity_graph(
+                        scanned_files, min_threshold=min(HASH_GRAPH_MIN_THRESHOLD, threshold),
+                        progress_callback=duplicate_progress_callback,
+                        exact_copies=exact_copies, hashes=self.hashes)
                 else:
-                    # Fallback for older version
-                    self.groups = result
-                    self.similarity_scores = {}
+                    self.similarity_graph = build_similarity_graph(
+                        embeddings, scanned_files, min_threshold=min(MIN_GROUPING_THRESHOLD, threshold),
+                        progress_callback=duplicate_progress_callback,
+                        exact_copies=exact_copies)
+                self.groups, self.similarity_scores = self.similarity_graph.group(
+                    threshold, return_scores=True, progress_callback=duplicate_progress_callback)
                 
-                # Update final status
+                # Update final status (the status bar stops mirroring progress)
+                self.progress_prefix = None
                 total_duplicates = sum(len(group) - 1 for group in self.groups)
                 threshold_percent = int(threshold * 100)
                 final_status = f"Complete! Found {len(self.groups)} images with duplicates (≥{threshold_percent}% similarity)"
@@ -742,6 +664,7 @@ class DuplicateImageIdentifierApp:
                 error_msg = f"Error during processing: {str(e)}"
                 print(f"[ERROR] {error_msg}")
                 
+                self.progress_prefix = None
                 self.update_progress(0, total, "Processing Failed", error_msg)
                 
                 # Update status bar with error
@@ -839,14 +762,6 @@ class DuplicateImageIdentifierApp:
                 print(f"[DEBUG] on_tree_select: No selection - {time.perf_counter() - start_time:.3f}s")
                 return
         
-            # Clear previous images and selection tracking
-            step_start = time.perf_counter()
-            widgets_to_destroy = self.img_panel.winfo_children()
-            for widget in widgets_to_destroy:
-                widget.destroy()
-            self.selected_check_vars.clear()  # Clear checkbox tracking
-            print(f"[DEBUG] on_tree_select: Cleared {len(widgets_to_destroy)} widgets - {time.perf_counter() - step_start:.3f}s")
-            
             # Handle both single and multiple selection with unified method
             step_start = time.perf_counter()
             print(f"[DEBUG] on_tree_select: About to call display_groups with {len(selected)} items")
@@ -860,11 +775,6 @@ class DuplicateImageIdentifierApp:
             
             # Update Select All button text
             self.update_select_all_button_text()
-            
-            # Update scroll region
-            step_start = time.perf_counter()
-            self.root.after(10, lambda: self.img_canvas.configure(scrollregion=self.img_canvas.bbox("all")))
-            print(f"[DEBUG] on_tree_select: Scheduled scroll update - {time.perf_counter() - step_start:.3f}s")
         
             total_time = time.perf_counter() - start_time
             print(f"[DEBUG] on_tree_select: COMPLETE - Total time: {total_time:.3f}s")
@@ -872,248 +782,90 @@ class DuplicateImageIdentifierApp:
         finally:
             self._tree_select_processing = False
     
-    def display_groups(self, selected_items, force_page=False):
-        """Unified method to display images from single or multiple selected groups with group-based paging support"""
+    def display_groups(self, selected_items, keep_position=False):
+        """
+        Show the images of the selected groups in the image grid.
+
+        One group fills the grid; several groups are shown one after another,
+        each under a header row. Only the cards in view are built, so any
+        number of groups is one continuous scroll.
+        """
         import time
         start_time = time.perf_counter()
         print(f"[DEBUG] display_groups: Starting with {len(selected_items)} selected items")
         
-        is_single_group = len(selected_items) == 1
-        
-        # Choose appropriate thumbnail size and layout
-        thumb_size = self.thumb_size if is_single_group else self.multi_thumb_size
-        
         # Collect all groups with their images from selected items
-        if not force_page:
-            self.current_display_groups = []  # Reset the list - now stores groups instead of individual images
-            self.current_page = 0  # Reset to first page
-            
-            for item_id in selected_items:
-                item = self.tree.item(item_id)
-                
-                # Skip if not a group node or if it's a placeholder
-                if ('values' in item and item['values']) or "No duplicates found" in item['text'] or "Select a folder" in item['text']:
-                    continue
-                
-                # Get group name
-                group_name = item['text']
-                
-                # Get images for this group
-                children = self.tree.get_children(item_id)
-                group_images = []
-                
-                for child in children:
-                    child_item = self.tree.item(child)
-                    if 'values' in child_item and child_item['values']:
-                        img_path = child_item['values'][0]
-                        group_images.append(img_path)
-                
-                # Store the entire group as one unit
-                if group_images:
-                    self.current_display_groups.append({
-                        'name': group_name,
-                        'images': group_images
-                    })
-        
-        # Calculate page slice - now paginating by groups, not images
-        start_idx = self.current_page * self.page_size
-        end_idx = min(start_idx + self.page_size, len(self.current_display_groups))
-        page_groups = self.current_display_groups[start_idx:end_idx]
-        
-        # Update pagination controls
-        self.update_page_controls()
-        
-        # Now display the groups on current page
-        current_row = 0
-        total_images = 0
-        
-        for group_data in page_groups:
-            group_name = group_data['name']
-            img_paths = group_data['images']
+        self.current_display_groups = []
+        for item_id in selected_items:
+            item = self.tree.item(item_id)
             
-            # Create group header (only for multiple groups or when showing headers)
-            show_header = not is_single_group or len(self.current_display_groups) > 1
-            if show_header:
-                group_header = tk.Frame(self.img_panel, bg=self.colors['bg_secondary'], height=40)
-                group_header.grid(row=current_row, column=0, columnspan=10, sticky='ew', padx=5, pady=(5, 0))
-                group_header.grid_propagate(False)
-                
-                header_label = tk.Label(group_header, 
-                                       text=f"{group_name}", 
-                                       font=("Segoe UI", 12, "bold"),
-                                       bg=self.colors['bg_secondary'],
-                                       fg=self.colors['text_primary'])
-                header_label.pack(side=tk.LEFT, padx=10, pady=8)
-                
-                current_row += 1
+            # Skip if not a group node or if it's a placeholder
+            if ('values' in item and item['values']) or "No duplicates found" in item['text'] or "Select a folder" in item['text']:
+                continue
             
-            # Load thumbnails for this group
+            # Get images for this group
             group_images = []
-            for img_path in img_paths:
-                img_tk = self.get_cached_thumbnail(img_path, thumb_size)
-                if img_tk:
-                    group_images.append((img_tk, img_path))
+            for child in self.tree.get_children(item_id):
+                child_item = self.tree.item(child)
+                if 'values' in child_item and child_item['values']:
+                    group_images.append(child_item['values'][0])
             
-            # Display images with appropriate layout
             if group_images:
-                if is_single_group:
-                    # Grid layout for single group (better space utilization)
-                    self.display_images_in_grid(group_images, current_row)
-                else:
-                    # Row layout for multiple groups
-                    self.display_images_in_row(group_images, current_row)
-                
-                total_images += len(group_images)
-                current_row += 1
+                self.current_display_groups.append({'name': item['text'], 'images': group_images})
+        
+        # Files known to be unreadable are skipped; the rest show placeholders
+        # until their thumbnails are decoded
+        thumb_size = self.current_thumb_size()
+        items, sections = [], []
+        for group_data in self.current_display_groups:
+            group_images = [p for p in group_data['images'] if not self.thumbnails.failed(p, thumb_size)]
+            if group_images:
+                items.extend(group_images)
+                sections.append((group_data['name'], len(group_images)))
+        
+        if tuple(self.image_grid.thumb_size) != tuple(thumb_size):
+            self.image_grid.set_thumb_size(thumb_size)
+        # A single group needs no header
+        self.image_grid.set_items(items, keep_position=keep_position,
+                                  sections=sections if len(self.current_display_groups) > 1 else None)
         
         # Update status
-        step_start = time.perf_counter()
         total_all_groups = len(self.current_display_groups)
         total_all_images = sum(len(g['images']) for g in self.current_display_groups)
-        
-        if is_single_group:
+        if total_all_groups == 1:
             self.status_bar.set_text(f"Viewing duplicate group with {total_all_images} images")
         else:
-            if total_all_groups > self.page_size:
-                displayed_groups = len(page_groups)
-                self.status_bar.set_text(f"Page {self.current_page + 1} - Showing {displayed_groups} of {total_all_groups} groups ({total_images} of {total_all_images} images)")
-            else:
-                self.status_bar.set_text(f"Viewing {total_all_groups} groups with {total_all_images} images")
-        print(f"[DEBUG] display_groups: Updated status bar - {time.perf_counter() - step_start:.3f}s")
+            self.status_bar.set_text(f"Viewing {total_all_groups} groups with {total_all_images} images")
         
         total_time = time.perf_counter() - start_time
-        print(f"[DEBUG] display_groups: COMPLETE - Total images: {total_images}, Total time: {total_time:.3f}s")
+        print(f"[DEBUG] display_groups: COMPLETE - Total images: {len(items)}, Total time: {total_time:.3f}s")
     
-    def display_images_in_grid(self, group_images, start_row):
-        """Display images in a grid layout (for single group selection)"""
-        canvas_width = self.img_canvas.winfo_width() or 800
-        cols = max(1, (canvas_width - 40) // 200)
-        
-        for idx, (img_tk, img_path) in enumerate(group_images):
-            row = start_row + (idx // cols)
-            col = idx % cols
-            
-            self.create_image_card(img_tk, img_path, row, col, is_grid=True)
+    def current_thumb_size(self):
+        """Thumbnail size for the current view: larger for a single group"""
+        return self.thumb_size if len(self.current_display_groups) <= 1 else self.multi_thumb_size
     
-    def display_images_in_row(self, group_images, row):
-        """Display images in a single row layout (for multiple group selection)"""
-        images_frame = tk.Frame(self.img_panel, bg=self.colors['bg_primary'])
-        images_frame.grid(row=row, column=0, columnspan=10, sticky='ew', padx=1, pady=1)
-        
-        for col, (img_tk, img_path) in enumerate(group_images):
-            self.create_image_card(img_tk, img_path, 0, col, parent=images_frame, is_grid=False)
+    def clear_image_grid(self):
+        """Remove every card from the image grid"""
+        self.current_display_groups = []
+        self.image_grid.set_items([])
     
-    def create_image_card(self, img_tk, img_path, row, col, parent=None, is_grid=True):
-        """Create a unified image card with canvas, checkbox, and similarity score"""
-        if parent is None:
-            parent = self.img_panel
-            
-        # Create image card
-        card = tk.Frame(parent, 
-                       bg=self.colors['bg_card'], 
-                       bd=0,
-                       highlightbackground=self.colors['bg_secondary'],
-                       highlightthickness=1,
-                       relief=tk.SOLID)
-        
-        if is_grid:
-            card.grid(row=row, column=col, padx=1, pady=1, sticky='nsew')
-        else:
-            card.grid(row=row, column=col, padx=1, pady=1, sticky='nsew')
-        
-        # Image container
-        padding = 1 if is_grid else 1
-        img_container = tk.Frame(card, bg=self.colors['bg_card'])
-        img_container.pack(fill=tk.BOTH, expand=True, padx=padding, pady=padding)
-        
-        # Canvas for image with overlay support
-        img_canvas = tk.Canvas(img_container, 
-                             width=img_tk.width(), 
-                             height=img_tk.height(),
-                             bg=self.colors['bg_card'], 
-                             highlightthickness=0, bd=0)
-        img_canvas.pack()
-        
-        # Draw image on canvas
-        img_canvas.create_image(0, 0, anchor=tk.NW, image=img_tk)
-        img_canvas.image = img_tk  # Keep reference
-        
-        # Store canvas reference for overlay updates
-        setattr(img_canvas, 'img_path', img_path)
-        
-        # Add double-click to open full image
-        img_canvas.bind('<Double-Button-1>', lambda e, path=img_path: self.open_full_image(path))
-        
-        # Info section for checkbox and similarity score
-        info_frame = tk.Frame(img_container, bg=self.colors['bg_card'])
-        info_frame.pack(fill=tk.X, pady=(5 if is_grid else 3, 0))
-        
-        # Checkbox and filename
-        var = tk.BooleanVar()
-        filename = os.path.basename(img_path)
-        max_length = 18 if is_grid else 12
-        truncate_length = 15 if is_grid else 9
-        
-        if len(filename) > max_length:
-            display_filename = filename[:truncate_length] + "..."
+    def describe_card(self, path):
+        """Info line for a thumbnail card: similarity to the group, colored by strength"""
+        if path not in self.similarity_scores:
+            return "", self.colors['text_secondary'], ""
+        similarity = self.similarity_scores[path]
+        
+        # Color code based on similarity
+        if similarity >= 0.98:
+            sim_color = self.colors['success']
+        elif similarity >= 0.96:
+            sim_color = self.colors['accent']
+        elif similarity >= 0.95:
+            sim_color = self.colors['warning']
         else:
-            display_filename = filename
-        
-        font_size = 9 if is_grid else 8
-        chk = tk.Checkbutton(info_frame,
-                           text=display_filename,
-                           variable=var,
-                           command=lambda v=var, p=img_path: self.on_image_check(v, p),
-                           font=("Segoe UI", font_size, "bold"),
-                           bg=self.colors['bg_card'],
-                           fg=self.colors['text_primary'],
-                           activebackground=self.colors['bg_card'],
-                           selectcolor=self.colors['accent'],
-                           bd=0, highlightthickness=0,
-                           anchor="w")
-        chk.pack(fill=tk.X, pady=(0, 2 if is_grid else 1))
-        
-        # Similarity score with color coding
-        if img_path in self.similarity_scores:
-            similarity = self.similarity_scores[img_path]
-            sim_text = f"Similarity: {similarity:.0%}" if is_grid else f"Similarity: {similarity:.0%}"
-            
-            # Color code based on similarity
-            if similarity >= 0.98:
-                sim_color = self.colors['success']
-            elif similarity >= 0.96:
-                sim_color = self.colors['accent']
-            elif similarity >= 0.95:
-                sim_color = self.colors['warning']
-            else:
-                sim_color = self.colors['danger']
-            
-            sim_font_size = 8 if is_grid else 7
-            sim_label = tk.Label(info_frame,
-                               text=sim_text,
-                               font=("Segoe UI", sim_font_size),
-                               bg=self.colors['bg_card'],
-                               fg=sim_color,
-                               anchor="w")
-            sim_label.pack(fill=tk.X)
-            
-            # Add tooltip for similarity score
-            tooltip_text = self.get_similarity_tooltip(similarity)
-            ToolTip(sim_label, tooltip_text)
-        
-        # Store checkbox and canvas references
-        self.selected_check_vars.append((var, img_path, img_canvas))
-        
-        # Hover effects
-        def on_enter(e, card=card):
-            card.configure(highlightbackground=self.colors['accent'], highlightthickness=2)
+            sim_color = self.colors['danger']
         
-        def on_leave(e, card=card):
-            card.configure(highlightbackground=self.colors['bg_secondary'], highlightthickness=1)
-        
-        for widget in [card, img_canvas, chk]:
-            widget.bind("<Enter>", on_enter)
-            widget.bind("<Leave>", on_leave)
+        return f"Similarity: {similarity:.0%}", sim_color, self.get_similarity_tooltip(similarity)
 
     def zoom_in(self):
         """Increase thumbnail size for better image viewing"""
@@ -1124,6 +876,7 @@ class DuplicateImageIdentifierApp:
             self.thumb_size = (new_width, new_height)
             # Also scale the multi-group thumbnail size proportionally
             self.multi_thumb_size = (int(new_width * 0.83), int(new_height * 0.89))
+            self.thumbnails.cancel_pending()  # Drop queued work at the old size
             self.refresh_current_view()
             self.update_zoom_controls()
             
@@ -1136,6 +889,7 @@ class DuplicateImageIdentifierApp:
             self.thumb_size = (new_width, new_height)
             # Also scale the multi-group thumbnail size proportionally
             self.multi_thumb_size = (int(new_width * 0.83), int(new_height * 0.89))
+            self.thumbnails.cancel_pending()  # Drop queued work at the old size
             self.refresh_current_view()
             self.update_zoom_controls()
             
@@ -1151,106 +905,10 @@ class DuplicateImageIdentifierApp:
         # Use common zoom controls component
         self.zoom_controls.update_controls(can_zoom_in, can_zoom_out, zoom_level)
     
-    def next_page(self):
-        """Navigate to the next page of groups"""
-        if not self.current_display_groups:
-            return
-        
-        next_page = self.current_page + 1
-        if next_page * self.page_size < len(self.current_display_groups):
-            self.current_page = next_page
-            # Disable buttons during update to prevent rapid clicks
-            self.prev_page_btn.config(state=tk.DISABLED)
-            self.next_page_btn.config(state=tk.DISABLED)
-            
-            # Clear and redisplay with new page
-            widgets_to_destroy = self.img_panel.winfo_children()
-            for widget in widgets_to_destroy:
-                widget.destroy()
-            self.selected_check_vars.clear()
-            
-            selected = self.tree.selection()
-            self.display_groups(selected, force_page=True)
-            
-            # Update scroll region
-            self.root.after(10, lambda: self.img_canvas.configure(scrollregion=self.img_canvas.bbox("all")))
-            self.update_clean_button_count()
-            self.update_select_all_button_text()
-    
-    def prev_page(self):
-        """Navigate to the previous page of groups"""
-        if not self.current_display_groups:
-            return
-            
-        if self.current_page > 0:
-            self.current_page -= 1
-            # Disable buttons during update to prevent rapid clicks
-            self.prev_page_btn.config(state=tk.DISABLED)
-            self.next_page_btn.config(state=tk.DISABLED)
-            
-            # Clear and redisplay with new page
-            widgets_to_destroy = self.img_panel.winfo_children()
-            for widget in widgets_to_destroy:
-                widget.destroy()
-            self.selected_check_vars.clear()
-            
-            selected = self.tree.selection()
-            self.display_groups(selected, force_page=True)
-            
-            # Update scroll region
-            self.root.after(10, lambda: self.img_canvas.configure(scrollregion=self.img_canvas.bbox("all")))
-            self.update_clean_button_count()
-            self.update_select_all_button_text()
-    
-    def update_page_controls(self):
-        """Update pagination control states and labels"""
-        if not self.current_display_groups or len(self.current_display_groups) == 0:
-            self.page_label.config(text="Page 0 of 0")
-            self.prev_page_btn.config(state=tk.DISABLED)
-            self.next_page_btn.config(state=tk.DISABLED)
-            self.page_frame.pack_forget()  # Hide when no groups
-            return
-        
-        # Show pagination controls only if there are multiple pages
-        total_pages = max(1, (len(self.current_display_groups) - 1) // self.page_size + 1)
-        
-        if total_pages > 1:
-            self.page_frame.pack(fill=tk.X, pady=(0, 20))
-            self.page_label.config(text=f"Page {self.current_page + 1} of {total_pages}")
-            
-            # Update button states
-            self.prev_page_btn.config(state=tk.NORMAL if self.current_page > 0 else tk.DISABLED)
-            next_enabled = (self.current_page + 1) * self.page_size < len(self.current_display_groups)
-            self.next_page_btn.config(state=tk.NORMAL if next_enabled else tk.DISABLED)
-        else:
-            self.page_frame.pack_forget()  # Hide pagination for single page
-    
     def refresh_current_view(self):
-        """Refresh the current image view after zoom change"""
-        selected = self.tree.selection()
-        if selected:
-            # Save current checkbox states before refresh
-            checkbox_states = {}
-            for item in self.selected_check_vars:
-                if len(item) >= 2:
-                    var, img_path = item[0], item[1]
-                    checkbox_states[img_path] = var.get()
-            
-            # Clear current display
-            for widget in self.img_panel.winfo_children():
-                widget.destroy()
-            
-            # Clear old canvas references
-            self.selected_check_vars.clear()
-            
-            # Redisplay with new thumbnail sizes using unified method (preserve current page)
-            self.display_groups(selected, force_page=True)
-            
-            # Restore checkbox states and apply cross overlays after UI update
-            self.root.after(50, lambda: self.restore_checkbox_states(checkbox_states))
-                
-            # Update scroll region
-            self.root.after(10, lambda: self.img_canvas.configure(scrollregion=self.img_canvas.bbox("all")))
+        """Re-lay out the current groups after a zoom change; selection and position are kept"""
+        if self.current_display_groups:
+            self.image_grid.set_thumb_size(self.current_thumb_size())
     
     def handle_ctrl_a(self, event=None):
         """Handle Ctrl+A in tree view to select all groups"""
@@ -1278,8 +936,8 @@ class DuplicateImageIdentifierApp:
         
     def select_all_groups(self):
         """Smart select: when images are displayed, selects only duplicates (keeps originals unchecked)"""
-        # If there are image checkboxes visible, use smart selection
-        if self.selected_check_vars:
+        # If there are images displayed, use smart selection
+        if self.image_grid.items:
             self.toggle_select_all_images()
         else:
             # Otherwise, select all tree items
@@ -1312,14 +970,9 @@ class DuplicateImageIdentifierApp:
         
         try:
             # Check if we have checkbox selections
-            if self.selected_check_vars:
+            if self.image_grid.items:
                 # Use checkbox selections
-                images_to_clean = []
-                for item in self.selected_check_vars:
-                    if len(item) >= 2:
-                        var, img_path = item[0], item[1]
-                    if var.get() and os.path.exists(img_path):
-                        images_to_clean.append(img_path)
+                images_to_clean = [p for p in self.image_grid.selected_paths() if os.path.exists(p)]
                 
                 if not images_to_clean:
                     messagebox.showinfo("No Selection", "Please select images using checkboxes to clean.")
@@ -1403,9 +1056,9 @@ class DuplicateImageIdentifierApp:
             return
             
         # Priority: Use checkbox selections if available, otherwise use tree selection
-        if self.selected_check_vars:
-            # Count selected checkboxes
-            selected_count = sum(1 for var, _, _ in self.selected_check_vars if var.get())
+        if self.image_grid.items:
+            # Count selected checkboxes, including cards scrolled out of view
+            selected_count = self.image_grid.selection_count()
         elif self.tree:
             # Fall back to tree selection count
             selected_count = len(self.tree.selection())
@@ -1414,28 +1067,18 @@ class DuplicateImageIdentifierApp:
             
         self.clean_btn_var.set(f"Clean ({selected_count})")
     
+    def first_images(self):
+        """First image of each group: the originals that Select All leaves unchecked"""
+        return {group[0] for group in self.groups if group}
+    
     def update_select_all_button_text(self):
         """Update the Select All button text based on current selection state"""
         if not hasattr(self, 'select_all_btn_var'):
             return
         
-        # Check if any images are displayed
-        if not self.selected_check_vars:
-            self.select_all_btn_var.set("Select All")
-            return
-        
-        # Create a set of first images (ones to keep) from all groups
-        first_images = set()
-        if hasattr(self, 'groups') and self.groups:
-            for group in self.groups:
-                if group:  # Make sure group is not empty
-                    first_images.add(group[0])  # First image in each group
-        
         # Check if any duplicates are currently selected (excluding first images)
-        duplicates_selected = any(
-            item[0].get() for item in self.selected_check_vars 
-            if len(item) >= 2 and item[1] not in first_images
-        )
+        first_images = self.first_images()
+        duplicates_selected = any(p not in first_images for p in self.image_grid.selected_paths())
         
         # Update button text based on state
         if duplicates_selected:
@@ -1443,87 +1086,24 @@ class DuplicateImageIdentifierApp:
         else:
             self.select_all_btn_var.set("Select All")
     
-    def on_image_check(self, var, img_path):
-        """Handle individual image checkbox selection"""
-        # Skip update if we're doing bulk selection to prevent performance issues
-        if getattr(self, '_updating_bulk_selection', False):
-            return
-            
-        # Update cross overlay on image
-        ImageUtils.update_cross_overlay(self.selected_check_vars, var, img_path, getattr(self, '_trash_icon_cache', None))
-            
-        # Update clean button count based on selected images
-        selected_count = sum(1 for item in self.selected_check_vars 
-                           if len(item) >= 2 and item[0].get())
-        if hasattr(self, 'clean_btn_var'):
-            self.clean_btn_var.set(f"Clean ({selected_count})")
-        
-        # Update Select All button text
+    def on_selection_change(self):
+        """Update the Clean and Select All buttons after the grid's selection changes"""
+        self.update_clean_button_count()
         self.update_select_all_button_text()
     
-    def count_selected_images(self):
-        """Count how many images are currently selected via checkboxes"""
-        return sum(1 for item in self.selected_check_vars 
-                  if len(item) >= 2 and item[0].get())
-    
     def toggle_select_all_images(self):
         """Smart selection: Keep first image in each group unchecked, select duplicates"""
-        if not self.selected_check_vars:
+        if not self.image_grid.items:
             return
         
-        # Create a set of first images (ones to keep) from all groups
-        first_images = set()
-        if hasattr(self, 'groups') and self.groups:
-            for group in self.groups:
-                if group:  # Make sure group is not empty
-                    first_images.add(group[0])  # First image in each group
-        
-        # Check if any duplicates are currently selected (excluding first images)
-        duplicates_selected = any(
-            item[0].get() for item in self.selected_check_vars 
-            if len(item) >= 2 and item[1] not in first_images
-        )
-        
         # If any duplicates are selected, clear all selections
-        # If no duplicates are selected, select all duplicates (but keep first images unchecked)
-        new_state = not duplicates_selected
-        
-        # Temporarily disable callback updates to prevent performance issues
-        self._updating_bulk_selection = True
-        
-        try:
-            # Apply smart selection logic
-            for item in self.selected_check_vars:
-                if len(item) >= 2:
-                    var, img_path = item[0], item[1]
-                    
-                    # If this is a first image (original), always keep it unchecked
-                    if img_path in first_images:
-                        var.set(False)
-                    else:
-                        # This is a duplicate, apply the toggle state
-                        var.set(new_state)
-        finally:
-            # Re-enable callback updates
-            self._updating_bulk_selection = False
-        
-        # Update all cross overlays
-        for item in self.selected_check_vars:
-            if len(item) >= 2:
-                var, img_path = item[0], item[1]
-                ImageUtils.update_cross_overlay(self.selected_check_vars, var, img_path, getattr(self, '_trash_icon_cache', None))
-        
-        # Update clean button once at the end
-        selected_count = self.count_selected_images()
-        if hasattr(self, 'clean_btn_var'):
-            self.clean_btn_var.set(f"Clean ({selected_count})")
-        
-        # Update Select All button text based on new state
-        if hasattr(self, 'select_all_btn_var'):
-            if new_state:
-                self.select_all_btn_var.set("Unselect All")
-            else:
-                self.select_all_btn_var.set("Select All")
+        # If no duplicates are selected, select all duplicates (but keep first images unchecked);
+        # this covers every displayed group, including cards scrolled out of view
+        first_images = self.first_images()
+        if any(p not in first_images for p in self.image_grid.selected_paths()):
+            self.image_grid.set_selected(())
+        else:
+            self.image_grid.set_selected(p for p in self.image_grid.items if p not in first_images)
     
     def refresh_after_clean(self, cleaned_paths):
         """Efficiently refresh UI after cleaning images"""
@@ -1658,56 +1238,42 @@ class DuplicateImageIdentifierApp:
                         # Call display_groups directly instead of on_tree_select to avoid event loops
                         selected = self.tree.selection()
                         if selected:
-                            # Clear previous images
-                            widgets_to_destroy = self.img_panel.winfo_children()
-                            for widget in widgets_to_destroy:
-                                widget.destroy()
-                            self.selected_check_vars.clear()
-                            # Display the selected groups
-                            self.display_groups(selected)
+                            # Display the remaining groups where the user was
+                            self.display_groups(selected, keep_position=True)
                             self.update_clean_button_count()
                             self.update_select_all_button_text()
-                            self.root.after(10, lambda: self.img_canvas.configure(scrollregion=self.img_canvas.bbox("all")))
                         
                         print(f"[DEBUG] Step 10b: Trigger display (direct call) - {time.perf_counter() - step_start:.3f}s")
                     else:
                         # No valid selection, clear image display
-                        img_widgets = self.img_panel.winfo_children()
-                        for widget in img_widgets:
-                            widget.destroy()
-                        self.selected_check_vars.clear()
-                        print(f"[DEBUG] Step 10: Clear display ({len(img_widgets)} widgets cleared) - {time.perf_counter() - step_start:.3f}s")
-                    
-                    # Update scroll region
-                    step_start = time.perf_counter()
-                    self.img_canvas.configure(scrollregion=self.img_canvas.bbox("all"))
-                    print(f"[DEBUG] Step 11: Update scroll region - {time.perf_counter() - step_start:.3f}s")
+                        self.clear_image_grid()
+                        print(f"[DEBUG] Step 10: Clear display - {time.perf_counter() - step_start:.3f}s")
                     
                     # Update clean button count
                     step_start = time.perf_counter()
                     self.update_clean_button_count()
-                    print(f"[DEBUG] Step 12: Update clean button count - {time.perf_counter() - step_start:.3f}s")
+                    print(f"[DEBUG] Step 11: Update clean button count - {time.perf_counter() - step_start:.3f}s")
                     
                     # Update trash count
                     step_start = time.perf_counter()
                     self.trash_manager.update_trash_count()
-                    print(f"[DEBUG] Step 13: Update trash count - {time.perf_counter() - step_start:.3f}s")
+                    print(f"[DEBUG] Step 12: Update trash count - {time.perf_counter() - step_start:.3f}s")
                     
                     # Update duplications label
                     step_start = time.perf_counter()
                     self.update_duplications_label()
-                    print(f"[DEBUG] Step 14: Update duplications label - {time.perf_counter() - step_start:.3f}s")
+                    print(f"[DEBUG] Step 13: Update duplications label - {time.perf_counter() - step_start:.3f}s")
                     
                     # Update status
                     step_start = time.perf_counter()
                     if hasattr(self, 'status_bar'):
                         self.status_bar.set_text(f"Cleaned images. {len(self.groups)} duplicate groups remaining.")
-                    print(f"[DEBUG] Step 15: Update status bar - {time.perf_counter() - step_start:.3f}s")
+                    print(f"[DEBUG] Step 14: Update status bar - {time.perf_counter() - step_start:.3f}s")
 
             # Show modern completion popup - TEMPORARILY DISABLED FOR DEBUGGING
             step_start = time.perf_counter()
             # self.show_clean_completion_popup()  # DISABLED
-            print(f"[DEBUG] Step 16: Show completion popup (SKIPPED) - {time.perf_counter() - step_start:.3f}s")
+            print(f"[DEBUG] Step 15: Show completion popup (SKIPPED) - {time.perf_counter() - step_start:.3f}s")
             
             total_time = time.perf_counter() - start_time
             print(f"[DEBUG] refresh_after_clean COMPLETE - Total time: {total_time:.3f}s")
@@ -1738,33 +1304,6 @@ class DuplicateImageIdentifierApp:
 
 
 
-    def restore_checkbox_states(self, checkbox_states):
-        """Restore checkbox states and cross overlays after refresh"""
-        # Temporarily disable bulk selection flag to allow individual updates
-        self._updating_bulk_selection = True
-        
-        try:
-            # Restore checkbox states
-            for item in self.selected_check_vars:
-                if len(item) >= 2:
-                    var, img_path = item[0], item[1]
-                    if img_path in checkbox_states:
-                        var.set(checkbox_states[img_path])
-        finally:
-            self._updating_bulk_selection = False
-        
-        # Apply cross overlays for checked items
-        for item in self.selected_check_vars:
-            if len(item) >= 2:
-                var, img_path = item[0], item[1]
-                if img_path in checkbox_states and checkbox_states[img_path]:
-                    ImageUtils.update_cross_overlay(self.selected_check_vars, var, img_path, getattr(self, '_trash_icon_cache', None))
-        
-        # Update clean button count
-        selected_count = self.count_selected_images()
-        if hasattr(self, 'clean_btn_var'):
-            self.clean_btn_var.set(f"Clean ({selected_count})")
-
     def open_full_image(self, img_path):
         """Open image in full-size window using common utility"""
         ImageUtils.open_full_image(self.root, img_path)
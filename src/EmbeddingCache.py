@@ -0,0 +1,44 @@
+"""
+Persistent Embedding Cache for PhotoSift
+Stores CLIP image embeddings on disk keyed by (path, size, mtime) so that
+rescanning a library that has barely changed only runs the model on new or
+modified files. Shared by every CLIP-based tool in the process.
+"""
+
+import numpy as np
+
+from SignatureCache import SignatureCache, CacheRegistry
+
+
+class EmbeddingCache(SignatureCache):
+    """SQLite-backed store of float32 embeddings for a single model.
+
+    Args:
+        model_key: Identifies the model and input size the vectors came from;
+            entries from other models are never returned.
+        db_path: Database file. Defaults to embeddings.sqlite in get_cache_dir().
+    """
+
+    TABLE = "embeddings"
+    DB_NAME = "embeddings.sqlite"
+    SCOPE_COLUMN = "model"
+    VALUE_COLUMN = "vector"
+    LABEL = "Embedding cache"
+
+    def __init__(self, model_key, db_path=None):
+        self.model_key = model_key
+        super().__init__(model_key, db_path)
+
+    def _encode(self, embedding):
+        return np.asarray(embedding, dtype=np.float32).tobytes()
+
+    def _decode(self, stored):
+        return np.frombuffer(stored, dtype=np.float32).copy()
+
+
+_caches = CacheRegistry(EmbeddingCache)
+
+
+def get_embedding_cache(model_key):
+    """Return the process-wide EmbeddingCache for a model, creating it on first use"""
+    return _caches.get(model_key)
@@ -0,0 +1,105 @@
+"""
+File Discovery for PhotoSift
+One os.scandir walk per scan: Trash folders are pruned before descending,
+extensions are matched case-insensitively in a single pass, and the stat
+result of every image is kept in a FileManifest that the detectors, caches
+and GUIs share instead of walking the tree again.
+"""
+
+import os
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.webp'}
+SKIP_DIRS = {'Trash'}
+
+
+class FileManifest:
+    """
+    Image files found under a folder, with their cached (size, mtime_ns).
+
+    Iterating yields paths (str) in walk order. signature() can be passed
+    wherever a file_signature-style lookup is needed to avoid another stat.
+    """
+
+    def __init__(self, root, stats, extensions=None):
+        """
+        Args:
+            root (str): Folder that was scanned
+            stats (dict): path -> (size, mtime_ns), in walk order
+            extensions (set): Lower-case extensions the scan matched, or None if unknown
+        """
+        self.root = root
+        self._stats = stats
+        self.extensions = frozenset(extensions) if extensions is not None else None
+
+    @property
+    def files(self):
+        """List of image paths in walk order"""
+        return list(self._stats)
+
+    def signature(self, path):
+        """Return the cached (size, mtime_ns) for a path, or None if not in the manifest"""
+        return self._stats.get(path)
+
+    @property
+    def total_bytes(self):
+        return sum(size for size, _ in self._stats.values())
+
+    def filter(self, extensions):
+        """Return a manifest with only the files whose extension is in extensions"""
+        extensions = {e.lower() for e in extensions}
+        if self.extensions is not None:
+            extensions &= self.extensions
+        return FileManifest(self.root, {path: sig for path, sig in self._stats.items()
+                                        if os.path.splitext(path)[1].lower() in extensions}, extensions)
+
+    def __len__(self):
+        return len(self._stats)
+
+    def __iter__(self):
+        return iter(self._stats)
+
+    def __contains__(self, path):
+        return path in self._stats
+
+
+def scan_image_files(folder, extensions=IMAGE_EXTENSIONS, skip_dirs=SKIP_DIRS):
+    """
+    Walk a folder once and collect every image file.
+
+    Directories named in skip_dirs are never entered. Directories that cannot
+    be read are skipped, like os.walk. Symlinked directories are not followed.
+
+    Args:
+        folder (str): Folder to scan
+        extensions (set): Lower-case extensions (with dot) to include
+        skip_dirs (set): Directory names to prune
+
+    Returns:
+        FileManifest: Files in os.walk (top-down) order
+    """
+    extensions = {e.lower() for e in extensions}
+    stats = {}
+    stack = [str(folder)]
+    while stack:
+        current = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in skip_dirs:
+                                subdirs.append(entry.path)
+                        elif os.path.splitext(entry.name)[1].lower() in extensions:
+                            # On Windows scandir already holds the stat data
+                            st = entry.stat()
+                            stats[entry.path] = (st.st_size, st.st_mtime_ns)
+                    except OSError:
+                        continue
+        except OSError as e:
+            print(f"[WARN] Cannot read folder {current}: {e}")
+            continue
+        # Reverse so subdirectories are visited in listing order
+        stack.extend(reversed(subdirs))
+    return FileManifest(str(folder), stats, extensions)
+
@@ -1,43 +1,13 @@
 import os, glob, time, sys
 from pathlib import Path
 
-import torch, numpy as np
+import numpy as np
 from PIL import Image
-from transformers import CLIPModel, CLIPProcessor
-
-device = "cuda" if torch.cuda.is_available() else "cpu"
-
-def get_model_path():
-    # Check if running in PyInstaller bundle
-    if getattr(sys, 'frozen', False):
-        base_path = sys._MEIPASS
-        model_path = os.path.join(base_path, 'models', 'clip-vit-base-patch32')
-    else:
-        # First check if we have local model files
-        local_path = os.path.join('models', 'clip-vit-base-patch32')
-        if os.path.exists(local_path):
-            model_path = local_path
-        else:
-            # Fall back to downloading from HuggingFace
-            model_path = "openai/clip-vit-base-patch32"
-    return model_path
-
-
-model = None
-processor = None
-
-def load_models():
-    global model, processor
-    if model is None or processor is None:
-        try:
-            model_path = get_model_path()
-            print(f"Loading CLIP from {model_path}")
-            model = CLIPModel.from_pretrained(model_path).to(device).eval()
-            processor = CLIPProcessor.from_pretrained(model_path)
-        except Exception as e:
-            print(f"Error loading model: {str(e)}")
-            # Raise to let caller handle it
-            raise e
+from ClipModelService import (load_models, get_model_path, encode_images, zero_shot_classify,
+                              prompt_set_key)
+from FileScanner import scan_image_files
+from ImageDecoder import load_resized
+from ScanResultCache import get_result_cache
 
 LABELS = {
     "people": [
@@ -65,14 +35,29 @@ def classify_people_vs_screenshot(path: str):
 def _load_image(path):
     from PIL import Image
     try:
-        img = Image.open(path).convert("RGB")
-        img = img.resize((224, 224), Image.BICUBIC)
-        return img
+        return load_resized(path, (224, 224), resample=Image.BICUBIC)
     except Exception as e:
         print(f"[WARN] Failed to load image: {path} ({e})")
         return None
 
+def get_classification_cache():
+    """Persistent per-file results, keyed by the prompt set so prompt edits invalidate them"""
+    return get_result_cache(f"people-screenshot-{prompt_set_key(LABELS)}")
+
+
 def classify_people_vs_screenshot_batch(paths):
+    # Unchanged files reuse their stored result; only new or modified ones hit the model
+    cache = get_classification_cache()
+    cached, misses = cache.get_many(paths)
+    if misses:
+        computed = dict(zip(misses, _classify_uncached(misses)))
+        cache.put_many((p, r) for p, r in computed.items() if r is not None)
+    else:
+        computed = {}
+    return [tuple(cached[p]) if p in cached else computed[p] for p in paths]
+
+
+def _classify_uncached(paths):
     # Parallel image loading
     from concurrent.futures import ThreadPoolExecutor
     with ThreadPoolExecutor(max_workers=8) as executor:
@@ -80,28 +65,12 @@ def classify_people_vs_screenshot_batch(paths):
     # Filter out failed images (None)
     valid = [(img, path) for img, path in zip(images, paths) if img is not None]
     if not valid:
-        return []
+        return [None] * len(paths)
     images, valid_paths = zip(*valid)
-    texts, owners = [], []
-    for lbl, prompts in LABELS.items():
-        for p in prompts:
-            texts.append(p)
-            owners.append(lbl)
-    
-    # Ensure model is loaded
-    load_models()
     
-    inputs = processor(text=texts, images=list(images), return_tensors="pt", padding=True)
-    inputs = {k: v.to(device) for k, v in inputs.items()}
-    with torch.inference_mode(), torch.autocast(device_type="cuda", dtype=torch.float16, enabled=(device=="cuda")):
-        out = model(**inputs).logits_per_image  # [batch, num_prompts]
-        probs = out.softmax(dim=-1).float().cpu().numpy()  # [batch, num_prompts]
-    owners = np.array(owners)
-    results = []
-    for prob in probs:
-        scores = {lbl: float(prob[owners == lbl].sum()) for lbl in LABELS}
-        pred = max(scores, key=scores.get)
-        results.append((pred, scores[pred], scores))
+    # Only the vision tower runs per batch; prompt embeddings come from the cache
+    image_features = encode_images(images)  # [batch, dim]
+    results = zero_shot_classify(image_features, LABELS)
     # Map results back to original paths, fill skipped with None
     out_results = []
     valid_iter = iter(results)
@@ -124,8 +93,7 @@ def classify_people_vs_screenshot_batch(paths):
 IMG_EXT = {".jpg",".jpeg",".png"}
 def classify_folder(folder: str):
     t0 = time.perf_counter()
-    files = [p for p in glob.glob(os.path.join(folder, "**", "*"), recursive=True)
-             if Path(p).suffix.lower() in IMG_EXT]
+    files = scan_image_files(folder, IMG_EXT).files
     for p in files:
         label, conf, _ = classify_people_vs_screenshot(p)
         print(f"{p} -> {label} ({conf:.3f})")
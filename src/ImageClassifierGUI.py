@@ -11,179 +11,21 @@ from PIL import Image, ImageTk
 
 # Local imports
 from ImageClassification import classify_people_vs_screenshot, IMG_EXT
-from ImageClassification import classify_people_vs_screenshot_batch
+from FileScanner import scan_image_files
+from ImageClassification import classify_people_vs_screenshot_batch, get_classification_cache
 from CommonUI import (ToolTip, ModernColors, ProgressWindow, ModernStyling, 
-                     StatusBar, ZoomControls, ModernButton, ImageUtils, TrashManager, FileOperations)
+                     StatusBar, ZoomControls, ModernButton, ImageUtils, TrashManager, FileOperations,
+                     ImageCache, VirtualGrid)
+from ThumbnailCache import get_thumbnail_cache
+from ThumbnailService import ThumbnailService
 
 class ImageClassifierApp:
     def select_all_photos(self):
-        if not hasattr(self, 'selected_check_vars') or not self.selected_check_vars:
+        if not self.current_paths:
             return
-            
-        # Get current state from first checkbox to determine action
-        first_var = self.selected_check_vars[0][0]
-        new_state = not first_var.get()
-        
-        # Update all checkboxes and overlays
-        for var, path, canvas in self.selected_check_vars:
-            var.set(new_state)
-            ImageUtils.update_cross_overlay(self.selected_check_vars, var, path, self._trash_icon_cache)
-            
-        # Update clean button label
-        self.update_clean_btn_label(self.count_selected_photos())
-
-    def show_selected_thumbnails(self, paths, force_page=False):
-        # Use wait cursor during update
-        self.root.config(cursor="wait")
-        self.thumbs_frame.config(cursor="watch")
-        
-        # Clear previous thumbnails quickly
-        for widget in self.thumbs_frame.winfo_children():
-            widget.destroy()
-        self.thumb_imgs.clear()
-        self.img_panel.pack_forget()
-        self.lbl_result.pack_forget()
-        self.right_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.content_frame.pack(fill=tk.BOTH, expand=True)  # Show the main content frame
-        
-        # Update paths and reset page if needed
-        if not force_page:
-            self.current_paths = paths
-            self.current_page = 0
-        
-        # Sort paths by confidence score if they are from a category
-        category_paths = self.current_paths
-        if category_paths and category_paths[0] in self.confidence_scores:
-            category_paths = sorted(category_paths, key=lambda x: self.confidence_scores[x], reverse=True)
-            self.current_paths = category_paths
+        # Covers every photo shown, including cards scrolled out of view
+        self.thumb_grid.set_all_selected(not self.thumb_grid.all_selected())
 
-        # Calculate page slice
-        start_idx = self.current_page * self.page_size
-        end_idx = min(start_idx + self.page_size, len(self.current_paths))
-        page_paths = self.current_paths[start_idx:end_idx]
-        
-        # Update navigation controls
-        self.update_page_controls()
-        
-        # Show thumbnails for current page
-        self.selected_check_vars = []
-        for idx, img_path in enumerate(page_paths):
-            try:
-                thumb_size = (240, 180)
-                cache_key = (img_path, thumb_size)
-                if cache_key in self.image_cache:
-                    img_tk = self.image_cache[cache_key]
-                else:
-                    img = Image.open(img_path)
-                    img.thumbnail(thumb_size, Image.Resampling.LANCZOS)
-                    img_tk = ImageTk.PhotoImage(img)
-                    self.image_cache[cache_key] = img_tk
-                self.thumb_imgs.append(img_tk)
-                
-                # Modern card with rounded corners
-                card = tk.Frame(self.thumbs_frame, bd=0, 
-                               bg=self.colors['bg_card'], 
-                               highlightbackground=self.colors['bg_secondary'], 
-                               highlightthickness=1,
-                               relief=tk.SOLID)
-                card.grid(row=idx//4, column=idx%4, padx=1, pady=1, sticky="nsew")
-                
-                # Configure grid weights for responsive layout
-                self.thumbs_frame.grid_columnconfigure(idx%4, weight=1)
-                
-                # Image container with padding
-                img_container = tk.Frame(card, bg=self.colors['bg_card'])
-                img_container.pack(fill=tk.BOTH, expand=True, padx=12, pady=(12, 8))
-                
-                # Canvas for image with overlay support
-                img_canvas = tk.Canvas(img_container, 
-                                     width=img_tk.width(), 
-                                     height=img_tk.height(),
-                                     bg=self.colors['bg_card'], 
-                                     highlightthickness=0, bd=0)
-                img_canvas.pack()
-                
-                # Draw image on canvas
-                img_canvas.create_image(0, 0, anchor=tk.NW, image=img_tk)
-                img_canvas.image = img_tk  # Keep reference
-                
-                # Store canvas reference for overlay updates
-                setattr(img_canvas, 'img_path', img_path)
-                
-                # Add double-click to open full image
-                img_canvas.bind('<Double-Button-1>', lambda e, p=img_path: self.open_full_image(p))
-                
-                # Modern hover effects
-                def on_enter(ev, c=card):
-                    c.config(highlightbackground=self.colors['accent'], highlightthickness=2)
-                def on_leave(ev, c=card):
-                    c.config(highlightbackground=self.colors['bg_secondary'], highlightthickness=1)
-                
-                card.bind("<Enter>", on_enter)
-                card.bind("<Leave>", on_leave)
-                img_canvas.bind("<Enter>", on_enter)
-                img_canvas.bind("<Leave>", on_leave)
-                
-                # Info section at bottom
-                info_frame = tk.Frame(card, bg=self.colors['bg_card'])
-                info_frame.pack(fill=tk.X, padx=12, pady=(0, 12))
-                
-                # Checkbox and filename
-                var = tk.BooleanVar()
-                filename = os.path.basename(img_path)
-                if len(filename) > 25:
-                    filename = filename[:22] + "..."
-                    
-                chk = tk.Checkbutton(info_frame, 
-                                   text=filename, 
-                                   variable=var,
-                                   command=lambda v=var, p=img_path: self.on_image_check(v, p),
-                                   font=("Segoe UI", 10, "bold"), 
-                                   bg=self.colors['bg_card'],
-                                   fg=self.colors['text_primary'],
-                                   activebackground=self.colors['bg_card'],
-                                   selectcolor=self.colors['accent'], 
-                                   bd=0, highlightthickness=0,
-                                   anchor="w")
-                chk.pack(fill=tk.X, pady=(0, 4))
-                
-                # Confidence score with color coding
-                if img_path in self.confidence_scores:
-                    confidence = self.confidence_scores[img_path]
-                    conf_text = f"Confidence: {confidence:.0%}"
-                    
-                    # Color code based on confidence
-                    if confidence >= 0.9:
-                        conf_color = self.colors['success']
-                    elif confidence >= 0.7:
-                        conf_color = self.colors['accent']
-                    elif confidence >= 0.5:
-                        conf_color = self.colors['warning']
-                    else:
-                        conf_color = self.colors['danger']
-                    
-                    conf_label = tk.Label(info_frame, 
-                                        text=conf_text, 
-                                        font=("Segoe UI", 9),
-                                        bg=self.colors['bg_card'], 
-                                        fg=conf_color,
-                                        anchor="w")
-                    conf_label.pack(fill=tk.X)
-                
-                self.selected_check_vars.append((var, img_path, img_canvas))
-                var.trace_add('write', lambda *args, v=var, p=img_path, c=img_canvas: self.on_image_check(v, p, c))
-            except Exception as e:
-                print(f"Error loading thumbnail: {e}")
-                continue
-        
-        # Update zoom controls
-        self.update_zoom_controls()
-        
-        # Reset cursor and update view
-        self.root.config(cursor="")
-        self.thumbs_frame.config(cursor="")
-        self.thumb_canvas.update_idletasks()
-        self.thumb_canvas.yview_moveto(0)
     def __init__(self, root):
         self.root = root
         self.root.title("PhotoSift - Unwanted Photo Identifier")
@@ -195,12 +37,11 @@ class ImageClassifierApp:
         self.people_images = []
         self.screenshot_images = []
         self.current_list = "all"  # can be "all", "people", "screenshot"
-        self.image_cache = {}  # path -> PhotoImage
+        self.image_cache = ImageCache()  # (path, size) -> PhotoImage, on the shared memory budget
+        # Thumbnails are decoded off the UI thread into the same cache
+        self.thumbnails = ThumbnailService(self.root, cache=self.image_cache)
         self.confidence_scores = {}  # path -> confidence score
-        # Paging variables
-        self.page_size = 50  # images per page
-        self.current_page = 0
-        self.current_paths = []
+        self.current_paths = []  # Paths shown in the thumbnail grid
         
         # Thumbnail size configuration
         self.thumb_size = (240, 180)  # Default size
@@ -210,9 +51,6 @@ class ImageClassifierApp:
         # Cleaning operation flag
         self._cleaning_in_progress = False
         
-        # Trash icon cache for overlay functionality
-        self._trash_icon_cache = {}
-        
         # Use centralized color scheme
         self.colors = ModernColors.get_color_scheme()
         
@@ -555,113 +393,23 @@ class ImageClassifierApp:
         self.right_frame = tk.Frame(main_area, bg=self.colors['bg_primary'])
         self.right_frame.pack(fill=tk.BOTH, expand=True)
 
-        # Modern pagination controls
-        self.page_frame = tk.Frame(self.right_frame, bg=self.colors['bg_primary'], height=50)
-        self.page_frame.pack(fill=tk.X, pady=(0, 20))
-        self.page_frame.pack_propagate(False)
-        
-        # Center container for navigation
-        nav_center = tk.Frame(self.page_frame, bg=self.colors['bg_primary'])
-        nav_center.pack(expand=True)
-        
-        # Modern navigation buttons
-        nav_btn_style = {"font": ("Segoe UI", 12), 
-                        "bg": self.colors['bg_secondary'], 
-                        "fg": self.colors['text_primary'],
-                        "activebackground": self.colors['bg_card'], 
-                        "activeforeground": self.colors['text_primary'],
-                        "bd": 0, "padx": 20, "pady": 8, "cursor": "hand2"}
-        
-        self.prev_page_btn = tk.Button(nav_center, text="← Previous", command=self.prev_page, **nav_btn_style)
-        self.prev_page_btn.pack(side=tk.LEFT, padx=(0, 15))
-        
-        self.page_label = tk.Label(nav_center, text="Page 1 of 5", 
-                                  font=("Segoe UI", 12, "bold"), 
-                                  bg=self.colors['bg_primary'], 
-                                  fg=self.colors['text_primary'])
-        self.page_label.pack(side=tk.LEFT, padx=20)
-        
-        self.next_page_btn = tk.Button(nav_center, text="Next →", command=self.next_page, **nav_btn_style)
-        self.next_page_btn.pack(side=tk.LEFT, padx=(15, 0))
-        
-        self.page_frame.pack_forget()  # Hide initially
-        
         # Main container for thumbnails
         self.content_frame = tk.Frame(self.right_frame, bg=self.colors['bg_primary'])
         self.content_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Modern thumbnail container
-        self.thumb_container = tk.Frame(self.content_frame, bg=self.colors['bg_primary'])
-        self.thumb_container.pack(fill=tk.BOTH, expand=True, padx=20)
+        # Thumbnail grid: only the cards in view are built, so a whole category is one scroll
+        self.thumb_grid = VirtualGrid(self.content_frame, self.colors, self.thumbnails, thumb_size=self.thumb_size,
+                                      describe=self.describe_card, on_open=self.open_full_image,
+                                      on_selection_change=self.on_selection_change)
+        self.thumb_grid.pack(fill=tk.BOTH, expand=True, padx=20)
+        self.thumb_canvas = self.thumb_grid.canvas
         
-        # Modern canvas and scrollbar
-        self.thumb_canvas = tk.Canvas(self.thumb_container, 
-                                     bg=self.colors['bg_primary'], 
-                                     highlightthickness=0, 
-                                     bd=0)
-        
-        # Modern styled scrollbar
-        self.thumb_scrollbar = ttk.Scrollbar(self.thumb_container, 
-                                           orient=tk.VERTICAL, 
-                                           command=self.thumb_canvas.yview,
-                                           style="Modern.Vertical.TScrollbar")
-        self.thumb_canvas.configure(yscrollcommand=self.thumb_scrollbar.set)
-        self.thumb_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.thumb_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        # Create modern thumbs frame
-        self.thumbs_frame = tk.Frame(self.thumb_canvas, bg=self.colors['bg_primary'])
-        self.thumb_canvas.create_window((0,0), window=self.thumbs_frame, anchor="nw")
-        self.thumbs_frame.bind("<Configure>", lambda e: self.thumb_canvas.configure(scrollregion=self.thumb_canvas.bbox("all")))
-        
-        # Simple mouse wheel scrolling
-        def _on_mousewheel(event):
-            self.thumb_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-            
-        self.thumbs_frame.bind("<MouseWheel>", _on_mousewheel)
-        self.thumb_container.bind("<MouseWheel>", _on_mousewheel)
-        self.thumb_canvas.bind("<MouseWheel>", _on_mousewheel)
-        
-        # Enable mouse wheel scrolling with error handling
-        def on_mousewheel(event):
-            try:
-                scroll_amount = -1 if event.delta > 0 else 1
-                self.thumb_canvas.yview_scroll(scroll_amount, "units")
-            except Exception as e:
-                print(f"Scroll error: {str(e)}")
-                
-        # Bind mouse wheel events safely
-        try:
-            self.thumb_canvas.bind_all("<MouseWheel>", on_mousewheel)
-        except Exception as e:
-            print(f"Binding error: {str(e)}")
-        
-        # Enable mouse wheel scrolling
-        def on_mousewheel(event):
-            if event.state == 0:  # No modifier keys
-                # Regular scroll
-                self.thumb_canvas.yview_scroll(-1 * (event.delta // 120), "units")
-            elif event.state == 1:  # Shift key for horizontal scroll
-                # Horizontal scroll
-                self.thumb_canvas.xview_scroll(-1 * (event.delta // 120), "units")
-                
-        # Bind mouse wheel for Windows (MouseWheel) and macOS/Linux (Button-4/Button-5)
-        self.thumb_canvas.bind("<MouseWheel>", on_mousewheel)  # Windows
-        self.thumb_canvas.bind("<Button-4>", lambda e: self.thumb_canvas.yview_scroll(-1, "units"))  # Linux/macOS scroll up
-        self.thumb_canvas.bind("<Button-5>", lambda e: self.thumb_canvas.yview_scroll(1, "units"))   # Linux/macOS scroll down
-        
-        # Also bind the thumbnails frame for better event capture
-        self.thumbs_frame.bind("<MouseWheel>", on_mousewheel)
-        self.thumbs_frame.bind("<Button-4>", lambda e: self.thumb_canvas.yview_scroll(-1, "units"))
-        self.thumbs_frame.bind("<Button-5>", lambda e: self.thumb_canvas.yview_scroll(1, "units"))
+        # Mouse wheel scrolling (Windows/macOS deliver MouseWheel, X11 buttons 4 and 5)
+        self.thumb_canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+        self.thumb_canvas.bind("<Button-4>", lambda e: self.thumb_canvas.yview_scroll(-1, "units"))
+        self.thumb_canvas.bind("<Button-5>", lambda e: self.thumb_canvas.yview_scroll(1, "units"))
         
         self.content_frame.pack_forget()  # Hide initially
-        self.thumbs_frame = tk.Frame(self.thumb_canvas, bg=self.colors['bg_primary'])
-        self.thumb_canvas.create_window((0,0), window=self.thumbs_frame, anchor="nw")
-        # Configure frame for layout updates
-        self.thumbs_frame.bind("<Configure>", lambda e: self.thumb_canvas.configure(scrollregion=self.thumb_canvas.bbox("all")))
-        self.thumb_canvas.bind("<Configure>", self.on_canvas_configure)
-        self.thumb_imgs = []
         self.right_frame.pack_forget()  # Hide initially
 
         # Center frame for single image view
@@ -685,82 +433,21 @@ class ImageClassifierApp:
         # Create status bar using common component
         self.status_bar = StatusBar(self.root, self.colors, "Ready - Select a folder to classify images")
 
-    def on_canvas_configure(self, event=None):
-        # Update scroll region
-        self.thumb_canvas.configure(scrollregion=self.thumb_canvas.bbox("all"))
-        
-        # Only refresh layout if width changed significantly
-        if event and hasattr(self, 'last_width') and abs(event.width - self.last_width) < 50:
-            return
-            
-        self.last_width = event.width if event else self.thumb_canvas.winfo_width()
-        
-        # If we have current paths displayed, refresh the layout
-        if hasattr(self, 'current_paths') and self.current_paths:
-            self.show_selected_thumbnails(self.current_paths, force_page=True)
+    def _on_mousewheel(self, event):
+        if self.thumb_canvas.winfo_exists():
+            self.thumb_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
     
     def show_progress_window(self, total):
-        # Create modern progress window
-        self.progress_window = tk.Toplevel(self.root)
-        self.progress_window.title("Processing Images")
-        self.progress_window.geometry("450x180")
-        self.progress_window.transient(self.root)
-        self.progress_window.grab_set()
-        
-        # Center the progress window
-        window_width = 450
-        window_height = 180
-        screen_width = self.root.winfo_screenwidth()
-        screen_height = self.root.winfo_screenheight()
-        x = (screen_width - window_width) // 2
-        y = (screen_height - window_height) // 2
-        self.progress_window.geometry(f"{window_width}x{window_height}+{x}+{y}")
-        
-        # Modern progress window styling
-        self.progress_window.configure(bg=self.colors['bg_primary'])
-        frame = tk.Frame(self.progress_window, bg=self.colors['bg_primary'], padx=30, pady=25)
-        frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Modern progress label
-        self.progress_label = tk.Label(frame, 
-                                      text="Initializing AI Classification...", 
-                                      font=("Segoe UI", 13, "bold"), 
-                                      bg=self.colors['bg_primary'],
-                                      fg=self.colors['text_primary'])
-        self.progress_label.pack(pady=(0, 15))
-        
-        # Modern progress bar
-        self.progress_var = tk.DoubleVar()
-        style = ttk.Style()
-        style.configure("Modern.Horizontal.TProgressbar", 
-                       thickness=20, 
-                       background=self.colors['accent'],
-                       troughcolor=self.colors['bg_secondary'],
-                       borderwidth=0)
-        self.progress_bar = ttk.Progressbar(frame, 
-                                          style="Modern.Horizontal.TProgressbar", 
-                                          length=390, mode='determinate', 
-                                          maximum=total, variable=self.progress_var)
-        self.progress_bar.pack(pady=(0, 15))
-        
-        # Modern detailed status
-        self.progress_detail = tk.Label(frame, 
-                                       text="", 
-                                       font=("Segoe UI", 11), 
-                                       bg=self.colors['bg_primary'], 
-                                       fg=self.colors['text_secondary'])
-        self.progress_detail.pack()
+        """Show progress window using common component"""
+        self.progress_window.show(total, "Initializing AI Classification...")
 
     def update_progress(self, current, total, status_text, detail_text):
-        if hasattr(self, 'progress_window') and self.progress_window.winfo_exists():
-            self.progress_var.set(current)
-            self.progress_label.config(text=status_text)
-            self.progress_detail.config(text=detail_text)
-            self.progress_window.update_idletasks()
+        """Report progress from any thread; the progress window polls it on the main thread"""
+        self.progress_window.report(current, total, status_text, detail_text)
 
     def close_progress(self):
-        if hasattr(self, 'progress_window') and self.progress_window.winfo_exists():
-            self.progress_window.destroy()
+        """Close progress window using common component"""
+        self.progress_window.close()
 
 
     def select_folder(self):
@@ -776,24 +463,18 @@ class ImageClassifierApp:
             
             self.lbl_folder.config(text=display_path, fg=self.colors['text_primary'])
             self.trash_manager.update_trash_count()  # Update trash count when folder is selected
-            # Walk through directory but exclude Trash folder
-            self.images = []
-            for dp, dn, filenames in os.walk(folder):
-                # Skip the Trash directory and its subdirectories
-                if "Trash" in dp.split(os.sep):
-                    continue
-                    
-                # Add valid images to the list
-                for f in filenames:
-                    if os.path.splitext(f)[1].lower() in IMG_EXT:
-                        self.images.append(os.path.join(dp, f))
+            # Walk the directory once, pruning the Trash folder
+            self.images = scan_image_files(folder, IMG_EXT).files
+            # Forget stored results for files deleted since the last scan
+            get_classification_cache().prune(folder, self.images)
+            get_thumbnail_cache().prune(folder, self.images, IMG_EXT)
             self.people_images = []
             self.screenshot_images = []
             self.image_labels = {}  # path -> label
             total = len(self.images)
             
             # Show progress window
-            self.root.after(0, self.show_progress_window, total)
+            self.show_progress_window(total)
             self.status_bar.set_text(f"Processing 0/{total} images (0%)...")
             self.root.update_idletasks()
 
@@ -809,8 +490,8 @@ class ImageClassifierApp:
                     status_text = f"Processing images... ({percent}%)"
                     detail_text = f"Processing {start+1}-{end} of {total} images"
                     
-                    # Update both progress window and status bar
-                    self.root.after(0, self.update_progress, end, total, status_text, detail_text)
+                    # Update both progress window and status bar (the bar counts finished images)
+                    self.update_progress(start, total, status_text, detail_text)
                     self.root.after(0, self.status_bar.set_text, f"Processing images {start+1}-{end}/{total} ({percent}%)")
                     
                     batch_results = classify_people_vs_screenshot_batch(batch_paths)
@@ -836,7 +517,7 @@ class ImageClassifierApp:
                 people_count = len(self.people_images)
                 screenshot_count = len(self.screenshot_images)
                 final_status = f"Completed! Found {people_count} people and {screenshot_count} screenshots"
-                self.root.after(0, self.update_progress, total, total, "Processing Complete!", final_status)
+                self.update_progress(total, total, "Processing Complete!", final_status)
                 self.root.after(0, self.status_bar.set_text, f"Done processing {total} images. (100%) | People: {people_count} | Screenshot: {screenshot_count}")
                 self.root.after(0, self.status_bar.set_color, "#33cc33", "white")
                 
@@ -897,7 +578,6 @@ class ImageClassifierApp:
                 selected_paths.append(item['values'][0])
         if selected_paths:
             self.center_frame.pack_forget()
-            self.current_page = 0  # Reset to first page
             self.show_selected_thumbnails(selected_paths)
         else:
             # Fallback to single image view if no images selected
@@ -921,36 +601,15 @@ class ImageClassifierApp:
         button.config(bg="#a5d8fa", fg="#ffffff")
         self.root.after(50, lambda: button.config(bg="#e0e6ef", fg="#3a4a63"))
     
-    def next_page(self):
-        if not hasattr(self, 'current_paths') or not self.current_paths:
-            return
-        
-        next_page = self.current_page + 1
-        if next_page * self.page_size < len(self.current_paths):
-            self.current_page = next_page
-            # Disable buttons during update to prevent rapid clicks
-            self.prev_page_btn.config(state=tk.DISABLED)
-            self.next_page_btn.config(state=tk.DISABLED)
-            self.root.after(1, lambda: self.show_selected_thumbnails(self.current_paths, force_page=True))
-    
-    def prev_page(self):
-        if not hasattr(self, 'current_paths') or not self.current_paths:
-            return
-            
-        if self.current_page > 0:
-            self.current_page -= 1
-            # Disable buttons during update to prevent rapid clicks
-            self.prev_page_btn.config(state=tk.DISABLED)
-            self.next_page_btn.config(state=tk.DISABLED)
-            self.root.after(1, lambda: self.show_selected_thumbnails(self.current_paths, force_page=True))
-    
     def zoom_in(self):
         current_width, current_height = self.thumb_size
         new_width = min(int(current_width * 1.1), self.max_thumb_size[0])
         new_height = min(int(current_height * 1.1), self.max_thumb_size[1])
         if (new_width, new_height) != self.thumb_size:
             self.thumb_size = (new_width, new_height)
-            self.show_selected_thumbnails(self.current_paths, force_page=True)
+            self.thumbnails.cancel_pending()  # Drop queued work at the old size; cached sizes stay for zooming back
+            self.update_zoom_controls()
+            self.thumb_grid.set_thumb_size(self.thumb_size)
             
     def zoom_out(self):
         current_width, current_height = self.thumb_size
@@ -958,28 +617,19 @@ class ImageClassifierApp:
         new_height = max(int(current_height * 0.9), self.min_thumb_size[1])
         if (new_width, new_height) != self.thumb_size:
             self.thumb_size = (new_width, new_height)
-            self.show_selected_thumbnails(self.current_paths, force_page=True)
+            self.thumbnails.cancel_pending()  # Drop queued work at the old size; cached sizes stay for zooming back
+            self.update_zoom_controls()
+            self.thumb_grid.set_thumb_size(self.thumb_size)
             
     def update_zoom_controls(self):
         can_zoom_in = self.thumb_size[0] < self.max_thumb_size[0]
         can_zoom_out = self.thumb_size[0] > self.min_thumb_size[0]
         self.zoom_in_btn.config(state=tk.NORMAL if can_zoom_in else tk.DISABLED)
         self.zoom_out_btn.config(state=tk.NORMAL if can_zoom_out else tk.DISABLED)
-    
-    def update_page_controls(self):
-        if not hasattr(self, 'current_paths') or not self.current_paths:
-            self.page_label.config(text="Page 0 of 0")
-            self.prev_page_btn.config(state=tk.DISABLED)
-            self.next_page_btn.config(state=tk.DISABLED)
-            return
-            
-        total_pages = max(1, (len(self.current_paths) - 1) // self.page_size + 1)
-        self.page_label.config(text=f"Page {self.current_page + 1} of {total_pages}")
         
-        # Update button states
-        self.prev_page_btn.config(state=tk.NORMAL if self.current_page > 0 else tk.DISABLED)
-        next_enabled = (self.current_page + 1) * self.page_size < len(self.current_paths)
-        self.next_page_btn.config(state=tk.NORMAL if next_enabled else tk.DISABLED)
+        # Zoom level relative to the default width
+        zoom_level = int((self.thumb_size[0] / 240) * 100)
+        self.zoom_label.config(text=f"Zoom: {zoom_level}%")
     
     def animate_fade(self, widget, start_alpha, end_alpha, steps=10, interval=20):
         # Helper function for fade animation
@@ -1004,181 +654,40 @@ class ImageClassifierApp:
         b = int(b1 + (b2 - b1) * factor)
         return f"#{r:02x}{g:02x}{b:02x}"
     
-    def show_selected_thumbnails(self, paths, force_page=False):
-        # Clear previous thumbnails immediately without fade
-        for widget in self.thumbs_frame.winfo_children():
-            widget.destroy()
-        self.thumb_imgs.clear()
+    def show_selected_thumbnails(self, paths, keep_position=False):
         self.img_panel.pack_forget()
         self.lbl_result.pack_forget()
+        self.center_frame.pack_forget()
         self.right_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.content_frame.pack(fill=tk.BOTH, expand=True)  # Show the main content frame
-
-        self.center_frame.pack_forget()
-        self.selected_check_vars = []
-        self.update_clean_btn_label(0)
-        
-        # Update paths and reset page if needed
-        if not force_page:
-            self.current_paths = paths
-            self.current_page = 0
         
         # Sort paths by confidence score if they are from a category
-        category_paths = self.current_paths
-        if category_paths and category_paths[0] in self.confidence_scores:
-            category_paths = sorted(category_paths, key=lambda x: self.confidence_scores[x], reverse=True)
-            self.current_paths = category_paths
-
-        # Calculate page slice
-        start_idx = self.current_page * self.page_size
-        end_idx = min(start_idx + self.page_size, len(self.current_paths))
-        page_paths = self.current_paths[start_idx:end_idx]
-        
-        # Update navigation controls
-        self.update_page_controls()
+        if paths and paths[0] in self.confidence_scores:
+            paths = sorted(paths, key=lambda x: self.confidence_scores[x], reverse=True)
+        self.current_paths = list(paths)
         
-        # Show pagination if there are multiple pages
-        total_pages = max(1, (len(self.current_paths) - 1) // self.page_size + 1)
-        if total_pages > 1:
-            self.page_frame.pack(fill=tk.X, pady=(0, 20))
-        else:
-            self.page_frame.pack_forget()
-        
-        # Configure grid for proper spacing
-        cols = self.calculate_columns()
-        for i in range(cols):
-            self.thumbs_frame.grid_columnconfigure(i, weight=1)
-        
-        # Show thumbnails for current page
-        for idx, img_path in enumerate(page_paths):
-            try:
-                cache_key = (img_path, self.thumb_size)
-                if cache_key in self.image_cache:
-                    img_tk = self.image_cache[cache_key]
-                else:
-                    img = Image.open(img_path)
-                    img.thumbnail(self.thumb_size, Image.Resampling.LANCZOS)
-                    img_tk = ImageTk.PhotoImage(img)
-                    self.image_cache[cache_key] = img_tk
-                self.thumb_imgs.append(img_tk)
-                
-                # Update zoom level indicator
-                base_width = 240  # Reference width
-                zoom_level = int((self.thumb_size[0] / base_width) * 100)
-                self.zoom_label.config(text=f"Zoom: {zoom_level}%")
-                
-                # Calculate layout position
-                cols = self.calculate_columns()
-                
-                # Create modern dark theme card
-                frame = tk.Frame(self.thumbs_frame, bd=0, 
-                               bg=self.colors['bg_card'], 
-                               highlightbackground=self.colors['bg_secondary'], 
-                               highlightthickness=1,
-                               relief=tk.SOLID)
-                frame.grid(row=idx//cols, column=idx%cols, padx=1, pady=1, sticky='nsew')
-                
-                # Image container with reduced padding
-                img_container = tk.Frame(frame, bg=self.colors['bg_card'])
-                img_container.pack(fill=tk.BOTH, expand=True, padx=4, pady=(4, 2))
-                
-                # Canvas for image with overlay support
-                img_canvas = tk.Canvas(img_container, 
-                                     width=img_tk.width(), 
-                                     height=img_tk.height(),
-                                     bg=self.colors['bg_card'], 
-                                     highlightthickness=0, bd=0)
-                img_canvas.pack()
-                
-                # Draw image on canvas
-                img_canvas.create_image(0, 0, anchor=tk.NW, image=img_tk)
-                img_canvas.image = img_tk  # Keep reference
-                
-                # Store canvas reference for overlay updates
-                setattr(img_canvas, 'img_path', img_path)
-                
-                # Add double-click to open full image
-                img_canvas.bind('<Double-Button-1>', lambda e, p=img_path: self.open_full_image(p))
-                
-                # Modern hover animations
-                def on_enter(ev, f=frame):
-                    f.config(highlightbackground=self.colors['accent'], highlightthickness=2)
-                    
-                def on_leave(ev, f=frame):
-                    f.config(highlightbackground=self.colors['bg_secondary'], highlightthickness=1)
-                frame.bind("<Enter>", on_enter)
-                frame.bind("<Leave>", on_leave)
-                img_canvas.bind("<Enter>", on_enter)
-                img_canvas.bind("<Leave>", on_leave)
-                
-                var = tk.BooleanVar()
-                # Create frame for text (filename and confidence)
-                text_frame = tk.Frame(frame, bg=self.colors['bg_card'])
-                text_frame.pack(fill=tk.X, padx=4, pady=(0, 4))
-                
-                # Filename checkbox with modern styling
-                filename = os.path.basename(img_path)
-                if len(filename) > 25:
-                    filename = filename[:22] + "..."
-                
-                chk = tk.Checkbutton(text_frame, 
-                                   text=filename, 
-                                   variable=var, 
-                                   command=lambda v=var, p=img_path, c=img_canvas: self.on_image_check(v, p, c), 
-                                   font=("Segoe UI", 9, "bold"), 
-                                   bg=self.colors['bg_card'],
-                                   fg=self.colors['text_primary'],
-                                   activebackground=self.colors['bg_card'], 
-                                   selectcolor=self.colors['accent'], 
-                                   bd=0, highlightthickness=0)
-                chk.pack(anchor="w", pady=(0, 2))
-                
-                # Confidence score with color coding
-                if img_path in self.confidence_scores:
-                    conf_score = self.confidence_scores[img_path]
-                    conf_text = f"Confidence: {conf_score:.0%}"
-                    
-                    # Color code based on confidence
-                    if conf_score >= 0.9:
-                        conf_color = self.colors['success']
-                    elif conf_score >= 0.7:
-                        conf_color = self.colors['accent']
-                    elif conf_score >= 0.5:
-                        conf_color = self.colors['warning']
-                    else:
-                        conf_color = self.colors['danger']
-                    
-                    conf_label = tk.Label(text_frame, 
-                                        text=conf_text, 
-                                        font=("Segoe UI", 8), 
-                                        bg=self.colors['bg_card'], 
-                                        fg=conf_color,
-                                        cursor="question_arrow")
-                    conf_label.pack(anchor="w")
-                    
-                    # Create tooltip with confidence explanation
-                    category = self.image_labels.get(img_path, "unknown")
-                    tooltip_text = self.get_confidence_tooltip(conf_score, category)
-                    ToolTip(conf_label, tooltip_text)
-                self.selected_check_vars.append((var, img_path, img_canvas))
-                var.trace_add('write', lambda *args, v=var, p=img_path, c=img_canvas: self.on_image_check(v, p, c))
-            except Exception:
-                continue
-        self.thumb_canvas.update_idletasks()
-        self.thumb_canvas.yview_moveto(0)
+        self.thumb_grid.set_items(self.current_paths, keep_position=keep_position)
+        self.update_zoom_controls()
 
-    def calculate_columns(self):
-        # Get the actual width of the canvas
-        canvas_width = self.thumb_canvas.winfo_width()
-        if not canvas_width:
-            # If not yet realized, get parent's width
-            canvas_width = self.thumb_canvas.master.winfo_width() or 800
-        
-        # Calculate space needed for each thumbnail including padding
-        thumb_space = self.thumb_size[0] + 12  # thumbnail width + reduced padding
+    def describe_card(self, path):
+        """Info line for a thumbnail card: confidence, colored by strength"""
+        if path not in self.confidence_scores:
+            return "", self.colors['text_secondary'], ""
+        conf_score = self.confidence_scores[path]
+        
+        # Color code based on confidence
+        if conf_score >= 0.9:
+            conf_color = self.colors['success']
+        elif conf_score >= 0.7:
+            conf_color = self.colors['accent']
+        elif conf_score >= 0.5:
+            conf_color = self.colors['warning']
+        else:
+            conf_color = self.colors['danger']
         
-        # Calculate number of columns that can fit
-        return max(1, canvas_width // thumb_space)
+        # Tooltip with confidence explanation
+        category = self.image_labels.get(path, "unknown")
+        return f"Confidence: {conf_score:.0%}", conf_color, self.get_confidence_tooltip(conf_score, category)
     
     def get_confidence_tooltip(self, confidence, category):
         """Generate helpful tooltip text for confidence scores"""
@@ -1208,17 +717,15 @@ class ImageClassifierApp:
         return tooltip
     
     def count_selected_photos(self):
-        return sum(var.get() for var, _, _ in self.selected_check_vars)
+        return self.thumb_grid.selection_count()
 
     def update_select_all_button_text(self):
         """Update Select All button text based on current selection state"""
-        if not hasattr(self, 'selected_check_vars') or not self.selected_check_vars:
-            self.select_all_btn_var.set("Select All")
-            return
-        
-        # Check if all photos are selected
-        all_selected = all(var.get() for var, _, _ in self.selected_check_vars)
-        self.select_all_btn_var.set("Unselect All" if all_selected else "Select All")
+        self.select_all_btn_var.set("Unselect All" if self.thumb_grid.all_selected() else "Select All")
+
+    def on_selection_change(self):
+        """Update the Clean and Select All buttons after the grid's selection changes"""
+        self.update_clean_btn_label(self.count_selected_photos())
 
     def update_clean_btn_label(self, count):
         # Skip update during cleaning to prevent flicker
@@ -1232,8 +739,8 @@ class ImageClassifierApp:
         if self._cleaning_in_progress:
             return
             
-        # Get selected photos
-        selected = [img_path for var, img_path, _ in self.selected_check_vars if var.get()]
+        # Get selected photos, including cards scrolled out of view
+        selected = self.thumb_grid.selected_paths()
         if not selected:
             messagebox.showinfo("Clean", "No photos selected.")
             return
@@ -1258,8 +765,7 @@ class ImageClassifierApp:
                     del self.image_labels[img_path]
                 if img_path in self.confidence_scores:
                     del self.confidence_scores[img_path]
-                if img_path in self.image_cache:
-                    del self.image_cache[img_path]
+                self.image_cache.forget_path(img_path)
             
             # Show completion popup using shared functionality
             FileOperations.show_clean_completion_popup(self.root, moved_count, failed_files)
@@ -1299,6 +805,7 @@ class ImageClassifierApp:
                     self.remove_cleaned_thumbnails(cleaned_paths)
                 else:
                     # No images left in current view
+                    self.thumb_grid.set_items([])
                     self.right_frame.pack_forget()
                     self.center_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
                     self.content_frame.pack_forget()
@@ -1350,33 +857,13 @@ class ImageClassifierApp:
             print(f"Error removing cleaned tree items: {e}")
 
     def remove_cleaned_thumbnails(self, cleaned_paths):
-        """Remove specific thumbnails without rebuilding entire view"""
-        try:
-            # Remove cleaned images from selected_check_vars
-            self.selected_check_vars = [(var, path, canvas) for var, path, canvas in self.selected_check_vars 
-                                      if path not in cleaned_paths]
-            
-            # Since thumbnails don't have img_path attributes, just refresh the current view
-            # This is still more efficient than full tree rebuild
-            if self.current_paths:
-                self.show_selected_thumbnails(self.current_paths, force_page=True)
-                
-        except Exception as e:
-            print(f"Error removing thumbnails: {e}")
-            # Fallback to full refresh
-            self.show_selected_thumbnails(self.current_paths, force_page=True)
+        """Drop cleaned photos from the grid, keeping the scroll position"""
+        self.show_selected_thumbnails(self.current_paths, keep_position=True)
 
     def open_full_image(self, img_path):
         """Open image in full-size window using common utility"""
         ImageUtils.open_full_image(self.root, img_path)
 
-    def on_image_check(self, var, path, canvas):
-        """Handle checkbox state changes and update trash overlay"""
-        ImageUtils.update_cross_overlay(self.selected_check_vars, var, path, self._trash_icon_cache)
-        count = self.count_selected_photos()
-        self.clean_btn_var.set(f"Clean ({count})")
-        self.update_select_all_button_text()
-
     def show_img(self):
         img_list = self.get_current_list()
         if not img_list:
@@ -1388,12 +875,11 @@ class ImageClassifierApp:
         # Use cache if available
         main_size = (800, 600)
         cache_key = (path, main_size)
-        if cache_key in self.image_cache:
-            img_tk = self.image_cache[cache_key]
-        else:
+        img_tk = self.image_cache.get(cache_key)
+        if img_tk is None:
             img = Image.open(path).resize(main_size)
             img_tk = ImageTk.PhotoImage(img)
-            self.image_cache[cache_key] = img_tk
+            self.image_cache.put(cache_key, img_tk)
         self.img_panel.config(image=img_tk)
         self.img_panel.image = img_tk
         label, conf, _ = classify_people_vs_screenshot(path)
@@ -0,0 +1,98 @@
+"""
+Reduced-Resolution Image Decoding for PhotoSift
+Decodes images straight to the smallest size a consumer needs. For JPEGs,
+libjpeg's DCT scaling (PIL Image.draft / cv2.IMREAD_REDUCED_COLOR_*) skips
+most of the work of a full 24-megapixel decode. Also defines the canonical
+analysis scale used by the blur and brightness metrics.
+
+cv2 is only imported by the analysis path, so thumbnail and CLIP callers
+(and the launcher) never pay for it.
+"""
+
+import numpy as np
+from PIL import Image
+
+from ImageHeader import read_image_header, oriented_size
+
+# Long side (pixels) that blur/brightness are measured at. Laplacian variance
+# grows as an image is downscaled; ImageQualityAnalyzer.blur_score corrects
+# for the downscale so blur thresholds keep their full-resolution meaning.
+ANALYSIS_MAX_SIDE = 1024
+
+# DCT reduction factor -> cv2 imread flag name
+_REDUCED_FLAGS = {8: 'IMREAD_REDUCED_COLOR_8', 4: 'IMREAD_REDUCED_COLOR_4', 2: 'IMREAD_REDUCED_COLOR_2'}
+
+
+def open_reduced(path, size, mode="RGB"):
+    """
+    Open an image decoded at the smallest JPEG scale that is still at least size.
+
+    Non-JPEG formats are decoded at full size. The result is loaded, so the
+    file is closed when this returns.
+
+    Args:
+        path: Image file path
+        size: (width, height) the caller will resize to
+        mode: PIL mode of the returned image
+
+    Returns:
+        PIL.Image in the requested mode
+    """
+    with Image.open(path) as img:
+        img.draft(mode, (int(size[0]), int(size[1])))
+        return img.convert(mode)
+
+
+def load_resized(path, size, mode="RGB", resample=Image.Resampling.LANCZOS):
+    """Decode at reduced scale and resize to exactly size"""
+    return open_reduced(path, size, mode).resize(size, resample)
+
+
+def reduction_factor(width, height, max_side=ANALYSIS_MAX_SIDE):
+    """Largest DCT scale (8, 4, 2 or 1) that keeps the long side at or above max_side"""
+    long_side = max(width, height)
+    for factor in _REDUCED_FLAGS:
+        if long_side // factor >= max_side:
+            return factor
+    return 1
+
+
+def _fit_long_side(image, max_side):
+    """Area-downscale a BGR array so its long side is at most max_side"""
+    import cv2
+    height, width = image.shape[:2]
+    long_side = max(width, height)
+    if long_side <= max_side:
+        return image
+    scale = max_side / long_side
+    return cv2.resize(image, (max(1, round(width * scale)), max(1, round(height * scale))),
+                      interpolation=cv2.INTER_AREA)
+
+
+def decode_for_analysis(path, max_side=ANALYSIS_MAX_SIDE):
+    """
+    Decode an image as a BGR array at the canonical analysis scale.
+
+    Large JPEGs are decoded directly at 1/2, 1/4 or 1/8 scale, then
+    area-downscaled so the long side is max_side. Smaller images are left at
+    native size. EXIF orientation is ignored, which does not affect blur or
+    brightness.
+
+    Args:
+        path: Image file path
+        max_side: Long side to analyze at
+
+    Returns:
+        (image, (width, height)): BGR uint8 array and the full-resolution size
+        from the file header, with EXIF orientation applied
+    """
+    import cv2
+    width, height, orientation = read_image_header(path)
+    factor = reduction_factor(width, height, max_side)
+    flag = getattr(cv2, _REDUCED_FLAGS.get(factor, 'IMREAD_COLOR'))
+    image = cv2.imread(str(path), flag | cv2.IMREAD_IGNORE_ORIENTATION)
+    if image is None:
+        # Try with PIL if cv2 fails (e.g. Unicode paths on Windows)
+        target = (max(1, width // factor), max(1, height // factor))
+        image = cv2.cvtColor(np.asarray(open_reduced(path, target)), cv2.COLOR_RGB2BGR)
+    return _fit_long_side(image, max_side), oriented_size(width, height, orientation)
@@ -0,0 +1,250 @@
+"""
+Header-Only Image Dimension Reader for PhotoSift
+Reads pixel dimensions and EXIF orientation straight from the JPEG SOF,
+PNG IHDR, WebP VP8/VP8L/VP8X, BMP and TIFF headers, touching only the first
+few KB of each file. Other formats (and files these parsers cannot make
+sense of) fall back to PIL.
+"""
+
+import struct
+
+from PIL import Image
+
+ORIENTATION_TAG = 0x0112
+# EXIF orientations 5-8 are rotated by 90 or 270 degrees
+_TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+_TIFF_WIDTH_TAG = 0x0100
+_TIFF_HEIGHT_TAG = 0x0101
+# TIFF field type -> struct code (SHORT, LONG)
+_TIFF_TYPES = {3: 'H', 4: 'I'}
+
+# JPEG start-of-frame markers (C4 DHT, C8 JPG and CC DAC share the range)
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_EXIF_READ_SIZE = 4096  # IFD0 sits at the start of the APP1 segment
+
+
+class HeaderError(ValueError):
+    """The file header is truncated or not in a format this module parses"""
+
+
+def _read_exact(f, size):
+    data = f.read(size)
+    if len(data) != size:
+        raise HeaderError("Unexpected end of file")
+    return data
+
+
+def _parse_ifd(data, offset, endian, tags):
+    """
+    Read SHORT/LONG values for the given tags from a TIFF IFD held in data.
+
+    Args:
+        data: Bytes of a TIFF structure, offsets relative to its start
+        offset: Offset of the IFD in data
+        endian: '<' or '>'
+        tags: Tags to collect
+
+    Returns:
+        dict of tag -> int for the tags found
+    """
+    if offset + 2 > len(data):
+        raise HeaderError("IFD offset outside header")
+    count = struct.unpack_from(endian + 'H', data, offset)[0]
+    values = {}
+    for i in range(count):
+        entry = offset + 2 + 12 * i
+        if entry + 12 > len(data):
+            break
+        tag, field_type = struct.unpack_from(endian + 'HH', data, entry)
+        if tag in tags and field_type in _TIFF_TYPES:
+            # Single SHORT/LONG values are stored inline, left-justified
+            values[tag] = struct.unpack_from(endian + _TIFF_TYPES[field_type], data, entry + 8)[0]
+    return values
+
+
+def _tiff_endian(data):
+    if data[:4] == b'II*\x00':
+        return '<'
+    if data[:4] == b'MM\x00*':
+        return '>'
+    raise HeaderError("Not a TIFF header")
+
+
+def _exif_orientation(tiff_data):
+    """Orientation from an EXIF TIFF block, 1 if absent or unreadable"""
+    try:
+        endian = _tiff_endian(tiff_data)
+        offset = struct.unpack_from(endian + 'I', tiff_data, 4)[0]
+        return _parse_ifd(tiff_data, offset, endian, {ORIENTATION_TAG}).get(ORIENTATION_TAG, 1)
+    except (HeaderError, struct.error):
+        return 1
+
+
+def _read_jpeg(f):
+    orientation = 1
+    f.seek(2)
+    while True:
+        # Markers are 0xFF followed by a code; extra 0xFF bytes are padding
+        if _read_exact(f, 1) != b'\xff':
+            raise HeaderError("Corrupt JPEG marker")
+        marker = 0xFF
+        while marker == 0xFF:
+            marker = _read_exact(f, 1)[0]
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            continue  # Standalone markers carry no length
+        if marker in (0xD9, 0xDA):
+            raise HeaderError("No frame header before image data")
+        length = struct.unpack('>H', _read_exact(f, 2))[0]
+        if length < 2:
+            raise HeaderError("Corrupt JPEG segment length")
+        if marker in _SOF_MARKERS:
+            height, width = struct.unpack('>xHH', _read_exact(f, 5))
+            if width == 0 or height == 0:
+                raise HeaderError("Height defined by DNL marker")
+            return width, height, orientation
+        if marker == 0xE1 and orientation == 1:
+            segment = f.read(min(length - 2, _EXIF_READ_SIZE))
+            if segment.startswith(b'Exif\x00\x00'):
+                orientation = _exif_orientation(segment[6:])
+            f.seek(length - 2 - len(segment), 1)
+        else:
+            f.seek(length - 2, 1)
+
+
+def _read_png(f):
+    f.seek(8)
+    length, chunk_type, width, height = struct.unpack('>I4sII', _read_exact(f, 16))
+    if chunk_type != b'IHDR':
+        raise HeaderError("PNG does not start with IHDR")
+    return width, height, 1
+
+
+def _read_webp(f):
+    f.seek(12)
+    chunk_type, size = struct.unpack('<4sI', _read_exact(f, 8))
+    data = _read_exact(f, min(size, 30))
+    if chunk_type == b'VP8 ':
+        if data[3:6] != b'\x9d\x01\x2a':
+            raise HeaderError("Missing VP8 start code")
+        width, height = struct.unpack_from('<HH', data, 6)
+        return width & 0x3FFF, height & 0x3FFF, 1
+    if chunk_type == b'VP8L':
+        if data[0] != 0x2F:
+            raise HeaderError("Missing VP8L signature")
+        bits = struct.unpack_from('<I', data, 1)[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1, 1
+    if chunk_type == b'VP8X':
+        flags = data[0]
+        width = int.from_bytes(data[4:7], 'little') + 1
+        height = int.from_bytes(data[7:10], 'little') + 1
+        orientation = _read_webp_orientation(f, 20 + size + (size & 1)) if flags & 0x08 else 1
+        return width, height, orientation
+    raise HeaderError(f"Unknown WebP chunk {chunk_type!r}")
+
+
+def _read_webp_orientation(f, offset):
+    """Find the EXIF chunk by skipping over chunk headers (it follows the image data)"""
+    while True:
+        f.seek(offset)
+        header = f.read(8)
+        if len(header) < 8:
+            return 1
+        chunk_type, size = struct.unpack('<4sI', header)
+        if chunk_type == b'EXIF':
+            data = f.read(min(size, _EXIF_READ_SIZE))
+            # Some writers keep the JPEG APP1 prefix
+            if data.startswith(b'Exif\x00\x00'):
+                data = data[6:]
+            return _exif_orientation(data)
+        offset += 8 + size + (size & 1)
+
+
+def _read_bmp(f):
+    f.seek(14)
+    header_size = struct.unpack('<I', _read_exact(f, 4))[0]
+    if header_size == 12:
+        width, height = struct.unpack('<HH', _read_exact(f, 4))
+    else:
+        width, height = struct.unpack('<ii', _read_exact(f, 8))
+    # Negative height marks a top-down bitmap
+    return abs(width), abs(height), 1
+
+
+def _read_tiff(f):
+    f.seek(0)
+    head = _read_exact(f, 8)
+    endian = _tiff_endian(head)
+    offset = struct.unpack_from(endian + 'I', head, 4)[0]
+    f.seek(offset)
+    count = struct.unpack(endian + 'H', _read_exact(f, 2))[0]
+    # Re-base the IFD at offset 0 so _parse_ifd can index it directly
+    ifd = struct.pack(endian + 'H', count) + _read_exact(f, 12 * count)
+    values = _parse_ifd(ifd, 0, endian, {_TIFF_WIDTH_TAG, _TIFF_HEIGHT_TAG, ORIENTATION_TAG})
+    if _TIFF_WIDTH_TAG not in values or _TIFF_HEIGHT_TAG not in values:
+        raise HeaderError("TIFF IFD without dimensions")
+    return values[_TIFF_WIDTH_TAG], values[_TIFF_HEIGHT_TAG], values.get(ORIENTATION_TAG, 1)
+
+
+def _header_reader(signature):
+    if signature.startswith(b'\xff\xd8'):
+        return _read_jpeg
+    if signature.startswith(b'\x89PNG\r\n\x1a\n'):
+        return _read_png
+    if signature.startswith(b'RIFF') and signature[8:12] == b'WEBP':
+        return _read_webp
+    if signature.startswith(b'BM'):
+        return _read_bmp
+    if signature[:4] in (b'II*\x00', b'MM\x00*'):
+        return _read_tiff
+    return None
+
+
+def _read_header_pil(image_path):
+    with Image.open(image_path) as img:
+        width, height = img.size
+        orientation = img.getexif().get(ORIENTATION_TAG, 1)
+    return width, height, orientation
+
+
+def read_image_header(image_path):
+    """
+    Read the stored pixel size and EXIF orientation of an image.
+
+    Args:
+        image_path: Path to the image file
+
+    Returns:
+        (width, height, orientation): Size as stored in the file (before
+        orientation is applied) and the EXIF orientation (1-8, 1 if none)
+
+    Raises:
+        OSError: If the file cannot be opened or PIL cannot identify it
+    """
+    image_path = str(image_path)
+    with open(image_path, 'rb') as f:
+        reader = _header_reader(f.read(12))
+        if reader is not None:
+            try:
+                return reader(f)
+            except (HeaderError, struct.error, IndexError):
+                pass
+    return _read_header_pil(image_path)
+
+
+def read_image_size(image_path):
+    """
+    Read the displayed (width, height) of an image without decoding pixels.
+
+    EXIF orientation is applied, so a portrait photo stored sideways reports
+    its upright size.
+
+    Raises:
+        OSError: If the file cannot be opened or PIL cannot identify it
+    """
+    return oriented_size(*read_image_header(image_path))
+
+
+def oriented_size(width, height, orientation):
+    """Apply an EXIF orientation to a stored (width, height)"""
+    return (height, width) if orientation in _TRANSPOSED_ORIENTATIONS else (width, height)
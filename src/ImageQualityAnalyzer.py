@@ -0,0 +1,584 @@
+"""
+Image Quality Analyzer for PhotoSift
+Decodes each image once and computes every pixel-quality metric from that
+decode: Laplacian variance (blur), mean HSV Value (brightness) and pixel
+dimensions. Records are kept in memory and on disk keyed by (path, size,
+mtime), so the blur, dark and low resolution tools share one decode per image
+and a rescan only decodes new or modified files.
+"""
+
+import os
+import bisect
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from operator import itemgetter
+
+import numpy as np
+
+from SignatureCache import file_signature
+from FileScanner import scan_image_files
+from ImageDecoder import decode_for_analysis
+from ImageHeader import read_image_size
+from ScanResultCache import get_result_cache
+from ThumbnailCache import get_thumbnail_cache
+
+QUALITY_CACHE_KEY = "quality-v4"  # v2: blur measured at ANALYSIS_MAX_SIDE, v3: oriented dimensions, v4: blur on full-resolution scale
+BLUR_GAIN_MAX = 11.0  # Largest correction applied to a downscaled blur score (reached around 12 MP)
+PERSIST_BATCH = 200  # Records written to the persistent cache per transaction
+PROCESS_CHUNK_SIZE = 32  # Images per process-pool task
+PROCESS_MIN_IMAGES = 256  # Below this, "auto" uses threads (process start-up costs more than it saves)
+RESULT_INTERVAL = 0.5  # Seconds between partial-result chunks handed to a result_callback
+
+# path -> ((size, mtime_ns), record)
+_records = {}
+_records_lock = threading.Lock()
+
+
+def blur_score(image, full_size):
+    """
+    Laplacian variance of an analysis-scale image, on the full-resolution scale.
+
+    Downscaling to ANALYSIS_MAX_SIDE averages away the finest detail, so a
+    large photo measures several times sharper than it did when blur was
+    scored at full resolution. The variance is divided by the squared
+    downscale factor (capped at BLUR_GAIN_MAX), which keeps the blur
+    thresholds and quality bands meaning what they did for images blurred by
+    about a pixel at full resolution, where the default threshold sits.
+    Images no larger than ANALYSIS_MAX_SIDE are measured unchanged.
+
+    Args:
+        image: BGR array from decode_for_analysis
+        full_size: (width, height) of the image at full resolution
+
+    Returns:
+        float: Blur score (higher = sharper)
+    """
+    import cv2  # Deferred: header-only scans and the CLIP tools never need OpenCV
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    variance = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+    scale = max(full_size) / max(gray.shape)
+    return variance / min(BLUR_GAIN_MAX, max(1.0, scale * scale))
+
+
+def analyze_image_quality(image_path):
+    """
+    Compute blur, brightness and dimensions for one image from a single decode.
+
+    Pixels are decoded at reduced scale and measured at ANALYSIS_MAX_SIDE (see
+    ImageDecoder); dimensions are the full-resolution size from the header,
+    with EXIF orientation applied.
+
+    Args:
+        image_path (str): Path to the image file
+
+    Returns:
+        dict: {'path', 'blur_score', 'brightness', 'width', 'height'}.
+              Metrics are -1 if the image cannot be processed.
+    """
+    try:
+        image, (width, height) = decode_for_analysis(image_path)
+        score = blur_score(image, (width, height))
+        # HSV Value is the per-pixel max of B, G and R
+        brightness = float(np.mean(image.max(axis=2)))
+        return {'path': str(image_path), 'blur_score': score, 'brightness': brightness,
+                'width': width, 'height': height}
+    except Exception as e:
+        print(f"Error processing {image_path}: {str(e)}")
+        return {'path': str(image_path), 'blur_score': -1, 'brightness': -1, 'width': -1, 'height': -1}
+
+
+def read_dimensions(image_path):
+    """
+    Read dimensions from the image header only (no pixel decode).
+
+    Returns:
+        dict record with blur_score and brightness set to None
+    """
+    try:
+        width, height = read_image_size(image_path)
+    except Exception as e:
+        print(f"Error reading {image_path}: {e}")
+        width, height = -1, -1
+    return {'path': str(image_path), 'blur_score': None, 'brightness': None, 'width': width, 'height': height}
+
+
+class ResultBatcher:
+    """
+    Collects per-image results during a scan and hands them to a callback in
+    chunks, at most every interval seconds, so a GUI can show results while
+    the scan is still running.
+
+    Args:
+        callback: Callable(list_of_results), or None to disable
+        interval (float): Minimum seconds between chunks
+    """
+
+    def __init__(self, callback, interval=RESULT_INTERVAL):
+        self.callback = callback
+        self.interval = interval
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+    def add(self, result):
+        if self.callback is None:
+            return
+        self._pending.append(result)
+        if time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+
+    def extend(self, results):
+        if self.callback is None:
+            return
+        self._pending.extend(results)
+        if time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """Hand over everything collected so far"""
+        self._last_flush = time.monotonic()
+        if self._pending:
+            chunk, self._pending = self._pending, []
+            self.callback(chunk)
+
+
+class SortedResults:
+    """
+    Results kept in order of a numeric key as a scan streams them in.
+
+    A small chunk is placed item by item with bisect on a parallel key list;
+    a chunk that is large next to the list is appended and merged in one
+    stable sort, which only has two sorted runs to merge. Either way a
+    partial-results tick costs far less than re-sorting everything seen so
+    far. Equal keys stay in arrival order, as with a stable sort.
+
+    Args:
+        key: Callable(item) -> number the items are ordered by
+        descending: Keep the highest key first
+    """
+
+    def __init__(self, key, descending=False):
+        self.items = []
+        self._keys = []
+        self._key = key
+        self._sign = -1 if descending else 1
+
+    def __len__(self):
+        return len(self.items)
+
+    def extend(self, items):
+        keyed = [(self._sign * self._key(item), item) for item in items]
+        if len(keyed) * 8 < len(self.items):
+            for key, item in keyed:
+                i = bisect.bisect_right(self._keys, key)
+                self._keys.insert(i, key)
+                self.items.insert(i, item)
+            return
+        keyed.sort(key=itemgetter(0))
+        merged = list(zip(self._keys, self.items)) + keyed
+        merged.sort(key=itemgetter(0))
+        self._keys = [key for key, _ in merged]
+        self.items = [item for _, item in merged]
+
+
+class StreamingSplit:
+    """
+    Partial results split in two, in the order ScoreIndex.split and
+    DimensionIndex.split return them: the first list lowest key first, the
+    second highest first. Each chunk is merged into both lists, so the GUIs
+    never re-split everything scanned so far.
+
+    Args:
+        key: Callable(item) -> number both lists are ordered by
+        is_below: Callable(item) -> True if the item goes in the first list
+    """
+
+    def __init__(self, key, is_below):
+        self.below = SortedResults(key)
+        self.above = SortedResults(key, descending=True)
+        self._is_below = is_below
+
+    def extend(self, items):
+        """Merge a chunk into both lists; returns the chunk's (below, above) items"""
+        below, above = [], []
+        for item in items:
+            (below if self._is_below(item) else above).append(item)
+        self.below.extend(below)
+        self.above.extend(above)
+        return below, above
+
+
+def default_workers(backend="thread"):
+    """Default pool size: every core for processes, up to 8 threads"""
+    if backend == "process":
+        return multiprocessing.cpu_count()
+    return min(multiprocessing.cpu_count(), 8)  # Cap at 8 to avoid overhead
+
+
+def _init_worker():
+    # The pool supplies the parallelism; one OpenCV thread per process avoids oversubscription
+    import cv2
+    cv2.setNumThreads(1)
+
+
+def score_chunk(image_paths, need_pixels=True):
+    """
+    Analyze a chunk of images in a worker process.
+
+    Args:
+        image_paths: List of image file paths
+        need_pixels (bool): Compute blur and brightness, not only dimensions
+
+    Returns:
+        np.ndarray: float64 array of shape (n, 4) holding blur_score,
+        brightness, width and height per image (NaN where not computed, -1 on failure)
+    """
+    worker = analyze_image_quality if need_pixels else read_dimensions
+    scores = np.empty((len(image_paths), 4))
+    for i, path in enumerate(image_paths):
+        record = worker(path)
+        scores[i] = [np.nan if record[key] is None else record[key]
+                     for key in ('blur_score', 'brightness', 'width', 'height')]
+    return scores
+
+
+def _record_from_scores(path, row):
+    blur, brightness, width, height = row.tolist()
+    return {'path': path,
+            'blur_score': None if np.isnan(blur) else blur,
+            'brightness': None if np.isnan(brightness) else brightness,
+            'width': int(width), 'height': int(height)}
+
+
+def iter_quality_records(image_paths, need_pixels=True, backend="thread", max_workers=None,
+                         chunk_size=PROCESS_CHUNK_SIZE):
+    """
+    Analyze images in parallel, yielding records as they complete.
+
+    Args:
+        image_paths: List of image file paths
+        need_pixels (bool): Compute blur and brightness, not only dimensions
+        backend (str): "thread" runs one image per task in a thread pool. "process"
+            sends chunks of paths to worker processes, which return compact score
+            arrays; use it when the GIL-bound work stops threads from scaling.
+        max_workers (int): Pool size (default: see default_workers)
+        chunk_size (int): Maximum images per process-pool task
+
+    Yields:
+        dict: Records (see analyze_image_quality) in completion order
+    """
+    image_paths = [str(p) for p in image_paths]
+    if not image_paths:
+        return
+    if backend not in ("thread", "process"):
+        raise ValueError(f"Unknown backend: {backend}")
+    if max_workers is None:
+        max_workers = default_workers(backend)
+
+    remaining = image_paths
+    if backend == "process":
+        # Smaller chunks near the end of a scan keep every worker busy
+        chunk_size = max(1, min(chunk_size, -(-len(image_paths) // (max_workers * 4))))
+        chunks = [image_paths[i:i + chunk_size] for i in range(0, len(image_paths), chunk_size)]
+        done = set()
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+                futures = {executor.submit(score_chunk, chunk, need_pixels): chunk for chunk in chunks}
+                for future in as_completed(futures):
+                    chunk = futures[future]
+                    for path, row in zip(chunk, future.result()):
+                        yield _record_from_scores(path, row)
+                    done.update(chunk)
+            return
+        except (BrokenProcessPool, OSError) as e:
+            print(f"[WARN] Process pool failed ({e}); continuing with threads")
+            remaining = [p for p in image_paths if p not in done]
+            max_workers = default_workers("thread")
+
+    worker = analyze_image_quality if need_pixels else read_dimensions
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(worker, path) for path in remaining]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _cached_record(path, signature, need_pixels):
+    entry = _records.get(path)
+    if entry is None or entry[0] != signature:
+        return None
+    record = entry[1]
+    if need_pixels and record['blur_score'] is None:
+        return None
+    return record
+
+
+def get_quality_records(image_paths, need_pixels=True, progress_callback=None, max_workers=None, manifest=None,
+                        backend="auto", result_callback=None):
+    """
+    Get quality records for many images, decoding only those not seen yet.
+
+    Records are looked up in memory first, then in the persistent scan result
+    cache, so a rescan only decodes files that are new or changed on disk.
+
+    Args:
+        image_paths: List of image file paths
+        need_pixels (bool): Compute blur and brightness. When False only
+            dimensions are required; they come from an earlier full decode if
+            one is cached, otherwise from the file header.
+        progress_callback (callable): Optional callback function(current, total, filename)
+        max_workers (int): Maximum number of parallel workers (default: see default_workers)
+        manifest (FileManifest): Optional manifest whose cached stat results are used
+            instead of stat'ing each file again
+        backend (str): "thread", "process" or "auto", which uses processes when
+            at least PROCESS_MIN_IMAGES images need decoding (see iter_quality_records)
+        result_callback (callable): Optional callback(records) for showing results
+            while the scan runs. Receives every cached record in one chunk first,
+            then newly analyzed records every RESULT_INTERVAL seconds.
+
+    Returns:
+        list: Records (see analyze_image_quality) in completion order
+    """
+    image_paths = [str(p) for p in image_paths]
+    total = len(image_paths)
+    records = []
+    signatures = {}
+    misses = []
+    for path in image_paths:
+        signature = manifest.signature(path) if manifest is not None else None
+        if signature is None:
+            signature = file_signature(path)
+        signatures[path] = signature
+        record = _cached_record(path, signature, need_pixels) if signature else None
+        if record is not None:
+            records.append(record)
+        else:
+            misses.append(path)
+
+    # Records persisted by an earlier session for unchanged files
+    store = get_result_cache(QUALITY_CACHE_KEY)
+    stored, _ = store.get_many(misses, signature=signatures.get)
+    pending = []
+    for path in misses:
+        record = stored.get(path)
+        if record is not None and not (need_pixels and record['blur_score'] is None):
+            records.append(record)
+            with _records_lock:
+                _records[path] = (signatures[path], record)
+        else:
+            pending.append((path, signatures[path]))
+    if stored:
+        print(f"[LOG] Quality cache: {total - len(pending)} of {total} images unchanged")
+
+    processed = len(records)
+    if progress_callback and processed:
+        progress_callback(processed, total, "cached results")
+    stream = ResultBatcher(result_callback)
+    stream.extend(records)
+    stream.flush()
+
+    if backend == "auto":
+        # Header reads are I/O-bound and stay on threads
+        backend = "process" if need_pixels and len(pending) >= PROCESS_MIN_IMAGES else "thread"
+
+    new_records = []
+    for record in iter_quality_records([path for path, _ in pending], need_pixels=need_pixels,
+                                       backend=backend, max_workers=max_workers):
+        path = record['path']
+        signature = signatures[path]
+        records.append(record)
+        stream.add(record)
+        if signature and record['width'] != -1:
+            with _records_lock:
+                _records[path] = (signature, record)
+            new_records.append((path, record))
+            if len(new_records) >= PERSIST_BATCH:
+                store.put_many(new_records, signature=signatures.get)
+                new_records = []
+        processed += 1
+        if progress_callback:
+            progress_callback(processed, total, os.path.basename(path))
+    store.put_many(new_records, signature=signatures.get)
+    stream.flush()
+    return records
+
+
+def scan_folder_quality(folder_path, need_pixels=True, progress_callback=None, max_workers=None, manifest=None,
+                        backend="auto", result_callback=None):
+    """Get quality records for every image in a folder (see get_quality_records)"""
+    if manifest is None:
+        manifest = scan_image_files(folder_path)
+    # Forget results for files deleted since the last scan of this folder
+    get_result_cache(QUALITY_CACHE_KEY).prune(folder_path, manifest.files)
+    get_thumbnail_cache().prune(folder_path, manifest.files, manifest.extensions)
+    return get_quality_records(manifest.files, need_pixels=need_pixels, progress_callback=progress_callback,
+                               max_workers=max_workers, manifest=manifest, backend=backend,
+                               result_callback=result_callback)
+
+
+def clear_quality_cache():
+    """Forget all in-memory quality records"""
+    with _records_lock:
+        _records.clear()
+
+
+def scored_items(records, key):
+    """(path, score) for records with a valid 'blur_score' or 'brightness' (key)"""
+    return [(r['path'], r[key]) for r in records if r[key] not in (None, -1)]
+
+
+def dimension_items(records):
+    """(path, width, height) for records whose dimensions could be read"""
+    return [(r['path'], r['width'], r['height']) for r in records if r['width'] != -1]
+
+
+class ScoreIndex:
+    """
+    Scores from one scan in a sorted array, so a new threshold splits them by
+    binary search (O(log n) plus output size) instead of a rescan.
+
+    Args:
+        paths: Image paths
+        scores: Score per path (failed or missing scores are dropped)
+    """
+
+    def __init__(self, paths, scores):
+        paths = np.asarray(paths, dtype=object)
+        scores = np.asarray(scores, dtype=np.float64)
+        order = np.argsort(scores, kind='stable')
+        self.paths = paths[order]
+        self.scores = scores[order]
+
+    @classmethod
+    def from_records(cls, records, key):
+        """Index one metric ('blur_score' or 'brightness') of quality records"""
+        items = scored_items(records, key)
+        return cls([path for path, _ in items], [score for _, score in items])
+
+    def __len__(self):
+        return len(self.scores)
+
+    def split(self, threshold):
+        """
+        Returns:
+            (below, at_or_above): [(path, score), ...] lowest first, and
+            [(path, score), ...] highest first
+        """
+        cut = int(np.searchsorted(self.scores, threshold, side='left'))
+        below = list(zip(self.paths[:cut].tolist(), self.scores[:cut].tolist()))
+        above = list(zip(self.paths[cut:][::-1].tolist(), self.scores[cut:][::-1].tolist()))
+        return below, above
+
+    def without(self, paths):
+        """Return an index without the given paths (e.g. after moving them to Trash)"""
+        removed = set(paths)
+        keep = np.fromiter((p not in removed for p in self.paths), dtype=bool, count=len(self.paths))
+        return ScoreIndex(self.paths[keep], self.scores[keep])
+
+
+class DimensionIndex:
+    """
+    Image dimensions from one scan, ordered by short side, so a new minimum
+    resolution is re-applied with one vectorized comparison and no sorting.
+
+    Args:
+        paths: Image paths
+        widths, heights: Dimensions per path (failed reads are dropped)
+    """
+
+    def __init__(self, paths, widths, heights):
+        paths = np.asarray(paths, dtype=object)
+        widths = np.asarray(widths, dtype=np.int64)
+        heights = np.asarray(heights, dtype=np.int64)
+        order = np.argsort(np.minimum(widths, heights), kind='stable')
+        self.paths = paths[order]
+        self.widths = widths[order]
+        self.heights = heights[order]
+
+    @classmethod
+    def from_records(cls, records):
+        items = dimension_items(records)
+        return cls([p for p, _, _ in items], [w for _, w, _ in items], [h for _, _, h in items])
+
+    def __len__(self):
+        return len(self.paths)
+
+    def split(self, min_width, min_height):
+        """
+        Returns:
+            (low_res, ok): [(path, width, height), ...] smallest short side
+            first, and [(path, width, height), ...] largest first
+        """
+        low = (self.widths < min_width) | (self.heights < min_height)
+        ok = ~low
+        low_res = list(zip(self.paths[low].tolist(), self.widths[low].tolist(), self.heights[low].tolist()))
+        ok_images = list(zip(self.paths[ok][::-1].tolist(), self.widths[ok][::-1].tolist(),
+                             self.heights[ok][::-1].tolist()))
+        return low_res, ok_images
+
+    def without(self, paths):
+        """Return an index without the given paths (e.g. after moving them to Trash)"""
+        removed = set(paths)
+        keep = np.fromiter((p not in removed for p in self.paths), dtype=bool, count=len(self.paths))
+        return DimensionIndex(self.paths[keep], self.widths[keep], self.heights[keep])
+
+
+def blur_results(records, threshold=100.0):
+    """
+    Split records (or a ScoreIndex of blur scores) into the
+    detect_blurry_images_batch result format.
+    """
+    index = records if isinstance(records, ScoreIndex) else ScoreIndex.from_records(records, 'blur_score')
+    blurry_images, sharp_images = index.split(threshold)
+    return {
+        'blurry_images': blurry_images,
+        'sharp_images': sharp_images,
+        'total_processed': len(index),
+        'total_blurry': len(blurry_images)
+    }
+
+
+def dark_results(records, threshold=40.0):
+    """
+    Split records (or a ScoreIndex of brightness scores) into the
+    detect_dark_images_batch result format.
+    """
+    index = records if isinstance(records, ScoreIndex) else ScoreIndex.from_records(records, 'brightness')
+    dark_images, bright_images = index.split(threshold)
+    return {
+        'dark_images': dark_images,
+        'bright_images': bright_images,
+        'total_processed': len(index),
+        'total_dark': len(dark_images)
+    }
+
+
+def low_res_results(records, min_width=1280, min_height=720):
+    """
+    Split records (or a DimensionIndex) into the detect_low_res_images_batch
+    result format.
+    """
+    index = records if isinstance(records, DimensionIndex) else DimensionIndex.from_records(records)
+    low_res_images, ok_images = index.split(min_width, min_height)
+    return {
+        'low_res_images': low_res_images,
+        'ok_images': ok_images,
+        'total_processed': len(index),
+        'total_low_res': len(low_res_images),
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) > 1:
+        t0 = time.perf_counter()
+        records = scan_folder_quality(sys.argv[1])
+        print(f"Blurry images: {blur_results(records)['total_blurry']}")
+        print(f"Dark images: {dark_results(records)['total_dark']}")
+        print(f"Low resolution images: {low_res_results(records)['total_low_res']}")
+        print(f"Done {len(records)} images in {time.perf_counter() - t0:.2f}s")
+    else:
+        print("Usage: python ImageQualityAnalyzer.py <folder_path>")
@@ -0,0 +1,127 @@
+"""
+Library Analyzer for PhotoSift
+One-pass "analyze everything" scan: every image is decoded and run through
+the CLIP vision tower once, and that single embedding feeds the duplicate
+finder, the people/screenshot classifier and the safe content scanner
+(the classifiers only need the cached text-prompt matrices).
+"""
+
+import time
+
+import numpy as np
+
+from ClipModelService import zero_shot_classify
+from FileScanner import scan_image_files
+from DuplicateImageIdentifier import (find_exact_duplicates, split_exact_duplicates,
+                                      get_clip_embeddings_cached, build_similarity_graph,
+                                      prune_scan_caches, MIN_GROUPING_THRESHOLD)
+import DuplicateImageIdentifier
+import ImageClassification
+import SafeContentDetection
+
+IMG_EXT = DuplicateImageIdentifier.IMG_EXT | ImageClassification.IMG_EXT | SafeContentDetection.IMG_EXT
+
+
+def list_images(folder):
+    """Recursively list supported images under folder, skipping Trash folders"""
+    return scan_image_files(folder, IMG_EXT).files
+
+
+def classify_embeddings(paths, embeddings, labels):
+    """
+    Zero-shot classify already-embedded images.
+
+    Args:
+        paths: List of file paths, all present in embeddings
+        embeddings: dict of path -> CLIP image embedding
+        labels: dict of label -> list of prompts
+
+    Returns:
+        list of (path, label, confidence, all_scores) tuples in paths order
+    """
+    if not paths:
+        return []
+    features = np.stack([embeddings[p] for p in paths])
+    return [(path, pred, conf, scores)
+            for path, (pred, conf, scores) in zip(paths, zero_shot_classify(features, labels))]
+
+
+def analyze_folder(folder=None, files=None, threshold=0.95, progress_callback=None):
+    """
+    Find duplicates, people/screenshots and unsafe content in one pass.
+
+    Byte-identical copies are found by hashing and embedded once; their
+    classification is copied from the representative.
+
+    Args:
+        folder: Folder to scan when files is not given
+        files: Optional list of image paths
+        threshold: Duplicate similarity threshold
+        progress_callback: Optional callback(current, total, status_text, detail_text)
+
+    Returns:
+        dict with keys:
+            'files':             list of scanned paths
+            'duplicate_groups':  list of duplicate groups (lists of paths)
+            'duplicate_scores':  dict of path -> similarity to its group leader
+            'similarity_graph':  SimilarityGraph, for regrouping at another threshold
+            'classification':    [(path, 'people'|'screenshot', confidence, scores), ...]
+            'safe_content':      dict in the scan_folder_safe_content format
+            'error_images':      [path, ...] images that could not be embedded
+            'elapsed':           seconds
+    """
+    t0 = time.perf_counter()
+    if files is None:
+        files = list_images(folder)
+        prune_scan_caches(folder, files, extensions=IMG_EXT)
+    files = list(files)
+
+    representatives, exact_copies = split_exact_duplicates(files, find_exact_duplicates(files, progress_callback))
+    embeddings = get_clip_embeddings_cached(representatives, progress_callback=progress_callback)
+    embedded = [f for f in representatives if f in embeddings]
+    embedded_set = set(embedded)
+    errors = [path for rep in representatives if rep not in embedded_set
+              for path in [rep] + exact_copies.get(rep, [])]
+
+    graph = build_similarity_graph(embeddings, embedded, min_threshold=min(MIN_GROUPING_THRESHOLD, threshold),
+                                   progress_callback=progress_callback, exact_copies=exact_copies)
+    groups, scores = graph.group(threshold, return_scores=True, progress_callback=progress_callback)
+
+    if progress_callback:
+        progress_callback(len(embedded), len(embedded), "Classifying Images...",
+                          "Matching embeddings against people, screenshot and content prompts")
+
+    def with_copies(results):
+        # Exact copies share their representative's label
+        out = []
+        for path, label, conf, label_scores in results:
+            out.append((path, label, conf, label_scores))
+            out.extend((copy, label, conf, label_scores) for copy in exact_copies.get(path, []))
+        return out
+
+    classification = with_copies(classify_embeddings(embedded, embeddings, ImageClassification.LABELS))
+    content_results = with_copies(classify_embeddings(embedded, embeddings, SafeContentDetection.LABELS))
+    content_results.extend((path, 'error', 0.0, {}) for path in errors)
+
+    elapsed = time.perf_counter() - t0
+    print(f"[LOG] Analyzed {len(files)} images ({len(embedded)} unique) in {elapsed:.2f}s")
+    return {
+        'files': files,
+        'duplicate_groups': groups,
+        'duplicate_scores': scores,
+        'similarity_graph': graph,
+        'classification': classification,
+        'safe_content': SafeContentDetection.summarize_content_results(content_results),
+        'error_images': errors,
+        'elapsed': elapsed,
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    result = analyze_folder(sys.argv[1] if len(sys.argv) > 1 else "test_images")
+    print(f"Duplicate groups: {len(result['duplicate_groups'])}")
+    screenshots = sum(1 for _, label, _, _ in result['classification'] if label == 'screenshot')
+    print(f"Screenshots: {screenshots}, people: {len(result['classification']) - screenshots}")
+    print(f"Flagged content: {result['safe_content']['total_flagged']}")
+    print(f"Done {len(result['files'])} images in {result['elapsed']:.2f}s")
@@ -0,0 +1,446 @@
+"""
+GUI for the Library Analyzer
+Runs LibraryAnalyzer.analyze_folder, the one-pass scan that embeds every image
+once and feeds that embedding to the duplicate finder, the people/screenshot
+classifier and the safe content scanner, and shows the three result sets
+side by side. The embeddings land in the shared cache, so opening one of the
+dedicated tools on the same folder afterwards does not run the model again.
+"""
+
+import threading
+
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+
+from LibraryAnalyzer import analyze_folder, IMG_EXT
+from FileScanner import scan_image_files
+from CommonUI import (ToolTip, ModernColors, ProgressWindow, ModernStyling,
+                      StatusBar, ModernButton, ImageUtils, TrashManager, FileOperations, ResultTree,
+                      VirtualGrid)
+from ThumbnailService import ThumbnailService
+
+# (item_id, tree text) in display order; every id but "duplicates" is a classifier or content label
+CATEGORIES = [
+    ("duplicates", "Duplicates"),
+    ("screenshot", "Screenshots"),
+    ("people", "People"),
+    ("adult", "Adult Content"),
+    ("violent", "Violent / Gore"),
+    ("disturbing", "Disturbing"),
+]
+
+
+class LibraryAnalyzerApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("PhotoSift - Analyze Library")
+        self.root.state('zoomed')
+
+        self.folder = ""
+        self.files = []
+        self.duplicate_groups = []   # [[leader, duplicate, ...], ...]
+        self.duplicate_scores = {}   # {path: similarity to its group leader}
+        self.group_index = {}        # {path: group number, from 1}
+        self.labels = {}             # {path: (label, confidence)}, classifier and content labels
+        self.category_paths = {item_id: [] for item_id, _ in CATEGORIES}
+
+        self.current_category = None
+        self.thumbnails = ThumbnailService(self.root)  # Decodes thumbnails off the UI thread
+        self._cleaning_in_progress = False
+        self._scan_in_progress = False
+
+        self.thumb_size = (240, 180)
+        self.min_thumb_size = (60, 45)
+        self.max_thumb_size = (580, 360)
+
+        self.colors = ModernColors.get_color_scheme()
+        self.progress_window = ProgressWindow(self.root, "Analyzing Library")
+
+        self.setup_ui()
+        ModernStyling.apply_modern_styling(self.colors)
+        self.root.after(100, self.apply_dark_theme_fix)
+
+    def apply_dark_theme_fix(self):
+        """Ensure dark theme is properly applied to the treeview."""
+        try:
+            style = ttk.Style()
+            style.configure("Treeview",
+                            fieldbackground=self.colors['bg_card'],
+                            background=self.colors['bg_card'],
+                            foreground=self.colors['text_primary'],
+                            borderwidth=0)
+            style.map("Treeview",
+                      background=[('selected', self.colors['accent']),
+                                  ('active', self.colors['bg_secondary'])],
+                      foreground=[('selected', self.colors['text_primary']),
+                                  ('active', self.colors['text_primary'])])
+            self.tree.configure(style="Treeview")
+        except Exception as e:
+            print(f"Error applying dark theme fix: {e}")
+
+    def setup_ui(self):
+        self.root.configure(bg=self.colors['bg_primary'])
+
+        # Header
+        header = tk.Frame(self.root, bg=self.colors['bg_primary'], height=80)
+        header.pack(fill=tk.X, padx=20, pady=(20, 0))
+        header.pack_propagate(False)
+
+        title_frame = tk.Frame(header, bg=self.colors['bg_primary'])
+        title_frame.pack(side=tk.LEFT, fill=tk.Y)
+
+        tk.Label(title_frame, text="PhotoSift",
+                 font=("Segoe UI", 28, "bold"),
+                 bg=self.colors['bg_primary'],
+                 fg=self.colors['text_primary']).pack(anchor="w")
+
+        tk.Label(title_frame, text="Analyze Library",
+                 font=("Segoe UI", 14),
+                 bg=self.colors['bg_primary'],
+                 fg=self.colors['text_secondary']).pack(anchor="w")
+
+        # Trash manager in header
+        header_buttons = tk.Frame(header, bg=self.colors['bg_primary'])
+        header_buttons.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.trash_manager = TrashManager(
+            header_buttons, self.colors, lambda: self.folder, IMG_EXT, button_style="emoji")
+        self.trash_manager.pack(side=tk.RIGHT, padx=(10, 0))
+
+        # Main content layout
+        content = tk.Frame(self.root, bg=self.colors['bg_primary'])
+        content.pack(fill=tk.BOTH, expand=True, padx=20, pady=(20, 20))
+
+        # Left sidebar
+        left_panel = tk.Frame(content, width=300, bg=self.colors['bg_sidebar'])
+        left_panel.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 20))
+        left_panel.pack_propagate(False)
+
+        # Right main area
+        main_area = tk.Frame(content, bg=self.colors['bg_primary'])
+        main_area.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        self.right_frame = main_area
+
+        # --- Sidebar contents ---
+
+        # Folder selection
+        folder_frame = tk.Frame(left_panel, bg=self.colors['bg_sidebar'])
+        folder_frame.pack(fill=tk.X, padx=20, pady=(20, 15))
+
+        btn_select = ModernButton.create_primary_button(
+            folder_frame, text="Select Folder", command=self.select_folder, colors=self.colors)
+        btn_select.pack(fill=tk.X)
+        ToolTip(btn_select, "Select a folder to analyze")
+
+        self.lbl_folder = tk.Label(folder_frame, text="No folder selected",
+                                   wraplength=260, justify=tk.LEFT,
+                                   bg=self.colors['bg_sidebar'],
+                                   fg=self.colors['text_secondary'],
+                                   font=("Segoe UI", 10))
+        self.lbl_folder.pack(fill=tk.X, pady=(8, 0))
+
+        # Scan button
+        btn_scan = ModernButton.create_primary_button(
+            left_panel, text="Analyze", command=self.start_scan, colors=self.colors)
+        btn_scan.pack(fill=tk.X, padx=20, pady=(0, 15))
+        ToolTip(btn_scan, "Find duplicates, screenshots and unsafe content in one pass over the folder")
+
+        # Categories tree
+        categories_section = tk.Frame(left_panel, bg=self.colors['bg_sidebar'])
+        categories_section.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 15))
+
+        tk.Label(categories_section, text="Results",
+                 bg=self.colors['bg_sidebar'],
+                 font=("Segoe UI", 14, "bold"),
+                 fg=self.colors['text_primary']).pack(anchor="w", pady=(0, 10))
+
+        tree_frame = tk.Frame(categories_section, bg=self.colors['bg_card'])
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+
+        tree_scroll = ttk.Scrollbar(tree_frame, orient="vertical",
+                                    style="Modern.Vertical.TScrollbar")
+        self.tree = ttk.Treeview(tree_frame, columns=("count",),
+                                  show="tree headings", style="Treeview",
+                                  yscrollcommand=tree_scroll.set)
+        tree_scroll.config(command=self.tree.yview)
+
+        self.tree.heading("#0", text="Category")
+        self.tree.heading("count", text="Count")
+        self.tree.column("#0", width=150)
+        self.tree.column("count", width=50, anchor="e")
+
+        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
+
+        # --- Right panel ---
+
+        # Navigation bar (zoom + actions)
+        nav_bar = tk.Frame(self.right_frame, bg=self.colors['bg_primary'], height=60)
+        nav_bar.pack(fill=tk.X, pady=(0, 20))
+        nav_bar.pack_propagate(False)
+
+        # Zoom controls
+        zoom_frame = tk.Frame(nav_bar, bg=self.colors['bg_primary'])
+        zoom_frame.pack(side=tk.LEFT, fill=tk.Y)
+
+        self.zoom_out_btn = tk.Button(zoom_frame, text="\U0001f50d-",
+                                      command=self.zoom_out,
+                                      font=("Segoe UI", 14),
+                                      bg=self.colors['bg_secondary'],
+                                      fg=self.colors['text_primary'],
+                                      activebackground=self.colors['bg_card'],
+                                      bd=0, relief=tk.FLAT, cursor="hand2",
+                                      padx=12, pady=8)
+        self.zoom_out_btn.pack(side=tk.LEFT, padx=(0, 5))
+
+        self.zoom_in_btn = tk.Button(zoom_frame, text="\U0001f50d+",
+                                     command=self.zoom_in,
+                                     font=("Segoe UI", 14),
+                                     bg=self.colors['bg_secondary'],
+                                     fg=self.colors['text_primary'],
+                                     activebackground=self.colors['bg_card'],
+                                     bd=0, relief=tk.FLAT, cursor="hand2",
+                                     padx=12, pady=8)
+        self.zoom_in_btn.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.zoom_label = tk.Label(zoom_frame, text="100%",
+                                   font=("Segoe UI", 12),
+                                   bg=self.colors['bg_primary'],
+                                   fg=self.colors['text_secondary'])
+        self.zoom_label.pack(side=tk.LEFT, fill=tk.Y)
+
+        # Action buttons (right-aligned)
+        action_frame = tk.Frame(nav_bar, bg=self.colors['bg_primary'])
+        action_frame.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.select_all_btn_var = tk.StringVar(value="Select All")
+        self.select_all_btn = ModernButton.create_primary_button(
+            action_frame, "", self.select_all_photos, self.colors,
+            textvariable=self.select_all_btn_var)
+        self.select_all_btn.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.clean_btn_var = tk.StringVar(value="Clean (0)")
+        self.clean_btn = ModernButton.create_danger_button(
+            action_frame, "", self.clean_selected_photos, self.colors,
+            textvariable=self.clean_btn_var)
+        self.clean_btn.pack(side=tk.LEFT, padx=(0, 10))
+
+        # Thumbnail area
+        thumb_container = tk.Frame(self.right_frame, bg=self.colors['bg_primary'])
+        thumb_container.pack(fill=tk.BOTH, expand=True)
+
+        self.thumb_grid = VirtualGrid(thumb_container, self.colors, self.thumbnails, thumb_size=self.thumb_size,
+                                      describe=self.describe_card, on_open=self.open_full_image,
+                                      on_selection_change=self.on_selection_change)
+        self.thumb_grid.pack(fill=tk.BOTH, expand=True, padx=20)
+        self.thumb_canvas = self.thumb_grid.canvas
+        self.thumb_canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+
+        # Status bar
+        self.status_bar = StatusBar(self.root, colors=self.colors)
+        self.status_bar.set_text("Ready")
+
+    # --- Event handlers ---
+
+    def _on_mousewheel(self, event):
+        if self.thumb_canvas.winfo_exists():
+            self.thumb_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+
+    # --- Zoom ---
+
+    def zoom_in(self):
+        w, h = self.thumb_size
+        nw = min(w + 60, self.max_thumb_size[0])
+        nh = min(h + 45, self.max_thumb_size[1])
+        if (nw, nh) != self.thumb_size:
+            self.thumb_size = (nw, nh)
+            self.thumbnails.cancel_pending()  # Drop queued work at the old size; cached sizes stay for zooming back
+            self.update_zoom_controls()
+            self.thumb_grid.set_thumb_size(self.thumb_size)
+
+    def zoom_out(self):
+        w, h = self.thumb_size
+        nw = max(w - 60, self.min_thumb_size[0])
+        nh = max(h - 45, self.min_thumb_size[1])
+        if (nw, nh) != self.thumb_size:
+            self.thumb_size = (nw, nh)
+            self.thumbnails.cancel_pending()  # Drop queued work at the old size; cached sizes stay for zooming back
+            self.update_zoom_controls()
+            self.thumb_grid.set_thumb_size(self.thumb_size)
+
+    def update_zoom_controls(self):
+        self.zoom_in_btn.config(
+            state=tk.NORMAL if self.thumb_size[0] < self.max_thumb_size[0] else tk.DISABLED)
+        self.zoom_out_btn.config(
+            state=tk.NORMAL if self.thumb_size[0] > self.min_thumb_size[0] else tk.DISABLED)
+        zoom_percent = int((self.thumb_size[0] / 240) * 100)
+        self.zoom_label.config(text=f"{zoom_percent}%")
+
+    # --- Folder / scan ---
+
+    def select_folder(self):
+        folder = filedialog.askdirectory()
+        if folder:
+            self.folder = folder
+            self.lbl_folder.config(text=folder)
+            self.status_bar.set_text(f"Selected folder: {folder}")
+            self.trash_manager.update_trash_count()
+
+    def start_scan(self):
+        if self._scan_in_progress:
+            return
+        if not self.folder:
+            messagebox.showerror("Error", "Please select a folder first.")
+            return
+        files = scan_image_files(self.folder, IMG_EXT).files
+        if not files:
+            messagebox.showinfo("No Images Found", "No images found in the selected folder.")
+            return
+        self.progress_window.show(total=len(files), initial_text="Loading AI model...")
+        self._scan_in_progress = True
+        threading.Thread(target=self._scan_thread, args=(self.folder, files), daemon=True).start()
+
+    def _scan_thread(self, folder, files):
+        def progress_callback(current, total, status_text, detail_text):
+            # The progress window polls this on the main thread
+            self.progress_window.report(current, total, status_text, detail_text)
+
+        try:
+            from DuplicateImageIdentifier import prune_scan_caches
+            # Cached embeddings of unchanged files are reused; drop deleted ones
+            prune_scan_caches(folder, files, extensions=IMG_EXT)
+            result = analyze_folder(files=files, progress_callback=progress_callback)
+        except Exception as e:
+            print(f"[WARN] Library analysis failed: {e}")
+            self.root.after(0, self.on_scan_failed, str(e))
+            return
+        self.root.after(0, self.on_scan_complete, result)
+
+    # --- Results ---
+
+    def on_scan_failed(self, error):
+        self.progress_window.close()
+        self._scan_in_progress = False
+        messagebox.showerror("Error", f"Analysis failed: {error}")
+
+    def on_scan_complete(self, result):
+        self.progress_window.close()
+        self._scan_in_progress = False
+        self.files = result['files']
+        self.duplicate_groups = result['duplicate_groups']
+        self.duplicate_scores = result['duplicate_scores']
+        self.labels = {path: (label, conf) for path, label, conf, _ in result['classification']}
+        for key in ('adult', 'violent', 'disturbing'):
+            for path, conf, _ in result['safe_content'][f'{key}_images']:
+                # Unsafe content outranks the people/screenshot label on the card
+                self.labels[path] = (key, conf)
+        self._apply_results()
+
+        duplicates = sum(len(group) - 1 for group in self.duplicate_groups)
+        self.status_bar.set_text(
+            f"Analysis complete. {len(self.files)} images in {result['elapsed']:.1f}s: "
+            f"{duplicates} duplicates, {len(self.category_paths['screenshot'])} screenshots, "
+            f"{result['safe_content']['total_flagged']} flagged.")
+
+        selected = self.tree.selection()
+        category = selected[0] if selected else "duplicates"
+        self.tree.selection_set(category)
+        self.show_thumbnails_for_category(category)
+
+    def _apply_results(self):
+        """Rebuild the per-category path lists and tree counts from the current results"""
+        self.group_index = {path: i for i, group in enumerate(self.duplicate_groups, 1) for path in group}
+        self.category_paths = {item_id: [] for item_id, _ in CATEGORIES}
+        # Groups are shown whole, leader first, so each duplicate is seen next to its original
+        self.category_paths['duplicates'] = [path for group in self.duplicate_groups for path in group]
+        classifier_labels = {}
+        for path in self.files:
+            entry = self.labels.get(path)
+            if entry is not None:
+                classifier_labels.setdefault(entry[0], []).append(path)
+        for item_id in ('screenshot', 'people', 'adult', 'violent', 'disturbing'):
+            self.category_paths[item_id] = classifier_labels.get(item_id, [])
+
+        ResultTree.set_counts(self.tree, [
+            ("duplicates", "Duplicates", sum(len(group) - 1 for group in self.duplicate_groups)),
+        ] + [(item_id, text, len(self.category_paths[item_id])) for item_id, text in CATEGORIES[1:]])
+
+    def on_tree_select(self, event):
+        selected = self.tree.selection()
+        if not selected:
+            return
+        self.show_thumbnails_for_category(selected[0])
+
+    def show_thumbnails_for_category(self, category, keep_position=False):
+        self.current_category = category
+        self.thumb_grid.set_items(self.category_paths.get(category, []), keep_position=keep_position)
+        self.update_zoom_controls()
+
+    def describe_card(self, path):
+        """Info line for a thumbnail card: duplicate group and similarity, or label and confidence"""
+        if self.current_category == "duplicates":
+            group = self.group_index.get(path)
+            score = self.duplicate_scores.get(path, 1.0)
+            if self.duplicate_groups[group - 1][0] == path:
+                return f"Group {group}: original", self.colors['success'], None
+            return f"Group {group}: {score * 100:.0f}% similar", self.colors['warning'], None
+        entry = self.labels.get(path)
+        if entry is None:
+            return "Unknown", self.colors['text_secondary'], None
+        label, confidence = entry
+        if label in ('adult', 'violent'):
+            score_color = self.colors['danger']
+        elif label in ('disturbing', 'screenshot'):
+            score_color = self.colors['warning']
+        else:
+            score_color = self.colors['success']
+        return f"{label.title()}: {confidence * 100:.0f}%", score_color, None
+
+    def select_all_photos(self):
+        if not self.thumb_grid.items:
+            return
+        # Covers the whole category, including cards scrolled out of view
+        self.thumb_grid.set_all_selected(not self.thumb_grid.all_selected())
+
+    def on_selection_change(self):
+        """Update the Clean and Select All buttons after the grid's selection changes"""
+        self.clean_btn_var.set(f"Clean ({self.thumb_grid.selection_count()})")
+        self.select_all_btn_var.set("Unselect All" if self.thumb_grid.all_selected() else "Select All")
+
+    def clean_selected_photos(self):
+        if self._cleaning_in_progress:
+            return
+        if self._scan_in_progress:
+            messagebox.showinfo("Clean", "Please wait for the analysis to finish before cleaning photos.")
+            return
+        selected_paths = set(self.thumb_grid.selected_paths())
+        if not selected_paths:
+            messagebox.showinfo("Clean", "No photos selected.")
+            return
+        self._cleaning_in_progress = True
+        try:
+            moved_count, failed_files = FileOperations.move_images_to_trash(
+                list(selected_paths), self.folder)
+            FileOperations.show_clean_completion_popup(self.root, moved_count, failed_files)
+            self.trash_manager.update_trash_count()
+
+            # Drop moved files from every result set; groups left with one image are no longer duplicates
+            self.files = [p for p in self.files if p not in selected_paths]
+            groups = ([p for p in group if p not in selected_paths] for group in self.duplicate_groups)
+            self.duplicate_groups = [group for group in groups if len(group) > 1]
+            self._apply_results()
+            self.show_thumbnails_for_category(self.current_category, keep_position=True)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+        finally:
+            self._cleaning_in_progress = False
+
+    def open_full_image(self, path):
+        ImageUtils.open_full_image(self.root, path)
+
+
+if __name__ == '__main__':
+    root = tk.Tk()
+    app = LibraryAnalyzerApp(root)
+    root.mainloop()
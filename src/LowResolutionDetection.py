@@ -1,14 +1,18 @@
 """
 Low Resolution Image Detection Module
-Detects images below a minimum pixel dimension threshold using PIL metadata.
+Detects images below a minimum pixel dimension threshold by reading image
+headers only (see ImageHeader).
 """
 
 import os
 import multiprocessing
-from PIL import Image
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from FileScanner import scan_image_files
+from ImageHeader import read_image_size
+from ImageQualityAnalyzer import ResultBatcher
+
 
 class LowResolutionDetector:
     def __init__(self, min_width=1280, min_height=720):
@@ -16,10 +20,9 @@ class LowResolutionDetector:
         self.min_height = min_height
 
     def get_dimensions(self, image_path):
-        """Return (width, height) or (-1, -1) on failure."""
+        """Return the EXIF-oriented (width, height) or (-1, -1) on failure."""
         try:
-            with Image.open(str(image_path)) as img:
-                return img.size  # (width, height)
+            return read_image_size(image_path)
         except Exception as e:
             print(f"Error reading {image_path}: {e}")
             return (-1, -1)
@@ -46,9 +49,12 @@ class LowResolutionDetector:
 
 
 def detect_low_res_images_batch(folder_path, min_width=1280, min_height=720,
-                                 progress_callback=None, max_workers=None):
+                                 progress_callback=None, max_workers=None, manifest=None, result_callback=None):
     """
     Scan folder for images below the minimum dimensions.
+    Pass manifest (FileManifest) to reuse an existing directory walk, and
+    result_callback([(path, width, height, is_low_res), ...]) to receive
+    unsorted result chunks while the scan runs.
 
     Returns:
         dict: {
@@ -59,17 +65,10 @@ def detect_low_res_images_batch(folder_path, min_width=1280, min_height=720,
         }
     """
     detector = LowResolutionDetector(min_width=min_width, min_height=min_height)
-    image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.webp'}
-
-    image_files = []
-    for ext in image_extensions:
-        for img_path in Path(folder_path).rglob(f'*{ext}'):
-            if 'Trash' not in img_path.parts:
-                image_files.append(img_path)
-        for img_path in Path(folder_path).rglob(f'*{ext.upper()}'):
-            if 'Trash' not in img_path.parts:
-                image_files.append(img_path)
-    image_files = list(set(image_files))  # deduplicate
+    # One directory walk with Trash pruned, unless the caller already has a manifest
+    if manifest is None:
+        manifest = scan_image_files(folder_path)
+    image_files = [Path(p) for p in manifest]
 
     if max_workers is None:
         max_workers = min(multiprocessing.cpu_count(), 8)
@@ -78,6 +77,7 @@ def detect_low_res_images_batch(folder_path, min_width=1280, min_height=720,
     ok_images = []
     total = len(image_files)
     processed = 0
+    stream = ResultBatcher(result_callback)
 
     def process_single(img_path):
         flag, w, h = detector.is_low_res(str(img_path))
@@ -94,12 +94,14 @@ def detect_low_res_images_batch(folder_path, min_width=1280, min_height=720,
                         low_res_images.append((path_str, w, h))
                     else:
                         ok_images.append((path_str, w, h))
+                    stream.add((path_str, w, h, flag))
                 processed += 1
                 if progress_callback:
                     progress_callback(processed, total, img_path.name)
             except Exception as e:
                 print(f"Error: {e}")
                 processed += 1
+    stream.flush()
 
     # Sort: low-res ascending by short side (worst first); ok descending
     low_res_images.sort(key=lambda x: min(x[1], x[2]))
@@ -12,12 +12,16 @@ from pathlib import Path
 # Third-party imports
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-from PIL import Image, ImageTk
 
 # Local imports
-from LowResolutionDetection import detect_low_res_images_batch, get_recommended_thresholds, LowResolutionDetector
+from LowResolutionDetection import get_recommended_thresholds, LowResolutionDetector
+from ImageQualityAnalyzer import (scan_folder_quality, low_res_results, dimension_items, DimensionIndex,
+                                  StreamingSplit)
+from FileScanner import scan_image_files
 from CommonUI import (ToolTip, ModernColors, ProgressWindow, ModernStyling,
-                     StatusBar, ZoomControls, ModernButton, ImageUtils, TrashManager, FileOperations)
+                     StatusBar, ZoomControls, ModernButton, ImageUtils, TrashManager, FileOperations,
+                     ResultTree, VirtualGrid)
+from ThumbnailService import ThumbnailService
 
 class LowResolutionApp:
     def __init__(self, root):
@@ -27,17 +31,16 @@ class LowResolutionApp:
         self.root.state('zoomed')  # Windows maximized state
 
         self.folder = ""
+        self.manifest = None  # FileManifest from the last folder walk
+        self.dimension_index = None  # Dimensions from the last scan, for re-applying the minimum
         self.low_res_images = []   # list of (path, width, height)
         self.ok_images = []        # list of (path, width, height)
         self.dimensions = {}       # path -> (width, height)
+        self.low_res_paths = set()
         self.current_paths = []
-        self.current_page = 0
-        self.page_size = 50
-        self.thumb_imgs = []
-        self.image_cache = {}
-        self.selected_check_vars = []
-        self._trash_icon_cache = {}
+        self.thumbnails = ThumbnailService(self.root)  # Decodes thumbnails off the UI thread
         self._cleaning_in_progress = False
+        self._scan_in_progress = False  # Results stream in while a scan runs
         self.detector = LowResolutionDetector()
 
         # Thumbnail size configuration
@@ -190,6 +193,13 @@ class LowResolutionApp:
             btn.pack(side=tk.LEFT, padx=(0, 4))
             ToolTip(btn, f"Flag images below {w}x{h}")
 
+        # Re-apply button (shown only after a scan completes)
+        self.reapply_btn = ModernButton.create_secondary_button(
+            threshold_frame, "Re-apply Minimum", self.reapply_threshold, self.colors)
+        ToolTip(self.reapply_btn,
+                "Split the last scan's images at the current minimum resolution.\n"
+                "Instant, since images don't need to be re-read.")
+
         # Scan button
         btn_scan = ModernButton.create_primary_button(left_panel, text="Start Scan", command=self.start_scan, colors=self.colors)
         btn_scan.pack(fill=tk.X, padx=20)
@@ -282,53 +292,12 @@ class LowResolutionApp:
         thumb_container = tk.Frame(self.right_frame, bg=self.colors['bg_primary'])
         thumb_container.pack(fill=tk.BOTH, expand=True)
 
-        # Pagination controls at top
-        self.page_frame = tk.Frame(thumb_container, bg=self.colors['bg_primary'], height=50)
-        self.page_frame.pack(fill=tk.X, pady=(0, 20))
-        self.page_frame.pack_propagate(False)
-
-        # Center container for navigation
-        nav_center = tk.Frame(self.page_frame, bg=self.colors['bg_primary'])
-        nav_center.pack(expand=True)
-
-        nav_btn_style = {"font": ("Segoe UI", 12),
-                        "bg": self.colors['bg_secondary'],
-                        "fg": self.colors['text_primary'],
-                        "activebackground": self.colors['bg_card'],
-                        "activeforeground": self.colors['text_primary'],
-                        "bd": 0, "padx": 20, "pady": 8, "cursor": "hand2"}
-
-        self.prev_page_btn = tk.Button(nav_center, text="← Previous", command=self.prev_page, **nav_btn_style)
-        self.prev_page_btn.pack(side=tk.LEFT, padx=(0, 15))
-
-        self.page_label = tk.Label(nav_center, text="Page 1 of 1",
-                                  font=("Segoe UI", 12, "bold"),
-                                  bg=self.colors['bg_primary'],
-                                  fg=self.colors['text_primary'])
-        self.page_label.pack(side=tk.LEFT, padx=20)
-
-        self.next_page_btn = tk.Button(nav_center, text="Next →", command=self.next_page, **nav_btn_style)
-        self.next_page_btn.pack(side=tk.LEFT, padx=(15, 0))
-
-        self.page_frame.pack_forget()  # Hide initially
-
-        # Thumbnail display area
-        content_frame = tk.Frame(thumb_container, bg=self.colors['bg_primary'])
-        content_frame.pack(fill=tk.BOTH, expand=True, padx=20)
-
-        self.thumb_canvas = tk.Canvas(content_frame, bg=self.colors['bg_primary'], highlightthickness=0, bd=0)
-        self.thumb_scrollbar = ttk.Scrollbar(content_frame, orient="vertical", command=self.thumb_canvas.yview, style="Modern.Vertical.TScrollbar")
-        self.thumbs_frame = tk.Frame(self.thumb_canvas, bg=self.colors['bg_primary'])
-
-        self.thumb_canvas.configure(yscrollcommand=self.thumb_scrollbar.set)
-        self.thumb_canvas.create_window((0, 0), window=self.thumbs_frame, anchor="nw")
-        self.thumbs_frame.bind("<Configure>", lambda e: self.thumb_canvas.configure(scrollregion=self.thumb_canvas.bbox("all")))
-
-        self.thumb_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.thumb_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-        # Bind canvas configure event
-        self.thumb_canvas.bind("<Configure>", self.on_canvas_configure)
+        # Thumbnail grid: only the cards in view are built, so a whole category is one scroll
+        self.thumb_grid = VirtualGrid(thumb_container, self.colors, self.thumbnails, thumb_size=self.thumb_size,
+                                      describe=self.describe_card, on_open=self.open_full_image,
+                                      on_selection_change=self.on_selection_change)
+        self.thumb_grid.pack(fill=tk.BOTH, expand=True, padx=20)
+        self.thumb_canvas = self.thumb_grid.canvas
         self.thumb_canvas.bind_all("<MouseWheel>", self._on_mousewheel)
 
         # Status bar
@@ -339,18 +308,23 @@ class LowResolutionApp:
         if self.thumb_canvas.winfo_exists():
             self.thumb_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
 
-    def on_canvas_configure(self, event=None):
-        self.thumb_canvas.configure(scrollregion=self.thumb_canvas.bbox("all"))
-        if event and hasattr(self, 'last_width') and abs(event.width - self.last_width) < 50:
-            return
-        self.last_width = event.width if event else self.thumb_canvas.winfo_width()
-        if hasattr(self, 'current_paths') and self.current_paths:
-            sel = self.tree.selection()
-            self.show_thumbnails_for_category(sel[0] if sel else "low_res")
-
     def _apply_preset(self, width, height):
         self.min_width_var.set(width)
         self.min_height_var.set(height)
+        if self.dimension_index is not None:
+            self.reapply_threshold()
+
+    def reapply_threshold(self):
+        """Re-split the last scan's dimensions at the current minimum without rescanning"""
+        if self._scan_in_progress:
+            return
+        if self.dimension_index is None:
+            messagebox.showinfo("No Data", "Please scan a folder first before re-applying the minimum.")
+            return
+        min_width, min_height = self.min_width_var.get(), self.min_height_var.get()
+        self.on_scan_complete(low_res_results(self.dimension_index, min_width=min_width, min_height=min_height))
+        self.status_bar.set_text(f"Minimum {min_width}x{min_height} applied. "
+                                 f"Found {len(self.low_res_images)} low resolution images.")
 
     def zoom_in(self):
         width, height = self.thumb_size
@@ -358,10 +332,9 @@ class LowResolutionApp:
         new_height = min(height + 45, self.max_thumb_size[1])
         if (new_width, new_height) != self.thumb_size:
             self.thumb_size = (new_width, new_height)
-            self.image_cache.clear()
+            self.thumbnails.cancel_pending()  # Drop queued work at the old size; cached sizes stay for zooming back
             self.update_zoom_controls()
-            if self.current_paths:
-                self.display_page()
+            self.thumb_grid.set_thumb_size(self.thumb_size)
 
     def zoom_out(self):
         width, height = self.thumb_size
@@ -369,10 +342,9 @@ class LowResolutionApp:
         new_height = max(height - 45, self.min_thumb_size[1])
         if (new_width, new_height) != self.thumb_size:
             self.thumb_size = (new_width, new_height)
-            self.image_cache.clear()
+            self.thumbnails.cancel_pending()  # Drop queued work at the old size; cached sizes stay for zooming back
             self.update_zoom_controls()
-            if self.current_paths:
-                self.display_page()
+            self.thumb_grid.set_thumb_size(self.thumb_size)
 
     def update_zoom_controls(self):
         can_zoom_in = self.thumb_size[0] < self.max_thumb_size[0]
@@ -383,18 +355,14 @@ class LowResolutionApp:
         self.zoom_label.config(text=f"{zoom_percent}%")
 
     def _get_image_count(self, folder_path):
-        image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.webp'}
-        count = 0
+        """Walk the folder once (excluding Trash) and keep the manifest for the scan."""
         try:
-            for ext in image_extensions:
-                for img_path in Path(folder_path).rglob(f'*{ext}'):
-                    if 'Trash' not in img_path.parts: count += 1
-                for img_path in Path(folder_path).rglob(f'*{ext.upper()}'):
-                    if 'Trash' not in img_path.parts: count += 1
-            return count
+            self.manifest = scan_image_files(folder_path)
         except Exception as e:
             print(f"Error counting images: {e}")
+            self.manifest = None
             return 0
+        return len(self.manifest)
 
     def select_folder(self):
         folder = filedialog.askdirectory()
@@ -405,6 +373,8 @@ class LowResolutionApp:
             self.trash_manager.update_trash_count()
 
     def start_scan(self):
+        if self._scan_in_progress:
+            return
         if not self.folder:
             messagebox.showerror("Error", "Please select a folder first.")
             return
@@ -412,32 +382,97 @@ class LowResolutionApp:
         if total_images == 0:
             messagebox.showinfo("No Images Found", "No images found in the selected folder.")
             return
-        self.progress_window.show(total=total_images, initial_text="Preparing to scan...")
+        # Non-modal: results can be reviewed as they stream in
+        self.progress_window.show(total=total_images, initial_text="Preparing to scan...", modal=False)
         min_width = self.min_width_var.get()
         min_height = self.min_height_var.get()
-        threading.Thread(target=self._scan_thread, args=(self.folder, min_width, min_height), daemon=True).start()
-
-    def _scan_thread(self, folder, min_width, min_height):
+        self._scan_in_progress = True
+        self._clear_results()
+        # Partial results are merged into this split as they arrive, ordered by short side
+        self._partial = StreamingSplit(key=lambda item: min(item[1], item[2]),
+                                       is_below=lambda item: item[1] < min_width or item[2] < min_height)
+        threading.Thread(target=self._scan_thread, args=(self.folder, min_width, min_height, self.manifest),
+                         daemon=True).start()
+
+    def _scan_thread(self, folder, min_width, min_height, manifest):
         def progress_callback(current, total, filename):
-            self.root.after(0, self.progress_window.update, current, total, f"Processing: {filename}", f"{current}/{total}")
-        results = detect_low_res_images_batch(folder, min_width=min_width, min_height=min_height,
-                                               progress_callback=progress_callback)
-        self.root.after(0, self.on_scan_complete, results)
+            # The progress window polls this on the main thread
+            self.progress_window.report(current, total, f"Processing: {filename}", f"{current}/{total}")
 
-    def on_scan_complete(self, results):
-        self.progress_window.close()
+        def result_callback(records):
+            # Runs on the scan thread; the UI merges each new chunk into its sorted lists
+            self.root.after(0, self.on_partial_results, records)
+
+        try:
+            # Dimensions only: header reads, or records already decoded by the blur/dark tools
+            records = scan_folder_quality(folder, need_pixels=False, progress_callback=progress_callback,
+                                          manifest=manifest, result_callback=result_callback)
+        except Exception as e:
+            print(f"[WARN] Low resolution scan failed: {e}")
+            self.root.after(0, self.on_scan_failed, str(e))
+            return
+        dimension_index = DimensionIndex.from_records(records)
+        results = low_res_results(dimension_index, min_width=min_width, min_height=min_height)
+        self.root.after(0, self.on_scan_complete, results, dimension_index)
+
+    def _clear_results(self):
+        """Drop the previous scan's results before a new scan streams in"""
+        for i in self.tree.get_children(): self.tree.delete(i)
+        self.show_thumbnails_for_category(None)
+
+    def _apply_results(self, results):
         self.low_res_images = results['low_res_images']
         self.ok_images = results['ok_images']
         self.dimensions.clear()
         for path, w, h in self.low_res_images: self.dimensions[path] = (w, h)
+        self.low_res_paths = {path for path, _, _ in self.low_res_images}
         for path, w, h in self.ok_images: self.dimensions[path] = (w, h)
+        self._update_counts()
+
+    def _update_counts(self):
+        ResultTree.set_counts(self.tree, [("low_res", "Low Resolution", len(self.low_res_images)),
+                                          ("ok", "OK Resolution", len(self.ok_images))])
+
+    def on_partial_results(self, records):
+        """Merge a chunk of newly read images into the results shown while the scan keeps running"""
+        if not self._scan_in_progress: return
+        items = dimension_items(records)
+        low, _ = self._partial.extend(items)
+        for path, w, h in items:
+            self.dimensions[path] = (w, h)
+        self.low_res_images = self._partial.below.items
+        self.ok_images = self._partial.above.items
+        self.low_res_paths.update(path for path, _, _ in low)
+        self._update_counts()
+        self.status_bar.set_text(f"Scanning... {len(self.low_res_images)} low resolution images found so far.")
+        # Refresh the category being reviewed in place; scroll position and selection are kept
+        selected = self.tree.selection()
+        if not selected:
+            if self.low_res_images:
+                self.tree.selection_set("low_res")
+                self.show_thumbnails_for_category("low_res")
+        else:
+            self.show_thumbnails_for_category(selected[0], keep_position=True)
 
-        for i in self.tree.get_children(): self.tree.delete(i)
-        self.tree.insert("", "end", "low_res", text="Low Resolution", values=(len(self.low_res_images),))
-        self.tree.insert("", "end", "ok", text="OK Resolution", values=(len(self.ok_images),))
+    def on_scan_failed(self, error):
+        self.progress_window.close()
+        self._scan_in_progress = False
+        messagebox.showerror("Error", f"Scan failed: {error}")
+
+    def on_scan_complete(self, results, dimension_index=None):
+        self.progress_window.close()
+        self._scan_in_progress = False
+        if dimension_index is not None:
+            self.dimension_index = dimension_index
+            self.reapply_btn.pack(fill=tk.X, pady=(10, 0))
+        self._apply_results(results)
 
         self.status_bar.set_text(f"Scan complete. Found {len(self.low_res_images)} low resolution images.")
-        if self.low_res_images:
+        # Refresh the category being reviewed, or show low resolution images first
+        selected = self.tree.selection()
+        if selected:
+            self.show_thumbnails_for_category(selected[0], keep_position=True)
+        elif self.low_res_images:
             self.tree.selection_set("low_res")
             self.show_thumbnails_for_category("low_res")
 
@@ -447,128 +482,49 @@ class LowResolutionApp:
         category = selected_item[0]
         self.show_thumbnails_for_category(category)
 
-    def show_thumbnails_for_category(self, category):
+    def show_thumbnails_for_category(self, category, keep_position=False):
         if category == "low_res":
             self.current_paths = [p for p, w, h in self.low_res_images]
         elif category == "ok":
             self.current_paths = [p for p, w, h in self.ok_images]
         else:
             self.current_paths = []
-        self.current_page = 0
-        self.display_page()
-        if self.current_paths:
-            self.page_frame.pack(fill=tk.X, pady=(0, 20))
-        else:
-            self.page_frame.pack_forget()
-
-    def display_page(self):
-        self.root.config(cursor="wait")
-        for widget in self.thumbs_frame.winfo_children(): widget.destroy()
-        self.thumb_imgs.clear()
-        self.selected_check_vars.clear()
-
-        start_idx = self.current_page * self.page_size
-        end_idx = start_idx + self.page_size
-        page_paths = self.current_paths[start_idx:end_idx]
-
-        canvas_width = self.thumb_canvas.winfo_width()
-        if canvas_width < 200: canvas_width = 1000
-        thumb_width = self.thumb_size[0] + 30
-        cols = max(1, canvas_width // thumb_width)
-
-        for idx, path in enumerate(page_paths):
-            row, col = divmod(idx, cols)
-            self.thumbs_frame.grid_columnconfigure(col, weight=1)
-            card = tk.Frame(self.thumbs_frame, bd=0, bg=self.colors['bg_card'], highlightthickness=1, relief=tk.SOLID)
-            card.grid(row=row, column=col, padx=1, pady=1, sticky="nsew")
-
-            img_tk = self.get_thumbnail(path)
-            self.thumb_imgs.append(img_tk)
-            if img_tk is not None:
-                img_canvas = tk.Canvas(card, width=img_tk.width(), height=img_tk.height(), bg=self.colors['bg_card'], highlightthickness=0, bd=0)
-                img_canvas.pack(pady=5)
-                img_canvas.create_image(0, 0, anchor=tk.NW, image=img_tk)
-                img_canvas.image = img_tk  # Keep reference to prevent GC blanking
-                img_canvas.bind('<Double-Button-1>', lambda e, p=path: self.open_full_image(p))
-            else:
-                img_canvas = tk.Canvas(card, width=self.thumb_size[0], height=self.thumb_size[1], bg=self.colors['bg_card'], highlightthickness=0, bd=0)
-                img_canvas.pack(pady=5)
-                img_canvas.create_text(self.thumb_size[0]//2, self.thumb_size[1]//2, text="No Preview", fill=self.colors.get('text_secondary', 'gray'))
-                img_canvas.bind('<Double-Button-1>', lambda e, p=path: self.open_full_image(p))
-
-            info_frame = tk.Frame(card, bg=self.colors['bg_card'])
-            info_frame.pack(fill=tk.X, padx=5, pady=5)
-
-            var = tk.BooleanVar()
-            filename = os.path.basename(path)
-            if len(filename) > 25: filename = filename[:22] + "..."
-            chk = tk.Checkbutton(info_frame, text=filename, variable=var, font=("Segoe UI", 10, "bold"), bg=self.colors['bg_card'], fg=self.colors['text_primary'], selectcolor=self.colors['accent'], bd=0)
-            chk.pack(fill=tk.X)
-            var.trace_add('write', lambda *args, v=var, p=path, c=img_canvas: self.on_image_check(v, p, c))
-            self.selected_check_vars.append((var, path, img_canvas))
-
-            dims = self.dimensions.get(path, (-1, -1))
-            w, h = dims
-            quality = self.detector.get_resolution_quality(w, h)
-            is_low = any(p == path for p, _, _ in self.low_res_images)
-            score_color = self.colors['danger'] if is_low else self.colors['success']
-            dim_text = f"{w} x {h} ({quality})" if w != -1 else "Unknown"
-            score_label = tk.Label(info_frame, text=dim_text, bg=self.colors['bg_card'], fg=score_color, font=("Segoe UI", 9))
-            score_label.pack(fill=tk.X)
-            ToolTip(score_label, f"Image dimensions: {w}x{h} pixels\nQuality: {quality}")
-
-        self.update_page_controls()
+        self.thumb_grid.set_items(self.current_paths, keep_position=keep_position)
         self.update_zoom_controls()
-        self.root.config(cursor="")
 
-    def get_thumbnail(self, path):
-        cache_key = (path, self.thumb_size)
-        if cache_key in self.image_cache: return self.image_cache[cache_key]
-        try:
-            img = Image.open(path)
-            img.thumbnail(self.thumb_size, Image.Resampling.LANCZOS)
-            img_tk = ImageTk.PhotoImage(img)
-            self.image_cache[cache_key] = img_tk
-            return img_tk
-        except Exception: return None
-
-    def update_page_controls(self):
-        total_pages = max(1, (len(self.current_paths) - 1) // self.page_size + 1)
-        self.page_label.config(text=f"Page {self.current_page + 1} of {total_pages}")
-        self.prev_page_btn.config(state=tk.NORMAL if self.current_page > 0 else tk.DISABLED)
-        self.next_page_btn.config(state=tk.NORMAL if (self.current_page + 1) < total_pages else tk.DISABLED)
-
-    def prev_page(self):
-        if self.current_page > 0: self.current_page -= 1; self.display_page()
-
-    def next_page(self):
-        total_pages = (len(self.current_paths) - 1) // self.page_size + 1
-        if (self.current_page + 1) < total_pages: self.current_page += 1; self.display_page()
+    def describe_card(self, path):
+        """Info line for a thumbnail card: dimensions, red when below the minimum"""
+        w, h = self.dimensions.get(path, (-1, -1))
+        quality = self.detector.get_resolution_quality(w, h)
+        score_color = self.colors['danger'] if path in self.low_res_paths else self.colors['success']
+        dim_text = f"{w} x {h} ({quality})" if w != -1 else "Unknown"
+        return dim_text, score_color, f"Image dimensions: {w}x{h} pixels\nQuality: {quality}"
 
     def select_all_photos(self):
-        if not self.selected_check_vars: return
-        new_state = not self.selected_check_vars[0][0].get()
-        for var, path, canvas in self.selected_check_vars:
-            var.set(new_state)
-        self.update_select_all_button_text()
-
-    def update_select_all_button_text(self):
-        self.select_all_btn_var.set("Unselect All" if all(var.get() for var, _, _ in self.selected_check_vars) else "Select All")
+        if not self.current_paths:
+            return
+        # Covers the whole category, including cards scrolled out of view
+        self.thumb_grid.set_all_selected(not self.thumb_grid.all_selected())
 
-    def on_image_check(self, var, path, canvas):
-        ImageUtils.update_cross_overlay(self.selected_check_vars, var, path, self._trash_icon_cache)
-        self.clean_btn_var.set(f"Clean ({sum(1 for v, _, _ in self.selected_check_vars if v.get())})")
-        self.update_select_all_button_text()
+    def on_selection_change(self):
+        """Update the Clean and Select All buttons after the grid's selection changes"""
+        self.clean_btn_var.set(f"Clean ({self.thumb_grid.selection_count()})")
+        self.select_all_btn_var.set("Unselect All" if self.thumb_grid.all_selected() else "Select All")
 
     def clean_selected_photos(self):
         if self._cleaning_in_progress: return
-        selected_paths = [path for var, path, _ in self.selected_check_vars if var.get()]
+        if self._scan_in_progress:
+            messagebox.showinfo("Clean", "Please wait for the scan to finish before cleaning photos."); return
+        selected_paths = self.thumb_grid.selected_paths()
         if not selected_paths: messagebox.showinfo("Clean", "No photos selected."); return
         self._cleaning_in_progress = True
         try:
             moved_count, failed_files = FileOperations.move_images_to_trash(selected_paths, self.folder)
             FileOperations.show_clean_completion_popup(self.root, moved_count, failed_files)
             self.trash_manager.update_trash_count()
+            if self.dimension_index is not None:
+                self.dimension_index = self.dimension_index.without(selected_paths)
+            selected_paths = set(selected_paths)
             self.on_scan_complete({
                 'low_res_images': [(p, w, h) for p, w, h in self.low_res_images if p not in selected_paths],
                 'ok_images': [(p, w, h) for p, w, h in self.ok_images if p not in selected_paths],
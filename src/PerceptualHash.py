@@ -0,0 +1,214 @@
+"""
+Perceptual Hashing for PhotoSift
+64-bit dHash / pHash fingerprints computed from a tiny grayscale decode, plus
+Hamming-radius neighbor search (multi-index hash table for radii up to
+MULTI_INDEX_MAX_RADIUS, blocked vectorized scan for larger ones). Needs only PIL and numpy - no AI model or GPU.
+"""
+
+import numpy as np
+from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+
+from ImageDecoder import open_reduced
+
+HASH_BITS = 64
+HASH_METHODS = ("dhash", "phash")
+
+# The multi-index table splits hashes into 4 chunks of 16 bits and probes each
+# chunk within radius // 4 bits. Up to radius 7 (one flipped bit per chunk) a
+# random pair is a candidate with probability ~4 * 17 / 2**16; beyond that the
+# probes multiply and the candidates approach all pairs, so a blocked
+# vectorized scan is faster
+MULTI_INDEX_CHUNKS = 4
+MULTI_INDEX_MAX_RADIUS = 7
+
+_PHASH_SIZE = 32
+_DCT_MATRIX = np.cos(np.pi * (2 * np.arange(_PHASH_SIZE)[None, :] + 1) *
+                     np.arange(_PHASH_SIZE)[:, None] / (2 * _PHASH_SIZE))
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _bits_to_int(bits):
+    """Pack a flat array of 64 booleans into an int (first bit is most significant)"""
+    return int.from_bytes(np.packbits(bits.astype(np.uint8)).tobytes(), "big")
+
+
+def _load_gray(path, size):
+    """Open an image as a small grayscale array, letting JPEG decode at reduced scale"""
+    img = open_reduced(path, (size[0] * 4, size[1] * 4), "L")
+    return np.asarray(img.resize(size, Image.Resampling.LANCZOS), dtype=np.float32)
+
+
+def dhash(path):
+    """Difference hash: compares horizontally adjacent pixels of a 9x8 thumbnail"""
+    pixels = _load_gray(path, (9, 8))
+    return _bits_to_int((pixels[:, 1:] > pixels[:, :-1]).ravel())
+
+
+def phash(path):
+    """DCT hash: compares the 8x8 lowest frequencies of a 32x32 thumbnail to their median"""
+    pixels = _load_gray(path, (_PHASH_SIZE, _PHASH_SIZE))
+    dct = _DCT_MATRIX @ pixels @ _DCT_MATRIX.T
+    low = dct[:8, :8].ravel()
+    return _bits_to_int(low > np.median(low))
+
+
+def compute_image_hash(path, method="dhash"):
+    """
+    Compute a 64-bit perceptual hash for one image.
+
+    Returns:
+        int hash, or None if the image could not be read
+    """
+    try:
+        return phash(path) if method == "phash" else dhash(path)
+    except Exception as e:
+        print(f"[WARN] Could not hash {path}: {e}")
+        return None
+
+
+def compute_hashes_batch(paths, method="dhash", progress_callback=None, max_workers=8):
+    """
+    Compute perceptual hashes for many images in parallel.
+
+    Args:
+        paths: List of image file paths
+        method: "dhash" or "phash"
+        progress_callback: Optional callback(current, total, status_text, detail_text)
+        max_workers: Number of decode threads
+
+    Returns:
+        dict of path -> int hash (unreadable images are omitted)
+    """
+    if method not in HASH_METHODS:
+        raise ValueError(f"Unknown hash method: {method}")
+    paths = list(paths)
+    total = len(paths)
+    hashes = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for i, (path, value) in enumerate(zip(paths, executor.map(lambda p: compute_image_hash(p, method), paths)), 1):
+            if value is not None:
+                hashes[path] = value
+            if progress_callback and (i % 50 == 0 or i == total):
+                percent = int((i / total) * 100)
+                progress_callback(i, total, f"Hashing Images ({percent}%)",
+                                  f"Computed {method} for {i}/{total} images")
+    return hashes
+
+
+def hamming_distance(a, b):
+    """Number of differing bits between two int hashes"""
+    return bin(a ^ b).count("1")
+
+
+def _popcount64(values):
+    """Vectorized popcount of a uint64 array"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return _POPCOUNT_TABLE[values.view(np.uint8)].reshape(values.shape + (8,)).sum(axis=-1)
+
+
+def _chunk_probes(radius):
+    """XOR masks reaching every chunk value within radius bits (0 or 1) of a given one"""
+    chunk_bits = HASH_BITS // MULTI_INDEX_CHUNKS
+    masks = [0] + ([1 << bit for bit in range(chunk_bits)] if radius else [])
+    return np.array(masks, dtype=np.uint64)
+
+
+def _multi_index_neighbors(values, max_distance):
+    """
+    Pairs within max_distance bits, found through a multi-index hash table.
+
+    The 64 bits are split into MULTI_INDEX_CHUNKS chunks of 16 bits. By the
+    pigeonhole principle, two hashes within max_distance bits differ in at
+    most max_distance // 4 bits on at least one chunk, so each hash only
+    looks up the entries whose chunk is within that radius of its own, and
+    only those candidates get a full popcount.
+
+    Returns:
+        (i, j, distances) arrays with i < j, deduplicated
+    """
+    n = len(values)
+    chunk_bits = HASH_BITS // MULTI_INDEX_CHUNKS
+    probes = _chunk_probes(max_distance // MULTI_INDEX_CHUNKS)
+    owners_of_probes = np.repeat(np.arange(n, dtype=np.int64), len(probes))
+    pair_keys = []
+    for chunk in range(MULTI_INDEX_CHUNKS):
+        keys = (values >> np.uint64(chunk * chunk_bits)) & np.uint64((1 << chunk_bits) - 1)
+        # Chunks are 16 bits, so the table is a direct-addressed bucket array
+        bucket_sizes = np.bincount(keys.astype(np.int64), minlength=1 << chunk_bits)
+        bucket_starts = np.cumsum(bucket_sizes) - bucket_sizes
+        order = np.argsort(keys, kind="stable")
+        queries = (keys[:, None] ^ probes[None, :]).ravel().astype(np.int64)
+        counts = bucket_sizes[queries]
+        total = int(counts.sum())
+        if not total:
+            continue
+        run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+        owners = np.repeat(owners_of_probes, counts)
+        matches = order[np.repeat(bucket_starts[queries], counts) + np.arange(total) - run_starts]
+        keep = owners < matches
+        owners, matches = owners[keep], matches[keep]
+        # Filter before deduplicating: few candidates are true neighbors
+        close = _popcount64(values[owners] ^ values[matches]) <= max_distance
+        pair_keys.append(owners[close] * n + matches[close])
+    if not pair_keys:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    unique_keys = np.unique(np.concatenate(pair_keys))
+    first, second = unique_keys // n, unique_keys % n
+    return first, second, _popcount64(values[first] ^ values[second]).astype(np.int64)
+
+
+def _scan_neighbors(values, max_distance, max_block_mb):
+    """Exhaustive blocked XOR/popcount scan; see find_hash_neighbors"""
+    n = len(values)
+    rows, cols, dists = [], [], []
+    block_rows = max(1, int(max_block_mb * 1024 * 1024) // (max(n, 1) * 8))
+    for start in range(0, n, block_rows):
+        end = min(start + block_rows, n)
+        distances = _popcount64(values[start:end, None] ^ values[None, :])
+        distances[np.arange(end - start), np.arange(start, end)] = HASH_BITS + 1
+        block_r, block_c = np.nonzero(distances <= max_distance)
+        rows.append(block_r + start)
+        cols.append(block_c)
+        dists.append(distances[block_r, block_c].astype(np.int64))
+    if not rows:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(dists)
+
+
+def find_hash_neighbors(hashes, max_distance, max_block_mb=64):
+    """
+    Find every pair of hashes within a Hamming radius.
+
+    Uses a multi-index hash table up to MULTI_INDEX_MAX_RADIUS (sub-quadratic)
+    and a blocked vectorized XOR/popcount scan (quadratic) for larger radii.
+
+    Args:
+        hashes: Sequence of int hashes
+        max_distance: Maximum Hamming distance (inclusive)
+        max_block_mb: Memory budget for one block of the vectorized scan
+
+    Returns:
+        (rows, cols, distances) arrays listing each pair in both directions,
+        excluding self-pairs
+    """
+    values = np.array(hashes, dtype=np.uint64)
+    if max_distance > MULTI_INDEX_MAX_RADIUS:
+        return _scan_neighbors(values, max_distance, max_block_mb)
+
+    first, second, distances = _multi_index_neighbors(values, max_distance)
+    return (np.concatenate([first, second]), np.concatenate([second, first]),
+            np.concatenate([distances, distances]))
+
+
+def distance_to_similarity(distance):
+    """Map a Hamming distance to a 0-1 similarity comparable to the duplicate slider"""
+    return 1.0 - np.asarray(distance, dtype=np.float32) / HASH_BITS
+
+
+def similarity_to_distance(similarity):
+    """Largest Hamming distance whose similarity is still >= the given value"""
+    return int(np.floor((1.0 - similarity) * HASH_BITS + 1e-6))
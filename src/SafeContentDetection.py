@@ -8,44 +8,15 @@ import os
 import sys
 from pathlib import Path
 
-import torch
 import numpy as np
 from PIL import Image
-from transformers import CLIPModel, CLIPProcessor
-
-device = "cuda" if torch.cuda.is_available() else "cpu"
-
-
-def get_model_path():
-    """Return the path to the CLIP model, preferring local bundle over HuggingFace."""
-    if getattr(sys, 'frozen', False):
-        base_path = sys._MEIPASS
-        model_path = os.path.join(base_path, 'models', 'clip-vit-base-patch32')
-    else:
-        local_path = os.path.join('models', 'clip-vit-base-patch32')
-        if os.path.exists(local_path):
-            model_path = local_path
-        else:
-            model_path = "openai/clip-vit-base-patch32"
-    return model_path
-
-
-model = None
-processor = None
-
-
-def load_models():
-    """Lazily load CLIP model and processor."""
-    global model, processor
-    if model is None or processor is None:
-        try:
-            model_path = get_model_path()
-            print(f"Loading CLIP from {model_path}")
-            model = CLIPModel.from_pretrained(model_path).to(device).eval()
-            processor = CLIPProcessor.from_pretrained(model_path)
-        except Exception as e:
-            print(f"Error loading model: {str(e)}")
-            raise e
+from ClipModelService import (load_models, get_model_path, encode_images, zero_shot_classify,
+                              prompt_set_key)
+from FileScanner import scan_image_files
+from ImageDecoder import load_resized
+from ImageQualityAnalyzer import SortedResults
+from ScanResultCache import get_result_cache
+from ThumbnailCache import get_thumbnail_cache
 
 
 LABELS = {
@@ -142,25 +113,35 @@ class SafeContentDetector:
         return 'Unknown'
 
 
+def get_content_cache():
+    """Persistent per-file results, keyed by the prompt set so prompt edits invalidate them"""
+    return get_result_cache(f"safe-content-{prompt_set_key(LABELS)}")
+
+
 def _load_image(path):
     """Load and resize an image for CLIP inference. Returns None on failure."""
     try:
-        img = Image.open(path).convert("RGB")
-        img = img.resize((224, 224), Image.BICUBIC)
-        return img
+        return load_resized(path, (224, 224), resample=Image.BICUBIC)
     except Exception as e:
         print(f"[WARN] Failed to load image: {path} ({e})")
         return None
 
 
-def scan_content_batch(image_paths, progress_callback=None, batch_size=32):
+def scan_content_batch(image_paths, progress_callback=None, batch_size=32, result_callback=None):
     """
     Run CLIP inference on a list of image paths.
 
+    Results for files unchanged since an earlier scan come from the persistent
+    scan result cache; only new or modified files are decoded and classified.
+    Images are decoded one batch ahead of the CLIP forward pass, so memory
+    stays bounded and the first results are available after one batch.
+
     Args:
         image_paths: list of file path strings
         progress_callback: optional callable(current, total, filename)
         batch_size: images per CLIP forward pass
+        result_callback: optional callable(results) receiving the cached results,
+            then each batch's results, while the scan runs
 
     Returns:
         list of (path, label, confidence, all_scores) tuples.
@@ -169,50 +150,47 @@ def scan_content_batch(image_paths, progress_callback=None, batch_size=32):
     if not image_paths:
         return []
 
-    from concurrent.futures import ThreadPoolExecutor
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        images = list(executor.map(_load_image, image_paths))
-
-    failed_paths = {path for img, path in zip(images, image_paths) if img is None}
-    valid_pairs = [(img, path) for img, path in zip(images, image_paths) if img is not None]
-
-    if not valid_pairs:
-        return [(path, 'error', 0.0, {}) for path in image_paths]
-
-    valid_images, valid_paths = zip(*valid_pairs)
-
-    # Build text prompt list and owner index
-    texts, owners = [], []
-    for lbl, prompts in LABELS.items():
-        for p in prompts:
-            texts.append(p)
-            owners.append(lbl)
-    owners_np = np.array(owners)
-
-    load_models()
-
-    all_results = {}
-    total_valid = len(valid_images)
-
-    for batch_start in range(0, total_valid, batch_size):
-        batch_imgs = list(valid_images[batch_start:batch_start + batch_size])
-        batch_paths = list(valid_paths[batch_start:batch_start + batch_size])
-
-        inputs = processor(text=texts, images=batch_imgs, return_tensors="pt", padding=True)
-        inputs = {k: v.to(device) for k, v in inputs.items()}
+    cache = get_content_cache()
+    cached, misses = cache.get_many(image_paths)
+    all_results = {path: tuple(result) for path, result in cached.items()}
+    if cached and progress_callback:
+        progress_callback(len(cached), len(image_paths), "")
+    if cached and result_callback:
+        result_callback([(path, *all_results[path]) for path in image_paths if path in all_results])
 
-        with torch.inference_mode(), torch.autocast(
-                device_type="cuda", dtype=torch.float16, enabled=(device == "cuda")):
-            out = model(**inputs).logits_per_image  # [batch, num_prompts]
-            probs = out.softmax(dim=-1).float().cpu().numpy()
+    failed_paths = set()
+    done = len(cached)
+    batches = [misses[i:i + batch_size] for i in range(0, len(misses), batch_size)]
 
-        for prob, path in zip(probs, batch_paths):
-            scores = {lbl: float(prob[owners_np == lbl].sum()) for lbl in LABELS}
-            pred = max(scores, key=scores.get)
-            all_results[path] = (pred, scores[pred], scores)
-
-        if progress_callback:
-            progress_callback(batch_start + len(batch_imgs), total_valid, "")
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        def submit(batch):
+            return [executor.submit(_load_image, path) for path in batch]
+
+        loading = submit(batches[0]) if batches else []
+        for i, batch in enumerate(batches):
+            images = [future.result() for future in loading]
+            # Decode the next batch while CLIP runs on this one
+            loading = submit(batches[i + 1]) if i + 1 < len(batches) else []
+
+            batch_paths = [path for img, path in zip(images, batch) if img is not None]
+            batch_imgs = [img for img in images if img is not None]
+            batch_output = [(path, 'error', 0.0, {}) for img, path in zip(images, batch) if img is None]
+            failed_paths.update(path for path, *_ in batch_output)
+
+            if batch_imgs:
+                # Only the vision tower runs per batch; prompt embeddings come from the cache
+                image_features = encode_images(batch_imgs)  # [batch, dim]
+                batch_results = zero_shot_classify(image_features, LABELS)
+                all_results.update(zip(batch_paths, batch_results))
+                cache.put_many(zip(batch_paths, batch_results))
+                batch_output.extend((path, *result) for path, result in zip(batch_paths, batch_results))
+
+            done += len(batch)
+            if progress_callback:
+                progress_callback(done, len(image_paths), "")
+            if result_callback:
+                result_callback(batch_output)
 
     # Reconstruct in original order
     output = []
@@ -225,13 +203,16 @@ def scan_content_batch(image_paths, progress_callback=None, batch_size=32):
     return output
 
 
-def scan_folder_safe_content(folder_path, progress_callback=None):
+def scan_folder_safe_content(folder_path, progress_callback=None, manifest=None, result_callback=None):
     """
     Scan all images in a folder for inappropriate content.
 
     Args:
         folder_path: path to the folder to scan
         progress_callback: optional callable(current, total, filename)
+        manifest: optional FileManifest from an earlier scan of folder_path
+        result_callback: optional callable([(path, label, confidence, all_scores), ...])
+            receiving results in chunks while the scan runs
 
     Returns:
         dict with keys:
@@ -243,24 +224,15 @@ def scan_folder_safe_content(folder_path, progress_callback=None):
             'total_processed':   int
             'total_flagged':     int  (adult + violent + disturbing)
     """
-    folder = Path(folder_path)
-    image_paths = [
-        str(p) for p in folder.rglob('*')
-        if p.suffix.lower() in IMG_EXT and 'Trash' not in p.parts
-    ]
-
-    result = {
-        'safe_images': [],
-        'adult_images': [],
-        'violent_images': [],
-        'disturbing_images': [],
-        'error_images': [],
-        'total_processed': 0,
-        'total_flagged': 0,
-    }
+    if manifest is None:
+        manifest = scan_image_files(folder_path, IMG_EXT)
+    image_paths = manifest.files
+    # Forget stored results for files deleted since the last scan
+    get_content_cache().prune(folder_path, image_paths)
+    get_thumbnail_cache().prune(folder_path, image_paths, manifest.extensions)
 
     if not image_paths:
-        return result
+        return summarize_content_results([])
 
     total = len(image_paths)
 
@@ -268,29 +240,62 @@ def scan_folder_safe_content(folder_path, progress_callback=None):
         if progress_callback:
             progress_callback(current, total, filename)
 
-    batch_results = scan_content_batch(image_paths, _progress)
+    batch_results = scan_content_batch(image_paths, _progress, result_callback=result_callback)
+    return summarize_content_results(batch_results)
 
-    for path, label, confidence, all_scores in batch_results:
-        if label == 'error':
-            result['error_images'].append(path)
-        elif label == 'safe':
-            result['safe_images'].append((path, confidence, all_scores))
-        elif label == 'adult':
-            result['adult_images'].append((path, confidence, all_scores))
-        elif label == 'violent':
-            result['violent_images'].append((path, confidence, all_scores))
-        elif label == 'disturbing':
-            result['disturbing_images'].append((path, confidence, all_scores))
 
-    # Sort flagged categories descending by confidence (most concerning first)
-    for key in ('adult_images', 'violent_images', 'disturbing_images', 'safe_images'):
-        result[key].sort(key=lambda x: x[1], reverse=True)
+def summarize_content_results(batch_results):
+    """
+    Bucket (path, label, confidence, all_scores) tuples into the result dict
+    returned by scan_folder_safe_content.
+    """
+    summary = ContentSummary()
+    summary.extend(batch_results)
+    return summary.results()
+
+
+class ContentSummary:
+    """
+    Running summary of a safe content scan. Each chunk of classifications is
+    merged into per-category lists that stay sorted by confidence (most
+    concerning first) and the totals are counted up, so a partial-results
+    update only costs the new chunk rather than re-summarizing the scan.
+    """
+
+    CATEGORIES = ('safe', 'adult', 'violent', 'disturbing')
+    FLAGGED = ('adult', 'violent', 'disturbing')
 
-    result['total_processed'] = len(batch_results)
-    result['total_flagged'] = (
-        len(result['adult_images']) +
-        len(result['violent_images']) +
-        len(result['disturbing_images'])
-    )
+    def __init__(self):
+        self._buckets = {label: SortedResults(lambda item: item[1], descending=True)
+                         for label in self.CATEGORIES}
+        self.error_images = []
+        self.total_processed = 0
+        self.total_flagged = 0
 
-    return result
+    def extend(self, batch_results):
+        """
+        Merge (path, label, confidence, all_scores) tuples into the summary.
+
+        Returns:
+            dict: label -> [(path, confidence, all_scores), ...] added by this chunk
+        """
+        added = {label: [] for label in self.CATEGORIES}
+        for path, label, confidence, all_scores in batch_results:
+            if label == 'error':
+                self.error_images.append(path)
+            elif label in added:
+                added[label].append((path, confidence, all_scores))
+
+        for label, items in added.items():
+            self._buckets[label].extend(items)
+        self.total_processed += len(batch_results)
+        self.total_flagged += sum(len(added[label]) for label in self.FLAGGED)
+        return added
+
+    def results(self):
+        """The summary in the dict shape returned by scan_folder_safe_content"""
+        result = {f'{label}_images': self._buckets[label].items for label in self.CATEGORIES}
+        result['error_images'] = self.error_images
+        result['total_processed'] = self.total_processed
+        result['total_flagged'] = self.total_flagged
+        return result
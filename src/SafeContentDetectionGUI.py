@@ -10,11 +10,15 @@ from pathlib import Path
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-from PIL import Image, ImageTk
 
-from SafeContentDetection import scan_folder_safe_content, SafeContentDetector
+from SafeContentDetection import (scan_folder_safe_content, ContentSummary,
+                                  SafeContentDetector, IMG_EXT)
+from FileScanner import scan_image_files
+from ImageQualityAnalyzer import ResultBatcher
 from CommonUI import (ToolTip, ModernColors, ProgressWindow, ModernStyling,
-                      StatusBar, ModernButton, ImageUtils, TrashManager, FileOperations)
+                      StatusBar, ModernButton, ImageUtils, TrashManager, FileOperations, ResultTree,
+                      VirtualGrid)
+from ThumbnailService import ThumbnailService
 
 
 class SafeContentDetectionApp:
@@ -24,6 +28,7 @@ class SafeContentDetectionApp:
         self.root.state('zoomed')
 
         self.folder = ""
+        self.manifest = None  # FileManifest from the last folder walk
         self.safe_images = []        # [(path, confidence, all_scores), ...]
         self.adult_images = []
         self.violent_images = []
@@ -32,13 +37,9 @@ class SafeContentDetectionApp:
 
         self.current_paths = []
         self.current_category = "adult"
-        self.current_page = 0
-        self.page_size = 50
-        self.thumb_imgs = []
-        self.image_cache = {}
-        self.selected_check_vars = []
-        self._trash_icon_cache = {}
+        self.thumbnails = ThumbnailService(self.root)  # Decodes thumbnails off the UI thread
         self._cleaning_in_progress = False
+        self._scan_in_progress = False  # Results stream in while a scan runs
         self.detector = SafeContentDetector()
 
         self.thumb_size = (240, 180)
@@ -239,60 +240,12 @@ class SafeContentDetectionApp:
         thumb_container = tk.Frame(self.right_frame, bg=self.colors['bg_primary'])
         thumb_container.pack(fill=tk.BOTH, expand=True)
 
-        # Pagination controls
-        self.page_frame = tk.Frame(thumb_container, bg=self.colors['bg_primary'], height=50)
-        self.page_frame.pack(fill=tk.X, pady=(0, 20))
-        self.page_frame.pack_propagate(False)
-
-        nav_center = tk.Frame(self.page_frame, bg=self.colors['bg_primary'])
-        nav_center.pack(expand=True)
-
-        nav_btn_style = {
-            "font": ("Segoe UI", 12),
-            "bg": self.colors['bg_secondary'],
-            "fg": self.colors['text_primary'],
-            "activebackground": self.colors['bg_card'],
-            "activeforeground": self.colors['text_primary'],
-            "bd": 0, "padx": 20, "pady": 8, "cursor": "hand2"
-        }
-
-        self.prev_page_btn = tk.Button(nav_center, text="\u2190 Previous",
-                                       command=self.prev_page, **nav_btn_style)
-        self.prev_page_btn.pack(side=tk.LEFT, padx=(0, 15))
-
-        self.page_label = tk.Label(nav_center, text="Page 1 of 1",
-                                   font=("Segoe UI", 12, "bold"),
-                                   bg=self.colors['bg_primary'],
-                                   fg=self.colors['text_primary'])
-        self.page_label.pack(side=tk.LEFT, padx=20)
-
-        self.next_page_btn = tk.Button(nav_center, text="Next \u2192",
-                                       command=self.next_page, **nav_btn_style)
-        self.next_page_btn.pack(side=tk.LEFT, padx=(15, 0))
-
-        self.page_frame.pack_forget()
-
-        # Thumbnail canvas with scrollbar
-        content_frame = tk.Frame(thumb_container, bg=self.colors['bg_primary'])
-        content_frame.pack(fill=tk.BOTH, expand=True, padx=20)
-
-        self.thumb_canvas = tk.Canvas(content_frame, bg=self.colors['bg_primary'],
-                                      highlightthickness=0, bd=0)
-        self.thumb_scrollbar = ttk.Scrollbar(content_frame, orient="vertical",
-                                             command=self.thumb_canvas.yview,
-                                             style="Modern.Vertical.TScrollbar")
-        self.thumbs_frame = tk.Frame(self.thumb_canvas, bg=self.colors['bg_primary'])
-
-        self.thumb_canvas.configure(yscrollcommand=self.thumb_scrollbar.set)
-        self.thumb_canvas.create_window((0, 0), window=self.thumbs_frame, anchor="nw")
-        self.thumbs_frame.bind(
-            "<Configure>",
-            lambda e: self.thumb_canvas.configure(scrollregion=self.thumb_canvas.bbox("all")))
-
-        self.thumb_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.thumb_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-        self.thumb_canvas.bind("<Configure>", self.on_canvas_configure)
+        # Thumbnail grid: only the cards in view are built, so a whole category is one scroll
+        self.thumb_grid = VirtualGrid(thumb_container, self.colors, self.thumbnails, thumb_size=self.thumb_size,
+                                      describe=self.describe_card, on_open=self.open_full_image,
+                                      on_selection_change=self.on_selection_change)
+        self.thumb_grid.pack(fill=tk.BOTH, expand=True, padx=20)
+        self.thumb_canvas = self.thumb_grid.canvas
         self.thumb_canvas.bind_all("<MouseWheel>", self._on_mousewheel)
 
         # Status bar
@@ -305,16 +258,6 @@ class SafeContentDetectionApp:
         if self.thumb_canvas.winfo_exists():
             self.thumb_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
 
-    def on_canvas_configure(self, event=None):
-        self.thumb_canvas.configure(scrollregion=self.thumb_canvas.bbox("all"))
-        if event and hasattr(self, 'last_width') and abs(event.width - self.last_width) < 50:
-            return
-        self.last_width = event.width if event else self.thumb_canvas.winfo_width()
-        if hasattr(self, 'current_paths') and self.current_paths:
-            sel = self.tree.selection()
-            cat = sel[0] if sel else self.current_category
-            self.show_thumbnails_for_category(cat)
-
     # --- Zoom ---
 
     def zoom_in(self):
@@ -323,10 +266,9 @@ class SafeContentDetectionApp:
         nh = min(h + 45, self.max_thumb_size[1])
         if (nw, nh) != self.thumb_size:
             self.thumb_size = (nw, nh)
-            self.image_cache.clear()
+            self.thumbnails.cancel_pending()  # Drop queued work at the old size; cached sizes stay for zooming back
             self.update_zoom_controls()
-            if self.current_paths:
-                self.display_page()
+            self.thumb_grid.set_thumb_size(self.thumb_size)
 
     def zoom_out(self):
         w, h = self.thumb_size
@@ -334,10 +276,9 @@ class SafeContentDetectionApp:
         nh = max(h - 45, self.min_thumb_size[1])
         if (nw, nh) != self.thumb_size:
             self.thumb_size = (nw, nh)
-            self.image_cache.clear()
+            self.thumbnails.cancel_pending()  # Drop queued work at the old size; cached sizes stay for zooming back
             self.update_zoom_controls()
-            if self.current_paths:
-                self.display_page()
+            self.thumb_grid.set_thumb_size(self.thumb_size)
 
     def update_zoom_controls(self):
         self.zoom_in_btn.config(
@@ -350,15 +291,13 @@ class SafeContentDetectionApp:
     # --- Folder / scan ---
 
     def _get_image_count(self, folder_path):
-        image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.webp'}
-        count = 0
+        """Walk the folder once (excluding Trash) and keep the manifest for the scan."""
         try:
-            for p in Path(folder_path).rglob('*'):
-                if p.suffix.lower() in image_extensions and 'Trash' not in p.parts:
-                    count += 1
-            return count
+            self.manifest = scan_image_files(folder_path, IMG_EXT)
         except Exception:
+            self.manifest = None
             return 0
+        return len(self.manifest)
 
     def select_folder(self):
         folder = filedialog.askdirectory()
@@ -369,6 +308,8 @@ class SafeContentDetectionApp:
             self.trash_manager.update_trash_count()
 
     def start_scan(self):
+        if self._scan_in_progress:
+            return
         if not self.folder:
             messagebox.showerror("Error", "Please select a folder first.")
             return
@@ -376,73 +317,125 @@ class SafeContentDetectionApp:
         if total_images == 0:
             messagebox.showinfo("No Images Found", "No images found in the selected folder.")
             return
-        self.progress_window.show(total=total_images, initial_text="Loading AI model...")
-        threading.Thread(target=self._scan_thread, args=(self.folder,), daemon=True).start()
-
-    def _scan_thread(self, folder):
+        # Non-modal: results can be reviewed as they stream in
+        self.progress_window.show(total=total_images, initial_text="Loading AI model...", modal=False)
+        self._scan_in_progress = True
+        self._clear_results()
+        # Partial results are merged into this summary as they arrive
+        self._partial = ContentSummary()
+        threading.Thread(target=self._scan_thread, args=(self.folder, self.manifest), daemon=True).start()
+
+    def _scan_thread(self, folder, manifest):
         # Signal model loading phase
-        self.root.after(0, self.progress_window.update, 0, 1,
-                        "Loading AI model...", "Initializing CLIP...")
+        self.progress_window.report(0, 1, "Loading AI model...", "Initializing CLIP...")
 
         def progress_callback(current, total, filename):
+            # The progress window polls this on the main thread
             name = os.path.basename(filename) if filename else ''
-            self.root.after(0, self.progress_window.update, current, total,
-                            f"Processing: {name}", f"{current}/{total}")
+            self.progress_window.report(current, total, f"Processing: {name}", f"{current}/{total}")
 
-        results = scan_folder_safe_content(folder, progress_callback)
+        def show_partial(chunk):
+            # Runs on the scan thread; the UI merges each chunk into its running summary
+            self.root.after(0, self.on_partial_results, chunk)
+
+        # CLIP batches can finish faster than the UI needs updates; pass them on at most twice a second
+        stream = ResultBatcher(show_partial)
+        try:
+            results = scan_folder_safe_content(folder, progress_callback, manifest=manifest,
+                                               result_callback=stream.extend)
+        except Exception as e:
+            print(f"[WARN] Safe content scan failed: {e}")
+            self.root.after(0, self.on_scan_failed, str(e))
+            return
         self.root.after(0, self.on_scan_complete, results)
 
     # --- Results ---
 
+    def _clear_results(self):
+        """Drop the previous scan's results before a new scan streams in"""
+        for i in self.tree.get_children():
+            self.tree.delete(i)
+        self.show_thumbnails_for_category(None)
+
+    def _select_first_category(self):
+        """Auto-select the most concerning non-empty category"""
+        for category, images in (("adult", self.adult_images), ("violent", self.violent_images),
+                                 ("disturbing", self.disturbing_images)):
+            if images:
+                break
+        else:
+            category = "safe"
+        self.tree.selection_set(category)
+        self.show_thumbnails_for_category(category)
+
+    def on_partial_results(self, chunk):
+        """Merge a chunk of newly classified images into the results shown while the scan keeps running"""
+        if not self._scan_in_progress:
+            return
+        added = self._partial.extend(chunk)
+        for label, items in added.items():
+            for path, conf, scores in items:
+                self.content_scores[path] = (label, conf, scores)
+        self._set_categories(self._partial.results())
+        self.status_bar.set_text(
+            f"Scanning... {self._partial.total_processed} images scanned, "
+            f"{self._partial.total_flagged} flagged so far.")
+
+        # Refresh the category being reviewed in place; scroll position and selection are kept
+        selected = self.tree.selection()
+        if not selected:
+            self._select_first_category()
+        else:
+            self.show_thumbnails_for_category(selected[0], keep_position=True)
+
+    def on_scan_failed(self, error):
+        self.progress_window.close()
+        self._scan_in_progress = False
+        messagebox.showerror("Error", f"Scan failed: {error}")
+
     def on_scan_complete(self, results):
         self.progress_window.close()
+        self._scan_in_progress = False
+        self._apply_results(results)
 
-        self.adult_images = results['adult_images']
-        self.violent_images = results['violent_images']
-        self.disturbing_images = results['disturbing_images']
-        self.safe_images = results['safe_images']
+        total = results['total_processed']
+        flagged = results['total_flagged']
+        self.status_bar.set_text(
+            f"Scan complete. {total} images scanned, {flagged} flagged.")
+
+        # Refresh the category being reviewed, or auto-select the most concerning one
+        selected = self.tree.selection()
+        if selected:
+            self.show_thumbnails_for_category(selected[0], keep_position=True)
+        else:
+            self._select_first_category()
 
+    def _apply_results(self, results):
         # Rebuild lookup
         self.content_scores.clear()
-        for path, conf, scores in self.adult_images:
+        for path, conf, scores in results['adult_images']:
             self.content_scores[path] = ('adult', conf, scores)
-        for path, conf, scores in self.violent_images:
+        for path, conf, scores in results['violent_images']:
             self.content_scores[path] = ('violent', conf, scores)
-        for path, conf, scores in self.disturbing_images:
+        for path, conf, scores in results['disturbing_images']:
             self.content_scores[path] = ('disturbing', conf, scores)
-        for path, conf, scores in self.safe_images:
+        for path, conf, scores in results['safe_images']:
             self.content_scores[path] = ('safe', conf, scores)
+        self._set_categories(results)
 
-        # Rebuild tree (flagged first)
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        self.tree.insert("", "end", "adult", text="Adult Content",
-                         values=(len(self.adult_images),))
-        self.tree.insert("", "end", "violent", text="Violent / Gore",
-                         values=(len(self.violent_images),))
-        self.tree.insert("", "end", "disturbing", text="Disturbing",
-                         values=(len(self.disturbing_images),))
-        self.tree.insert("", "end", "safe", text="Safe Images",
-                         values=(len(self.safe_images),))
-
-        total = results['total_processed']
-        flagged = results['total_flagged']
-        self.status_bar.set_text(
-            f"Scan complete. {total} images scanned, {flagged} flagged.")
+    def _set_categories(self, results):
+        self.adult_images = results['adult_images']
+        self.violent_images = results['violent_images']
+        self.disturbing_images = results['disturbing_images']
+        self.safe_images = results['safe_images']
 
-        # Auto-select most concerning non-empty category
-        if self.adult_images:
-            self.tree.selection_set("adult")
-            self.show_thumbnails_for_category("adult")
-        elif self.violent_images:
-            self.tree.selection_set("violent")
-            self.show_thumbnails_for_category("violent")
-        elif self.disturbing_images:
-            self.tree.selection_set("disturbing")
-            self.show_thumbnails_for_category("disturbing")
-        else:
-            self.tree.selection_set("safe")
-            self.show_thumbnails_for_category("safe")
+        # Update tree counts in place (flagged first) so the user's selection survives
+        ResultTree.set_counts(self.tree, [
+            ("adult", "Adult Content", len(self.adult_images)),
+            ("violent", "Violent / Gore", len(self.violent_images)),
+            ("disturbing", "Disturbing", len(self.disturbing_images)),
+            ("safe", "Safe Images", len(self.safe_images)),
+        ])
 
     def on_tree_select(self, event):
         selected = self.tree.selection()
@@ -450,7 +443,7 @@ class SafeContentDetectionApp:
             return
         self.show_thumbnails_for_category(selected[0])
 
-    def show_thumbnails_for_category(self, category):
+    def show_thumbnails_for_category(self, category, keep_position=False):
         self.current_category = category
         if category == "adult":
             self.current_paths = [p for p, c, s in self.adult_images]
@@ -463,151 +456,44 @@ class SafeContentDetectionApp:
         else:
             self.current_paths = []
 
-        self.current_page = 0
-        self.display_page()
-
-        if self.current_paths:
-            self.page_frame.pack(fill=tk.X, pady=(0, 20))
-        else:
-            self.page_frame.pack_forget()
-
-    def display_page(self):
-        self.root.config(cursor="wait")
-        for widget in self.thumbs_frame.winfo_children():
-            widget.destroy()
-        self.thumb_imgs.clear()
-        self.selected_check_vars.clear()
-
-        start_idx = self.current_page * self.page_size
-        page_paths = self.current_paths[start_idx:start_idx + self.page_size]
-
-        canvas_width = self.thumb_canvas.winfo_width()
-        if canvas_width < 200:
-            canvas_width = 1000
-        cols = max(1, canvas_width // (self.thumb_size[0] + 30))
-
-        for idx, path in enumerate(page_paths):
-            row, col = divmod(idx, cols)
-            self.thumbs_frame.grid_columnconfigure(col, weight=1)
-
-            card = tk.Frame(self.thumbs_frame, bd=0, bg=self.colors['bg_card'],
-                            highlightthickness=1, relief=tk.SOLID)
-            card.grid(row=row, column=col, padx=1, pady=1, sticky="nsew")
-
-            img_tk = self.get_thumbnail(path)
-            self.thumb_imgs.append(img_tk)
-
-            if img_tk is not None:
-                img_canvas = tk.Canvas(card, width=img_tk.width(), height=img_tk.height(),
-                                       bg=self.colors['bg_card'], highlightthickness=0, bd=0)
-                img_canvas.pack(pady=5)
-                img_canvas.create_image(0, 0, anchor=tk.NW, image=img_tk)
-                img_canvas.image = img_tk  # Prevent GC blanking
-                img_canvas.bind('<Double-Button-1>', lambda e, p=path: self.open_full_image(p))
-            else:
-                img_canvas = tk.Canvas(card, width=self.thumb_size[0], height=self.thumb_size[1],
-                                       bg=self.colors['bg_card'], highlightthickness=0, bd=0)
-                img_canvas.pack(pady=5)
-                img_canvas.create_text(
-                    self.thumb_size[0] // 2, self.thumb_size[1] // 2,
-                    text="No Preview", fill=self.colors.get('text_secondary', 'gray'))
-                img_canvas.bind('<Double-Button-1>', lambda e, p=path: self.open_full_image(p))
-
-            info_frame = tk.Frame(card, bg=self.colors['bg_card'])
-            info_frame.pack(fill=tk.X, padx=5, pady=5)
-
-            var = tk.BooleanVar()
-            filename = os.path.basename(path)
-            if len(filename) > 25:
-                filename = filename[:22] + "..."
-            chk = tk.Checkbutton(info_frame, text=filename, variable=var,
-                                  font=("Segoe UI", 10, "bold"),
-                                  bg=self.colors['bg_card'],
-                                  fg=self.colors['text_primary'],
-                                  selectcolor=self.colors['accent'], bd=0)
-            chk.pack(fill=tk.X)
-            var.trace_add('write',
-                          lambda *args, v=var, p=path, c=img_canvas: self.on_image_check(v, p, c))
-            self.selected_check_vars.append((var, path, img_canvas))
-
-            # Content score label
-            entry = self.content_scores.get(path)
-            if entry:
-                label, confidence, _ = entry
-                label_str = f"{label.title()}: {confidence * 100:.0f}%"
-                if label in ('adult', 'violent'):
-                    score_color = self.colors['danger']
-                elif label == 'disturbing':
-                    score_color = self.colors['warning']
-                else:
-                    score_color = self.colors['success']
-            else:
-                label_str = "Unknown"
-                score_color = self.colors['text_secondary']
-
-            score_label = tk.Label(info_frame, text=label_str,
-                                   bg=self.colors['bg_card'], fg=score_color,
-                                   font=("Segoe UI", 9))
-            score_label.pack(fill=tk.X)
-
-        self.update_page_controls()
+        self.thumb_grid.set_items(self.current_paths, keep_position=keep_position)
         self.update_zoom_controls()
-        self.root.config(cursor="")
 
-    def get_thumbnail(self, path):
-        cache_key = (path, self.thumb_size)
-        if cache_key in self.image_cache:
-            return self.image_cache[cache_key]
-        try:
-            img = Image.open(path)
-            img.thumbnail(self.thumb_size, Image.Resampling.LANCZOS)
-            img_tk = ImageTk.PhotoImage(img)
-            self.image_cache[cache_key] = img_tk
-            return img_tk
-        except Exception:
-            return None
-
-    def update_page_controls(self):
-        total_pages = max(1, (len(self.current_paths) - 1) // self.page_size + 1)
-        self.page_label.config(text=f"Page {self.current_page + 1} of {total_pages}")
-        self.prev_page_btn.config(state=tk.NORMAL if self.current_page > 0 else tk.DISABLED)
-        self.next_page_btn.config(
-            state=tk.NORMAL if (self.current_page + 1) < total_pages else tk.DISABLED)
-
-    def prev_page(self):
-        if self.current_page > 0:
-            self.current_page -= 1
-            self.display_page()
-
-    def next_page(self):
-        total_pages = (len(self.current_paths) - 1) // self.page_size + 1
-        if (self.current_page + 1) < total_pages:
-            self.current_page += 1
-            self.display_page()
+    def describe_card(self, path):
+        """Info line for a thumbnail card: content label and confidence"""
+        entry = self.content_scores.get(path)
+        if entry:
+            label, confidence, _ = entry
+            label_str = f"{label.title()}: {confidence * 100:.0f}%"
+            if label in ('adult', 'violent'):
+                score_color = self.colors['danger']
+            elif label == 'disturbing':
+                score_color = self.colors['warning']
+            else:
+                score_color = self.colors['success']
+        else:
+            label_str = "Unknown"
+            score_color = self.colors['text_secondary']
+        return label_str, score_color, None
 
     def select_all_photos(self):
-        if not self.selected_check_vars:
+        if not self.current_paths:
             return
-        new_state = not self.selected_check_vars[0][0].get()
-        for var, path, canvas in self.selected_check_vars:
-            var.set(new_state)
-        self.update_select_all_button_text()
-
-    def update_select_all_button_text(self):
-        all_selected = all(var.get() for var, _, _ in self.selected_check_vars)
-        self.select_all_btn_var.set("Unselect All" if all_selected else "Select All")
-
-    def on_image_check(self, var, path, canvas):
-        ImageUtils.update_cross_overlay(
-            self.selected_check_vars, var, path, self._trash_icon_cache)
-        count = sum(1 for v, _, _ in self.selected_check_vars if v.get())
-        self.clean_btn_var.set(f"Clean ({count})")
-        self.update_select_all_button_text()
+        # Covers the whole category, including cards scrolled out of view
+        self.thumb_grid.set_all_selected(not self.thumb_grid.all_selected())
+
+    def on_selection_change(self):
+        """Update the Clean and Select All buttons after the grid's selection changes"""
+        self.clean_btn_var.set(f"Clean ({self.thumb_grid.selection_count()})")
+        self.select_all_btn_var.set("Unselect All" if self.thumb_grid.all_selected() else "Select All")
 
     def clean_selected_photos(self):
         if self._cleaning_in_progress:
             return
-        selected_paths = {path for var, path, _ in self.selected_check_vars if var.get()}
+        if self._scan_in_progress:
+            messagebox.showinfo("Clean", "Please wait for the scan to finish before cleaning photos.")
+            return
+        selected_paths = set(self.thumb_grid.selected_paths())
         if not selected_paths:
             messagebox.showinfo("Clean", "No photos selected.")
             return
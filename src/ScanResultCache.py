@@ -0,0 +1,45 @@
+"""
+Persistent Scan Result Cache for PhotoSift
+Stores each detector's per-file result on disk keyed by (path, size, mtime),
+so a rescan only analyzes new or modified files and drops entries for files
+that were deleted. Results are small JSON values (scores, labels, dimensions).
+"""
+
+import json
+
+from SignatureCache import SignatureCache, CacheRegistry
+
+
+class ScanResultCache(SignatureCache):
+    """SQLite-backed store of JSON results for a single detector.
+
+    Args:
+        detector_key: Identifies the detector (and anything its results depend
+            on, e.g. a prompt-set hash); other detectors' entries are never returned.
+        db_path: Database file. Defaults to scan_results.sqlite in get_cache_dir().
+    """
+
+    TABLE = "results"
+    DB_NAME = "scan_results.sqlite"
+    SCOPE_COLUMN = "detector"
+    VALUE_COLUMN = "result"
+    VALUE_TYPE = "TEXT"
+    LABEL = "Scan result cache"
+
+    def __init__(self, detector_key, db_path=None):
+        self.detector_key = detector_key
+        super().__init__(detector_key, db_path)
+
+    def _encode(self, result):
+        return json.dumps(result)
+
+    def _decode(self, stored):
+        return json.loads(stored)
+
+
+_caches = CacheRegistry(ScanResultCache)
+
+
+def get_result_cache(detector_key):
+    """Return the process-wide ScanResultCache for a detector, creating it on first use"""
+    return _caches.get(detector_key)
@@ -0,0 +1,298 @@
+"""
+Shared SQLite Cache Base for PhotoSift
+The embedding, scan result and thumbnail caches all store one value per file
+that stays valid while the file's (size, mtime) is unchanged. SignatureCache
+holds the connection handling, chunked lookups, writes, pruning of deleted
+files and hit statistics they have in common; each cache only declares its
+table and how its values are encoded.
+"""
+
+import os
+import sqlite3
+import threading
+
+
+def get_cache_dir():
+    """Return the PhotoSift cache directory, creating it if needed"""
+    cache_dir = os.path.join(os.environ.get('LOCALAPPDATA', os.path.expanduser('~')), 'PhotoSift', 'cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def file_signature(path):
+    """Return (size, mtime_ns) for a file, or None if it cannot be stat'ed"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def folder_prefix(folder):
+    """Prefix shared by every path inside folder (folder plus a separator)"""
+    return os.path.join(str(folder), '')
+
+
+class SignatureCache:
+    """SQLite table of per-file values keyed by (path, size, mtime).
+
+    Each row holds path, an optional scope column (the model or detector the
+    value came from), optional extra key columns, size, mtime_ns and the
+    encoded value. Subclasses set the class attributes and override
+    _encode/_decode; instances only see rows of their own scope.
+
+    Args:
+        scope: Value of SCOPE_COLUMN for this instance, or None if the table
+            has no scope column
+        db_path: Database file. Defaults to DB_NAME in get_cache_dir().
+    """
+
+    TABLE = None
+    DB_NAME = None
+    SCOPE_COLUMN = None
+    KEY_COLUMNS = ()  # (name, SQL type) pairs that are part of the primary key
+    VALUE_COLUMN = "value"
+    VALUE_TYPE = "BLOB"
+    LABEL = "Cache"  # Used in log messages
+
+    # SQLite limits the number of bound parameters per statement
+    _QUERY_CHUNK = 500
+
+    def __init__(self, scope=None, db_path=None):
+        self.scope = scope
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        key_columns = ([self.SCOPE_COLUMN] if self.SCOPE_COLUMN else []) + [name for name, _ in self.KEY_COLUMNS]
+        columns = ["path TEXT NOT NULL"]
+        if self.SCOPE_COLUMN:
+            columns.append(f"{self.SCOPE_COLUMN} TEXT NOT NULL")
+        columns += [f"{name} {sql_type} NOT NULL" for name, sql_type in self.KEY_COLUMNS]
+        columns += ["size INTEGER NOT NULL", "mtime_ns INTEGER NOT NULL",
+                    f"{self.VALUE_COLUMN} {self.VALUE_TYPE} NOT NULL",
+                    f"PRIMARY KEY ({', '.join(['path'] + key_columns)})"]
+        self._columns = ["path"] + key_columns + ["size", "mtime_ns", self.VALUE_COLUMN]
+        try:
+            if self.db_path is None:
+                self.db_path = os.path.join(get_cache_dir(), self.DB_NAME)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {self.TABLE} ({', '.join(columns)})")
+            self._conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            # A broken or read-only cache must never stop a scan
+            print(f"[WARN] {self.LABEL} disabled ({self.db_path}): {e}")
+            self._conn = None
+
+    @property
+    def enabled(self):
+        return self._conn is not None
+
+    def _encode(self, value):
+        """Convert a value to what is stored in VALUE_COLUMN"""
+        return value
+
+    def _decode(self, stored):
+        """Convert a stored VALUE_COLUMN back to a value"""
+        return stored
+
+    def _scope_filter(self):
+        """(SQL condition, parameters) restricting a query to this instance's rows"""
+        if self.SCOPE_COLUMN:
+            return f"{self.SCOPE_COLUMN} = ?", [self.scope]
+        return "1 = 1", []
+
+    def _select(self, paths, where="1 = 1", params=()):
+        """
+        Read the stored rows for paths.
+
+        Args:
+            paths: List of file paths
+            where: Extra SQL condition, e.g. on a KEY_COLUMNS column
+            params: Parameters for where
+
+        Returns:
+            dict of path -> (size, mtime_ns, stored value); one row per path
+        """
+        rows = {}
+        if not self.enabled:
+            return rows
+        scope_sql, scope_params = self._scope_filter()
+        with self._lock:
+            for start in range(0, len(paths), self._QUERY_CHUNK):
+                chunk = paths[start:start + self._QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                try:
+                    cursor = self._conn.execute(
+                        f"SELECT path, size, mtime_ns, {self.VALUE_COLUMN} FROM {self.TABLE} "
+                        f"WHERE {scope_sql} AND {where} AND path IN ({placeholders})",
+                        scope_params + list(params) + chunk)
+                    for path, size, mtime_ns, stored in cursor:
+                        rows[path] = (size, mtime_ns, stored)
+                except sqlite3.Error as e:
+                    print(f"[WARN] {self.LABEL} lookup failed: {e}")
+                    break
+        return rows
+
+    def _write(self, entries, signature):
+        """
+        Store encoded values made from the current version of each file.
+
+        Args:
+            entries: Iterable of (path, KEY_COLUMNS values, stored value).
+                Files that can no longer be stat'ed are skipped.
+            signature: Callable path -> (size, mtime_ns) or None
+        """
+        if not self.enabled:
+            return
+        scope = [self.scope] if self.SCOPE_COLUMN else []
+        records = []
+        for path, keys, stored in entries:
+            sig = signature(path)
+            if sig is None:
+                continue
+            records.append((path, *scope, *keys, sig[0], sig[1], stored))
+        if not records:
+            return
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO {self.TABLE} ({', '.join(self._columns)}) "
+                    f"VALUES ({', '.join('?' * len(self._columns))})", records)
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"[WARN] {self.LABEL} write failed: {e}")
+
+    def get_many(self, paths, signature=file_signature):
+        """Look up cached values for the given files.
+
+        Args:
+            paths: Iterable of file paths
+            signature: Callable path -> (size, mtime_ns) or None, e.g. a
+                FileManifest's signature method to avoid stat'ing again
+
+        Returns:
+            (hits, misses): dict of path -> value for files whose size and
+            mtime still match, and a list of the remaining paths in order.
+        """
+        paths = list(paths)
+        rows = self._select(paths)
+        hits = {}
+        misses = []
+        for path in paths:
+            row = rows.get(path)
+            if row is not None and signature(path) == (row[0], row[1]):
+                hits[path] = self._decode(row[2])
+            else:
+                misses.append(path)
+
+        self.hits += len(hits)
+        self.misses += len(misses)
+        return hits, misses
+
+    def put_many(self, items, signature=file_signature):
+        """Store values for files.
+
+        Args:
+            items: Iterable of (path, value) pairs. Files that can no longer
+                be stat'ed are skipped.
+            signature: Callable path -> (size, mtime_ns) or None
+        """
+        self._write(((path, (), self._encode(value)) for path, value in items), signature)
+
+    def remove(self, paths):
+        """Drop cached entries for the given paths (e.g. after moving them to Trash)"""
+        if not self.enabled:
+            return
+        paths = list(paths)
+        scope_sql, scope_params = self._scope_filter()
+        with self._lock:
+            try:
+                for start in range(0, len(paths), self._QUERY_CHUNK):
+                    chunk = paths[start:start + self._QUERY_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    self._conn.execute(
+                        f"DELETE FROM {self.TABLE} WHERE {scope_sql} AND path IN ({placeholders})",
+                        scope_params + chunk)
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"[WARN] {self.LABEL} delete failed: {e}")
+
+    def prune(self, folder, current_paths, extensions=None):
+        """
+        Drop entries under folder whose files are no longer in current_paths.
+
+        Caches are shared by tools that scan for different file types, so
+        only files of the types the scan looked for are considered.
+
+        Args:
+            folder: Folder that was just scanned
+            current_paths: Every file found under folder by that scan
+            extensions: Extensions the scan matched; None treats every stored
+                file under folder as scanned
+
+        Returns:
+            int: Number of files whose entries were removed
+        """
+        if not self.enabled:
+            return 0
+        scope_sql, scope_params = self._scope_filter()
+        # LIKE is case-insensitive for ASCII; compare the prefix exactly so a
+        # sibling folder that differs only in case is left alone
+        prefix = folder_prefix(folder)
+        with self._lock:
+            try:
+                stored = [row[0] for row in self._conn.execute(
+                    f"SELECT DISTINCT path FROM {self.TABLE} WHERE {scope_sql} AND substr(path, 1, ?) = ?",
+                    scope_params + [len(prefix), prefix])]
+            except sqlite3.Error as e:
+                print(f"[WARN] {self.LABEL} lookup failed: {e}")
+                return 0
+        current = set(current_paths)
+        if extensions is not None:
+            extensions = {e.lower() for e in extensions}
+            stored = [p for p in stored if os.path.splitext(p)[1].lower() in extensions]
+        deleted = [p for p in stored if p not in current]
+        if deleted:
+            self.remove(deleted)
+        return len(deleted)
+
+    def clear(self):
+        """Remove every entry in this instance's scope"""
+        if not self.enabled:
+            return
+        scope_sql, scope_params = self._scope_filter()
+        with self._lock:
+            try:
+                self._conn.execute(f"DELETE FROM {self.TABLE} WHERE {scope_sql}", scope_params)
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"[WARN] {self.LABEL} delete failed: {e}")
+
+    def get_stats(self):
+        total = self.hits + self.misses
+        hit_rate = (self.hits / total * 100) if total > 0 else 0
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': hit_rate}
+
+
+class CacheRegistry:
+    """Process-wide caches created on first use, one per key (thread-safe).
+
+    Args:
+        factory: Callable(*key) creating the cache for a key
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def get(self, *key):
+        with self._lock:
+            cache = self._caches.get(key)
+            if cache is None:
+                cache = self._factory(*key)
+                self._caches[key] = cache
+            return cache
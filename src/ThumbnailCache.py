@@ -0,0 +1,151 @@
+"""
+Persistent Thumbnail Cache for PhotoSift
+Stores a small pyramid of JPEG thumbnails per image on disk, keyed by
+(path, size, mtime) like the other caches, so every tool that opens a
+folder it (or another tool) has shown before skips decoding the originals,
+and each zoom step is resampled from the nearest larger level.
+"""
+
+import io
+
+from PIL import Image
+
+from SignatureCache import SignatureCache, CacheRegistry, file_signature
+
+# Long-side sizes kept on disk; a request is served from the smallest level
+# that covers it. Together they span the GUIs' zoom range (60-580 px wide);
+# larger requests go to the original file.
+THUMBNAIL_LEVELS = (160, 320, 640)
+JPEG_QUALITY = 90
+
+
+def thumbnail_level(size):
+    """
+    Pick the stored level that covers a thumbnail bounding box.
+
+    Args:
+        size: (width, height) bounding box
+
+    Returns:
+        int level, or None if the box is larger than every level
+    """
+    needed = max(size)
+    for level in THUMBNAIL_LEVELS:
+        if level >= needed:
+            return level
+    return None
+
+
+def build_pyramid(image):
+    """
+    Make every THUMBNAIL_LEVELS level from one decoded image.
+
+    Each level is resampled from the one above it, so the original is only
+    decoded once (at the largest level).
+
+    Args:
+        image: PIL.Image, ideally decoded at about the largest level
+
+    Returns:
+        dict of level -> PIL.Image in RGB mode
+    """
+    levels = {}
+    current = image.convert("RGB")
+    for level in sorted(THUMBNAIL_LEVELS, reverse=True):
+        current = current.copy()
+        current.thumbnail((level, level), Image.Resampling.LANCZOS)
+        levels[level] = current
+    return levels
+
+
+class ThumbnailDiskCache(SignatureCache):
+    """SQLite-backed store of JPEG thumbnails shared by every tool.
+
+    Args:
+        db_path: Database file. Defaults to thumbnails.sqlite in get_cache_dir().
+        quality: JPEG quality for stored thumbnails
+    """
+
+    TABLE = "thumbnails"
+    DB_NAME = "thumbnails.sqlite"
+    KEY_COLUMNS = (("level", "INTEGER"),)
+    VALUE_COLUMN = "data"
+    LABEL = "Thumbnail cache"
+
+    def __init__(self, db_path=None, quality=JPEG_QUALITY):
+        self.quality = quality
+        super().__init__(db_path=db_path)
+
+    def get(self, path, level, signature=file_signature, draft_size=None):
+        """
+        Load a stored thumbnail if the file has not changed since it was made.
+
+        Args:
+            path: Original image path
+            level: One of THUMBNAIL_LEVELS
+            signature: Callable path -> (size, mtime_ns) or None
+            draft_size: Optional (width, height) the caller will shrink to;
+                the stored JPEG is then decoded at the smallest DCT scale
+                that still covers it
+
+        Returns:
+            PIL.Image in RGB mode, or None on a miss
+        """
+        row = self._select([path], "level = ?", (level,)).get(path)
+        if row is None or signature(path) != (row[0], row[1]):
+            self.misses += 1
+            return None
+        try:
+            image = Image.open(io.BytesIO(row[2]))
+            if draft_size is not None:
+                image.draft("RGB", (int(draft_size[0]), int(draft_size[1])))
+            image.load()
+        except OSError as e:
+            print(f"[WARN] Discarding unreadable cached thumbnail for {path}: {e}")
+            self.remove([path])
+            self.misses += 1
+            return None
+        self.hits += 1
+        return image
+
+    def put(self, path, level, image, signature=file_signature):
+        """
+        Store a thumbnail made from the current version of a file.
+
+        Args:
+            path: Original image path (skipped if it can no longer be stat'ed)
+            level: One of THUMBNAIL_LEVELS
+            image: PIL.Image no larger than level on its long side
+            signature: Callable path -> (size, mtime_ns) or None
+        """
+        self.put_levels(path, {level: image}, signature)
+
+    def put_levels(self, path, levels, signature=file_signature):
+        """
+        Store several levels of one file in a single transaction.
+
+        Args:
+            path: Original image path (skipped if it can no longer be stat'ed)
+            levels: dict of level -> PIL.Image, e.g. from build_pyramid()
+            signature: Callable path -> (size, mtime_ns) or None
+        """
+        if not self.enabled:
+            return
+        sig = signature(path)
+        if sig is None:
+            return
+        entries = []
+        for level, image in levels.items():
+            buffer = io.BytesIO()
+            image.convert("RGB").save(buffer, format="JPEG", quality=self.quality)
+            entries.append((path, (level,), buffer.getvalue()))
+        # Every level shares the signature taken before encoding
+        self._write(entries, lambda _: sig)
+
+
+_caches = CacheRegistry(ThumbnailDiskCache)
+
+
+def get_thumbnail_cache():
+    """Return the process-wide ThumbnailDiskCache, creating it on first use"""
+    return _caches.get()
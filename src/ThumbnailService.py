@@ -0,0 +1,278 @@
+"""
+Background Thumbnail Service for PhotoSift
+Decodes and resizes thumbnails on worker threads (large JPEGs are decoded at
+reduced DCT scale, and results are kept in the shared on-disk ThumbnailCache)
+so opening a page of photos never blocks the window.
+The Tk side shows placeholders straight away and swaps in the real images as
+they finish; requests for cards on screen jump ahead of prefetches.
+"""
+
+import heapq
+import itertools
+import multiprocessing
+import threading
+from collections import deque
+
+from PIL import Image, ImageTk
+
+from CommonUI import ImageCache
+from ImageDecoder import open_reduced
+from ThumbnailCache import get_thumbnail_cache, thumbnail_level, build_pyramid, THUMBNAIL_LEVELS
+
+# Request priorities: lower runs first
+VISIBLE = 0
+PREFETCH = 1
+
+POLL_MS = 30  # How often the UI collects finished thumbnails while work is pending
+DELIVER_BATCH = 64  # Finished thumbnails turned into PhotoImages per poll
+
+
+def make_thumbnail(path, size, disk_cache=None):
+    """
+    Decode and shrink an image to fit inside size, keeping its aspect ratio.
+
+    Sizes up to the largest THUMBNAIL_LEVELS are resampled from the stored
+    level that covers them. On a miss the original is decoded once and the
+    whole pyramid is stored, so later zoom steps never touch the original.
+
+    Args:
+        path: Image file path
+        size: (width, height) bounding box
+        disk_cache: ThumbnailDiskCache (default: the process-wide cache)
+
+    Returns:
+        PIL.Image in RGB mode
+    """
+    level = thumbnail_level(size)
+    if level is None:
+        img = open_reduced(path, size)
+    else:
+        if disk_cache is None:
+            disk_cache = get_thumbnail_cache()
+        img = disk_cache.get(path, level, draft_size=size)
+        if img is None:
+            top = max(THUMBNAIL_LEVELS)
+            levels = build_pyramid(open_reduced(path, (top, top)))
+            disk_cache.put_levels(path, levels)
+            img = levels[level]
+    img.thumbnail(size, Image.Resampling.LANCZOS)
+    return img
+
+
+def default_thumbnail_workers():
+    """Decode threads: PIL releases the GIL while decoding, but the UI still needs a core"""
+    return max(1, min(multiprocessing.cpu_count() - 1, 4))
+
+
+class ThumbnailLoader:
+    """
+    Priority work queue that produces PIL thumbnails on daemon threads.
+
+    Requests are keyed by (path, size). Within a priority the most recent
+    request runs first, so after a fast scroll the cards the user stopped on
+    are decoded before the ones that flew past. Nothing here touches Tk;
+    finished thumbnails are collected with drain().
+
+    Args:
+        max_workers: Decode threads (default: default_thumbnail_workers())
+        loader: Callable(path, size) -> PIL.Image
+    """
+
+    def __init__(self, max_workers=None, loader=make_thumbnail):
+        self.max_workers = max_workers or default_thumbnail_workers()
+        self.loader = loader
+        self._cond = threading.Condition()
+        self._heap = []  # [priority, -seq, key, live]
+        self._pending = {}  # key -> heap entry
+        self._running = set()
+        self._done = deque()
+        self._seq = itertools.count()
+        self._workers = []
+        self._closed = False
+
+    def request(self, path, size, priority=VISIBLE):
+        """
+        Queue a thumbnail, or raise the priority of one already queued.
+
+        Returns:
+            bool: True if the thumbnail is queued or being decoded
+        """
+        key = (path, tuple(size))
+        with self._cond:
+            if self._closed:
+                return False
+            if key in self._running:
+                return True
+            entry = self._pending.get(key)
+            if entry is not None:
+                if entry[0] <= priority:
+                    return True
+                entry[3] = False  # Superseded; skipped when popped
+            entry = [priority, -next(self._seq), key, True]
+            self._pending[key] = entry
+            heapq.heappush(self._heap, entry)
+            if len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._work, daemon=True, name="thumbnail-loader")
+                self._workers.append(worker)
+                worker.start()
+            self._cond.notify()
+        return True
+
+    def cancel(self, path, size):
+        """Drop a queued request (one already being decoded still finishes)"""
+        with self._cond:
+            entry = self._pending.pop((path, tuple(size)), None)
+            if entry is not None:
+                entry[3] = False
+
+    def cancel_all(self):
+        with self._cond:
+            for entry in self._pending.values():
+                entry[3] = False
+            self._pending.clear()
+            self._heap.clear()
+
+    def pending_count(self):
+        """Requests queued, being decoded, or finished but not yet drained"""
+        with self._cond:
+            return len(self._pending) + len(self._running) + len(self._done)
+
+    def drain(self, limit=None):
+        """
+        Collect finished thumbnails.
+
+        Returns:
+            list of ((path, size), PIL.Image or None if decoding failed)
+        """
+        results = []
+        with self._cond:
+            while self._done and (limit is None or len(results) < limit):
+                results.append(self._done.popleft())
+        return results
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._heap.clear()
+            self._cond.notify_all()
+
+    def _work(self):
+        while True:
+            with self._cond:
+                entry = None
+                while entry is None:
+                    while not self._heap and not self._closed:
+                        self._cond.wait()
+                    if self._closed:
+                        return
+                    candidate = heapq.heappop(self._heap)
+                    if candidate[3]:
+                        entry = candidate
+                key = entry[2]
+                del self._pending[key]
+                self._running.add(key)
+            try:
+                image = self.loader(*key)
+            except Exception as e:
+                print(f"Error creating thumbnail for {key[0]}: {e}")
+                image = None
+            with self._cond:
+                self._running.discard(key)
+                self._done.append((key, image))
+
+
+class ThumbnailService:
+    """
+    Asynchronous thumbnail cache for the Tk GUIs.
+
+    get() answers from the cache or queues the decode and returns None; the
+    callback runs on the Tk thread once the PhotoImage is ready. Decode
+    failures are remembered so a broken file is not retried on every scroll.
+    PhotoImages live in a byte-bounded ImageCache sharing one memory budget
+    with every other open tool.
+
+    Args:
+        widget: Any Tk widget, used to schedule polling on the main loop
+        max_workers: Decode threads
+        cache: ImageCache to keep PhotoImages in (default: a new one on the
+            shared budget)
+    """
+
+    FAILED = False  # Cached value for files that could not be decoded
+
+    def __init__(self, widget, max_workers=None, cache=None):
+        self.widget = widget
+        self.loader = ThumbnailLoader(max_workers)
+        self.cache = cache if cache is not None else ImageCache()  # (path, size) -> PhotoImage, or FAILED
+        self._callbacks = {}  # (path, size) -> [callback(path, size, image)]
+        self._poll_id = None
+
+    def get(self, path, size, callback=None, prefetch=False):
+        """
+        Look up a thumbnail, queueing it in the background if needed.
+
+        Args:
+            path: Image file path
+            size: (width, height) bounding box
+            callback: Optional callable(path, size, image) run on the Tk
+                thread when a queued thumbnail finishes; image is None if
+                the file could not be decoded
+            prefetch: True for cards just outside the viewport; they are
+                decoded after every card on screen
+
+        Returns:
+            PhotoImage if cached, FAILED if decoding failed before,
+            None if the thumbnail is being prepared
+        """
+        key = (path, tuple(size))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        if callback is not None:
+            callbacks = self._callbacks.setdefault(key, [])
+            if callback not in callbacks:
+                callbacks.append(callback)
+        self.loader.request(path, key[1], PREFETCH if prefetch else VISIBLE)
+        self._schedule_poll()
+        return None
+
+    def failed(self, path, size):
+        """True if the file is already known to be undecodable at this size"""
+        return self.cache.peek((path, tuple(size))) is self.FAILED
+
+    def prioritize(self, path, size):
+        """Move a queued thumbnail to the front, e.g. when its card scrolls into view"""
+        if (path, tuple(size)) not in self.cache:
+            self.loader.request(path, size, VISIBLE)
+
+    def cancel(self, path, size):
+        """Forget a request whose card is no longer shown"""
+        key = (path, tuple(size))
+        self._callbacks.pop(key, None)
+        self.loader.cancel(path, size)
+
+    def cancel_pending(self):
+        """Drop queued work but keep cached thumbnails (e.g. when zooming)"""
+        self.loader.cancel_all()
+        self._callbacks.clear()
+
+    def clear(self):
+        """Drop cached thumbnails and queued work (e.g. after switching folders)"""
+        self.loader.cancel_all()
+        self._callbacks.clear()
+        self.cache.clear()
+
+    def _schedule_poll(self):
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_id = None
+        for key, image in self.loader.drain(DELIVER_BATCH):
+            photo = ImageTk.PhotoImage(image) if image is not None else None
+            self.cache.put(key, photo if photo is not None else self.FAILED)
+            for callback in self._callbacks.pop(key, ()):
+                callback(key[0], key[1], photo)
+        if self.loader.pending_count():
+            self._schedule_poll()
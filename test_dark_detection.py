@@ -1,7 +1,12 @@
 import cv2
 import numpy as np
 import os
-from src.DarkImageDetection import DarkImageDetector
+import sys
+
+# src modules import each other by name, so src itself must be on the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from DarkImageDetection import DarkImageDetector
 
 def test_dark_detection():
     detector = DarkImageDetector(threshold=40.0)
@@ -0,0 +1,60 @@
+"""
+Throughput comparison of the CLIP backends
+Encodes a folder of images (or random noise images) with PyTorch and with
+ONNX Runtime, then prints images/second for each and how far apart their
+embeddings are.
+
+Usage:
+    python tests/benchmark_clip_backends.py [image_folder] [--batch-size N] [--limit N]
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+from PIL import Image
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ClipModelService import benchmark_backends, onnx_available, ONNX_TOLERANCE
+from ImageDecoder import load_resized
+
+IMG_EXT = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+
+def load_images(folder, limit):
+    if folder is None:
+        rng = np.random.default_rng(0)
+        return [Image.fromarray(rng.integers(0, 256, (224, 224, 3), dtype=np.uint8)) for _ in range(limit)]
+    paths = sorted(os.path.join(root, name) for root, _, files in os.walk(folder)
+                   for name in files if os.path.splitext(name)[1].lower() in IMG_EXT)
+    return [load_resized(path, (224, 224)) for path in paths[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare CLIP throughput on PyTorch and ONNX Runtime")
+    parser.add_argument("folder", nargs="?", help="Folder of images (default: random images)")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--limit", type=int, default=256, help="Maximum number of images")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    if not onnx_available():
+        print("onnxruntime is not installed; only the torch backend will be measured")
+    images = load_images(args.folder, args.limit)
+    print(f"Encoding {len(images)} images, batch size {args.batch_size}")
+    results = benchmark_backends(images, batch_size=args.batch_size, repeats=args.repeats)
+
+    for backend in ("torch", "onnx"):
+        if backend in results:
+            print(f"{backend:>6}: {results[backend]:8.1f} images/s")
+    if "onnx" in results:
+        print(f"speedup: {results['onnx'] / results['torch']:.2f}x")
+        print(f"max abs diff: {results['max_abs_diff']:.2e} (tolerance {ONNX_TOLERANCE:.0e}), "
+              f"min cosine: {results['min_cosine']:.6f}")
+
+
+if __name__ == "__main__":
+    main()
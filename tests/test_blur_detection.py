@@ -146,6 +146,42 @@ class TestBlurDetectionIntegration(unittest.TestCase):
         except ImportError:
             print("⚠ OpenCV not available for Laplacian test")
     
+    def test_blurry_fixture_flagged_at_default(self):
+        """Test that the demo blur fixtures keep their verdicts at the default threshold"""
+        examples = Path(__file__).parent.parent / "tutorial_demo_photos" / "blur_examples"
+        detector = BlurryImageDetector()
+        self.assertTrue(detector.is_blurry(str(examples / "sample_slight_blur.jpg"))[0])
+        self.assertFalse(detector.is_blurry(str(examples / "base_sharp.jpg"))[0])
+        print("✓ Blur fixtures classified at the default threshold")
+
+    def test_camera_size_blur_flagged_at_default(self):
+        """Test that a blurry camera-size photo is still flagged after downscaled analysis"""
+        import cv2
+        examples = Path(__file__).parent.parent / "tutorial_demo_photos" / "blur_examples"
+        # An 800x600 photo enlarged to 12 MP has no detail finer than ~5 pixels
+        image = cv2.imread(str(examples / "sample_sharp.jpg"))
+        image = cv2.resize(image, (4000, 3000), interpolation=cv2.INTER_LANCZOS4)
+        image_path = self.test_data_dir / "camera_size_blur.jpg"
+        cv2.imwrite(str(image_path), image)
+        try:
+            is_blurry, score = BlurryImageDetector().is_blurry(str(image_path))
+        finally:
+            image_path.unlink()
+        self.assertTrue(is_blurry)
+        self.assertLess(score, 50)
+        print(f"✓ Camera-size blurry photo flagged (score {score:.1f})")
+
+    def test_small_image_score_unscaled(self):
+        """Test that images at or below the analysis size keep their raw Laplacian variance"""
+        import cv2
+        from ImageQualityAnalyzer import blur_score
+        image = np.random.default_rng(0).integers(0, 256, (600, 800, 3), dtype=np.uint8)
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        expected = cv2.Laplacian(gray, cv2.CV_64F).var()
+        self.assertAlmostEqual(blur_score(image, (800, 600)), expected)
+        self.assertAlmostEqual(blur_score(image, (1600, 1200)), expected / 4)
+        print("✓ Blur score scaled only for downscaled images")
+
     def test_parallel_processing_support(self):
         """Test that parallel processing is available"""
         try:
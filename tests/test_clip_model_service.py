@@ -0,0 +1,217 @@
+"""
+Tests for the shared CLIP model service
+Verifies that every CLIP tool uses the same process-wide loader, that
+opening a tool does not import torch or transformers, and that the ONNX
+Runtime backend matches PyTorch or falls back to it
+"""
+
+import unittest
+import os
+import sys
+import shutil
+import subprocess
+import threading
+import numpy as np
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import ClipModelService
+
+
+class TestClipModelService(unittest.TestCase):
+    """Test cases for ClipModelService"""
+
+    def test_tools_share_one_loader(self):
+        """Test that all three CLIP modules use the shared load_models"""
+        import DuplicateImageIdentifier
+        import ImageClassification
+        import SafeContentDetection
+        self.assertIs(DuplicateImageIdentifier.load_models, ClipModelService.load_models)
+        self.assertIs(ImageClassification.load_models, ClipModelService.load_models)
+        self.assertIs(SafeContentDetection.load_models, ClipModelService.load_models)
+        print("✓ CLIP tools share one model loader")
+
+    def test_unload_when_not_loaded(self):
+        """Test that unloading an unloaded model is a no-op"""
+        if ClipModelService.is_loaded():
+            self.skipTest("Model already loaded by another test")
+        ClipModelService.unload_models()
+        self.assertFalse(ClipModelService.is_loaded())
+        print("✓ Unload without a loaded model is safe")
+
+    def test_model_path(self):
+        """Test that the model path points at the ViT-B/32 checkpoint"""
+        self.assertIn(ClipModelService.MODEL_NAME, ClipModelService.get_model_path())
+        print("✓ Model path resolved")
+
+    def test_prompt_key_stable(self):
+        """Test that the text-embedding cache key depends only on model and prompts"""
+        key = ClipModelService._prompt_key(["a photo", "a screenshot"])
+        self.assertEqual(key, ClipModelService._prompt_key(["a photo", "a screenshot"]))
+        self.assertNotEqual(key, ClipModelService._prompt_key(["a screenshot", "a photo"]))
+        self.assertTrue(key.startswith(ClipModelService.MODEL_NAME))
+        print("✓ Prompt cache key stable")
+
+    def test_zero_shot_classify_uses_cached_text(self):
+        """Test that classification sums prompt probabilities per label from cached embeddings"""
+        labels = {"people": ["a person", "a face"], "screenshot": ["a screenshot"]}
+        prompts = ["a person", "a face", "a screenshot"]
+        text = np.eye(3, 4, dtype=np.float32)
+        key = ClipModelService._prompt_key(prompts)
+        ClipModelService._text_embeddings[key] = (text, 100.0)
+        try:
+            results = ClipModelService.zero_shot_classify(
+                np.array([[0, 2, 0, 0], [0, 0, 5, 0]], dtype=np.float32), labels)
+        finally:
+            ClipModelService._text_embeddings.pop(key, None)
+        self.assertEqual([r[0] for r in results], ["people", "screenshot"])
+        for _, conf, scores in results:
+            self.assertAlmostEqual(sum(scores.values()), 1.0, places=5)
+            self.assertGreater(conf, 0.99)
+        print("✓ Zero-shot classification uses cached text embeddings")
+
+
+    def test_tool_imports_defer_torch(self):
+        """Test that importing the tool GUIs leaves torch, transformers and cv2 unloaded"""
+        src_dir = os.path.join(os.path.dirname(__file__), '..', 'src')
+        code = ("import sys; import ClipModelService, ImageClassifierGUI, DuplicateImageIdentifierGUI, "
+                "SafeContentDetectionGUI, LowResolutionGUI, LibraryAnalyzerGUI; "
+                "print('loaded=' + ','.join(m for m in ('torch', 'transformers', 'cv2') if m in sys.modules))")
+        result = subprocess.run([sys.executable, "-c", code], cwd=src_dir, capture_output=True, text=True,
+                                timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("loaded=\n", result.stdout)
+        print("✓ Heavy imports deferred until a model or OpenCV is used")
+
+
+def _module_available(name):
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+class TestClipBackends(unittest.TestCase):
+    """Test cases for selecting the torch or ONNX Runtime backend"""
+
+    def setUp(self):
+        self.previous = (ClipModelService.get_backend(), ClipModelService._model,
+                         ClipModelService._processor, ClipModelService._onnx_sessions)
+
+    def tearDown(self):
+        (ClipModelService._backend, ClipModelService._model,
+         ClipModelService._processor, ClipModelService._onnx_sessions) = self.previous
+
+    def test_set_backend(self):
+        """Test that only known backends can be selected"""
+        ClipModelService.set_backend(" ONNX ")
+        self.assertEqual(ClipModelService.get_backend(), "onnx")
+        with self.assertRaises(ValueError):
+            ClipModelService.set_backend("tensorrt")
+        self.assertEqual(ClipModelService.get_backend(), "onnx")
+        print("✓ Backend selection validated")
+
+    def test_onnx_paths_in_cache_dir(self):
+        """Test that exported models are cached per model and opset"""
+        vision_path, text_path = ClipModelService.get_onnx_paths("onnx_dir")
+        self.assertEqual(os.path.dirname(vision_path), "onnx_dir")
+        for path, tower in ((vision_path, "vision"), (text_path, "text")):
+            self.assertIn(ClipModelService.MODEL_NAME, path)
+            self.assertIn(tower, path)
+            self.assertIn(f"opset{ClipModelService.ONNX_OPSET}", path)
+        print("✓ ONNX export paths keyed by model and opset")
+
+    def test_unload_waits_for_onnx_setup(self):
+        """Test that unloading waits while the ONNX sessions are being created"""
+        ClipModelService._onnx_sessions = {}
+        with ClipModelService._onnx_lock:
+            thread = threading.Thread(target=ClipModelService.unload_models)
+            thread.start()
+            thread.join(0.2)
+            self.assertTrue(thread.is_alive())
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(ClipModelService._onnx_sessions)
+        print("✓ Unload serialized with ONNX session setup")
+
+    @unittest.skipUnless(_module_available("onnxruntime") and _module_available("onnx"),
+                         "onnxruntime and onnx are not installed")
+    def test_onnx_backend_skips_torch_model(self):
+        """Test that the ONNX backend serves load_models without the PyTorch model"""
+        from transformers import CLIPConfig, CLIPModel
+        tower = dict(hidden_size=32, intermediate_size=64, num_hidden_layers=2, num_attention_heads=2)
+        config = CLIPConfig(text_config=dict(tower, vocab_size=1000),
+                            vision_config=dict(tower, image_size=224, patch_size=32), projection_dim=16)
+        ClipModelService._model = CLIPModel(config).eval()
+        processor = ClipModelService._processor = object()
+        ClipModelService._onnx_sessions = None
+        onnx_dir = Path(__file__).parent / "test_data" / "clip_onnx_only"
+        try:
+            ClipModelService.export_onnx(str(onnx_dir), force=True)
+            ClipModelService._model = None
+            ClipModelService._load_onnx_sessions(str(onnx_dir))
+            ClipModelService.set_backend("onnx")
+            model, loaded_processor = ClipModelService.load_models()
+        finally:
+            ClipModelService._onnx_sessions = None
+            shutil.rmtree(onnx_dir, ignore_errors=True)
+        self.assertIsNone(model)
+        self.assertIs(loaded_processor, processor)
+        self.assertIsNone(ClipModelService._model)
+        print("✓ ONNX backend keeps only the processor and sessions")
+
+    @unittest.skipIf(_module_available("onnxruntime"), "onnxruntime is installed")
+    def test_falls_back_without_onnxruntime(self):
+        """Test that selecting ONNX without onnxruntime falls back to torch"""
+        ClipModelService.set_backend("onnx")
+        self.assertFalse(ClipModelService.onnx_available())
+        self.assertEqual(ClipModelService._active_backend(), "torch")
+        print("✓ Missing onnxruntime falls back to torch")
+
+    @unittest.skipUnless(_module_available("onnxruntime") and _module_available("onnx"),
+                         "onnxruntime and onnx are not installed")
+    def test_onnx_matches_torch(self):
+        """Test that both ONNX towers reproduce the PyTorch embeddings"""
+        import torch
+        from transformers import CLIPConfig, CLIPModel
+        tower = dict(hidden_size=32, intermediate_size=64, num_hidden_layers=2, num_attention_heads=2)
+        config = CLIPConfig(text_config=dict(tower, vocab_size=1000),
+                            vision_config=dict(tower, image_size=224, patch_size=32), projection_dim=16)
+        torch.manual_seed(0)
+        ClipModelService._model = CLIPModel(config).eval()
+        ClipModelService._processor = object()
+        ClipModelService._onnx_sessions = None
+        onnx_dir = Path(__file__).parent / "test_data" / "clip_onnx"
+        try:
+            paths = ClipModelService.export_onnx(str(onnx_dir), force=True)
+            pixel_values = torch.rand(3, 3, 224, 224)
+            input_ids = torch.randint(0, 1000, (2, 7))
+            attention_mask = torch.ones_like(input_ids)
+            with torch.no_grad():
+                expected_image = ClipModelService._as_features(
+                    ClipModelService._model.get_image_features(pixel_values=pixel_values)).numpy()
+                expected_text = ClipModelService._as_features(ClipModelService._model.get_text_features(
+                    input_ids=input_ids, attention_mask=attention_mask)).numpy()
+
+            import onnxruntime as ort
+            vision = ort.InferenceSession(paths[0], providers=["CPUExecutionProvider"])
+            text = ort.InferenceSession(paths[1], providers=["CPUExecutionProvider"])
+            ClipModelService._onnx_sessions = {"vision": vision, "text": text}
+            ClipModelService.set_backend("onnx")
+            image = ClipModelService.compute_image_features({"pixel_values": pixel_values})
+            text_embeds, logit_scale = text.run(None, {"input_ids": input_ids.numpy(),
+                                                       "attention_mask": attention_mask.numpy()})
+        finally:
+            ClipModelService._onnx_sessions = None
+            shutil.rmtree(onnx_dir, ignore_errors=True)
+        np.testing.assert_allclose(image, expected_image, atol=ClipModelService.ONNX_TOLERANCE)
+        np.testing.assert_allclose(text_embeds, expected_text, atol=ClipModelService.ONNX_TOLERANCE)
+        self.assertAlmostEqual(float(logit_scale), float(ClipModelService._model.logit_scale.exp()), places=4)
+        print("✓ ONNX embeddings match PyTorch within tolerance")
+
+
+if __name__ == '__main__':
+    unittest.main()
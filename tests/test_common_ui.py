@@ -11,7 +11,8 @@ from pathlib import Path
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from CommonUI import ModernColors, ModernButton, TrashManager, ToolTip, StatusBar
+from CommonUI import (ModernColors, ModernButton, TrashManager, ToolTip, StatusBar, ProgressChannel, format_eta,
+                      GridLayout, VirtualGrid, ImageCache, ImageCacheBudget, image_nbytes)
 
 
 class TestCommonUI(unittest.TestCase):
@@ -95,6 +96,192 @@ class TestUIComponentIntegration(unittest.TestCase):
         print("✓ All color values are valid hex codes")
 
 
+class TestProgressChannel(unittest.TestCase):
+    """Test the progress state shared between scan threads and the UI"""
+    
+    def setUp(self):
+        self.now = 0.0
+        self.channel = ProgressChannel(clock=lambda: self.now)
+        self.channel.reset(100, "Preparing...")
+    
+    def test_latest_push_wins(self):
+        """Test that only the latest counters are kept between polls"""
+        for i in range(1, 51):
+            self.channel.push(i, 100, f"Processing: {i}.jpg", f"{i}/100")
+        snapshot = self.channel.snapshot()
+        self.assertEqual(snapshot['current'], 50)
+        self.assertEqual(snapshot['status'], "Processing: 50.jpg")
+        self.assertEqual(snapshot['detail'], "50/100")
+        self.assertIsNone(snapshot['rate'])  # One sample cannot give a rate
+        print("✓ Channel keeps only the latest progress")
+    
+    def test_rate_and_eta(self):
+        """Test images/sec and ETA from successive polls"""
+        self.channel.snapshot()
+        self.now = 2.0
+        self.channel.push(20, 100)
+        snapshot = self.channel.snapshot()
+        self.assertAlmostEqual(snapshot['rate'], 10.0)
+        self.assertAlmostEqual(snapshot['eta'], 8.0)
+        self.assertIn("10.0 img/s", ProgressChannel.describe(snapshot))
+        self.assertIn("ETA 0:08", ProgressChannel.describe(snapshot))
+        print("✓ Rate and ETA computed from polls")
+    
+    def test_rate_follows_recent_speed(self):
+        """Test that old samples fall out of the rate window"""
+        self.channel.snapshot()
+        self.now = 1.0
+        self.channel.push(50, 100)  # Fast start (cached files)
+        self.channel.snapshot()
+        for step in range(2, 12):
+            self.now = float(step)
+            self.channel.push(50 + 2 * (step - 1), 100)
+            snapshot = self.channel.snapshot()
+        self.assertLess(snapshot['rate'], 3.0)
+        print(f"✓ Rate follows recent speed ({snapshot['rate']:.1f} img/s)")
+    
+    def test_new_phase_resets_rate(self):
+        """Test that a new total starts a fresh rate estimate"""
+        self.channel.snapshot()
+        self.now = 1.0
+        self.channel.push(100, 100)
+        self.channel.snapshot()
+        self.channel.push(0, 40, "Grouping...")
+        self.now = 2.0
+        snapshot = self.channel.snapshot()
+        self.assertEqual(snapshot['total'], 40)
+        self.assertIsNone(snapshot['rate'])
+        print("✓ New phase resets the rate")
+    
+    def test_format_eta(self):
+        """Test ETA formatting"""
+        self.assertEqual(format_eta(5), "0:05")
+        self.assertEqual(format_eta(125), "2:05")
+        self.assertEqual(format_eta(3725), "1:02:05")
+        print("✓ ETA formatting")
+
+
+class TestGridLayout(unittest.TestCase):
+    """Test the cell arithmetic behind the virtualized thumbnail grid"""
+    
+    def test_columns_and_height(self):
+        """Test column count and content height"""
+        layout = GridLayout(count=10, cell_width=270, cell_height=242, width=1000)
+        self.assertEqual(layout.columns, 3)
+        self.assertEqual(layout.rows, 4)
+        self.assertEqual(layout.height, 4 * 242)
+        self.assertEqual(layout.position(4), (270, 242))
+        self.assertEqual(GridLayout(5, 270, 242, 100).columns, 1)  # Never fewer than one column
+        print("✓ Grid columns and height")
+    
+    def test_visible_range_tracks_viewport(self):
+        """Test that only rows overlapping the viewport are visible"""
+        layout = GridLayout(count=30000, cell_width=100, cell_height=100, width=400)
+        visible = layout.visible_range(top=0, height=250)
+        self.assertEqual((visible.start, visible.stop), (0, 12))  # Rows 0-2
+        visible = layout.visible_range(top=500000, height=250, overscan_rows=1)
+        self.assertEqual((visible.start, visible.stop), (19996, 20016))  # Rows 4999-5003
+        last = layout.visible_range(top=layout.height - 100, height=250, overscan_rows=1)
+        self.assertEqual(last.stop, 30000)
+        print("✓ Visible range stays proportional to the viewport")
+    
+    def test_visible_range_empty(self):
+        """Test that an empty grid or unmapped viewport shows nothing"""
+        self.assertEqual(len(GridLayout(0, 100, 100, 400).visible_range(0, 500)), 0)
+        self.assertEqual(len(GridLayout(10, 100, 100, 400).visible_range(0, 0)), 0)
+        print("✓ Empty grid has no visible cells")
+    
+    def test_sections_start_on_new_rows(self):
+        """Test that each section starts a new row below its own header"""
+        layout = GridLayout(count=7, cell_width=100, cell_height=100, width=400,
+                            sections=[5, 0, 2], header_height=40)
+        self.assertEqual(layout.section_tops, [0, 240, 280])
+        self.assertEqual(layout.height, 420)
+        self.assertEqual(layout.position(4), (0, 140))  # Second row of the first section
+        self.assertEqual(layout.position(5), (0, 320))  # Past the empty section's header
+        print("✓ Sections laid out under their headers")
+    
+    def test_sections_visible_range(self):
+        """Test that headers and card rows are found in the viewport independently"""
+        layout = GridLayout(count=7, cell_width=100, cell_height=100, width=400,
+                            sections=[5, 0, 2], header_height=40)
+        self.assertEqual(layout.visible_range(top=130, height=20), range(0, 5))
+        self.assertEqual(layout.visible_range(top=250, height=100), range(5, 7))
+        self.assertEqual(len(layout.visible_range(top=245, height=30)), 0)  # Only headers in view
+        self.assertEqual(layout.visible_sections(top=250, height=100), range(1, 3))
+        self.assertEqual(len(GridLayout(10, 100, 100, 400).visible_sections(0, 500)), 0)
+        print("✓ Sectioned grid visible range")
+    
+    def test_virtual_grid_interface(self):
+        """Test that VirtualGrid exposes the methods the detector GUIs use"""
+        for name in ('set_items', 'set_thumb_size', 'refresh', 'selected_paths', 'selection_count',
+                     'all_selected', 'set_all_selected', 'set_selected', 'visible_range', 'pack'):
+            self.assertTrue(callable(getattr(VirtualGrid, name)))
+        print("✓ VirtualGrid interface present")
+
+
+class FakePhoto:
+    """Stand-in for ImageTk.PhotoImage (needs no display)"""
+    
+    def __init__(self, width, height):
+        self._size = (width, height)
+    
+    def width(self):
+        return self._size[0]
+    
+    def height(self):
+        return self._size[1]
+
+
+class TestImageCache(unittest.TestCase):
+    """Test the byte-bounded LRU image cache"""
+    
+    def test_image_nbytes(self):
+        """Test memory estimates for PhotoImages, PIL images and placeholders"""
+        self.assertEqual(image_nbytes(FakePhoto(10, 20)), 800)
+        from PIL import Image
+        self.assertEqual(image_nbytes(Image.new("RGB", (10, 20))), 800)
+        self.assertEqual(image_nbytes(False), 0)
+        print("✓ Image memory estimates")
+    
+    def test_evicts_least_recently_used(self):
+        """Test that the budget evicts the entry used longest ago"""
+        cache = ImageCache(budget=ImageCacheBudget(max_bytes=3 * 400))
+        for name in "abc":
+            cache.put(name, FakePhoto(10, 10))
+        self.assertIsNotNone(cache.get("a"))  # "b" is now the oldest
+        cache.put("d", FakePhoto(10, 10))
+        self.assertNotIn("b", cache)
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.nbytes, 1200)
+        stats = cache.get_stats()
+        self.assertEqual((stats['hits'], stats['evictions']), (1, 1))
+        print("✓ Least recently used entry evicted")
+    
+    def test_shared_budget(self):
+        """Test that caches on one budget evict each other's oldest entries"""
+        budget = ImageCacheBudget(max_bytes=2 * 400)
+        idle, active = ImageCache(budget=budget), ImageCache(budget=budget)
+        idle.put(("a.jpg", (10, 10)), FakePhoto(10, 10))
+        active.put(("b.jpg", (10, 10)), FakePhoto(10, 10))
+        active.put(("c.jpg", (10, 10)), FakePhoto(10, 10))
+        self.assertEqual(len(idle), 0)
+        self.assertEqual(len(active), 2)
+        self.assertEqual(budget.used_bytes, 800)
+        print("✓ Budget shared across caches")
+    
+    def test_forget_path(self):
+        """Test that every size of a file can be dropped at once"""
+        cache = ImageCache(budget=ImageCacheBudget())
+        cache.put(("a.jpg", (240, 180)), FakePhoto(240, 180))
+        cache.put(("a.jpg", (800, 600)), FakePhoto(800, 600))
+        cache.put(("b.jpg", (240, 180)), FakePhoto(240, 180))
+        cache.forget_path("a.jpg")
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.nbytes, 240 * 180 * 4)
+        print("✓ All sizes of a file forgotten")
+
+
 if __name__ == '__main__':
     print("=" * 70)
     print("Running Common UI Tests")
@@ -106,6 +106,172 @@ class TestDuplicateDetectionIntegration(unittest.TestCase):
         print("✓ Cosine similarity calculations are correct")
 
 
+class TestSimilarityGrouping(unittest.TestCase):
+    """Tests for group_similar_images_clip on synthetic embeddings (no model needed)"""
+    
+    def setUp(self):
+        """Build clustered embeddings: three tight clusters plus isolated points"""
+        import numpy as np
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(3, 512))
+        vectors = []
+        for c in centers:
+            for _ in range(4):
+                vectors.append(c + rng.normal(scale=0.05, size=512))
+        vectors.extend(rng.normal(size=(20, 512)))
+        order = rng.permutation(len(vectors))
+        self.files = [f"img_{i:03d}.jpg" for i in range(len(vectors))]
+        self.embeddings = {f: np.asarray(vectors[k], dtype=np.float32) for f, k in zip(self.files, order)}
+    
+    def test_blocked_grouping_matches_single_block(self):
+        """Test that tiny similarity blocks give the same groups as one big block"""
+        from DuplicateImageIdentifier import group_similar_images_clip
+        big = group_similar_images_clip(embeddings=self.embeddings, files=self.files,
+                                        threshold=0.9, return_scores=True, max_block_mb=1024)
+        tiny = group_similar_images_clip(embeddings=self.embeddings, files=self.files,
+                                         threshold=0.9, return_scores=True, max_block_mb=0.0001)
+        self.assertEqual(big[0], tiny[0])
+        self.assertEqual(big[1].keys(), tiny[1].keys())
+        for path, score in big[1].items():
+            self.assertAlmostEqual(score, tiny[1][path], places=5)
+        self.assertEqual(len(big[0]), 3)
+        self.assertTrue(all(len(g) == 4 for g in big[0]))
+        print("✓ Blocked similarity search matches single-block grouping")
+    
+    def test_graph_regrouping_matches_pairwise_grouping(self):
+        """Test that one graph built at 0.80 regroups identically to dense pairwise grouping"""
+        import numpy as np
+        from DuplicateImageIdentifier import build_similarity_graph
+        graph = build_similarity_graph(self.embeddings, self.files, min_threshold=0.80)
+        
+        matrix = np.array([self.embeddings[f] for f in self.files])
+        matrix = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+        similarity = matrix @ matrix.T
+        for threshold in (0.80, 0.9, 0.95, 0.99):
+            expected, used = [], set()
+            for i in range(len(self.files)):
+                if i in used:
+                    continue
+                members = [j for j in np.where(similarity[i] >= threshold)[0] if j not in used and j != i]
+                used.add(i)
+                if members:
+                    expected.append([self.files[i]] + [self.files[j] for j in members])
+                    used.update(members)
+            self.assertEqual(graph.group(threshold), expected)
+        print("✓ Graph re-grouping matches pairwise grouping at every threshold")
+    
+    def test_graph_rejects_threshold_below_minimum(self):
+        """Test that grouping below the graph's minimum threshold raises"""
+        from DuplicateImageIdentifier import build_similarity_graph
+        graph = build_similarity_graph(self.embeddings, self.files, min_threshold=0.9)
+        with self.assertRaises(ValueError):
+            graph.group(0.85)
+        print("✓ Graph rejects thresholds below its minimum")
+    
+    def test_empty_input(self):
+        """Test that grouping an empty file list returns no groups"""
+        from DuplicateImageIdentifier import group_similar_images_clip
+        groups, scores = group_similar_images_clip(embeddings={}, files=[], return_scores=True)
+        self.assertEqual(groups, [])
+        self.assertEqual(scores, {})
+        print("✓ Empty input returns no groups")
+
+
+class TestExactDuplicates(unittest.TestCase):
+    """Tests for the hash-based exact duplicate stage"""
+    
+    def setUp(self):
+        """Write small files: two copies, a same-size different file and a unique file"""
+        self.test_data_dir = Path(__file__).parent / "test_data" / "exact_duplicates"
+        self.test_data_dir.mkdir(parents=True, exist_ok=True)
+        payload = os.urandom(200 * 1024)
+        different = bytearray(payload)
+        different[100 * 1024] ^= 0xFF  # Differs only in the middle, outside the partial hash
+        contents = {"a.jpg": payload, "b.jpg": bytes(different), "c.jpg": payload, "d.jpg": b"unique"}
+        self.paths = {}
+        for name, data in contents.items():
+            path = self.test_data_dir / name
+            path.write_bytes(data)
+            self.paths[name] = str(path)
+    
+    def tearDown(self):
+        """Clean up test files"""
+        import shutil
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+    
+    def test_find_exact_duplicates(self):
+        """Test that only byte-identical files are grouped"""
+        from DuplicateImageIdentifier import find_exact_duplicates
+        files = [self.paths[n] for n in ("a.jpg", "b.jpg", "c.jpg", "d.jpg")]
+        groups = find_exact_duplicates(files)
+        self.assertEqual(groups, [[self.paths["a.jpg"], self.paths["c.jpg"]]])
+        print("✓ Exact duplicates found by size and hash")
+    
+    def test_exact_copies_join_groups(self):
+        """Test that skipped copies are added back into the grouped output"""
+        import numpy as np
+        from DuplicateImageIdentifier import find_exact_duplicates, split_exact_duplicates, build_similarity_graph
+        files = [self.paths[n] for n in ("a.jpg", "b.jpg", "c.jpg", "d.jpg")]
+        representatives, exact_copies = split_exact_duplicates(files, find_exact_duplicates(files))
+        self.assertNotIn(self.paths["c.jpg"], representatives)
+        
+        embeddings = {f: np.eye(4, dtype=np.float32)[k] for k, f in enumerate(representatives)}
+        graph = build_similarity_graph(embeddings, representatives, min_threshold=0.8,
+                                       exact_copies=exact_copies)
+        groups, scores = graph.group(0.9, return_scores=True)
+        self.assertEqual(groups, [[self.paths["a.jpg"], self.paths["c.jpg"]]])
+        self.assertEqual(scores[self.paths["c.jpg"]], 1.0)
+        print("✓ Exact copies grouped without embeddings")
+
+
+class TestEmbeddingDecodeFailures(unittest.TestCase):
+    """Tests that undecodable files are left out of the embeddings and the cache"""
+
+    def setUp(self):
+        """Write one valid and one truncated JPEG, and stand in for the CLIP model"""
+        import numpy as np
+        from unittest import mock
+        from PIL import Image
+        import DuplicateImageIdentifier
+        from EmbeddingCache import EmbeddingCache
+        self.test_data_dir = Path(__file__).parent / "test_data" / "decode_failures"
+        self.test_data_dir.mkdir(parents=True, exist_ok=True)
+        self.good = str(self.test_data_dir / "good.jpg")
+        Image.new("RGB", (64, 48), (200, 30, 30)).save(self.good)
+        self.truncated = str(self.test_data_dir / "truncated.jpg")
+        with open(self.good, "rb") as f:
+            header = f.read(40)
+        Path(self.truncated).write_bytes(header)
+        self.cache = EmbeddingCache("test-model", db_path=str(self.test_data_dir / "embeddings.sqlite"))
+        processor = lambda images, **kwargs: np.stack([np.asarray(img, dtype=np.float32) for img in images])
+        self.patches = [
+            mock.patch.object(DuplicateImageIdentifier, "load_models", lambda: (None, processor)),
+            mock.patch.object(DuplicateImageIdentifier, "_image_features",
+                              lambda inputs: inputs.reshape(len(inputs), -1)[:, :8]),
+            mock.patch.object(DuplicateImageIdentifier, "get_embedding_cache", lambda key: self.cache),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        """Stop the patches and clean up"""
+        import shutil
+        for patch in self.patches:
+            patch.stop()
+        self.cache._conn.close()
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def test_undecodable_file_omitted_and_not_cached(self):
+        """Test that a truncated file gets no embedding and is retried on the next scan"""
+        from DuplicateImageIdentifier import get_clip_embeddings_cached
+        embeddings = get_clip_embeddings_cached([self.good, self.truncated])
+        self.assertEqual(list(embeddings), [self.good])
+        hits, misses = self.cache.get_many([self.good, self.truncated])
+        self.assertEqual(list(hits), [self.good])
+        self.assertEqual(misses, [self.truncated])
+        print("✓ Undecodable files omitted and left out of the cache")
+
+
 if __name__ == '__main__':
     print("=" * 70)
     print("Running Duplicate Detection Tests")
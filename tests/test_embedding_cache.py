@@ -0,0 +1,61 @@
+"""
+Tests for the persistent CLIP embedding cache
+Verifies float32 vectors round-trip and entries are kept per model,
+without loading the CLIP model
+"""
+
+import unittest
+import os
+import sys
+import shutil
+from pathlib import Path
+import numpy as np
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from EmbeddingCache import EmbeddingCache
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    """Test cases for EmbeddingCache"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_data_dir = Path(__file__).parent / "test_data" / "embedding_cache"
+        self.test_data_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(self.test_data_dir / "embeddings.sqlite")
+        self.image_path = str(self.test_data_dir / "a.jpg")
+        with open(self.image_path, "wb") as f:
+            f.write(b"not really a jpeg")
+        self.cache = EmbeddingCache("test-model", db_path=self.db_path)
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.cache._conn.close()
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def test_vector_round_trip(self):
+        """Test that a stored embedding comes back as the same float32 vector"""
+        vector = np.linspace(-1, 1, 8).astype(np.float64)
+        self.cache.put_many([(self.image_path, vector)])
+        hits, _ = self.cache.get_many([self.image_path])
+        stored = hits[self.image_path]
+        self.assertEqual(stored.dtype, np.float32)
+        np.testing.assert_array_equal(stored, vector.astype(np.float32))
+        stored[0] = 5.0  # Returned arrays are writable copies
+        print("✓ Embedding stored and returned as float32")
+
+    def test_model_isolation(self):
+        """Test that entries from another model key are not returned"""
+        self.cache.put_many([(self.image_path, np.ones(4, dtype=np.float32))])
+        other = EmbeddingCache("other-model", db_path=self.db_path)
+        hits, misses = other.get_many([self.image_path])
+        other._conn.close()
+        self.assertEqual(hits, {})
+        self.assertEqual(misses, [self.image_path])
+        print("✓ Cache entries isolated per model")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Tests for the single-walk file discovery engine
+Verifies Trash pruning, case-insensitive extensions and cached stat results
+"""
+
+import unittest
+import os
+import sys
+import shutil
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from FileScanner import scan_image_files
+
+
+class TestFileScanner(unittest.TestCase):
+    """Test cases for scan_image_files and FileManifest"""
+
+    def setUp(self):
+        """Create a small tree with nested folders, a Trash folder and mixed-case extensions"""
+        self.test_data_dir = Path(__file__).parent / "test_data" / "file_scanner"
+        for sub in ("a", "a/deep", "b", "Trash", "b/Trash"):
+            (self.test_data_dir / sub).mkdir(parents=True, exist_ok=True)
+        self.expected = []
+        for rel in ("top.jpg", "a/one.JPG", "a/deep/two.Png", "b/three.webp"):
+            path = self.test_data_dir / rel
+            path.write_bytes(b"x" * 10)
+            self.expected.append(str(path))
+        for rel in ("notes.txt", "Trash/gone.jpg", "b/Trash/gone.png"):
+            (self.test_data_dir / rel).write_bytes(b"x")
+
+    def tearDown(self):
+        """Clean up test tree"""
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def test_matches_os_walk(self):
+        """Test that the manifest lists the same files as os.walk with Trash filtered out"""
+        walked = []
+        for dp, dn, filenames in os.walk(self.test_data_dir):
+            if "Trash" in dp.split(os.sep):
+                continue
+            walked.extend(os.path.join(dp, f) for f in filenames
+                          if os.path.splitext(f)[1].lower() in {'.jpg', '.png', '.webp'})
+        manifest = scan_image_files(str(self.test_data_dir))
+        self.assertEqual(sorted(manifest.files), sorted(walked))
+        self.assertEqual(sorted(manifest.files), sorted(self.expected))
+        print("✓ Single walk matches os.walk without Trash")
+
+    def test_cached_signatures(self):
+        """Test that each file's (size, mtime_ns) is recorded during the walk"""
+        manifest = scan_image_files(str(self.test_data_dir))
+        for path in self.expected:
+            st = os.stat(path)
+            self.assertEqual(manifest.signature(path), (st.st_size, st.st_mtime_ns))
+        self.assertIsNone(manifest.signature(str(self.test_data_dir / "notes.txt")))
+        self.assertEqual(manifest.total_bytes, 40)
+        print("✓ Stat results cached in manifest")
+
+    def test_extension_filter(self):
+        """Test restricting a manifest to a subset of extensions"""
+        manifest = scan_image_files(str(self.test_data_dir)).filter({'.jpg'})
+        self.assertEqual(sorted(manifest), sorted(self.expected[:2]))
+        self.assertEqual(manifest.extensions, {'.jpg'})
+        print("✓ Manifest filtered by extension")
+
+    def test_missing_folder(self):
+        """Test that a missing folder yields an empty manifest"""
+        self.assertEqual(len(scan_image_files(str(self.test_data_dir / "missing"))), 0)
+        print("✓ Missing folder returns empty manifest")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Tests for reduced-resolution decoding
+Verifies DCT-scaled decodes keep full-resolution dimensions and that blur
+scores measured on them stay on the full-resolution scale
+"""
+
+import unittest
+import os
+import sys
+import shutil
+from pathlib import Path
+import numpy as np
+import cv2
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ImageDecoder import (decode_for_analysis, load_resized, reduction_factor, ANALYSIS_MAX_SIDE)
+from BlurryImageDetection import BlurryImageDetector
+from ImageQualityAnalyzer import BLUR_GAIN_MAX
+
+
+class TestImageDecoder(unittest.TestCase):
+    """Test cases for ImageDecoder"""
+
+    def setUp(self):
+        """Write the same scene as a large and a half-size JPEG"""
+        self.test_data_dir = Path(__file__).parent / "test_data" / "image_decoder"
+        self.test_data_dir.mkdir(parents=True, exist_ok=True)
+        yy, xx = np.mgrid[0:3000, 0:4000].astype(np.float32)
+        scene = np.stack([np.sin(xx / 40) * np.cos(yy / 25) * 100 + 128, xx / 16 % 256, yy / 12 % 256], -1)
+        scene = scene.clip(0, 255).astype(np.uint8)
+        self.large = str(self.test_data_dir / "large.jpg")
+        self.half = str(self.test_data_dir / "half.jpg")
+        cv2.imwrite(self.large, scene, [cv2.IMWRITE_JPEG_QUALITY, 95])
+        cv2.imwrite(self.half, cv2.resize(scene, (2000, 1500), interpolation=cv2.INTER_AREA),
+                    [cv2.IMWRITE_JPEG_QUALITY, 95])
+
+    def tearDown(self):
+        """Clean up test images"""
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def test_reduction_factor(self):
+        """Test that the DCT scale never drops the long side below the target"""
+        self.assertEqual(reduction_factor(6000, 4000, 1024), 4)
+        self.assertEqual(reduction_factor(2048, 1536, 1024), 2)
+        self.assertEqual(reduction_factor(800, 600, 1024), 1)
+        self.assertEqual(reduction_factor(9000, 6000, 1024), 8)
+        print("✓ Reduction factor chosen per image size")
+
+    def test_analysis_decode_scale(self):
+        """Test that large images are measured at the canonical scale with header dimensions"""
+        image, size = decode_for_analysis(self.large)
+        self.assertEqual(size, (4000, 3000))
+        self.assertEqual(max(image.shape[:2]), ANALYSIS_MAX_SIDE)
+        print("✓ Analysis decode uses canonical scale and full-size dimensions")
+
+    def test_blur_score_full_resolution_scale(self):
+        """Test that downscaled measurements are corrected back to the full-resolution scale"""
+        detector = BlurryImageDetector()
+        large_score = detector.calculate_blur_score(self.large)
+        half_score = detector.calculate_blur_score(self.half)
+        image, _ = decode_for_analysis(self.large)
+        raw = cv2.Laplacian(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), cv2.CV_64F).var()
+        self.assertAlmostEqual(large_score, raw / BLUR_GAIN_MAX)
+        # The same scene spread over more pixels is blurrier per pixel, as at full resolution
+        self.assertLess(large_score, half_score)
+        print("✓ Blur score kept on the full-resolution scale")
+
+    def test_load_resized(self):
+        """Test that the reduced decode still returns the exact requested size"""
+        img = load_resized(self.large, (224, 224))
+        self.assertEqual(img.size, (224, 224))
+        self.assertEqual(img.mode, "RGB")
+        print("✓ Reduced decode resized to requested size")
+
+
+if __name__ == '__main__':
+    unittest.main()
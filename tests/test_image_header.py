@@ -0,0 +1,104 @@
+"""
+Tests for the header-only dimension reader
+Checks every parsed format against PIL and that EXIF orientation is applied
+"""
+
+import unittest
+import os
+import sys
+import shutil
+from pathlib import Path
+from PIL import Image
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import ImageHeader
+from ImageHeader import read_image_header, read_image_size, ORIENTATION_TAG
+
+
+class TestImageHeader(unittest.TestCase):
+    """Test cases for ImageHeader"""
+
+    def setUp(self):
+        """Create a test directory"""
+        self.test_data_dir = Path(__file__).parent / "test_data" / "image_header"
+        self.test_data_dir.mkdir(parents=True, exist_ok=True)
+
+    def tearDown(self):
+        """Clean up test images"""
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def _save(self, name, size=(321, 123), mode="RGB", orientation=None, **params):
+        path = str(self.test_data_dir / name)
+        img = Image.new(mode, size, (40, 120, 200) if mode == "RGB" else None)
+        if orientation is not None:
+            exif = Image.Exif()
+            exif[ORIENTATION_TAG] = orientation
+            params['exif'] = exif
+        img.save(path, **params)
+        return path
+
+    def test_formats_match_pil(self):
+        """Test that each parsed format reports the same size as PIL"""
+        paths = [
+            self._save("baseline.jpg"),
+            self._save("progressive.jpg", progressive=True),
+            self._save("image.png"),
+            self._save("lossy.webp"),
+            self._save("lossless.webp", lossless=True),
+            self._save("alpha.webp", mode="RGBA"),
+            self._save("image.bmp"),
+            self._save("image.tif"),
+            self._save("compressed.tiff", compression="tiff_lzw"),
+        ]
+        for path in paths:
+            with Image.open(path) as img:
+                expected = img.size
+            with self.subTest(path=os.path.basename(path)):
+                self.assertEqual(read_image_size(path), expected)
+        print(f"✓ Header sizes match PIL for {len(paths)} files")
+
+    def test_headers_parsed_without_pil(self):
+        """Test that supported formats never take the PIL fallback"""
+        paths = [self._save("a.jpg"), self._save("b.png"), self._save("c.webp"),
+                 self._save("d.bmp"), self._save("e.tif")]
+        original = ImageHeader._read_header_pil
+        ImageHeader._read_header_pil = lambda path: self.fail(f"PIL fallback used for {path}")
+        try:
+            for path in paths:
+                self.assertEqual(read_image_size(path), (321, 123))
+        finally:
+            ImageHeader._read_header_pil = original
+        print("✓ Supported formats parsed from headers")
+
+    def test_exif_orientation_applied(self):
+        """Test that rotated EXIF orientations swap width and height"""
+        rotated_jpeg = self._save("rotated.jpg", orientation=6)
+        mirrored_jpeg = self._save("mirrored.jpg", orientation=2)
+        rotated_webp = self._save("rotated.webp", orientation=8)
+        rotated_tiff = self._save("rotated.tif", orientation=5)
+        self.assertEqual(read_image_header(rotated_jpeg), (321, 123, 6))
+        self.assertEqual(read_image_size(rotated_jpeg), (123, 321))
+        self.assertEqual(read_image_size(mirrored_jpeg), (321, 123))
+        self.assertEqual(read_image_size(rotated_webp), (123, 321))
+        self.assertEqual(read_image_size(rotated_tiff), (123, 321))
+        print("✓ EXIF orientation applied to dimensions")
+
+    def test_fallback_and_errors(self):
+        """Test PIL fallback for other formats and errors for unreadable files"""
+        gif = self._save("image.gif")
+        self.assertEqual(read_image_size(gif), (321, 123))
+
+        truncated = str(self.test_data_dir / "truncated.jpg")
+        with open(truncated, 'wb') as f:
+            f.write(b'\xff\xd8\xff\xe0\x00\x10JFIF')
+        with self.assertRaises(OSError):
+            read_image_size(truncated)
+        with self.assertRaises(OSError):
+            read_image_size(str(self.test_data_dir / "missing.jpg"))
+        print("✓ PIL fallback and error handling work")
+
+
+if __name__ == '__main__':
+    unittest.main()
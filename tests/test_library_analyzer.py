@@ -0,0 +1,133 @@
+"""
+Tests for the one-pass library analyzer
+Verifies that one embedding per image feeds duplicates and both classifiers
+"""
+
+import unittest
+import os
+import sys
+import shutil
+from pathlib import Path
+import numpy as np
+from PIL import Image
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import ClipModelService
+import ImageClassification
+import SafeContentDetection
+import LibraryAnalyzer
+
+
+def _prompt_list(labels):
+    return [p for prompts in labels.values() for p in prompts]
+
+
+class TestLibraryAnalyzer(unittest.TestCase):
+    """Test cases for analyze_folder with precomputed embeddings"""
+
+    def setUp(self):
+        """Create images and fake embedding/text matrices"""
+        self.test_data_dir = Path(__file__).parent / "test_data" / "library_analyzer"
+        (self.test_data_dir / "Trash").mkdir(parents=True, exist_ok=True)
+        rng = np.random.default_rng(3)
+        self.files = []
+        for name in ("a.jpg", "b.jpg", "c.jpg"):
+            path = str(self.test_data_dir / name)
+            Image.fromarray(rng.integers(0, 256, size=(32, 32, 3), dtype=np.uint8)).save(path)
+            self.files.append(path)
+        self.copy = str(self.test_data_dir / "a_copy.jpg")
+        shutil.copyfile(self.files[0], self.copy)
+        Image.new("RGB", (8, 8)).save(self.test_data_dir / "Trash" / "old.jpg")
+
+        # a and b are near-duplicate "people" images, c is a "screenshot"
+        dim = 8
+        self.vectors = {
+            self.files[0]: np.eye(dim, dtype=np.float32)[0],
+            self.files[1]: np.eye(dim, dtype=np.float32)[0] + 0.01,
+            self.files[2]: np.eye(dim, dtype=np.float32)[1],
+        }
+        self.vectors[self.copy] = self.vectors[self.files[0]]
+        self.embedded_calls = []
+        self.text_keys = []
+        for labels in (ImageClassification.LABELS, SafeContentDetection.LABELS):
+            prompts = _prompt_list(labels)
+            text = np.zeros((len(prompts), dim), dtype=np.float32)
+            owners = [lbl for lbl, ps in labels.items() for _ in ps]
+            for i, owner in enumerate(owners):
+                text[i, list(labels).index(owner) % 2] = 1.0
+            key = ClipModelService._prompt_key(prompts)
+            ClipModelService._text_embeddings[key] = (text, 100.0)
+            self.text_keys.append(key)
+
+        self.saved_embedder = LibraryAnalyzer.get_clip_embeddings_cached
+
+        def fake_embeddings(paths, progress_callback=None):
+            self.embedded_calls.append(list(paths))
+            return {p: self.vectors[p] for p in paths}
+        LibraryAnalyzer.get_clip_embeddings_cached = fake_embeddings
+
+    def tearDown(self):
+        """Restore patched functions and clean up"""
+        LibraryAnalyzer.get_clip_embeddings_cached = self.saved_embedder
+        for key in self.text_keys:
+            ClipModelService._text_embeddings.pop(key, None)
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def test_single_embedding_pass(self):
+        """Test that every unique image is embedded once and feeds all three results"""
+        result = LibraryAnalyzer.analyze_folder(str(self.test_data_dir), threshold=0.95)
+
+        self.assertEqual(len(self.embedded_calls), 1)
+        # Only one of the two byte-identical files is embedded
+        self.assertEqual(len(self.embedded_calls[0]), 3)
+        self.assertTrue(set(self.files[1:]) <= set(self.embedded_calls[0]))
+        self.assertNotIn("old.jpg", [os.path.basename(f) for f in result['files']])
+
+        self.assertEqual(len(result['duplicate_groups']), 1)
+        self.assertEqual(sorted(result['duplicate_groups'][0]), sorted(self.files[:2] + [self.copy]))
+
+        labels = {path: label for path, label, _, _ in result['classification']}
+        self.assertEqual(labels[self.copy], labels[self.files[0]])
+        self.assertEqual(labels[self.files[0]], "people")
+        self.assertEqual(labels[self.files[2]], "screenshot")
+
+        safe = result['safe_content']
+        self.assertEqual(safe['total_processed'], 4)
+        self.assertEqual(len(safe['safe_images']), 3)
+        self.assertEqual([p for p, _, _ in safe['adult_images']], [self.files[2]])
+        print("✓ One embedding per image feeds duplicates and both classifiers")
+
+    def test_undecodable_image_reported_as_error(self):
+        """Test that a truncated JPEG is reported as an error rather than classified"""
+        from unittest import mock
+        import DuplicateImageIdentifier
+        from EmbeddingCache import EmbeddingCache
+        truncated = str(self.test_data_dir / "truncated.jpg")
+        with open(self.files[2], "rb") as f:
+            Path(truncated).write_bytes(f.read(40))
+        cache = EmbeddingCache("test-model", db_path=str(self.test_data_dir / "embeddings.sqlite"))
+        files = self.files + [truncated]
+
+        # The real embedding pipeline with the CLIP model stood in for
+        processor = lambda images, **kwargs: list(images)
+        features = lambda inputs: np.stack([self.vectors[self.files[0]] for _ in inputs])
+        try:
+            with mock.patch.object(LibraryAnalyzer, "get_clip_embeddings_cached", self.saved_embedder), \
+                    mock.patch.object(DuplicateImageIdentifier, "load_models", lambda: (None, processor)), \
+                    mock.patch.object(DuplicateImageIdentifier, "_image_features", features), \
+                    mock.patch.object(DuplicateImageIdentifier, "get_embedding_cache", lambda key: cache):
+                result = LibraryAnalyzer.analyze_folder(files=files, threshold=0.95)
+        finally:
+            cache._conn.close()
+
+        self.assertEqual(result['error_images'], [truncated])
+        self.assertEqual(result['safe_content']['error_images'], [truncated])
+        self.assertNotIn(truncated, [path for path, _, _, _ in result['classification']])
+        self.assertNotIn(truncated, [p for group in result['duplicate_groups'] for p in group])
+        print("✓ Undecodable image reported in the error buckets")
+
+
+if __name__ == '__main__':
+    unittest.main()
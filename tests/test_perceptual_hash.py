@@ -0,0 +1,147 @@
+"""
+Tests for perceptual hashing and Hamming neighbor search
+Covers dHash/pHash stability and the fast (no AI) duplicate mode
+"""
+
+import unittest
+import os
+import sys
+import shutil
+from pathlib import Path
+from unittest import mock
+import numpy as np
+from PIL import Image
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import PerceptualHash
+from PerceptualHash import (compute_image_hash, find_hash_neighbors, hamming_distance,
+                            similarity_to_distance, distance_to_similarity)
+
+
+class TestPerceptualHash(unittest.TestCase):
+    """Unit tests for hash computation"""
+
+    def setUp(self):
+        """Create a smooth pattern image, a resized copy and an unrelated image"""
+        self.test_data_dir = Path(__file__).parent / "test_data" / "perceptual_hash"
+        self.test_data_dir.mkdir(parents=True, exist_ok=True)
+        yy, xx = np.mgrid[0:300, 0:400]
+        gradient = (np.sin(xx / 37.0) * np.cos(yy / 23.0) * 100 + 128 + xx * 0.2).clip(0, 255).astype(np.uint8)
+        rng = np.random.default_rng(1)
+        noise = rng.integers(0, 256, size=(300, 400), dtype=np.uint8)
+
+        self.original = str(self.test_data_dir / "original.jpg")
+        self.resized = str(self.test_data_dir / "resized.jpg")
+        self.other = str(self.test_data_dir / "other.png")
+        Image.fromarray(gradient).convert("RGB").save(self.original, quality=95)
+        Image.fromarray(gradient).convert("RGB").resize((200, 150)).save(self.resized, quality=70)
+        Image.fromarray(noise).save(self.other)
+
+    def tearDown(self):
+        """Clean up test images"""
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def test_resized_copy_hashes_close(self):
+        """Test that a resized, recompressed copy stays within a few bits"""
+        for method in ("dhash", "phash"):
+            a = compute_image_hash(self.original, method)
+            b = compute_image_hash(self.resized, method)
+            c = compute_image_hash(self.other, method)
+            self.assertLessEqual(hamming_distance(a, b), 4)
+            self.assertGreater(hamming_distance(a, c), 10)
+        print("✓ Resized copies hash close, unrelated images hash far")
+
+    def test_unreadable_file_returns_none(self):
+        """Test that a broken file yields None instead of raising"""
+        broken = self.test_data_dir / "broken.jpg"
+        broken.write_bytes(b"not an image")
+        self.assertIsNone(compute_image_hash(str(broken)))
+        print("✓ Unreadable image returns None")
+
+    def test_similarity_distance_mapping(self):
+        """Test that slider thresholds map to the expected Hamming radius"""
+        self.assertEqual(similarity_to_distance(0.95), 3)
+        self.assertEqual(similarity_to_distance(0.80), 12)
+        self.assertGreaterEqual(float(distance_to_similarity(3)), 0.95)
+        self.assertLess(float(distance_to_similarity(4)), 0.95)
+        print("✓ Similarity/distance mapping consistent with slider")
+
+
+class TestHashNeighborSearch(unittest.TestCase):
+    """Tests for find_hash_neighbors"""
+
+    def setUp(self):
+        """Random hashes plus perturbed copies of the first 50"""
+        rng = np.random.default_rng(0)
+        self.hashes = [int(v) for v in rng.integers(0, 2**63, size=2000, dtype=np.int64)]
+        for k, base in enumerate(self.hashes[:50]):
+            for bit in rng.choice(64, size=k % 9, replace=False):
+                base ^= 1 << int(bit)
+            self.hashes.append(base)
+
+    def test_multi_index_matches_scan(self):
+        """Test that the multi-index table finds exactly the pairs a full scan finds"""
+        for radius in (0, 3, 4, 5, 7):
+            fast = find_hash_neighbors(self.hashes, radius)
+            saved = PerceptualHash.MULTI_INDEX_MAX_RADIUS
+            PerceptualHash.MULTI_INDEX_MAX_RADIUS = -1
+            try:
+                full = find_hash_neighbors(self.hashes, radius)
+            finally:
+                PerceptualHash.MULTI_INDEX_MAX_RADIUS = saved
+            self.assertEqual(set(zip(*(a.tolist() for a in fast))), set(zip(*(a.tolist() for a in full))))
+        print("✓ Multi-index search matches exhaustive scan")
+
+    def test_pairs_are_symmetric(self):
+        """Test that every pair is reported in both directions"""
+        rows, cols, _ = find_hash_neighbors(self.hashes, 5)
+        pairs = set(zip(rows.tolist(), cols.tolist()))
+        self.assertTrue(all((j, i) in pairs for i, j in pairs))
+        self.assertFalse(any(i == j for i, j in pairs))
+        print("✓ Neighbor pairs symmetric without self-pairs")
+
+
+class TestFastDuplicateMode(unittest.TestCase):
+    """Tests for hash-based duplicate grouping"""
+
+    def setUp(self):
+        """Write an image, a resized copy, an exact copy and an unrelated image"""
+        self.test_data_dir = Path(__file__).parent / "test_data" / "fast_duplicates"
+        self.test_data_dir.mkdir(parents=True, exist_ok=True)
+        yy, xx = np.mgrid[0:300, 0:400]
+        gradient = (np.sin(xx / 37.0) * np.cos(yy / 23.0) * 100 + 128 + xx * 0.2).clip(0, 255).astype(np.uint8)
+        rng = np.random.default_rng(2)
+        self.files = [str(self.test_data_dir / n) for n in ("a.jpg", "b.jpg", "c.jpg", "d.png")]
+        Image.fromarray(gradient).convert("RGB").save(self.files[0], quality=95)
+        Image.fromarray(gradient).convert("RGB").resize((200, 150)).save(self.files[1], quality=80)
+        shutil.copyfile(self.files[0], self.files[2])
+        Image.fromarray(rng.integers(0, 256, size=(300, 400), dtype=np.uint8)).save(self.files[3])
+
+    def tearDown(self):
+        """Clean up test images"""
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def test_group_similar_images_hash(self):
+        """Test that fast mode groups exact and resized copies without the model"""
+        from DuplicateImageIdentifier import group_similar_images_hash
+        groups = group_similar_images_hash(files=self.files, threshold=0.9)
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(sorted(groups[0]), sorted(self.files[:3]))
+        print("✓ Fast mode groups exact and resized copies")
+
+    def test_default_radii_use_multi_index(self):
+        """Test that the default hash graph and CLIP prefilter never run the quadratic scan"""
+        from DuplicateImageIdentifier import build_hash_similarity_graph, find_hash_candidate_pairs
+        with mock.patch.object(PerceptualHash, "_scan_neighbors",
+                               side_effect=AssertionError("quadratic scan used")):
+            graph = build_hash_similarity_graph(self.files)
+            rows, _ = find_hash_candidate_pairs(self.files)
+        self.assertLessEqual(similarity_to_distance(graph.min_threshold), PerceptualHash.MULTI_INDEX_MAX_RADIUS)
+        self.assertGreater(len(rows), 0)
+        print("✓ Default hash searches stay on the multi-index table")
+
+
+if __name__ == '__main__':
+    unittest.main()
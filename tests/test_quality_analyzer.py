@@ -0,0 +1,196 @@
+"""
+Tests for the single-decode image quality analyzer
+Verifies blur, brightness and dimensions match the individual detectors
+"""
+
+import unittest
+import os
+import sys
+import shutil
+from pathlib import Path
+import numpy as np
+from PIL import Image, ImageFilter
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import ImageQualityAnalyzer
+from ImageQualityAnalyzer import (analyze_image_quality, scan_folder_quality, blur_results,
+                                  dark_results, low_res_results, clear_quality_cache, iter_quality_records,
+                                  ScoreIndex, DimensionIndex, StreamingSplit, scored_items, dimension_items)
+from BlurryImageDetection import BlurryImageDetector, detect_blurry_images_batch
+from DarkImageDetection import DarkImageDetector, detect_dark_images_batch
+from LowResolutionDetection import LowResolutionDetector
+
+
+class TestImageQualityAnalyzer(unittest.TestCase):
+    """Test cases for ImageQualityAnalyzer"""
+
+    def setUp(self):
+        """Create sharp, blurry, dark and small images plus a Trash folder"""
+        self.test_data_dir = Path(__file__).parent / "test_data" / "quality_analyzer"
+        (self.test_data_dir / "Trash").mkdir(parents=True, exist_ok=True)
+        rng = np.random.default_rng(4)
+        noise = Image.fromarray(rng.integers(0, 256, size=(300, 400, 3), dtype=np.uint8))
+        self.sharp = str(self.test_data_dir / "sharp.png")
+        self.blurry = str(self.test_data_dir / "blurry.png")
+        self.dark = str(self.test_data_dir / "dark.jpg")
+        self.small = str(self.test_data_dir / "small.png")
+        noise.save(self.sharp)
+        noise.filter(ImageFilter.GaussianBlur(8)).save(self.blurry)
+        Image.fromarray((rng.integers(0, 20, size=(300, 400, 3))).astype(np.uint8)).save(self.dark)
+        noise.resize((64, 48)).save(self.small)
+        noise.save(self.test_data_dir / "Trash" / "deleted.png")
+        clear_quality_cache()
+
+    def tearDown(self):
+        """Clean up test images"""
+        clear_quality_cache()
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def test_metrics_match_individual_detectors(self):
+        """Test that one decode gives the same numbers as the three detectors"""
+        for path in (self.sharp, self.blurry, self.dark, self.small):
+            record = analyze_image_quality(path)
+            self.assertAlmostEqual(record['blur_score'], BlurryImageDetector().calculate_blur_score(path), places=6)
+            self.assertAlmostEqual(record['brightness'], DarkImageDetector().calculate_brightness_score(path), places=6)
+            self.assertEqual((record['width'], record['height']), LowResolutionDetector().get_dimensions(path))
+        print("✓ Combined metrics match individual detectors")
+
+    def test_process_backend_matches_threads(self):
+        """Test that worker processes return the same records as the thread pool"""
+        paths = [self.sharp, self.blurry, self.dark, self.small, str(self.test_data_dir / "missing.png")]
+        for need_pixels in (True, False):
+            by_thread = {r['path']: r for r in iter_quality_records(paths, need_pixels, backend="thread")}
+            by_process = {r['path']: r for r in iter_quality_records(paths, need_pixels, backend="process",
+                                                                     max_workers=2, chunk_size=2)}
+            self.assertEqual(by_process, by_thread)
+        self.assertEqual(by_process[paths[-1]]['width'], -1)
+
+        folder = str(self.test_data_dir)
+        self.assertEqual(detect_blurry_images_batch(folder, backend="process", max_workers=2),
+                         detect_blurry_images_batch(folder))
+        self.assertEqual(detect_dark_images_batch(folder, backend="process", max_workers=2),
+                         detect_dark_images_batch(folder))
+        print("✓ Process backend matches thread backend")
+
+    def test_results_formats(self):
+        """Test that records split into each detector's result format"""
+        records = scan_folder_quality(str(self.test_data_dir))
+        self.assertEqual(len(records), 4)
+        blur = blur_results(records, threshold=100.0)
+        self.assertIn(self.blurry, [p for p, _ in blur['blurry_images']])
+        self.assertEqual(blur['sharp_images'][0][0], self.sharp)
+        dark = dark_results(records, threshold=40.0)
+        self.assertEqual([p for p, _ in dark['dark_images']], [self.dark])
+        low = low_res_results(records, min_width=200, min_height=200)
+        self.assertEqual(low['low_res_images'], [(self.small, 64, 48)])
+        self.assertEqual(low['total_processed'], 4)
+        print("✓ Records split into blur, dark and low-res results")
+
+    def test_results_streamed_during_scan(self):
+        """Test that result_callback receives every record, cached ones in one chunk"""
+        chunks = []
+        records = scan_folder_quality(str(self.test_data_dir), result_callback=chunks.append)
+        self.assertEqual(sorted(r['path'] for c in chunks for r in c), sorted(r['path'] for r in records))
+
+        chunks.clear()
+        scan_folder_quality(str(self.test_data_dir), result_callback=chunks.append)
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(len(chunks[0]), 4)
+
+        streamed = []
+        folder = str(self.test_data_dir)
+        result = detect_blurry_images_batch(folder, result_callback=streamed.extend)
+        self.assertEqual(sum(1 for _, _, blurry in streamed if blurry), result['total_blurry'])
+        print("✓ Results streamed while scanning")
+
+    def test_threshold_reapplied_from_index(self):
+        """Test that re-splitting an index matches a fresh split of the records"""
+        records = scan_folder_quality(str(self.test_data_dir))
+        blur_index = ScoreIndex.from_records(records, 'blur_score')
+        dims_index = DimensionIndex.from_records(records)
+        for threshold in (0.0, 50.0, 100.0, 1e9):
+            reapplied = blur_results(blur_index, threshold)
+            fresh = blur_results(records, threshold)
+            self.assertEqual(reapplied['total_blurry'], fresh['total_blurry'])
+            self.assertEqual(sorted(reapplied['blurry_images']), sorted(fresh['blurry_images']))
+            scores = [s for _, s in reapplied['blurry_images']]
+            self.assertEqual(scores, sorted(scores))
+        self.assertEqual(low_res_results(dims_index, 300, 300)['low_res_images'], [(self.small, 64, 48)])
+        self.assertEqual(low_res_results(dims_index, 500, 100)['total_low_res'], 4)
+
+        smaller = dims_index.without([self.small])
+        self.assertEqual(low_res_results(smaller, 300, 300)['low_res_images'], [])
+        self.assertEqual(len(blur_index.without([self.blurry])), 3)
+        print("✓ Thresholds re-applied from score index")
+
+    def test_streamed_chunks_merge_into_split(self):
+        """Test that merging result chunks gives the same lists as splitting everything at once"""
+        rng = np.random.default_rng(7)
+        records = [{'path': f"img_{i}.jpg", 'blur_score': float(score), 'width': int(w), 'height': int(h)}
+                   for i, (score, w, h) in enumerate(zip(rng.integers(0, 200, 300),
+                                                         rng.integers(50, 800, 300),
+                                                         rng.integers(50, 800, 300)))]
+        records[5]['blur_score'] = -1
+        records[6]['width'] = -1
+        blur = StreamingSplit(key=lambda item: item[1], is_below=lambda item: item[1] < 100.0)
+        dims = StreamingSplit(key=lambda item: min(item[1], item[2]),
+                              is_below=lambda item: item[1] < 300 or item[2] < 300)
+        # A large first chunk is merged by sorting, the small ones after it by bisection
+        for start, end in ((0, 100), (100, 110), (110, 111), (111, 300)):
+            blur.extend(scored_items(records[start:end], 'blur_score'))
+            dims.extend(dimension_items(records[start:end]))
+
+        expected = blur_results(records, 100.0)
+        self.assertEqual([s for _, s in blur.below.items], [s for _, s in expected['blurry_images']])
+        self.assertEqual([s for _, s in blur.above.items], [s for _, s in expected['sharp_images']])
+        self.assertEqual(sorted(blur.below.items), sorted(expected['blurry_images']))
+        expected = low_res_results(records, 300, 300)
+        self.assertEqual(sorted(dims.below.items), sorted(expected['low_res_images']))
+        self.assertEqual([min(w, h) for _, w, h in dims.below.items],
+                         [min(w, h) for _, w, h in expected['low_res_images']])
+        self.assertEqual([min(w, h) for _, w, h in dims.above.items],
+                         [min(w, h) for _, w, h in expected['ok_images']])
+        print("✓ Streamed chunks merged in split order")
+
+    def test_records_reused_across_tools(self):
+        """Test that a second scan (e.g. from another tool) does not decode again"""
+        scan_folder_quality(str(self.test_data_dir))
+        calls = []
+        saved = ImageQualityAnalyzer.analyze_image_quality
+        ImageQualityAnalyzer.analyze_image_quality = lambda p: calls.append(p) or saved(p)
+        try:
+            scan_folder_quality(str(self.test_data_dir))
+            scan_folder_quality(str(self.test_data_dir), need_pixels=False)
+            os.utime(self.dark, ns=(0, 0))
+            scan_folder_quality(str(self.test_data_dir))
+        finally:
+            ImageQualityAnalyzer.analyze_image_quality = saved
+        self.assertEqual(calls, [self.dark])
+        print("✓ Cached records reused; modified file decoded again")
+
+    def test_rescan_after_restart_decodes_only_changes(self):
+        """Test that persisted records survive clearing memory and deleted files are pruned"""
+        scan_folder_quality(str(self.test_data_dir))
+        clear_quality_cache()
+        os.remove(self.small)
+        Image.new("RGB", (32, 32)).save(self.test_data_dir / "new.png")
+        calls = []
+        saved = ImageQualityAnalyzer.analyze_image_quality
+        ImageQualityAnalyzer.analyze_image_quality = lambda p: calls.append(p) or saved(p)
+        try:
+            records = scan_folder_quality(str(self.test_data_dir))
+        finally:
+            ImageQualityAnalyzer.analyze_image_quality = saved
+        self.assertEqual(calls, [str(self.test_data_dir / "new.png")])
+        self.assertEqual(len(records), 4)
+        store = ImageQualityAnalyzer.get_result_cache(ImageQualityAnalyzer.QUALITY_CACHE_KEY)
+        rows = store._conn.execute("SELECT COUNT(*) FROM results WHERE path = ? AND detector = ?",
+                                   (self.small, store.detector_key)).fetchone()[0]
+        self.assertEqual(rows, 0)
+        print("✓ Rescan decodes only new files and prunes deleted ones")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -21,7 +21,8 @@ if hasattr(sys.stdout, 'reconfigure'):
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from SafeContentDetection import (
-    LABELS, SafeContentDetector, scan_folder_safe_content, scan_content_batch
+    LABELS, SafeContentDetector, scan_folder_safe_content, scan_content_batch,
+    summarize_content_results, ContentSummary
 )
 
 REQUIRED_CATEGORIES = {'safe', 'adult', 'violent', 'disturbing'}
@@ -201,6 +202,63 @@ class TestSafeContentDetection(unittest.TestCase):
                          "Images in Trash directory should be excluded from scan")
         print("✓ Images in Trash subdirectory are excluded from scan")
 
+    # --- Streaming ---
+
+    def test_results_streamed_per_batch(self):
+        """Each CLIP batch's results reach result_callback before the scan returns."""
+        import numpy as np
+        from PIL import Image as PILImage
+        import ClipModelService
+        import SafeContentDetection
+
+        paths = []
+        for i in range(4):
+            path = str(self.test_data_dir / f"img_{i}.jpg")
+            PILImage.new("RGB", (32, 32), color=(i * 60, 0, 0)).save(path)
+            paths.append(path)
+        broken = str(self.test_data_dir / "broken.jpg")
+        with open(broken, 'wb') as f:
+            f.write(b'not an image')
+        paths.append(broken)
+
+        # Inject text embeddings and a fake vision tower so no model is loaded
+        prompts = [p for ps in LABELS.values() for p in ps]
+        key = ClipModelService._prompt_key(prompts)
+        ClipModelService._text_embeddings[key] = (np.eye(len(prompts), 8, dtype=np.float32), 100.0)
+        saved_encoder = SafeContentDetection.encode_images
+        SafeContentDetection.encode_images = lambda imgs: np.eye(len(imgs), 8, dtype=np.float32)
+        chunks = []
+        try:
+            output = scan_content_batch(paths, batch_size=2, result_callback=chunks.append)
+        finally:
+            SafeContentDetection.encode_images = saved_encoder
+            ClipModelService._text_embeddings.pop(key, None)
+            SafeContentDetection.get_content_cache().remove(paths)
+
+        self.assertEqual([len(c) for c in chunks], [2, 2, 1])
+        self.assertEqual(sorted(r for c in chunks for r in c), sorted(output))
+        self.assertEqual(chunks[-1], [(broken, 'error', 0.0, {})])
+        print("✓ Results streamed to the callback one CLIP batch at a time")
+
+    def test_summary_merged_per_chunk(self):
+        """A summary built chunk by chunk matches summarizing every result at once."""
+        labels = ['safe', 'adult', 'violent', 'disturbing', 'error']
+        results = [(f"img_{i}.jpg", labels[i % 5], ((i * 37) % 100) / 100, {})
+                   for i in range(120)]
+        summary = ContentSummary()
+        added = summary.extend(results[:60])
+        self.assertEqual(len(added['adult']), 12)
+        for i in range(60, 120, 7):
+            summary.extend(results[i:i + 7])
+
+        expected = summarize_content_results(results)
+        self.assertEqual(summary.results(), expected)
+        adult = [(path, conf, scores) for path, label, conf, scores in results if label == 'adult']
+        self.assertEqual(expected['adult_images'], sorted(adult, key=lambda x: x[1], reverse=True))
+        self.assertEqual(expected['total_processed'], 120)
+        self.assertEqual(expected['total_flagged'], 72)
+        print("✓ Content summary merged one chunk at a time")
+
 
 if __name__ == '__main__':
     print("=" * 70)
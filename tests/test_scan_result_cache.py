@@ -0,0 +1,58 @@
+"""
+Tests for the persistent scan result cache
+Verifies JSON results round-trip and entries are kept per detector
+"""
+
+import unittest
+import os
+import sys
+import shutil
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ScanResultCache import ScanResultCache
+
+
+class TestScanResultCache(unittest.TestCase):
+    """Test cases for ScanResultCache"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_data_dir = Path(__file__).parent / "test_data" / "scan_result_cache"
+        self.test_data_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(self.test_data_dir / "results.sqlite")
+        self.paths = []
+        for name in ("a.jpg", "b.jpg"):
+            path = self.test_data_dir / name
+            path.write_bytes(b"image bytes")
+            self.paths.append(str(path))
+        self.cache = ScanResultCache("test-detector", db_path=self.db_path)
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.cache._conn.close()
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def test_json_round_trip(self):
+        """Test that stored results come back as the same JSON values"""
+        results = [(self.paths[0], {"score": 12.5, "width": 640}), (self.paths[1], ["people", 0.9, {}])]
+        self.cache.put_many(results)
+        hits, misses = self.cache.get_many(self.paths)
+        self.assertEqual(hits, dict(results))
+        self.assertEqual(misses, [])
+        print("✓ Cached result returned as stored")
+
+    def test_detector_isolation(self):
+        """Test that entries from another detector are not returned"""
+        self.cache.put_many([(self.paths[0], 1)])
+        other = ScanResultCache("other-detector", db_path=self.db_path)
+        hits, _ = other.get_many([self.paths[0]])
+        other._conn.close()
+        self.assertEqual(hits, {})
+        print("✓ Cache entries isolated per detector")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+Tests for the shared SQLite cache base
+Verifies (path, size, mtime) keyed lookups, invalidation of modified files,
+scope isolation, pruning of deleted files, chunked deletes and the
+process-wide cache registry
+"""
+
+import unittest
+import os
+import sys
+import shutil
+import time
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from SignatureCache import SignatureCache, CacheRegistry
+
+
+class TextCache(SignatureCache):
+    TABLE = "values_table"
+    DB_NAME = "values.sqlite"
+    SCOPE_COLUMN = "owner"
+    VALUE_TYPE = "TEXT"
+    LABEL = "Test cache"
+
+
+class TestSignatureCache(unittest.TestCase):
+    """Test cases for SignatureCache"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_data_dir = Path(__file__).parent / "test_data" / "signature_cache"
+        self.photos = self.test_data_dir / "photos"
+        self.photos.mkdir(parents=True, exist_ok=True)
+        self.paths = []
+        for name in ("a.jpg", "b.jpg", "c.webp"):
+            path = self.photos / name
+            path.write_bytes(name.encode())
+            self.paths.append(str(path))
+        self.db_path = str(self.test_data_dir / "values.sqlite")
+        self.cache = TextCache("tool-a", db_path=self.db_path)
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.cache._conn.close()
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def test_miss_then_hit(self):
+        """Test that stored values are returned for unchanged files"""
+        hits, misses = self.cache.get_many(self.paths)
+        self.assertEqual(hits, {})
+        self.assertEqual(misses, self.paths)
+
+        self.cache.put_many([(self.paths[0], "a")])
+        hits, misses = self.cache.get_many(self.paths)
+        self.assertEqual(hits, {self.paths[0]: "a"})
+        self.assertEqual(misses, self.paths[1:])
+        self.assertEqual(self.cache.get_stats()['hits'], 1)
+        print("✓ Cached value returned for unchanged file")
+
+    def test_modified_file_is_miss(self):
+        """Test that changing a file invalidates its cached value"""
+        self.cache.put_many([(self.paths[0], "a")])
+        time.sleep(0.01)
+        with open(self.paths[0], "ab") as f:
+            f.write(b"edited")
+        hits, misses = self.cache.get_many(self.paths[:1])
+        self.assertEqual(hits, {})
+        self.assertEqual(misses, self.paths[:1])
+        print("✓ Modified file treated as cache miss")
+
+    def test_scopes_are_isolated(self):
+        """Test that one scope never sees or deletes another scope's entries"""
+        other = TextCache("tool-b", db_path=self.db_path)
+        try:
+            self.cache.put_many([(self.paths[0], "a")])
+            other.put_many([(self.paths[0], "b")])
+            self.assertEqual(self.cache.get_many(self.paths[:1])[0], {self.paths[0]: "a"})
+            self.cache.clear()
+            self.assertEqual(other.get_many(self.paths[:1])[0], {self.paths[0]: "b"})
+        finally:
+            other._conn.close()
+        print("✓ Cache scopes isolated")
+
+    def test_prune_deleted_files(self):
+        """Test that pruning a folder drops only its deleted files"""
+        sibling = self.test_data_dir / "photos_2"
+        sibling.mkdir(exist_ok=True)
+        other = str(sibling / "d.jpg")
+        Path(other).write_bytes(b"d")
+        self.cache.put_many((path, "x") for path in self.paths + [other])
+        os.remove(self.paths[1])
+        removed = self.cache.prune(str(self.photos), [self.paths[0], self.paths[2]])
+        self.assertEqual(removed, 1)
+        hits, _ = self.cache.get_many([self.paths[0], self.paths[2], other])
+        # photos_2 shares the prefix "photos" but is a different folder
+        self.assertEqual(sorted(hits), sorted([self.paths[0], self.paths[2], other]))
+        print("✓ Deleted files pruned without touching sibling folders")
+
+    def test_prune_limited_to_extensions(self):
+        """Test that pruning only drops missing files of the scanned types"""
+        self.cache.put_many((path, "x") for path in self.paths)
+        removed = self.cache.prune(str(self.photos), self.paths[:1], {".jpg"})
+        self.assertEqual(removed, 1)
+        hits, misses = self.cache.get_many(self.paths)
+        self.assertEqual(sorted(hits), sorted([self.paths[0], self.paths[2]]))
+        self.assertEqual(misses, [self.paths[1]])
+        print("✓ Prune keeps file types outside the scan")
+
+    def test_prune_case_sensitive_folder(self):
+        """Test that pruning a folder leaves a sibling folder differing only in case alone"""
+        upper = self.test_data_dir / "Photos"
+        lower = self.test_data_dir / "photos"
+        upper.mkdir(exist_ok=True)
+        kept = str(upper / "x.jpg")
+        sibling = str(lower / "y.jpg")
+        for path in (kept, sibling):
+            Path(path).write_bytes(b"x")
+        self.cache.put_many([(kept, "x"), (sibling, "y")])
+        removed = self.cache.prune(str(upper), [kept])
+        # On a case-insensitive filesystem both names are one folder, but the
+        # stored paths keep the case they were scanned with
+        self.assertEqual(removed, 0)
+        hits, _ = self.cache.get_many([kept, sibling])
+        self.assertEqual(sorted(hits), sorted([kept, sibling]))
+        print("✓ Prune matches the folder prefix case-sensitively")
+
+    def test_remove_many_paths(self):
+        """Test that removing more paths than one query allows is chunked"""
+        self.cache.put_many((path, "x") for path in self.paths)
+        fake = [str(self.photos / f"missing{i}.jpg") for i in range(SignatureCache._QUERY_CHUNK + 10)]
+        self.cache.remove(fake + self.paths[:2])
+        hits, _ = self.cache.get_many(self.paths)
+        self.assertEqual(list(hits), [self.paths[2]])
+        print("✓ Large removals chunked")
+
+    def test_registry_creates_once(self):
+        """Test that the registry returns one cache per key"""
+        created = []
+        registry = CacheRegistry(lambda key: created.append(key) or object())
+        self.assertIs(registry.get("x"), registry.get("x"))
+        self.assertIsNot(registry.get("x"), registry.get("y"))
+        self.assertEqual(created, ["x", "y"])
+        print("✓ Registry creates each cache once")
+
+
+if __name__ == '__main__':
+    unittest.main()
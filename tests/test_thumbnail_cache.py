@@ -0,0 +1,103 @@
+"""
+Tests for the persistent thumbnail cache
+Verifies level selection, pyramid generation, thumbnails stored per
+level, pruning every level of a deleted file, and that make_thumbnail
+reuses stored levels
+"""
+
+import unittest
+import os
+import sys
+import shutil
+from pathlib import Path
+from PIL import Image
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ThumbnailCache import ThumbnailDiskCache, thumbnail_level, build_pyramid, THUMBNAIL_LEVELS
+from ThumbnailService import make_thumbnail
+
+
+class TestThumbnailCache(unittest.TestCase):
+    """Test cases for ThumbnailDiskCache"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_data_dir = Path(__file__).parent / "test_data" / "thumbnail_cache"
+        self.photos = self.test_data_dir / "photos"
+        self.photos.mkdir(parents=True, exist_ok=True)
+        self.paths = []
+        for name, color in (("a.jpg", (200, 30, 30)), ("b.jpg", (30, 200, 30))):
+            path = self.photos / name
+            Image.new("RGB", (1600, 1200), color).save(path, quality=90)
+            self.paths.append(str(path))
+        self.cache = ThumbnailDiskCache(db_path=str(self.test_data_dir / "thumbnails.sqlite"))
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.cache._conn.close()
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def test_thumbnail_level(self):
+        """Test that requests map to the smallest level covering them"""
+        self.assertEqual(thumbnail_level((60, 45)), 160)
+        self.assertEqual(thumbnail_level((240, 180)), 320)
+        self.assertEqual(thumbnail_level((580, 360)), 640)  # Largest zoom step in the GUIs
+        self.assertIsNone(thumbnail_level((800, 600)))
+        print("✓ Thumbnail level chosen per request size")
+
+    def test_levels_stored_separately(self):
+        """Test that a stored thumbnail is returned only for its own level"""
+        self.assertIsNone(self.cache.get(self.paths[0], 320))
+        self.cache.put(self.paths[0], 320, Image.new("RGB", (320, 240), (200, 30, 30)))
+        image = self.cache.get(self.paths[0], 320)
+        self.assertEqual(image.size, (320, 240))
+        self.assertGreater(image.getpixel((0, 0))[0], 150)
+        self.assertIsNone(self.cache.get(self.paths[0], 160))
+        print("✓ Thumbnails stored per level")
+
+    def test_prune_drops_every_level(self):
+        """Test that all levels of a deleted file are dropped and counted once"""
+        for path in self.paths:
+            self.cache.put(path, 160, Image.new("RGB", (160, 120)))
+            self.cache.put(path, 320, Image.new("RGB", (320, 240)))
+        removed = self.cache.prune(str(self.photos), self.paths[:1])
+        self.assertEqual(removed, 1)
+        self.assertIsNotNone(self.cache.get(self.paths[0], 320))
+        self.assertIsNone(self.cache.get(self.paths[1], 160))
+        self.assertIsNone(self.cache.get(self.paths[1], 320))
+        print("✓ Every level of a deleted file pruned")
+
+    def test_make_thumbnail_uses_stored_level(self):
+        """Test that a second request at another size is served from the stored level"""
+        first = make_thumbnail(self.paths[0], (240, 180), disk_cache=self.cache)
+        self.assertEqual(first.size, (240, 180))
+        self.assertEqual(self.cache.get_stats()['misses'], 1)
+        second = make_thumbnail(self.paths[0], (180, 135), disk_cache=self.cache)
+        self.assertEqual(second.size, (180, 135))
+        self.assertEqual(self.cache.get_stats()['hits'], 1)
+        print("✓ make_thumbnail reuses the stored level")
+
+    def test_build_pyramid(self):
+        """Test that every level is made from one image, keeping the aspect ratio"""
+        levels = build_pyramid(Image.new("RGB", (1600, 1200)))
+        self.assertEqual(sorted(levels), sorted(THUMBNAIL_LEVELS))
+        self.assertEqual(levels[640].size, (640, 480))
+        self.assertEqual(levels[160].size, (160, 120))
+        print("✓ Pyramid levels built from one decode")
+
+    def test_zoom_served_from_pyramid(self):
+        """Test that after one thumbnail, every zoom step is a cache hit"""
+        make_thumbnail(self.paths[1], (240, 180), disk_cache=self.cache)
+        misses = self.cache.get_stats()['misses']
+        for size in ((60, 45), (120, 90), (300, 225), (480, 360), (580, 360)):
+            img = make_thumbnail(self.paths[1], size, disk_cache=self.cache)
+            self.assertLessEqual(img.size[0], size[0])
+            self.assertLessEqual(img.size[1], size[1])
+        self.assertEqual(self.cache.get_stats()['misses'], misses)
+        print("✓ Zoom steps resampled from stored levels")
+
+
+if __name__ == '__main__':
+    unittest.main()
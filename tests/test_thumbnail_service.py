@@ -0,0 +1,135 @@
+"""
+Tests for background thumbnail generation
+Verifies request ordering, cancellation and failure handling of the
+ThumbnailLoader work queue, and the size of generated thumbnails
+"""
+
+import unittest
+import os
+import sys
+import time
+import shutil
+import threading
+from pathlib import Path
+from PIL import Image
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ThumbnailCache import ThumbnailDiskCache
+from ThumbnailService import ThumbnailLoader, make_thumbnail, PREFETCH, VISIBLE
+
+
+def drain_all(loader, timeout=5.0):
+    """Collect results until nothing is pending"""
+    results = []
+    deadline = time.monotonic() + timeout
+    while loader.pending_count() and time.monotonic() < deadline:
+        results.extend(loader.drain())
+        time.sleep(0.01)
+    results.extend(loader.drain())
+    return results
+
+
+class TestThumbnailLoader(unittest.TestCase):
+    """Test cases for ThumbnailLoader"""
+
+    def setUp(self):
+        self.order = []
+        self.started = threading.Event()
+        self.gate = threading.Event()
+
+    def tearDown(self):
+        self.gate.set()
+
+    def blocking_loader(self, path, size):
+        """Hold the single worker on the first request until the gate opens"""
+        self.started.set()
+        self.gate.wait(5)
+        self.order.append(path)
+        return Image.new("RGB", size)
+
+    def test_visible_before_prefetch(self):
+        """Test that visible cards decode first, most recent first"""
+        loader = ThumbnailLoader(max_workers=1, loader=self.blocking_loader)
+        loader.request("first", (10, 10))
+        self.assertTrue(self.started.wait(5))
+        loader.request("prefetch", (10, 10), PREFETCH)
+        loader.request("old", (10, 10), VISIBLE)
+        loader.request("new", (10, 10), VISIBLE)
+        self.gate.set()
+        drain_all(loader)
+        self.assertEqual(self.order, ["first", "new", "old", "prefetch"])
+        loader.shutdown()
+        print("✓ Visible thumbnails decoded before prefetches")
+
+    def test_prioritize_queued_request(self):
+        """Test that re-requesting a prefetch as visible moves it ahead"""
+        loader = ThumbnailLoader(max_workers=1, loader=self.blocking_loader)
+        loader.request("first", (10, 10))
+        self.assertTrue(self.started.wait(5))
+        loader.request("scrolled_to", (10, 10), PREFETCH)
+        loader.request("visible", (10, 10), VISIBLE)
+        loader.request("scrolled_to", (10, 10), VISIBLE)
+        self.gate.set()
+        results = drain_all(loader)
+        self.assertEqual(self.order, ["first", "scrolled_to", "visible"])
+        self.assertEqual(len(results), 3)
+        loader.shutdown()
+        print("✓ Raised priority reorders the queue without duplicating work")
+
+    def test_cancel(self):
+        """Test that cancelled requests are never decoded"""
+        loader = ThumbnailLoader(max_workers=1, loader=self.blocking_loader)
+        loader.request("first", (10, 10))
+        self.assertTrue(self.started.wait(5))
+        loader.request("gone", (10, 10))
+        loader.request("kept", (10, 10))
+        loader.cancel("gone", (10, 10))
+        self.gate.set()
+        results = drain_all(loader)
+        self.assertEqual(self.order, ["first", "kept"])
+        self.assertEqual({key[0] for key, _ in results}, {"first", "kept"})
+        loader.shutdown()
+        print("✓ Cancelled thumbnails skipped")
+
+    def test_failure_reported_as_none(self):
+        """Test that undecodable files come back as None instead of stopping the worker"""
+        def failing_loader(path, size):
+            if path == "broken":
+                raise OSError("cannot identify image file")
+            return Image.new("RGB", size)
+
+        loader = ThumbnailLoader(max_workers=1, loader=failing_loader)
+        loader.request("broken", (10, 10))
+        loader.request("fine", (10, 10))
+        results = dict(drain_all(loader))
+        self.assertIsNone(results[("broken", (10, 10))])
+        self.assertIsNotNone(results[("fine", (10, 10))])
+        loader.shutdown()
+        print("✓ Decode failures reported as None")
+
+
+class TestMakeThumbnail(unittest.TestCase):
+    """Test cases for make_thumbnail"""
+
+    def setUp(self):
+        self.test_data_dir = Path(__file__).parent / "test_data" / "thumbnail_service"
+        self.test_data_dir.mkdir(parents=True, exist_ok=True)
+        self.path = str(self.test_data_dir / "wide.jpg")
+        Image.new("RGB", (3000, 1500), (200, 120, 40)).save(self.path, quality=90)
+        self.disk_cache = ThumbnailDiskCache(db_path=str(self.test_data_dir / "thumbnails.sqlite"))
+
+    def tearDown(self):
+        self.disk_cache._conn.close()
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def test_fits_bounding_box(self):
+        """Test that thumbnails fit the box and keep the aspect ratio"""
+        img = make_thumbnail(self.path, (240, 180), disk_cache=self.disk_cache)
+        self.assertEqual(img.size, (240, 120))
+        print("✓ Thumbnail fits the bounding box")
+
+
+if __name__ == '__main__':
+    unittest.main()